@@ -16,7 +16,7 @@
 
 from fastapi import APIRouter, HTTPException, status
 
-from backend.API.Managers.authentication_manager import signup, login
+from backend.API.Managers.authentication_manager import signup_async, login_async
 from backend.API.Models.login_input import LoginInput
 from backend.API.Models.register_input import RegisterInput
 
@@ -33,14 +33,14 @@ authentication_router = APIRouter()
 
 
 @authentication_router.post("/register")
-def register_endpoint(register_input: RegisterInput):
+async def register_endpoint(register_input: RegisterInput):
     """
     Registers a new user
     :param register_input: The input data for the new user
     :return: A message indicating whether the user was registered successfully
     """
     # Check if the user was registered successfully
-    if signup(
+    if await signup_async(
         register_input.username,
         register_input.first_name,
         register_input.last_name,
@@ -56,14 +56,14 @@ def register_endpoint(register_input: RegisterInput):
 
 
 @authentication_router.post("/login")
-def register_endpoint(login_input: LoginInput):
+async def register_endpoint(login_input: LoginInput):
     """
     Logs in an existing user
     :param login_input: The input data for the user
     :return: An API key if the user was logged in successfully
     """
     # The API key retrieved from the login function
-    api_key = login(login_input.username, login_input.password)
+    api_key = await login_async(login_input.username, login_input.password)
     # If no API key was retrieved, raise an error
     if api_key is False:
         raise HTTPException(
@@ -20,6 +20,7 @@ from backend.API.Managers.authentication_manager import decode_token
 from backend.API.Managers.building_manager import process_building_data
 from backend.API.Managers.user_data_manager import check_user_exists, set_user_building
 from backend.API.Models.building_input import BuildingInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -47,18 +48,20 @@ def building_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the building data and create a building object
-        building = process_building_data(
-            num_floor=building_input.num_floor,
-            h_opening=building_input.h_opening,
-            zones=building_input.zones,
-            materials=building_input.materials,
-            username=username,
-        )
-        # Store the building object in the user's memory slot
-        set_user_building(username=username, building=building)
-        # Return the building object as a JSON string
-        return jsonpickle.encode(building, unpicklable=False)
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the building data and create a building object
+            building = process_building_data(
+                num_floor=building_input.num_floor,
+                h_opening=building_input.h_opening,
+                zones=building_input.zones,
+                materials=building_input.materials,
+                username=username,
+            )
+            # Store the building object in the user's memory slot
+            set_user_building(username=username, building=building)
+            # Return the building object as a JSON string
+            return jsonpickle.encode(building, unpicklable=False)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
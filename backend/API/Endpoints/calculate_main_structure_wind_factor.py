@@ -14,7 +14,9 @@
 ########################################################################################################################
 # IMPORTS
 ########################################################################################################################
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Header
 
 from backend.API.Managers.authentication_manager import decode_token
 from backend.API.Managers.user_data_manager import (
@@ -28,8 +30,10 @@ from backend.API.Managers.user_data_manager import (
 )
 from backend.API.Managers.main_structure_wind_factor_manager import process_main_structure_wind_factors
 from backend.API.Models.main_structure_wind_factor_input import MainStructureWindFactorInput
+from backend.API.Responses.entity_response import create_entity_response
 
 from backend.Constants.wind_constants import WindExposureFactorSelections
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -47,6 +51,7 @@ calculate_main_structure_wind_factor_router = APIRouter()
 def calculate_main_structure_wind_factor(
     wind_factor_inputs: MainStructureWindFactorInput,
     username: str = Depends(decode_token),
+    accept: Optional[str] = Header(None),
 ):
     """
     Calculates the wind factor for the main structure.
@@ -54,6 +59,7 @@ def calculate_main_structure_wind_factor(
     Parameters:
         wind_factor_inputs (MainStructureWindFactorInput): The input data required for wind factor calculation.
         username (str): The username of the user (decoded from the token).
+        accept (Optional[str]): The media types accepted by the client, MessagePack is sent if it is accepted.
 
     Returns:
         List[MainStructureWindFactor]: A list of wind factor objects for different height zones.
@@ -61,42 +67,46 @@ def calculate_main_structure_wind_factor(
     try:
         # Ensure user exists in memory
         check_user_exists(username)
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+
+            # Fetch required data from user storage
+            building = get_user_building(username=username)
 
-        # Fetch required data from user storage
-        building = get_user_building(username=username)
+            height_zones = building.height_zones
 
-        height_zones = building.height_zones
+            dimensions = get_user_dimensions(username=username)
 
-        dimensions = get_user_dimensions(username=username)
+            natural_frequency = get_user_natural_frequency(username=username)
 
-        natural_frequency = get_user_natural_frequency(username=username)
+            material = get_user_material_type(username=username)
 
-        material = get_user_material_type(username=username)
+            importance_category = get_user_importance_category(username=username)
 
-        importance_category = get_user_importance_category(username=username)
+            location = get_user_location(username=username)
 
-        location = get_user_location(username=username)
+            # Convert exposure factor input
+            exposure_factor = WindExposureFactorSelections(wind_factor_inputs.exposure_factor)
 
-        # Convert exposure factor input
-        exposure_factor = WindExposureFactorSelections(wind_factor_inputs.exposure_factor)
+            response = []
+            for idx, zone in enumerate(height_zones):
+                wind_factor = process_main_structure_wind_factors(
+                    zone,
+                    dimensions,
+                    natural_frequency,
+                    material,
+                    wind_factor_inputs.ct,
+                    exposure_factor,
+                    wind_factor_inputs.manual_ce_cei,
+                    location.wind_velocity_pressure,
+                    importance_category
+                )
 
-        response = []
-        for idx, zone in enumerate(height_zones):
-            wind_factor = process_main_structure_wind_factors(
-                zone,
-                dimensions,
-                natural_frequency,
-                material,
-                wind_factor_inputs.ct,
-                exposure_factor,
-                wind_factor_inputs.manual_ce_cei,
-                location.wind_velocity_pressure,
-                importance_category
-            )
+                response.append(wind_factor)
 
-            response.append(wind_factor)
-        
-        return response
+            # Encode the wind factors while the user's lock is held. They store their attributes in slots, which
+            # FastAPI's encoder cannot read.
+            return create_entity_response(response, accept)
 
     except Exception as e:
         print("❌ ERROR: Exception occurred while calculating wind factor.")
@@ -19,6 +19,7 @@ from backend.API.Managers.authentication_manager import decode_token
 from backend.API.Managers.cladding_manager import process_cladding_data
 from backend.API.Managers.user_data_manager import set_user_cladding, check_user_exists
 from backend.API.Models.cladding_input import CladdingInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -45,14 +46,16 @@ def cladding_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the cladding data and create a cladding object
-        cladding = process_cladding_data(
-            c_top=cladding_input.c_top, c_bot=cladding_input.c_bot
-        )
-        # Store the cladding object in the user's memory slot
-        set_user_cladding(username=username, cladding=cladding)
-        # Return the cladding object
-        return cladding
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the cladding data and create a cladding object
+            cladding = process_cladding_data(
+                c_top=cladding_input.c_top, c_bot=cladding_input.c_bot
+            )
+            # Store the cladding object in the user's memory slot
+            set_user_cladding(username=username, cladding=cladding)
+            # Return the cladding object
+            return cladding
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
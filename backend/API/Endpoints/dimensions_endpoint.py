@@ -23,6 +23,7 @@ from backend.API.Managers.user_data_manager import (
     set_user_dimensions,
 )
 from backend.API.Models.dimensions_input import DimensionsInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -49,20 +50,22 @@ def dimensions_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the dimensions data and create a dimensions object
-        dimensions = process_dimension_data(
-            width=max(dimensions_input.width_along, dimensions_input.width_across),
-            width_along=dimensions_input.width_along,
-            width_across=dimensions_input.width_across,
-            height=dimensions_input.height,
-            eave_height=dimensions_input.eave_height,
-            ridge_height=dimensions_input.ridge_height,
-            sea_level=dimensions_input.sea_level
-        )
-        # Store the dimensions object in the user's memory slot
-        set_user_dimensions(username=username, dimensions=dimensions)
-        # Return the dimensions object
-        return dimensions
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the dimensions data and create a dimensions object
+            dimensions = process_dimension_data(
+                width=max(dimensions_input.width_along, dimensions_input.width_across),
+                width_along=dimensions_input.width_along,
+                width_across=dimensions_input.width_across,
+                height=dimensions_input.height,
+                eave_height=dimensions_input.eave_height,
+                ridge_height=dimensions_input.ridge_height,
+                sea_level=dimensions_input.sea_level
+            )
+            # Store the dimensions object in the user's memory slot
+            set_user_dimensions(username=username, dimensions=dimensions)
+            # Return the dimensions object
+            return dimensions
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
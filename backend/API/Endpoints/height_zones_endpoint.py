@@ -13,11 +13,15 @@
 ########################################################################################################################
 # IMPORTS
 ########################################################################################################################
-import jsonpickle
-from fastapi import HTTPException, Depends, APIRouter
+from typing import Optional
+
+from fastapi import HTTPException, Depends, APIRouter, Header
 
 from backend.API.Managers.authentication_manager import decode_token
+from backend.API.Managers.load_dependency_manager import ensure_user_loads
 from backend.API.Managers.user_data_manager import get_user_building, check_user_exists
+from backend.API.Responses.entity_response import create_entity_response
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -32,24 +36,30 @@ height_zone_router = APIRouter()
 
 
 @height_zone_router.post("/get_height_zones")
-def get_height_zones_endpoint(username: str = Depends(decode_token)):
+def get_height_zones_endpoint(
+    username: str = Depends(decode_token), accept: Optional[str] = Header(None)
+):
     """
     Gets the height zones for a user's building
     :param username: The username of the user
-    :return: A JSON string representation of the height zones
+    :param accept: The media types accepted by the client, MessagePack is sent if it is accepted
+    :return: The height zones, keyed by height zone number
     """
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Get the user's building
-        building = get_user_building(username=username)
-        # Create a dictionary of the height zones
-        height_zones = {}
-        for zone in building.height_zones:
-            height_zones[zone.zone_num] = zone
-        # Return the height zones as a JSON string
-
-        return jsonpickle.encode(height_zones, unpicklable=False)
+        # Recompute the loads affected by the changes since they were last read
+        ensure_user_loads(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # Get the user's building
+            building = get_user_building(username=username)
+            # Create a dictionary of the height zones
+            height_zones = {}
+            for zone in building.height_zones:
+                height_zones[zone.zone_num] = zone
+            # Return the height zones, encoded while the user's lock is held
+            return create_entity_response(height_zones, accept)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -24,6 +24,7 @@ from backend.API.Managers.user_data_manager import (
     set_user_importance_category,
 )
 from backend.API.Models.importance_category_input import ImportanceCategoryInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -51,17 +52,19 @@ def importance_category_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the importance category data and create an importance category object
-        importance_category = process_importance_category_data(
-            importance_category_input.importance_category
-        )
-        assert(importance_category is not None)
-        # Store the importance category object in the user's memory slot
-        set_user_importance_category(
-            username=username, importance_category=importance_category
-        )
-        # Return the importance category object
-        return importance_category
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the importance category data and create an importance category object
+            importance_category = process_importance_category_data(
+                importance_category_input.importance_category
+            )
+            assert(importance_category is not None)
+            # Store the importance category object in the user's memory slot
+            set_user_importance_category(
+                username=username, importance_category=importance_category
+            )
+            # Return the importance category object
+            return importance_category
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
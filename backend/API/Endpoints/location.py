@@ -13,12 +13,18 @@
 # IMPORTS
 ########################################################################################################################
 
+from typing import Dict, Optional
+
 from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
 
 from backend.API.Managers.authentication_manager import decode_token
-from backend.API.Managers.location_manager import process_location_data
+from backend.API.Managers.location_manager import process_location_data_async
 from backend.API.Managers.user_data_manager import set_user_location, check_user_exists
 from backend.API.Models.location_input import LocationInput
+from backend.Entities.Location.location import Location
+from backend.Entities.Location.location_pipeline import STAGE_TIMEOUT, LocationStage
+from backend.Entities.User.user_locks import USER_LOCKS
 
 
 ########################################################################################################################
@@ -27,6 +33,47 @@ from backend.API.Models.location_input import LocationInput
 
 location_router = APIRouter()
 
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def store_user_location(username: str, location: Location) -> None:
+    """
+    Stores the location object in the user's memory slot while holding the user's lock for writing, creating the slot
+    if it does not exist
+    :param username: The username of the user
+    :param location: The location object
+    :return: None
+    """
+    # If storage for the user does not exist in memory, create a slot for the user. This takes the user's lock itself,
+    # so it is done before the lock is held.
+    check_user_exists(username)
+    with USER_LOCKS.write(username):
+        set_user_location(username=username, location=location)
+
+
+def get_incomplete_stages_error(
+    stages: Dict[str, LocationStage],
+) -> Optional[HTTPException]:
+    """
+    Gets the error returned when a lookup of the location did not complete. The loads need the coordinates, climatic and
+    seismic data of the location, so a partially resolved location is never stored.
+    :param stages: The outcome of each lookup, keyed by name
+    :return: A 504 error if a lookup timed out, a 502 error if a lookup failed, or None if every lookup completed
+    """
+    incomplete = [name for name, stage in stages.items() if not stage.is_complete()]
+    if not incomplete:
+        return None
+    timed_out = any(stages[name].status == STAGE_TIMEOUT for name in incomplete)
+    return HTTPException(
+        status_code=504 if timed_out else 502,
+        detail={
+            "message": f"The {', '.join(incomplete)} lookup did not complete, the location was not changed",
+            "stages": {name: stage.to_dict() for name, stage in stages.items()},
+        },
+    )
+
 
 ########################################################################################################################
 # ENDPOINTS
@@ -34,28 +81,38 @@ location_router = APIRouter()
 
 
 @location_router.post("/location")
-def location_endpoint(
+async def location_endpoint(
     location_input: LocationInput, username: str = Depends(decode_token)
 ):
     """
     Sets the location for a user
     :param location_input: The input data for the location
     :param username: The username of the user
-    :return: A location object
+    :return: The attributes of the location object and the outcome of each lookup under stages. If a lookup did not
+    complete, the user's location is left unchanged and a 504 or 502 error reports the outcome of each lookup.
     """
     try:
-        # If storage for the user does not exist in memory, create a slot for the user
-        check_user_exists(username)
         # Process the location data and create a location object
-        location = process_location_data(
+        location, stages = await process_location_data_async(
             address=location_input.address,
             site_designation=location_input.site_designation,
             seismic_value=location_input.seismic_value,
         )
-        # Store the location object in the user's memory slot
-        set_user_location(username=username, location=location)
-        # Return the location object
-        return location
+        # A partially resolved location would replace the user's previous location with missing data
+        error = get_incomplete_stages_error(stages)
+        if error is not None:
+            raise error
+        # Store the location object in the user's memory slot. Creating the user's slot and waiting for the user's lock
+        # happen on the thread pool so that the event loop is never blocked.
+        await run_in_threadpool(store_user_location, username, location)
+        # Return the location object along with the outcome of each lookup
+        return {
+            **vars(location),
+            "stages": {name: stage.to_dict() for name, stage in stages.items()},
+        }
+    # Errors describing the outcome of the lookups are returned as they are
+    except HTTPException:
+        raise
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
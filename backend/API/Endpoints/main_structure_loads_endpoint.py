@@ -25,6 +25,7 @@ from backend.API.Managers.user_data_manager import (
     get_user_material_type,
 )
 from backend.API.Models.loads_inputs import LoadsInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -57,35 +58,36 @@ def get_loads(
 
         # Ensure user exists in memory
         check_user_exists(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # Fetch required data from user storage
+            building = get_user_building(username=username)
 
-        # Fetch required data from user storage
-        building = get_user_building(username=username)
+            height_zones = building.height_zones
 
-        height_zones = building.height_zones
+            dimensions = get_user_dimensions(username=username)
 
-        dimensions = get_user_dimensions(username=username)
-
-        response = []
+            response = []
         
-        # Process each height zone
-        for idx, zone in enumerate(height_zones):
-
-            loads = process_main_structure_loads(
-                zone.elevation,
-                dimensions.width,
-                zone.wp,
-                zone.main_structure_wind_factor,
-                loads_input.wind_face,
-                loads_input.uls_or_sls,
-                loads_input.dead_coef,
-                loads_input.live_coef,
-                loads_input.wind_coef
-            )
+            # Process each height zone
+            for idx, zone in enumerate(height_zones):
+
+                loads = process_main_structure_loads(
+                    zone.elevation,
+                    dimensions.width,
+                    zone.wp,
+                    zone.main_structure_wind_factor,
+                    loads_input.wind_face,
+                    loads_input.uls_or_sls,
+                    loads_input.dead_coef,
+                    loads_input.live_coef,
+                    loads_input.wind_coef
+                )
 
             
-            response.append(loads)
+                response.append(loads)
 
-        return response
+            return response
 
     except Exception as e:
         # Debugging: Exception handling
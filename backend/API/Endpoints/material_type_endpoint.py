@@ -25,6 +25,7 @@ from backend.API.Managers.user_data_manager import (
     set_user_material_type,
 )
 from backend.API.Models.material_input import MaterialTypeInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -52,17 +53,19 @@ def material_type_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the material type data and create an material type object
-        material_type = process_material_type_data(
-            material_type_input.material_type
-        )
-        assert(material_type is not None)
-        # Store the material type object in the user's memory slot
-        set_user_material_type(
-            username=username, material_type=material_type
-        )
-        # Return the material type object
-        return material_type
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the material type data and create an material type object
+            material_type = process_material_type_data(
+                material_type_input.material_type
+            )
+            assert(material_type is not None)
+            # Store the material type object in the user's memory slot
+            set_user_material_type(
+                username=username, material_type=material_type
+            )
+            # Return the material type object
+            return material_type
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
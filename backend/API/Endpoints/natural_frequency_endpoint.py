@@ -22,6 +22,7 @@ from backend.API.Managers.user_data_manager import (
     set_user_natural_frequency,
 )
 from backend.API.Models.natural_frequency_input import NaturalFrequencyInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -49,15 +50,17 @@ def natural_frequency_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the natural frequency data and create an natural frequency object
-        natural_frequency = natural_frequency_input.frequency
-        assert(natural_frequency is not None)
-        # Store the natural frequency object in the user's memory slot
-        set_user_natural_frequency(
-            username=username, natural_frequency=natural_frequency
-        )
-        # Return the natural frequency object
-        return natural_frequency
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the natural frequency data and create an natural frequency object
+            natural_frequency = natural_frequency_input.frequency
+            assert(natural_frequency is not None)
+            # Store the natural frequency object in the user's memory slot
+            set_user_natural_frequency(
+                username=username, natural_frequency=natural_frequency
+            )
+            # Return the natural frequency object
+            return natural_frequency
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -19,6 +19,7 @@ from backend.API.Managers.authentication_manager import decode_token
 from backend.API.Managers.roof_manager import process_roof_data
 from backend.API.Managers.user_data_manager import check_user_exists, set_user_roof
 from backend.API.Models.roof_input import RoofInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -43,17 +44,19 @@ def roof_endpoint(roof_input: RoofInput, username: str = Depends(decode_token)):
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the roof data and create a roof object
-        roof = process_roof_data(
-            w_roof=roof_input.w_roof,
-            l_roof=roof_input.l_roof,
-            slope=roof_input.slope,
-            uniform_dead_load=roof_input.uniform_dead_load,
-        )
-        # Store the roof object in the user's memory slot
-        set_user_roof(username=username, roof=roof)
-        # Return the roof object
-        return roof
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Process the roof data and create a roof object
+            roof = process_roof_data(
+                w_roof=roof_input.w_roof,
+                l_roof=roof_input.l_roof,
+                slope=roof_input.slope,
+                uniform_dead_load=roof_input.uniform_dead_load,
+            )
+            # Store the roof object in the user's memory slot
+            set_user_roof(username=username, roof=roof)
+            # Return the roof object
+            return roof
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
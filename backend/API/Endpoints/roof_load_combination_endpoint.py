@@ -19,6 +19,7 @@ import json
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend.API.Managers.authentication_manager import decode_token
+from backend.API.Managers.load_dependency_manager import ensure_user_loads
 from backend.API.Managers.roof_load_combination_manager import (
     process_roof_load_combination_data,
 )
@@ -28,6 +29,7 @@ from backend.API.Managers.user_data_manager import (
     get_user_building,
 )
 from backend.API.Models.roof_load_combination_input import RoofLoadCombinationInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -54,19 +56,23 @@ def roof_load_combination_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # The building object associated with the user
-        building = get_user_building(username)
-        # Get the snow loads for the user
-        snow_load_upwind = get_user_snow_load(username)["upwind"]
-        snow_load_downwind = get_user_snow_load(username)["downwind"]
-        # Process the roof load combination data and create a roof load combination object
-        dataframes = process_roof_load_combination_data(
-            building=building,
-            snow_load_upwind=snow_load_upwind,
-            snow_load_downwind=snow_load_downwind,
-            uls_roof_type=roof_load_combination_input.uls_roof_type,
-            sls_roof_type=roof_load_combination_input.sls_roof_type,
-        )
+        # Recompute the loads affected by the changes since they were last read
+        ensure_user_loads(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # The building object associated with the user
+            building = get_user_building(username)
+            # Get the snow loads for the user
+            snow_load_upwind = get_user_snow_load(username)["upwind"]
+            snow_load_downwind = get_user_snow_load(username)["downwind"]
+            # Process the roof load combination data and create a roof load combination object
+            dataframes = process_roof_load_combination_data(
+                building=building,
+                snow_load_upwind=snow_load_upwind,
+                snow_load_downwind=snow_load_downwind,
+                uls_roof_type=roof_load_combination_input.uls_roof_type,
+                sls_roof_type=roof_load_combination_input.sls_roof_type,
+            )
         # Round the values in the dataframes to 4 decimal places
         upwind_df = dataframes["upwind"].round(4)
         # Get the headers and values for the upwind dataframe
@@ -17,14 +17,18 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend.API.Managers.authentication_manager import decode_token
-from backend.API.Managers.seismic_load_manager import process_seismic_load_data
+from backend.API.Managers.load_dependency_manager import (
+    get_seismic_load_inputs,
+    get_user_load_nodes,
+    refresh_user_loads,
+)
 from backend.API.Managers.user_data_manager import (
     check_user_exists,
-    get_user_building,
-    get_user_importance_category,
-    get_user_location,
+    set_user_seismic_load_inputs,
 )
 from backend.API.Models.seismic_load_input import SeismicLoadInput
+from backend.Entities.User.load_dependencies import SEISMIC_LOAD_KIND
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -42,7 +46,7 @@ def set_seismic_load_endpoint(
     seismic_load_input: SeismicLoadInput, username: str = Depends(decode_token)
 ):
     """
-    Creates a seismic load object for a user
+    Sets the inputs of the seismic load of a user and computes the seismic loads if they changed
     :param seismic_load_input: The input data for the seismic load
     :param username: The username of the user
     :return: None
@@ -50,21 +54,21 @@ def set_seismic_load_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Process the seismic load data and create a seismic load object
-        building = get_user_building(username=username)
-        # Get the user's importance factor
-        importance_factor = get_user_importance_category(username=username)
-        # Get the user's building location
-        location = get_user_location(username=username)
-        # Process the seismic load data
-        process_seismic_load_data(
-            building=building,
-            location=location,
-            importance_category=importance_factor,
-            ar=seismic_load_input.ar,
-            rp=seismic_load_input.rp,
-            cp=seismic_load_input.cp,
-        )
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Store the seismic load inputs, the seismic loads are only recomputed if they changed
+            set_user_seismic_load_inputs(
+                username=username,
+                seismic_load_inputs=get_seismic_load_inputs(
+                    ar=seismic_load_input.ar,
+                    rp=seismic_load_input.rp,
+                    cp=seismic_load_input.cp,
+                ),
+            )
+            # Compute the changed seismic loads now, so that an error is reported to the request that caused it
+            refresh_user_loads(
+                username, get_user_load_nodes(username, SEISMIC_LOAD_KIND), True
+            )
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
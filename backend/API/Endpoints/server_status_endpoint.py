@@ -2,6 +2,8 @@
 # server_status_endpoint.py
 # This file contains the endpoints used for the server status page. It includes the following endpoints:
 #   - /server_status: GET request to view the server status page
+#   - /cache_status: GET request to view the counters of the server caches
+#   - /metrics: GET request to view the database and cache metrics of the server
 #
 # Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
 # By using this code, you agree to abide by the terms and conditions in those files.
@@ -16,7 +18,12 @@
 from fastapi import APIRouter, HTTPException
 from starlette.responses import FileResponse
 
+from backend.API.Managers.user_data_manager import ALL_USER_DATA
+from backend.Entities.Location.geocoder import GEOCODER
+from backend.Entities.Location.postal_code_index import POSTAL_CODE_INDEX
+from backend.Entities.Location.seismic_hazard_client import SEISMIC_HAZARD_CLIENT
 from config import get_file_path
+from database.Entities.database_metrics import DATABASE_METRICS
 
 ########################################################################################################################
 # ROUTER
@@ -24,6 +31,24 @@ from config import get_file_path
 
 server_status_endpoint = APIRouter()
 
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def get_cache_stats() -> dict:
+    """
+    Gets the counters of the server's caches
+    :return: A dictionary containing the counters of each cache
+    """
+    return {
+        "geocode": GEOCODER.stats(),
+        "seismic_hazard": SEISMIC_HAZARD_CLIENT.cache.stats(),
+        "sessions": ALL_USER_DATA.stats(),
+        "postal_codes": POSTAL_CODE_INDEX.stats(),
+    }
+
+
 ########################################################################################################################
 # ENDPOINTS
 ########################################################################################################################
@@ -43,3 +68,33 @@ def user_data_endpoint():
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@server_status_endpoint.get("/cache_status")
+def cache_status_endpoint():
+    """
+    Returns the hit and miss counters of the server's caches, used to size the caches
+    :return: A dictionary containing the counters of each cache
+    """
+    try:
+        return get_cache_stats()
+    # If something goes wrong, raise an error
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@server_status_endpoint.get("/metrics")
+def metrics_endpoint():
+    """
+    Returns the metrics used for capacity planning: the connect time, checkout wait and saturation of each database
+    pool, the statement latency of each function querying the database, and the counters of the server's caches
+    :return: A dictionary containing the database and cache metrics
+    """
+    try:
+        return {
+            "database": DATABASE_METRICS.snapshot(),
+            "caches": get_cache_stats(),
+        }
+    # If something goes wrong, raise an error
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
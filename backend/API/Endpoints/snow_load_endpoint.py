@@ -17,15 +17,18 @@ import jsonpickle
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend.API.Managers.authentication_manager import decode_token
-from backend.API.Managers.snow_load_manager import process_snow_load_data
+from backend.API.Managers.load_dependency_manager import (
+    get_snow_load_inputs,
+    refresh_user_loads,
+)
 from backend.API.Managers.user_data_manager import (
     check_user_exists,
-    get_user_building,
-    get_user_importance_category,
-    get_user_location,
-    set_user_snow_load,
+    get_user_snow_load,
+    set_user_snow_load_inputs,
 )
 from backend.API.Models.snow_load_input import SnowLoadInput
+from backend.Entities.User.load_dependencies import SNOW_LOAD_NODE
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -51,24 +54,24 @@ def set_snow_load_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # The building associated with the user
-        building = get_user_building(username=username)
-        # The importance factor for the user
-        importance_factor = get_user_importance_category(username=username)
-        # The location of the user
-        location = get_user_location(username=username)
-        # Process the snow load data and create a snow load object
-        snow_load = process_snow_load_data(
-            building=building,
-            location=location,
-            importance_category=importance_factor,
-            exposure_factor_selection=snow_load_input.exposure_factor_selection,
-            roof_type=snow_load_input.roof_type,
-        )
-        # Store the snow load object in the user's memory slot
-        set_user_snow_load(username=username, snow_load=snow_load)
-        # Return the snow load object as a JSON string
-        return jsonpickle.encode(snow_load, unpicklable=False)
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Store the snow load inputs and recompute the loads affected by them
+            set_user_snow_load_inputs(
+                username=username,
+                snow_load_inputs=get_snow_load_inputs(
+                    exposure_factor_selection=snow_load_input.exposure_factor_selection,
+                    roof_type=snow_load_input.roof_type,
+                ),
+            )
+            refresh_user_loads(username, [SNOW_LOAD_NODE], True)
+            snow_load = get_user_snow_load(username=username)
+            if snow_load is None:
+                raise ValueError(
+                    "The location, importance category and building must be set before the snow load"
+                )
+            # Return the snow load object as a JSON string
+            return jsonpickle.encode(snow_load, unpicklable=False)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
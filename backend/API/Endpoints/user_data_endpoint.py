@@ -3,6 +3,7 @@
 # This file contains the endpoints used for managing user data. It includes the following endpoints:
 #   - /user_data: POST request to get user data
 #   - /get_user_profile: POST request to get user profile data
+#   - /get_user_load_status: POST request to get the state and computation times of the user's loads
 #   - /get_all_user_save_data: POST request to get all user save data
 #   - /get_user_save_file: POST request to get a user save file
 #   - /set_user_save_data: POST request to set user save data
@@ -23,25 +24,31 @@
 
 import io
 import json
+from typing import Optional
 
-import jsonpickle
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
 from starlette.responses import StreamingResponse
 
 from backend.API.Managers.authentication_manager import decode_token
+from backend.API.Managers.load_dependency_manager import (
+    ensure_user_loads,
+    get_user_load_status,
+)
 from backend.API.Managers.user_data_manager import (
     check_user_exists,
     get_user_data,
-    get_all_user_save_data,
-    get_user_save_file,
-    set_user_save_data,
+    get_all_user_save_data_async,
+    get_user_save_file_async,
+    set_user_save_data_async,
     set_user_current_save_file,
     get_user_current_save_file,
     get_user_profile,
-    delete_user_save_file,
-    get_user_save_file_json,
+    delete_user_save_file_async,
+    get_user_save_file_json_async,
 )
 from backend.API.Models.save_data_input import SaveDataInput
+from backend.API.Responses.entity_response import create_entity_response
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -56,41 +63,72 @@ user_data_router = APIRouter()
 
 
 @user_data_router.post("/user_data")
-def user_data_endpoint(username: str = Depends(decode_token)):
+def user_data_endpoint(
+    username: str = Depends(decode_token), accept: Optional[str] = Header(None)
+):
     """
     Gets user data
     :param username: The username of the user
+    :param accept: The media types accepted by the client, MessagePack is sent if it is accepted
     :return: The user's data
     """
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Return the user's data
-        return get_user_data(username)
+        # Recompute the loads affected by the changes since they were last read
+        ensure_user_loads(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # Return the user's data, encoded while the user's lock is held
+            return create_entity_response(get_user_data(username), accept)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @user_data_router.post("/get_user_profile")
-def get_user_profile_endpoint(username: str = Depends(decode_token)):
+def get_user_profile_endpoint(
+    username: str = Depends(decode_token), accept: Optional[str] = Header(None)
+):
     """
     Gets user profile data
     :param username: The username of the user
+    :param accept: The media types accepted by the client, MessagePack is sent if it is accepted
     :return: The user's profile data
     """
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # A JSON representation of the user's profile data
-        return jsonpickle.encode(get_user_profile(username), unpicklable=False)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # The user's profile data, encoded while the user's lock is held
+            return create_entity_response(get_user_profile(username), accept)
+    # If something goes wrong, raise an error
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@user_data_router.post("/get_user_load_status")
+def get_user_load_status_endpoint(username: str = Depends(decode_token)):
+    """
+    Gets the state of the user's loads, which of them are stale and how long their computations took
+    :param username: The username of the user
+    :return: The state and computation times of each node of the user's dependency graph
+    """
+    try:
+        # If storage for the user does not exist in memory, create a slot for the user
+        check_user_exists(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # Return the state of the user's loads
+            return get_user_load_status(username)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @user_data_router.post("/get_all_user_save_data")
-def get_all_user_save_data_endpoint(username: str = Depends(decode_token)):
+async def get_all_user_save_data_endpoint(username: str = Depends(decode_token)):
     """
     Gets all user save data
     :param username:
@@ -100,14 +138,14 @@ def get_all_user_save_data_endpoint(username: str = Depends(decode_token)):
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
         # Return the user's save data
-        return get_all_user_save_data(username)
+        return await get_all_user_save_data_async(username)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @user_data_router.post("/get_user_save_file")
-def get_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
+async def get_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
     """
     Gets a user save file
     :param id: The id of the save file
@@ -118,14 +156,14 @@ def get_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
         # Return the user's save file data
-        return get_user_save_file(username, id)
+        return await get_user_save_file_async(username, id)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @user_data_router.post("/set_user_save_data")
-def set_user_save_data_endpoint(
+async def set_user_save_data_endpoint(
     data: SaveDataInput, username: str = Depends(decode_token)
 ):
     """
@@ -138,7 +176,7 @@ def set_user_save_data_endpoint(
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
         # Set the user's save data
-        return set_user_save_data(username, data.json_data, data.id)
+        return await set_user_save_data_async(username, data.json_data, data.id)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -157,8 +195,10 @@ def set_user_current_save_file_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Set the current user save file
-        return set_user_current_save_file(username, current_save_file)
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # Set the current user save file
+            return set_user_current_save_file(username, current_save_file)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -174,14 +214,16 @@ def get_user_current_save_file_endpoint(username: str = Depends(decode_token)):
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        return get_user_current_save_file(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            return get_user_current_save_file(username)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @user_data_router.post("/delete_user_current_save_file")
-def delete_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
+async def delete_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
     """
     Deletes a user save file
     :param id: The id of the save file
@@ -191,14 +233,14 @@ def delete_user_save_file_endpoint(id: int, username: str = Depends(decode_token
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        return delete_user_save_file(username, id)
+        return await delete_user_save_file_async(username, id)
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @user_data_router.post("/download_user_save_file")
-def download_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
+async def download_user_save_file_endpoint(id: int, username: str = Depends(decode_token)):
     """
     Downloads a user save file
     :param id: The id of the save file
@@ -209,7 +251,7 @@ def download_user_save_file_endpoint(id: int, username: str = Depends(decode_tok
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
         # Get the user's save file data
-        data = get_user_save_file_json(username, id)
+        data = await get_user_save_file_json_async(username, id)
 
         # Create a string of JSON data
         json_str = json.dumps(data)
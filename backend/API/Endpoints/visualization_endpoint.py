@@ -20,24 +20,26 @@
 ########################################################################################################################
 
 import uuid
+from typing import Optional
 
 import jsonpickle
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header
 from starlette.responses import FileResponse
 
 from backend.API.Managers.authentication_manager import decode_token
+from backend.API.Managers.load_dependency_manager import ensure_user_loads
 from backend.API.Managers.user_data_manager import (
     check_user_exists,
     get_user_building,
     get_user_snow_load,
 )
 from backend.API.Models.simple_model_input import SimpleModelInput
+from backend.API.Responses.entity_response import create_entity_response
+from backend.Entities.User.user_locks import USER_LOCKS
 from backend.visualizations.load_combination_bar_chart import generate_bar_chart
 from blender.scripts.blender_object import WindZone, SeismicZone
-from blender.scripts.blender_request import run_blender_script
+from blender.scripts.blender_request import run_blender_script, run_blender_scripts
 from config import get_file_path
-from dotenv import load_dotenv
-import os
 
 ########################################################################################################################
 # ROUTER
@@ -52,27 +54,36 @@ visualization_router = APIRouter()
 
 
 @visualization_router.post("/bar_chart")
-def generate_bar_chart_endpoint(username: str = Depends(decode_token)):
+def generate_bar_chart_endpoint(
+    username: str = Depends(decode_token), accept: Optional[str] = Header(None)
+):
     """
     Generates a 3D bar chart for the load combinations for a height zone
     :param username: The username of the user
-    :return: A JSON object containing the id of the bar chart and the number of bar charts generated
+    :param accept: The media types accepted by the client, MessagePack is sent if it is accepted
+    :return: An object containing the id of the bar chart and the number of bar charts generated
     """
 
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # Generate a unique id for the bar chart
-        id = str(uuid.uuid4())
-        # Get the user's building and snow load
-        building = get_user_building(username)
-        snow_load = get_user_snow_load(username)["upwind"]
-        # Generate the bar chart
-        num_generated = generate_bar_chart(
-            id=id, building=building, snow_load=snow_load
-        )
-        # Return the id and the number of bar charts generated
-        return jsonpickle.encode({"id": id, "num_bar_charts": num_generated}, unpicklable=False)
+        # Recompute the loads affected by the changes since they were last read
+        ensure_user_loads(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # Generate a unique id for the bar chart
+            id = str(uuid.uuid4())
+            # Get the user's building and snow load
+            building = get_user_building(username)
+            snow_load = get_user_snow_load(username)["upwind"]
+            # Generate the bar chart
+            num_generated = generate_bar_chart(
+                id=id, building=building, snow_load=snow_load
+            )
+            # Return the id and the number of bar charts generated
+            return create_entity_response(
+                {"id": id, "num_bar_charts": num_generated}, accept
+            )
     # If something goes wrong, raise an error
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -88,45 +99,50 @@ def generate_load_model_endpoint(username: str = Depends(decode_token)):
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
+        # Recompute the loads affected by the changes since they were last read
+        ensure_user_loads(username)
         # Generate a unique id for the load model
         id = str(uuid.uuid4())
-        # Get the user's building
-        building = get_user_building(username=username)
-        # Get the height zones of the building
-        height_zones = building.height_zones
-        # Create a list of wind and seismic cubes for the building
-        wind_cubes = []
-        seismic_cubes = []
-        # Initialize the previous elevation
-        prev_elevation = 0
-        # For each height zone, create a wind and seismic cube
-        for height_zone in sorted(height_zones, key=lambda x: x.zone_num):
-            wind_cubes.append(
-                WindZone(
-                    h=height_zone.elevation - prev_elevation,
-                    wall_centre_pos=height_zone.wind_load.get_zone(4).pressure.pos_uls,
-                    wall_centre_neg=height_zone.wind_load.get_zone(4).pressure.neg_uls,
-                    wall_corner_pos=height_zone.wind_load.get_zone(5).pressure.pos_uls,
-                    wall_corner_neg=height_zone.wind_load.get_zone(5).pressure.neg_uls,
-                ).to_dict()
-            )
-            seismic_cubes.append(
-                SeismicZone(
-                    h=height_zone.elevation - prev_elevation,
-                    load=height_zone.seismic_load.vp,
-                ).to_dict()
-            )
-            # Update the previous elevation
-            prev_elevation = height_zone.elevation
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # Get the user's building
+            building = get_user_building(username=username)
+            # Get the height zones of the building
+            height_zones = building.height_zones
+            # Create a list of wind and seismic cubes for the building
+            wind_cubes = []
+            seismic_cubes = []
+            # Initialize the previous elevation
+            prev_elevation = 0
+            # For each height zone, create a wind and seismic cube
+            for height_zone in sorted(height_zones, key=lambda x: x.zone_num):
+                wind_cubes.append(
+                    WindZone(
+                        h=height_zone.elevation - prev_elevation,
+                        wall_centre_pos=height_zone.wind_load.get_zone(4).pressure.pos_uls,
+                        wall_centre_neg=height_zone.wind_load.get_zone(4).pressure.neg_uls,
+                        wall_corner_pos=height_zone.wind_load.get_zone(5).pressure.pos_uls,
+                        wall_corner_neg=height_zone.wind_load.get_zone(5).pressure.neg_uls,
+                    ).to_dict()
+                )
+                seismic_cubes.append(
+                    SeismicZone(
+                        h=height_zone.elevation - prev_elevation,
+                        load=height_zone.seismic_load.vp,
+                    ).to_dict()
+                )
+                # Update the previous elevation
+                prev_elevation = height_zone.elevation
 
         # Convert the wind and seismic cubes to JSON
         json_wind = jsonpickle.encode(wind_cubes, unpicklable=False)
         path_wind = get_file_path("blender/scripts/wind_cube.py")
-        run_blender_script(script_path=path_wind, id=id, json_str=json_wind)
-
         json_seismic = jsonpickle.encode(seismic_cubes, unpicklable=False)
         path_seismic = get_file_path("blender/scripts/seismic_cube.py")
-        run_blender_script(script_path=path_seismic, id=id, json_str=json_seismic)
+        # Render the wind and seismic models concurrently on the Blender worker pool
+        run_blender_scripts(
+            [(path_wind, id, json_wind), (path_seismic, id, json_seismic)]
+        )
         # Return the id of the load models
         return jsonpickle.encode(id, unpicklable=False)
     # If something goes wrong, raise an error
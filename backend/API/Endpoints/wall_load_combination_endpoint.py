@@ -19,6 +19,10 @@ import json
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend.API.Managers.authentication_manager import decode_token
+from backend.API.Managers.load_dependency_manager import (
+    ensure_user_loads,
+    get_user_wall_load_cases,
+)
 from backend.API.Managers.user_data_manager import (
     check_user_exists,
     get_user_building,
@@ -28,6 +32,7 @@ from backend.API.Managers.wall_load_combination_manager import (
     process_wall_load_combination_data,
 )
 from backend.API.Models.wall_load_combination_input import WallLoadCombinationInput
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -54,17 +59,22 @@ def wall_load_combination_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # The user's building data
-        building = get_user_building(username)
-        # The user's snow load data
-        snow_load = get_user_snow_load(username)["upwind"]
-        # Process the wall load combination data and create a wall load combination dataframe
-        df = process_wall_load_combination_data(
-            building=building,
-            snow_load=snow_load,
-            uls_wall_type=wall_load_combination_input.uls_wall_type,
-            sls_wall_type=wall_load_combination_input.sls_wall_type,
-        ).round(4)
+        # Recompute the loads affected by the changes since they were last read
+        ensure_user_loads(username)
+        # Hold the user's lock for reading so that no other request changes the user's data meanwhile
+        with USER_LOCKS.read(username):
+            # The user's building data
+            building = get_user_building(username)
+            # The user's snow load data
+            snow_load = get_user_snow_load(username)["upwind"]
+            # Process the wall load combination data and create a wall load combination dataframe
+            df = process_wall_load_combination_data(
+                building=building,
+                snow_load=snow_load,
+                uls_wall_type=wall_load_combination_input.uls_wall_type,
+                sls_wall_type=wall_load_combination_input.sls_wall_type,
+                load_cases=get_user_wall_load_cases(username),
+            ).round(4)
         # Check if the 'companion' column exists and drop it
         if "companion" in df.columns:
             df = df.drop(columns=["companion"])
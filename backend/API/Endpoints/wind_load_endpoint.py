@@ -16,14 +16,19 @@
 from fastapi import APIRouter, Depends, HTTPException
 
 from backend.API.Managers.authentication_manager import decode_token
+from backend.API.Managers.load_dependency_manager import (
+    get_user_load_nodes,
+    get_wind_load_inputs,
+    refresh_user_loads,
+)
 from backend.API.Managers.user_data_manager import (
     check_user_exists,
     get_user_building,
-    get_user_importance_category,
-    get_user_location,
+    set_user_wind_load_inputs,
 )
-from backend.API.Managers.wind_load_manager import process_wind_load_data
 from backend.API.Models.wind_load_input import WindLoadInput
+from backend.Entities.User.load_dependencies import WIND_LOAD_KIND
+from backend.Entities.User.user_locks import USER_LOCKS
 
 ########################################################################################################################
 # ROUTER
@@ -41,7 +46,8 @@ def set_wind_load_endpoint(
     wind_load_input: WindLoadInput, username: str = Depends(decode_token)
 ):
     """
-    Creates a wind load object for a user
+    Sets the inputs of the wind load of each height zone of a user and computes the wind loads of the height zones whose
+    inputs changed
     :param wind_load_input: The input data for the wind load
     :param username: The username of the user
     :return: None
@@ -49,26 +55,29 @@ def set_wind_load_endpoint(
     try:
         # If storage for the user does not exist in memory, create a slot for the user
         check_user_exists(username)
-        # The user's building data
-        building = get_user_building(username=username)
-        # The user's importance factor
-        importance_factor = get_user_importance_category(username=username)
-        # The user's location
-        location = get_user_location(username=username)
-        # Process the wind load data and create wind load objects
-        for height_zone in building.height_zones:
-            i = height_zone.zone_num - 1
-            process_wind_load_data(
-                building=building,
-                height_zone=height_zone,
-                importance_category=importance_factor,
-                location=location,
-                ct=wind_load_input.ct[i],
-                exposure_factor=wind_load_input.exposure_factor[i],
-                internal_pressure_category=wind_load_input.internal_pressure_category[
-                    i
-                ],
-                manual_ce_cei=wind_load_input.manual_ce_cei[i],
+        # Hold the user's lock for writing so that no other request reads or changes the user's data meanwhile
+        with USER_LOCKS.write(username):
+            # The user's building data
+            building = get_user_building(username=username)
+            # Store the wind load inputs of each height zone, only the wind loads of the height zones whose inputs
+            # changed are recomputed
+            for height_zone in building.height_zones:
+                i = height_zone.zone_num - 1
+                set_user_wind_load_inputs(
+                    username=username,
+                    zone_num=height_zone.zone_num,
+                    wind_load_inputs=get_wind_load_inputs(
+                        ct=wind_load_input.ct[i],
+                        exposure_factor=wind_load_input.exposure_factor[i],
+                        internal_pressure_category=wind_load_input.internal_pressure_category[
+                            i
+                        ],
+                        manual_ce_cei=wind_load_input.manual_ce_cei[i],
+                    ),
+                )
+            # Compute the changed wind loads now, so that an error is reported to the request that caused it
+            refresh_user_loads(
+                username, get_user_load_nodes(username, WIND_LOAD_KIND), True
             )
     # If something goes wrong, raise an error
     except Exception as e:
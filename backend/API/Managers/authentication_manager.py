@@ -12,22 +12,24 @@
 # IMPORTS
 ########################################################################################################################
 
-import os
+import asyncio
 from datetime import datetime
 
 import bcrypt
-from dotenv import load_dotenv
 from fastapi import Depends, status, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select
 
 from backend.API.Managers.user_data_manager import set_user_profile, check_user_exists
 from backend.Entities.User.profile import Profile
-from config import get_file_path
 from database.Constants.connection_constants import PrivilegeType
 from database.Entities.authentication_data import AuthenticationData
-from database.Entities.database_connection import DatabaseConnection
+from database.Entities.database_connection import (
+    get_async_session,
+    get_scoped_session,
+    open_scoped_session,
+)
 from database.Population import populate_authentication_data
 from database.Warnings.database_warnings import (
     not_valid_password_warning,
@@ -35,6 +37,7 @@ from database.Warnings.database_warnings import (
     username_taken_warning,
     username_not_valid_warning,
 )
+from settings import get_settings
 
 ########################################################################################################################
 # GLOBALS AND CONSTANTS
@@ -43,10 +46,8 @@ from database.Warnings.database_warnings import (
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-# Secret key to sign and verify JWT tokens
-# Get secret key from environment variable from data/EnvironmentVariables/.env
-load_dotenv(dotenv_path=get_file_path(relative_path="data/EnvironmentVariables/.env"))
-SECRET_KEY = os.getenv("API_SECRET_KEY")
+# Secret key to sign and verify JWT tokens, from data/EnvironmentVariables/.env
+SECRET_KEY = get_settings().api.secret_key
 ALGORITHM = "HS256"
 
 ########################################################################################################################
@@ -70,26 +71,31 @@ def valid_username(username: str) -> bool:
     :param username: The username to check
     :return: A boolean indicating if the username is valid
     """
-    # connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-
-    # Check if the username exists
-    username_exists = (
-        controller.query(AuthenticationData).filter_by(username=username).first()
-        is not None
-    )
+    # connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Check if the username exists
+        username_exists = (
+            controller.query(AuthenticationData).filter_by(username=username).first()
+            is not None
+        )
+
+    return check_username(username, username_exists)
 
+
+def check_username(username: str, username_exists: bool) -> bool:
+    """
+    Checks if a username is valid given whether it is already taken
+    :param username: The username to check
+    :param username_exists: Whether the username is already taken
+    :return: A boolean indicating if the username is valid
+    """
     # Check if the username is alphanumeric and between 5 and 20 characters long
     username_valid = (
         5 <= len(username) <= 20 and username.isalnum() and username.isalnum()
     )
 
-    # Close the connection to the database
-    new_connection.close()
-
     # If the username exists, then the username is not valid
     if username_exists:
         username_taken_warning(username)
@@ -110,20 +116,26 @@ def valid_email(email: str) -> bool:
     :param email: The email to check
     :return: A boolean indicating if the email is valid
     """
-    # Connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-
-    # Check if the email exists
-    email_exists = (
-        controller.query(AuthenticationData).filter_by(email=email).first() is not None
-    )
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Check if the email exists
+        email_exists = (
+            controller.query(AuthenticationData).filter_by(email=email).first()
+            is not None
+        )
 
-    # Close the connection to the database
-    new_connection.close()
+    return check_email(email, email_exists)
 
+
+def check_email(email: str, email_exists: bool) -> bool:
+    """
+    Checks if an email is valid given whether it is already taken
+    :param email: The email to check
+    :param email_exists: Whether the email is already taken
+    :return: A boolean indicating if the email is valid
+    """
     # If the email exists, then the email is not valid
     if email_exists:
         email_taken_warning(email)
@@ -210,20 +222,32 @@ def login(username: str, password: str):
     :param password: The password of the user
     :return: The API token for the user if the user was logged in, otherwise False
     """
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-
-    # Get the user's details from the database
-    authentication_data = (
-        controller.query(AuthenticationData).filter_by(username=username).first()
-    )
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Get the user's details from the database
+        authentication_data = (
+            controller.query(AuthenticationData).filter_by(username=username).first()
+        )
 
     # If the user does not exist, return False
     if authentication_data is None:
         return False
 
+    return create_token(username, password, authentication_data)
+
+
+def create_token(
+    username: str, password: str, authentication_data: AuthenticationData
+):
+    """
+    Sets the user's profile and creates an API token if the password matches the user's stored password
+    :param username: The username of the user
+    :param password: The password of the user
+    :param authentication_data: The user's details from the database
+    :return: The API token for the user if the password matches, otherwise False
+    """
     # Set the user's profile
     profile = Profile(
         username=authentication_data.username,
@@ -234,9 +258,6 @@ def login(username: str, password: str):
     check_user_exists(username)
     set_user_profile(username, profile)
 
-    # Close the connection to the database
-    new_connection.close()
-
     # Hash the password
     hashed_password = bcrypt.hashpw(
         password=password.encode("utf-8"), salt=authentication_data.salt
@@ -252,9 +273,94 @@ def login(username: str, password: str):
     return False
 
 
-def decode_token(token: str = Depends(oauth2_scheme)):
+async def get_authentication_data_async(**filters) -> AuthenticationData | None:
+    """
+    Gets the first user matching the given filters without blocking the event loop
+    :param filters: The column values to filter by, e.g. username or email
+    :return: The user's details from the database, or None if no user matches
+    """
+    # Connect to the database using the shared asyncio connection pool
+    session = get_async_session(
+        database_name="NBCC-2020", privilege=PrivilegeType.ADMIN
+    )
+    async with session() as controller:
+        result = await controller.execute(
+            select(AuthenticationData).filter_by(**filters).limit(1)
+        )
+        return result.scalars().first()
+
+
+async def signup_async(
+    username: str, first_name: str, last_name: str, password: str, email: str
+):
+    """
+    Signs up a user like signup, suspending the calling coroutine instead of blocking a thread while waiting on the
+    database. Hashing is CPU bound so it runs in a worker thread.
+    :param username: The username of the user
+    :param first_name: The first name of the user
+    :param last_name: The last name of the user
+    :param password: The password of the user
+    :param email: The email of the user
+    :return: A boolean indicating if the user was signed up
+    """
+    # Check if the username and email are taken concurrently
+    existing_username, existing_email = await asyncio.gather(
+        get_authentication_data_async(username=username),
+        get_authentication_data_async(email=email),
+    )
+    # Check if the username, email, and password are valid
+    if not all(
+        [
+            check_username(username, existing_username is not None),
+            check_email(email, existing_email is not None),
+            valid_password(password),
+        ]
+    ):
+        # Return False to indicate that the user was not signed up
+        return False
+
+    # Hash the password
+    hashed_password, salt = await asyncio.to_thread(hash_password, password)
+
+    # Add the user to the database
+    authentication_data = AuthenticationData(
+        username=username,
+        first_name=first_name,
+        last_name=last_name,
+        hashed_password=hashed_password,
+        salt=salt,
+        email=email,
+        signup_date=datetime.now(),
+    )
+    await populate_authentication_data.add_entry_async(authentication_data)
+
+    # Return True to indicate that the user was signed up
+    return True
+
+
+async def login_async(username: str, password: str):
+    """
+    Logs in a user like login, suspending the calling coroutine instead of blocking a thread while waiting on the
+    database. Hashing is CPU bound so it runs in a worker thread.
+    :param username: The username of the user
+    :param password: The password of the user
+    :return: The API token for the user if the user was logged in, otherwise False
+    """
+    # Get the user's details from the database
+    authentication_data = await get_authentication_data_async(username=username)
+
+    # If the user does not exist, return False
+    if authentication_data is None:
+        return False
+
+    return await asyncio.to_thread(
+        create_token, username, password, authentication_data
+    )
+
+
+async def decode_token(token: str = Depends(oauth2_scheme)):
     """
-    Decodes a token
+    Decodes a token, decoding is cheap so it runs on the event loop rather than in a worker thread
     :param token: The API token to decode
     :return: The username of the user if the token is valid, otherwise raise an HTTPException
     """
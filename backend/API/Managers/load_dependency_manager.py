@@ -0,0 +1,269 @@
+########################################################################################################################
+# load_dependency_manager.py
+# This file manages the incremental recomputation of the loads of a user. The endpoints setting the wind, seismic and
+# snow loads only store their inputs, and the loads affected by a change are recomputed from the dependency graph of
+# the user when they are next read.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from typing import Any, List, Optional
+
+import numpy as np
+
+from backend.API.Managers.seismic_load_manager import (
+    process_height_zone_seismic_load_data,
+)
+from backend.API.Managers.snow_load_manager import process_snow_load_data
+from backend.API.Managers.user_data_manager import ALL_USER_DATA
+from backend.API.Managers.wind_load_manager import process_wind_load_data
+from backend.Constants.snow_constants import RoofType
+from backend.Constants.wind_constants import (
+    InternalPressureSelections,
+    WindExposureFactorSelections,
+)
+from backend.Entities.User.load_dependencies import (
+    SEISMIC_LOAD_KIND,
+    SNOW_LOAD_NODE,
+    WALL_LOAD_CASES_KIND,
+    WIND_LOAD_KIND,
+    get_zone_node,
+    parse_node,
+)
+from backend.Entities.User.user import User
+from backend.Entities.User.user_locks import USER_LOCKS
+from backend.algorithms.load_combination_engine import (
+    collect_wall_height_zone_load_cases,
+)
+
+########################################################################################################################
+# INPUT FUNCTIONS
+########################################################################################################################
+
+
+def get_wind_load_inputs(
+    ct: float,
+    exposure_factor: str,
+    internal_pressure_category: str,
+    manual_ce_cei: Optional[float] = None,
+) -> dict:
+    """
+    Validates the inputs of the wind load of a height zone, so that invalid inputs are reported when they are set
+    rather than when the wind load is next read
+    :param ct: The topographic factor
+    :param exposure_factor: The exposure factor
+    :param internal_pressure_category: The internal pressure category
+    :param manual_ce_cei: The manual exposure factor for intermediate exposure
+    :return: The inputs of the wind load of the height zone
+    """
+    WindExposureFactorSelections(exposure_factor)
+    InternalPressureSelections(internal_pressure_category)
+    return {
+        "ct": ct,
+        "exposure_factor": exposure_factor,
+        "internal_pressure_category": internal_pressure_category,
+        "manual_ce_cei": manual_ce_cei,
+    }
+
+
+def get_seismic_load_inputs(ar: float, rp: float, cp: float) -> dict:
+    """
+    Gets the inputs of the seismic load
+    :param ar: The force amplification factor
+    :param rp: The response modification factor
+    :param cp: The component factor
+    :return: The inputs of the seismic load
+    """
+    return {"ar": ar, "rp": rp, "cp": cp}
+
+
+def get_snow_load_inputs(exposure_factor_selection: str, roof_type: str) -> dict:
+    """
+    Validates the inputs of the snow load, so that invalid inputs are reported when they are set
+    :param exposure_factor_selection: The exposure factor selection
+    :param roof_type: The roof type
+    :return: The inputs of the snow load
+    """
+    WindExposureFactorSelections(exposure_factor_selection)
+    RoofType(roof_type)
+    return {
+        "exposure_factor_selection": exposure_factor_selection,
+        "roof_type": roof_type,
+    }
+
+
+########################################################################################################################
+# RECOMPUTATION FUNCTIONS
+########################################################################################################################
+
+
+def check_load_prerequisites(user: User, load: str) -> None:
+    """
+    Checks that the data a load is computed from has been set
+    :param user: The user
+    :param load: The name of the load, used in the error message
+    :return: None
+    """
+    if (
+        user.get_building() is None
+        or user.get_location() is None
+        or user.get_importance_category() is None
+    ):
+        raise ValueError(
+            f"The location, importance category and building must be set before the {load}"
+        )
+
+
+def compute_load_node(user: User, name: str) -> Any:
+    """
+    Computes a derived node of the dependency graph of a user. A load whose inputs have not been set is left as it is,
+    a load whose inputs have been set but cannot be computed raises an error.
+    :param user: The user
+    :param name: The name of the node
+    :return: The value of the node
+    """
+    kind, zone_num = parse_node(name)
+    building = user.get_building()
+    location = user.get_location()
+    importance_category = user.get_importance_category()
+
+    if name == SNOW_LOAD_NODE:
+        inputs = user.get_snow_load_inputs()
+        if inputs is not None:
+            check_load_prerequisites(user, "snow load")
+            user.set_snow_load(
+                process_snow_load_data(
+                    building=building,
+                    location=location,
+                    importance_category=importance_category,
+                    **inputs,
+                )
+            )
+        return user.get_snow_load()
+
+    height_zone = building.get_height_zone(zone_num)
+    if kind == WIND_LOAD_KIND:
+        inputs = user.get_wind_load_inputs(zone_num)
+        if inputs is not None:
+            check_load_prerequisites(user, "wind load")
+            process_wind_load_data(
+                building=building,
+                height_zone=height_zone,
+                importance_category=importance_category,
+                location=location,
+                **inputs,
+            )
+        return height_zone.wind_load
+    if kind == SEISMIC_LOAD_KIND:
+        inputs = user.get_seismic_load_inputs()
+        if inputs is not None:
+            check_load_prerequisites(user, "seismic load")
+            process_height_zone_seismic_load_data(
+                building=building,
+                height_zone=height_zone,
+                location=location,
+                importance_category=importance_category,
+                **inputs,
+            )
+        return height_zone.seismic_load
+    if kind == WALL_LOAD_CASES_KIND:
+        snow_load = user.get_snow_load()
+        if (
+            snow_load is None
+            or height_zone.wind_load is None
+            or height_zone.seismic_load is None
+        ):
+            return None
+        return collect_wall_height_zone_load_cases(
+            building, snow_load["upwind"], zone_num
+        )
+    raise ValueError(f"Unknown load node {name}")
+
+
+def refresh_user_loads(
+    username: str, names: Optional[List[str]] = None, raise_errors: bool = False
+) -> List[str]:
+    """
+    Recomputes the loads of a user affected by the changes since they were last read. The caller must hold the user's
+    lock for writing.
+    :param username: The username of the user
+    :param names: The names of the nodes to bring up to date along with their dependencies, None for every node
+    :param raise_errors: Whether to raise the first error raised by a computation, otherwise errors are only recorded
+    in the dependency graph and reported by get_user_load_status
+    :return: The names of the nodes that were recomputed
+    """
+    user = ALL_USER_DATA[username]
+    return user.get_dependencies().refresh(
+        lambda name: compute_load_node(user, name), names, raise_errors
+    )
+
+
+def get_user_load_nodes(username: str, kind: str) -> List[str]:
+    """
+    Gets the nodes of a kind defined for each height zone of a user's building
+    :param username: The username of the user
+    :param kind: The kind of node, one of HEIGHT_ZONE_KINDS
+    :return: The names of the nodes of each height zone
+    """
+    building = ALL_USER_DATA[username].get_building()
+    if building is None:
+        return []
+    return [
+        get_zone_node(kind, height_zone.zone_num)
+        for height_zone in building.height_zones
+    ]
+
+
+def ensure_user_loads(username: str) -> None:
+    """
+    Brings the loads of a user up to date before they are read, holding the user's lock for writing only if some of
+    them are stale. Loads that cannot be computed are recorded as failed rather than failing the read, the endpoints
+    setting their inputs report the error. Must be called without holding the user's lock.
+    :param username: The username of the user
+    :return: None
+    """
+    user = ALL_USER_DATA.get(username)
+    if user is None or not user.get_dependencies().get_stale():
+        return
+    with USER_LOCKS.write(username):
+        refresh_user_loads(username)
+
+
+def get_user_wall_load_cases(username: str) -> Optional[np.ndarray]:
+    """
+    Assembles the wall load case matrix of a user from the load cases of each height zone, from the top height zone
+    down, so that only the height zones that changed were recomputed
+    :param username: The username of the user
+    :return: The wall load case matrix, or None if the loads of a height zone have not been computed
+    """
+    user = ALL_USER_DATA.get(username)
+    building = user.get_building()
+    graph = user.get_dependencies()
+    rows = []
+    for height_zone in sorted(
+        building.height_zones, key=lambda x: x.zone_num, reverse=True
+    ):
+        name = get_zone_node(WALL_LOAD_CASES_KIND, height_zone.zone_num)
+        node = graph.nodes.get(name)
+        if node is None or node.stale or node.value is None:
+            return None
+        rows.append(node.value)
+    return np.array(rows, dtype=float)
+
+
+def get_user_load_status(username: str) -> dict:
+    """
+    Gets the state of the loads of a user
+    :param username: The username of the user
+    :return: A dictionary containing, for each node of the user's dependency graph, whether it is stale, the nodes it
+    depends on, the error its last computation raised, and the number of times it was computed with the time its
+    computations took
+    """
+    return ALL_USER_DATA.get(username).get_dependencies().stats()
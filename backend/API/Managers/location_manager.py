@@ -14,6 +14,7 @@
 
 from backend.Constants.seismic_constants import SiteDesignation, SiteClass
 from backend.Entities.Location.location import LocationXvBuilder, LocationXsBuilder
+from backend.Entities.Location.location_pipeline import LOCATION_PIPELINE
 
 ########################################################################################################################
 # On Page Load
@@ -55,3 +56,37 @@ def process_location_data(
     location_builder.set_seismic_data(seismic_value)
     # Return the location object
     return location_builder.get_location()
+
+
+async def process_location_data_async(
+    address: str, site_designation: str, seismic_value: int | str
+):
+    """
+    Processes the location data and creates a location object like process_location_data, without blocking a thread
+    while waiting on the geocoder, the database and the seismic hazard API. Once the coordinates are known, the
+    climatic and seismic data are fetched concurrently.
+    :param address: The address of the location
+    :param site_designation: The site designation of the location
+    :param seismic_value: The seismic value of the location, int if xv, str if xs
+    :return: The location object, possibly missing its climatic or seismic data, and the outcome of each stage
+    """
+    # Convert the site designation and seismic value to the correct enums
+    site_designation = SiteDesignation.get_key_from_value(site_designation)
+    # If the site designation is XS, convert the seismic value to the correct enum
+    if site_designation == SiteDesignation.XS:
+        seismic_value = SiteClass.get_key_from_value(seismic_value)
+    # Create a location object based on the site designation type
+    match site_designation:
+        case SiteDesignation.XV:
+            location_builder = LocationXvBuilder()
+        case SiteDesignation.XS:
+            location_builder = LocationXsBuilder()
+    # Set the location data
+    location_builder.set_address(address)
+    # Set the coordinates, then the climatic and seismic data concurrently
+    location, stages = await LOCATION_PIPELINE.resolve(location_builder, seismic_value)
+    # Without coordinates there is nothing to return
+    if not stages["coordinates"].is_complete():
+        raise stages["coordinates"].error
+    # Return the location object and the outcome of each stage
+    return location, stages
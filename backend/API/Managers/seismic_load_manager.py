@@ -16,6 +16,7 @@ from copy import deepcopy
 
 from backend.Constants.importance_factor_constants import ImportanceFactor
 from backend.Entities.Building.building import Building
+from backend.Entities.Building.height_zone import HeightZone
 from backend.Entities.Location.location import Location
 from backend.Entities.Seismic.seismic_factor import SeismicFactorBuilder
 from backend.Entities.Seismic.seismic_load import SeismicLoadBuilder
@@ -32,6 +33,74 @@ from backend.algorithms.wall_cladding.seismic_load_algorithms import (
 ########################################################################################################################
 
 
+def compute_height_zone_seismic_load(
+    seismic_factor_builder: SeismicFactorBuilder,
+    building: Building,
+    height_zone: HeightZone,
+    location: Location,
+    importance_category: ImportanceFactor,
+):
+    """
+    Computes the seismic load of a single height zone and sets it in the height zone
+    :param seismic_factor_builder: The seismic factor builder holding the seismic factor values, which is not modified
+    :param building: The building object
+    :param height_zone: The height zone object
+    :param location: The location object
+    :param importance_category: The importance category
+    :return: The seismic load of the height zone
+    """
+    # Create a copy of the seismic factor builder object
+    zone_seismic_factor_builder = deepcopy(seismic_factor_builder)
+    # Create a seismic load builder object
+    seismic_load_builder = SeismicLoadBuilder()
+    # Set the height factor
+    get_height_factor(seismic_load_builder, building, height_zone.zone_num)
+    # Set the horizontal force factor
+    get_horizontal_force_factor(zone_seismic_factor_builder, seismic_load_builder)
+    # Set the specified lateral earthquake force
+    get_specified_lateral_earthquake_force(
+        seismic_load_builder,
+        building,
+        height_zone.zone_num,
+        location,
+        importance_category,
+    )
+    # Get the seismic load
+    seismic_load = seismic_load_builder.get_seismic_load()
+    # Set the seismic load in the height zone
+    height_zone.seismic_load = seismic_load
+    return seismic_load
+
+
+def process_height_zone_seismic_load_data(
+    building: Building,
+    height_zone: HeightZone,
+    location: Location,
+    importance_category: ImportanceFactor,
+    ar: float,
+    rp: float,
+    cp: float,
+):
+    """
+    Processes the seismic load data of a single height zone and creates its seismic load object
+    :param building: The building object
+    :param height_zone: The height zone object
+    :param location: The location object
+    :param importance_category: The importance category
+    :param ar: The force amplification factor
+    :param rp: The response modification factor
+    :param cp: The component factor
+    :return: The seismic load of the height zone
+    """
+    # Create a seismic factor builder object
+    seismic_factor_builder = SeismicFactorBuilder()
+    # Set the seismic factor values
+    get_seismic_factor_values(seismic_factor_builder, ar, rp, cp)
+    return compute_height_zone_seismic_load(
+        seismic_factor_builder, building, height_zone, location, importance_category
+    )
+
+
 def process_seismic_load_data(
     building: Building,
     location: Location,
@@ -56,23 +125,6 @@ def process_seismic_load_data(
     get_seismic_factor_values(seismic_factor_builder, ar, rp, cp)
     # For each height zone in the building, calculate the seismic load
     for height_zone in building.height_zones:
-        # Create a copy of the seismic factor builder object
-        zone_seismic_factor_builder = deepcopy(seismic_factor_builder)
-        # Create a seismic load builder object
-        seismic_load_builder = SeismicLoadBuilder()
-        # Set the height factor
-        get_height_factor(seismic_load_builder, building, height_zone.zone_num)
-        # Set the horizontal force factor
-        get_horizontal_force_factor(zone_seismic_factor_builder, seismic_load_builder)
-        # Set the specified lateral earthquake force
-        get_specified_lateral_earthquake_force(
-            seismic_load_builder,
-            building,
-            height_zone.zone_num,
-            location,
-            importance_category,
+        compute_height_zone_seismic_load(
+            seismic_factor_builder, building, height_zone, location, importance_category
         )
-        # Get the seismic load
-        seismic_load = seismic_load_builder.get_seismic_load()
-        # Set the seismic load in the height zone
-        height_zone.seismic_load = seismic_load
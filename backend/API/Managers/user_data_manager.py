@@ -14,29 +14,81 @@
 
 from datetime import datetime
 
-import jsonpickle
-from sqlalchemy import desc
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import desc, select
 
+from backend.Constants.cache_constants import SESSION_SPILL_FILE, SHARED_SESSION_FILE
 from backend.Constants.importance_factor_constants import ImportanceFactor
 from backend.Constants.materials import Materials
 from backend.Entities.Building.building import Building
 from backend.Entities.Building.cladding import Cladding
 from backend.Entities.Building.dimensions import Dimensions
 from backend.Entities.Building.roof import Roof
+from backend.Entities.Cache.persistent_cache import PersistentCache
+from backend.Entities.Cache.session_store import (
+    MemorySessionStore,
+    SharedSessionStore,
+)
 from backend.Entities.Location.location import Location
+from backend.Entities.Serialization.entity_serializer import from_json, to_json
 from backend.Entities.User.profile import Profile
 from backend.Entities.User.user import User
+from backend.Entities.User.user_locks import USER_LOCKS
+from config import get_file_path
 from database.Constants.connection_constants import PrivilegeType
-from database.Entities.database_connection import DatabaseConnection
+from database.Entities.database_connection import (
+    get_async_session,
+    get_scoped_session,
+    open_scoped_session,
+)
 from database.Entities.save_data import SaveData
+from settings import get_settings
 
 ########################################################################################################################
 # GLOBALS
 ########################################################################################################################
 
-# This dictionary stores all data across all users
-ALL_USER_DATA = dict()
+# This store keeps the data of each user. A server with a single worker keeps recently active users in memory, evicted
+# users are spilled to disk and rehydrated on their next request. A server with several workers keeps every user in a
+# file shared by the workers, so that any worker can serve any request.
+if get_settings().server.workers > 1:
+    ALL_USER_DATA = SharedSessionStore(
+        path=get_file_path(SHARED_SESSION_FILE),
+        max_local_users=get_settings().cache.session_store_max_users,
+        ttl=get_settings().cache.session_spill_ttl,
+        locks=USER_LOCKS,
+    )
+else:
+    ALL_USER_DATA = MemorySessionStore(
+        max_users=get_settings().cache.session_store_max_users,
+        max_bytes=get_settings().cache.session_store_max_bytes,
+        idle_ttl=get_settings().cache.session_store_idle_ttl,
+        spill=PersistentCache(
+            path=get_file_path(SESSION_SPILL_FILE),
+            max_entries=get_settings().cache.session_spill_max_entries,
+            ttl=get_settings().cache.session_spill_ttl,
+        ),
+        locks=USER_LOCKS,
+    )
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def merge_save_data(existing_entry: SaveData, json_data: str) -> None:
+    """
+    Merges new save data into an existing save file, overriding its JsonData and DateModified
+    :param existing_entry: The existing save file
+    :param json_data: The JSON data to merge into the save file
+    :return: None
+    """
+    prev_data = from_json(existing_entry.JsonData)
+    for key, value in from_json(json_data).items():
+        prev_data[key] = value
+
+    existing_entry.JsonData = to_json(prev_data).decode("utf-8")
+    existing_entry.DateModified = datetime.now()
 
 
 ########################################################################################################################
@@ -46,13 +98,16 @@ ALL_USER_DATA = dict()
 
 def check_user_exists(username: str) -> None:
     """
-    Checks if a user exists in the ALL_USER_DATA dictionary. If not, creates a new user object for the user.
+    Checks if a user exists in the ALL_USER_DATA store. If not, creates a new user object for the user.
     :param username: The username of the user
     :return: None
     """
-    # If the user does not exist in the dictionary, create a new user object for the user
+    # If the user does not exist in the store, create a new user object for the user. The check is repeated under the
+    # user's lock so that two concurrent first requests do not each create a user and lose the other's changes.
     if not ALL_USER_DATA.get(username):
-        ALL_USER_DATA[username] = User(username)
+        with USER_LOCKS.write(username):
+            if not ALL_USER_DATA.get(username):
+                ALL_USER_DATA[username] = User(username)
 
 
 def set_user_data(username: str, user_data: User) -> None:
@@ -221,6 +276,39 @@ def set_user_snow_load(username: str, snow_load) -> None:
     ALL_USER_DATA[username].set_snow_load(snow_load)
 
 
+def set_user_wind_load_inputs(
+    username: str, zone_num: int, wind_load_inputs: dict
+) -> None:
+    """
+    Sets the inputs of the wind load of a height zone for the user
+    :param username: The username of the user
+    :param zone_num: The number of the height zone
+    :param wind_load_inputs: The inputs of the wind load of the height zone
+    :return: None
+    """
+    ALL_USER_DATA[username].set_wind_load_inputs(zone_num, wind_load_inputs)
+
+
+def set_user_seismic_load_inputs(username: str, seismic_load_inputs: dict) -> None:
+    """
+    Sets the inputs of the seismic load for the user
+    :param username: The username of the user
+    :param seismic_load_inputs: The inputs of the seismic load
+    :return: None
+    """
+    ALL_USER_DATA[username].set_seismic_load_inputs(seismic_load_inputs)
+
+
+def set_user_snow_load_inputs(username: str, snow_load_inputs: dict) -> None:
+    """
+    Sets the inputs of the snow load for the user
+    :param username: The username of the user
+    :param snow_load_inputs: The inputs of the snow load
+    :return: None
+    """
+    ALL_USER_DATA[username].set_snow_load_inputs(snow_load_inputs)
+
+
 def set_user_save_data(username: str, json_data: str, id: int = None) -> int:
     """
     Sets the save data for the user
@@ -229,44 +317,35 @@ def set_user_save_data(username: str, json_data: str, id: int = None) -> int:
     :param id: The id of the save file
     :return: The id of the save file
     """
-    # Connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    Session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = Session()
-
-    # Check if the entry already exists
-    existing_entry = None
-    # If an id is provided, check if the entry exists
-    if id is not None:
-        existing_entry = (
-            controller.query(SaveData)
-            .filter((SaveData.Username == username) & (SaveData.ID == id))
-            .first()
-        )
-
-    # If the entry exists, modify it. Otherwise, create a new entry
-    if existing_entry is not None:
-        # modify existing entry, by overriding JsonData and DateModified to use current time
-        prev_data = jsonpickle.decode(existing_entry.JsonData)
-        for key, value in jsonpickle.decode(json_data).items():
-            prev_data[key] = value
-
-        existing_entry.JsonData = jsonpickle.encode(prev_data, unpicklable=False)
-        existing_entry.DateModified = datetime.now()
-    # Create new entry with the current time
-    else:
-        new_entry = SaveData(
-            Username=username, DateModified=datetime.now(), JsonData=json_data
-        )
-        controller.add(new_entry)
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Check if the entry already exists
+        existing_entry = None
+        # If an id is provided, check if the entry exists
+        if id is not None:
+            existing_entry = (
+                controller.query(SaveData)
+                .filter((SaveData.Username == username) & (SaveData.ID == id))
+                .first()
+            )
+
+        # If the entry exists, modify it. Otherwise, create a new entry
+        if existing_entry is not None:
+            # modify existing entry, by overriding JsonData and DateModified to use current time
+            merge_save_data(existing_entry, json_data)
+        # Create new entry with the current time
+        else:
+            new_entry = SaveData(
+                Username=username, DateModified=datetime.now(), JsonData=json_data
+            )
+            controller.add(new_entry)
+            controller.commit()
+            id = new_entry.ID
+
+        # Commit the changes
         controller.commit()
-        id = new_entry.ID
-
-    # Commit and close the connection
-    controller.commit()
-    controller.close()
-    new_connection.close()
 
     # Return the id of the save file
     return id
@@ -406,13 +485,13 @@ def get_user_snow_load(username: str):
     return ALL_USER_DATA.get(username).get_snow_load()
 
 
-def get_user_data(username: str):
+def get_user_data(username: str) -> User:
     """
     Gets the user data for the user
     :param username: The username of the user
-    :return: A JSON representation of the user data
+    :return: The user object holding the user data
     """
-    return jsonpickle.encode(ALL_USER_DATA.get(username), indent=4, unpicklable=False)
+    return ALL_USER_DATA.get(username)
 
 
 def get_all_user_save_data(username: str):
@@ -421,21 +500,17 @@ def get_all_user_save_data(username: str):
     :param username: The username of the user
     :return: The save data for the user
     """
-    # Connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-    # Get all the save data for the user
-    result = (
-        controller.query(SaveData)
-        .filter(SaveData.Username == username)
-        .order_by(desc(SaveData.DateModified))
-        .all()
-    )
-    # Close the connection
-    controller.close()
-    new_connection.close()
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Get all the save data for the user
+        result = (
+            controller.query(SaveData)
+            .filter(SaveData.Username == username)
+            .order_by(desc(SaveData.DateModified))
+            .all()
+        )
     # Return the save data
     return result
 
@@ -447,20 +522,16 @@ def get_user_save_file(username: str, id: int):
     :param id: The id of the save file
     :return: The save file with the given id
     """
-    # Connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-    # Get the save file with the given id
-    result = (
-        controller.query(SaveData)
-        .filter((SaveData.Username == username) & (SaveData.ID == id))
-        .first()
-    )
-    # Close the connection
-    controller.close()
-    new_connection.close()
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Get the save file with the given id
+        result = (
+            controller.query(SaveData)
+            .filter((SaveData.Username == username) & (SaveData.ID == id))
+            .first()
+        )
     # Return the save file
     return result
 
@@ -472,23 +543,20 @@ def delete_user_save_file(username: str, id: int):
     :param id: The id of the save file
     :return: None
     """
-    # Connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-    # Get the save file with the given id
-    result = (
-        controller.query(SaveData)
-        .filter((SaveData.Username == username) & (SaveData.ID == id))
-        .first()
-    )
-    # Delete the save file
-    controller.delete(result)
-    # Commit and close the connection
-    controller.commit()
-    controller.close()
-    new_connection.close()
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Get the save file with the given id
+        result = (
+            controller.query(SaveData)
+            .filter((SaveData.Username == username) & (SaveData.ID == id))
+            .first()
+        )
+        # Delete the save file
+        controller.delete(result)
+        # Commit the deletion
+        controller.commit()
 
 
 def get_user_save_file_json(username: str, id: int):
@@ -500,3 +568,130 @@ def get_user_save_file_json(username: str, id: int):
     """
     save_file = get_user_save_file(username, id)
     return save_file.JsonData
+
+
+########################################################################################################################
+# ASYNC MANAGER
+########################################################################################################################
+
+
+async def set_user_save_data_async(username: str, json_data: str, id: int = None) -> int:
+    """
+    Sets the save data for the user without blocking the event loop
+    :param username: The username of the user
+    :param json_data: The JSON data to save
+    :param id: The id of the save file
+    :return: The id of the save file
+    """
+    # Connect to the database using the shared asyncio connection pool
+    session = get_async_session(
+        database_name="NBCC-2020", privilege=PrivilegeType.ADMIN
+    )
+    async with session() as controller:
+        # Check if the entry already exists
+        existing_entry = None
+        # If an id is provided, check if the entry exists
+        if id is not None:
+            result = await controller.execute(
+                select(SaveData)
+                .filter((SaveData.Username == username) & (SaveData.ID == id))
+                .limit(1)
+            )
+            existing_entry = result.scalars().first()
+
+        # If the entry exists, modify it. Otherwise, create a new entry
+        if existing_entry is not None:
+            merge_save_data(existing_entry, json_data)
+        # Create new entry with the current time
+        else:
+            new_entry = SaveData(
+                Username=username, DateModified=datetime.now(), JsonData=json_data
+            )
+            controller.add(new_entry)
+            # Flush to have the database assign the id of the new entry
+            await controller.flush()
+            id = new_entry.ID
+
+        # Commit, the connection returns to the pool when the session closes
+        await controller.commit()
+
+    # Return the id of the save file
+    return id
+
+
+async def get_all_user_save_data_async(username: str):
+    """
+    Gets all the save data for the user without blocking the event loop
+    :param username: The username of the user
+    :return: The save data for the user
+    """
+    # Connect to the database using the shared asyncio connection pool
+    session = get_async_session(
+        database_name="NBCC-2020", privilege=PrivilegeType.ADMIN
+    )
+    async with session() as controller:
+        # Get all the save data for the user
+        result = await controller.execute(
+            select(SaveData)
+            .filter(SaveData.Username == username)
+            .order_by(desc(SaveData.DateModified))
+        )
+        # Return the save data
+        return result.scalars().all()
+
+
+async def get_user_save_file_async(username: str, id: int):
+    """
+    Gets the save file for the user without blocking the event loop
+    :param username: The username of the user
+    :param id: The id of the save file
+    :return: The save file with the given id
+    """
+    # Connect to the database using the shared asyncio connection pool
+    session = get_async_session(
+        database_name="NBCC-2020", privilege=PrivilegeType.ADMIN
+    )
+    async with session() as controller:
+        # Get the save file with the given id
+        result = await controller.execute(
+            select(SaveData)
+            .filter((SaveData.Username == username) & (SaveData.ID == id))
+            .limit(1)
+        )
+        # Return the save file
+        return result.scalars().first()
+
+
+async def delete_user_save_file_async(username: str, id: int):
+    """
+    Deletes the save file for the user without blocking the event loop
+    :param username: The username of the user
+    :param id: The id of the save file
+    :return: None
+    """
+    # Connect to the database using the shared asyncio connection pool
+    session = get_async_session(
+        database_name="NBCC-2020", privilege=PrivilegeType.ADMIN
+    )
+    async with session() as controller:
+        # Get the save file with the given id
+        result = await controller.execute(
+            select(SaveData)
+            .filter((SaveData.Username == username) & (SaveData.ID == id))
+            .limit(1)
+        )
+        # Delete the save file
+        await controller.delete(result.scalars().first())
+        # Commit, the connection returns to the pool when the session closes
+        await controller.commit()
+
+
+async def get_user_save_file_json_async(username: str, id: int):
+    """
+    Gets the JSON data for the save file with the given id without blocking the event loop
+    :param username: The username of the user
+    :param id: The id of the save file
+    :return: The JSON data for the save file
+    """
+    save_file = await get_user_save_file_async(username, id)
+    return save_file.JsonData
@@ -12,6 +12,10 @@
 # IMPORTS
 ########################################################################################################################
 
+from typing import Optional
+
+import numpy as np
+
 from backend.Constants.wall_load_combination_constants import (
     ULSWallLoadCombinationTypes,
     SLSWallLoadCombinationTypes,
@@ -29,7 +33,11 @@ from backend.algorithms.load_combination_algorithms import (
 
 
 def process_wall_load_combination_data(
-    building: Building, snow_load: SnowLoad, uls_wall_type: str, sls_wall_type: str
+    building: Building,
+    snow_load: SnowLoad,
+    uls_wall_type: str,
+    sls_wall_type: str,
+    load_cases: Optional[np.ndarray] = None,
 ):
     """
     Processes the wall load combination data and computes the wall load combinations
@@ -37,10 +45,11 @@ def process_wall_load_combination_data(
     :param snow_load: The snow load object
     :param uls_wall_type: The type of ULS wall load combination
     :param sls_wall_type: The type of SLS wall load combination
+    :param load_cases: The wall load case matrix if it has already been collected, from the top height zone down
     :return: A dataframe containing the wall load combinations
     """
     uls_wall_type = ULSWallLoadCombinationTypes(uls_wall_type)
     sls_wall_type = SLSWallLoadCombinationTypes(sls_wall_type)
     return compute_wall_load_combinations(
-        building, snow_load, uls_wall_type, sls_wall_type
+        building, snow_load, uls_wall_type, sls_wall_type, load_cases
     )
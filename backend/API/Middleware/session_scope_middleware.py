@@ -0,0 +1,116 @@
+########################################################################################################################
+# session_scope_middleware.py
+# This file contains the middleware that scopes the data of users to the request being served, so that the users
+# modified by a request are written back to the session store before the response is sent.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from typing import Any, Dict
+
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.Entities.Cache.session_store import (
+    REQUEST_USERS,
+    SessionConflictError,
+    SessionStoreInterface,
+)
+
+########################################################################################################################
+# MIDDLEWARE CLASS
+########################################################################################################################
+
+
+class SessionScopeMiddleware:
+    """
+    Collects the users read or written while serving each HTTP request and writes them back to the session store once
+    the endpoint has returned, before the response is sent, so that the next request for the same user sees the changes
+    whichever worker serves it. If another worker has written the users since they were read, the response is replaced
+    by a 409 Conflict response so that the client sends the request again. Written as a pure ASGI middleware so that
+    the request context, and with it the collected users, is shared with the endpoint.
+    """
+
+    # The wrapped application
+    app: ASGIApp
+    # The store the users are written back to
+    store: SessionStoreInterface
+
+    def __init__(self, app: ASGIApp, store: SessionStoreInterface):
+        """
+        Constructor for the SessionScopeMiddleware class
+        :param app: The wrapped application
+        :param store: The store the users are written back to
+        """
+        self.app = app
+        self.store = store
+
+    async def write_back(self, users: Dict[str, Any]) -> None:
+        """
+        Writes the collected users back to the store without blocking the event loop
+        :param users: The users read or written while serving the request, keyed by username
+        :return: None
+        """
+        if users:
+            try:
+                await run_in_threadpool(self.store.write_back, dict(users))
+            finally:
+                users.clear()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Serves a request, collecting and writing back the users of HTTP requests
+        :param scope: The connection scope
+        :param receive: The function receiving messages from the client
+        :param send: The function sending messages to the client
+        :return: None
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        users: Dict[str, Any] = {}
+        token = REQUEST_USERS.set(users)
+        # Whether the response was replaced because another worker wrote the users first
+        conflict = False
+
+        async def send_after_write_back(message: Message) -> None:
+            nonlocal conflict
+            # The messages of a replaced response are dropped
+            if conflict:
+                return
+            # Write the users back before the response starts, so that a client sending its next request as soon as
+            # it receives this response reads the changes
+            if message["type"] == "http.response.start":
+                try:
+                    await self.write_back(users)
+                except SessionConflictError as e:
+                    # The changes of the request were not stored, the frontend resends requests answered with 409
+                    conflict = True
+                    await JSONResponse({"detail": str(e)}, status_code=409)(
+                        scope, receive, send
+                    )
+                    return
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_after_write_back)
+        finally:
+            # Users modified by a request that failed before sending a response, or by a background task, are written
+            # back once the request is done
+            try:
+                await self.write_back(users)
+            except SessionConflictError:
+                # The response has already been sent or the request has failed, the changes are dropped in favour of
+                # those of the other worker
+                pass
+            finally:
+                REQUEST_USERS.reset(token)
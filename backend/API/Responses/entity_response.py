@@ -0,0 +1,67 @@
+########################################################################################################################
+# entity_response.py
+# This file contains the response returned by endpoints that send entities to the client. The entities are encoded
+# once, as JSON or, for clients that ask for it in their Accept header, as MessagePack, and the bytes are sent as they
+# are rather than being encoded again by FastAPI.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from typing import Any, Optional
+
+from starlette.responses import Response
+
+from backend.Entities.Serialization.entity_serializer import to_json, to_msgpack
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The media type of JSON responses
+JSON_MEDIA_TYPE = "application/json"
+# The media types a client may accept to receive MessagePack responses
+MSGPACK_MEDIA_TYPES = ["application/msgpack", "application/x-msgpack"]
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """
+    Checks if a client accepts MessagePack responses
+    :param accept: The Accept header of the request, None if it was not sent
+    :return: True if the header lists a MessagePack media type, False otherwise
+    """
+    if not accept:
+        return False
+    media_types = [
+        media_range.split(";")[0].strip() for media_range in accept.split(",")
+    ]
+    return any(media_type in MSGPACK_MEDIA_TYPES for media_type in media_types)
+
+
+########################################################################################################################
+# MAIN FUNCTION
+########################################################################################################################
+
+
+def create_entity_response(content: Any, accept: Optional[str] = None) -> Response:
+    """
+    Encodes entities into a response. The content is encoded when this is called, so callers holding a user's lock
+    must call it before releasing the lock.
+    :param content: An entity or any combination of entities, lists, dictionaries and primitive values
+    :param accept: The Accept header of the request, None if it was not sent
+    :return: A MessagePack response if the client accepts it, a JSON response otherwise
+    """
+    if accepts_msgpack(accept):
+        return Response(content=to_msgpack(content), media_type=MSGPACK_MEDIA_TYPES[0])
+    return Response(content=to_json(content), media_type=JSON_MEDIA_TYPE)
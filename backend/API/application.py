@@ -0,0 +1,128 @@
+########################################################################################################################
+# application.py
+# This file contains the factory creating the FastAPI application. It is called once by the server, or once in each
+# worker process when the server is started with more than one worker.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from anyio import to_thread
+from fastapi import FastAPI
+
+from backend.API.Endpoints.authentication import authentication_router
+from backend.API.Endpoints.building_endpoint import building_router
+from backend.API.Endpoints.calculate_main_structure_wind_factor import (
+    calculate_main_structure_wind_factor_router,
+)
+from backend.API.Endpoints.cladding_endpoint import cladding_router
+from backend.API.Endpoints.dimensions_endpoint import dimensions_router
+from backend.API.Endpoints.height_zones_endpoint import height_zone_router
+from backend.API.Endpoints.importance_category_endpoint import (
+    importance_category_router,
+)
+from backend.API.Endpoints.location import location_router
+from backend.API.Endpoints.main_structure_loads_endpoint import (
+    main_structure_loads_router,
+)
+from backend.API.Endpoints.material_type_endpoint import (
+    material_type_endpoint_router,
+)
+from backend.API.Endpoints.natural_frequency_endpoint import (
+    natural_frequency_endpoint_router,
+)
+from backend.API.Endpoints.output_endpoint import output_router
+from backend.API.Endpoints.roof_endpoint import roof_router
+from backend.API.Endpoints.roof_load_combination_endpoint import (
+    roof_load_combination_router,
+)
+from backend.API.Endpoints.seismic_load_endpoint import seismic_load_router
+from backend.API.Endpoints.server_status_endpoint import server_status_endpoint
+from backend.API.Endpoints.snow_load_endpoint import snow_load_router
+from backend.API.Endpoints.user_data_endpoint import user_data_router
+from backend.API.Endpoints.visualization_endpoint import visualization_router
+from backend.API.Endpoints.wall_load_combination_endpoint import (
+    wall_load_combination_router,
+)
+from backend.API.Endpoints.wind_load_endpoint import wind_load_router
+from backend.API.Managers.user_data_manager import ALL_USER_DATA
+from backend.API.Middleware.session_scope_middleware import SessionScopeMiddleware
+from backend.Entities.Location.geocoder import GEOCODER
+from backend.Entities.Location.postal_code_index import POSTAL_CODE_INDEX
+from backend.Entities.Location.seismic_hazard_client import SEISMIC_HAZARD_CLIENT
+from blender.scripts.blender_request import BLENDER_WORKER_POOL
+from database.Entities.database_connection import (
+    dispose_async_pooled_engines,
+    dispose_pooled_engines,
+)
+from settings import get_settings
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def set_thread_pool_size() -> None:
+    """
+    Sets the number of threads sync endpoints run on. Requests for the same user are serialized by the user's lock, so
+    the pool can be larger than the default without requests seeing each other's partial changes.
+    :return: None
+    """
+    to_thread.current_default_thread_limiter().total_tokens = (
+        get_settings().server.threads
+    )
+
+
+########################################################################################################################
+# FACTORY
+########################################################################################################################
+
+
+def create_app() -> FastAPI:
+    """
+    Creates the FastAPI application with every router and the handlers run when the server starts and shuts down
+    :return: The FastAPI application
+    """
+    app = FastAPI()
+    # Write the users modified by each request back to the session store before the response is sent
+    app.add_middleware(SessionScopeMiddleware, store=ALL_USER_DATA)
+    # Size the thread pool sync endpoints run on
+    app.add_event_handler("startup", set_thread_pool_size)
+    # Map the postal code index, building it if the postal code CSV has changed, before the first request
+    app.add_event_handler("startup", POSTAL_CODE_INDEX.refresh)
+    # Close all pooled database connections when the server shuts down
+    app.add_event_handler("shutdown", dispose_pooled_engines)
+    app.add_event_handler("shutdown", dispose_async_pooled_engines)
+    # Close the asyncio HTTP sessions when the server shuts down
+    app.add_event_handler("shutdown", GEOCODER.aclose)
+    app.add_event_handler("shutdown", SEISMIC_HAZARD_CLIENT.aclose)
+    # Stop the Blender workers when the server shuts down
+    app.add_event_handler("shutdown", BLENDER_WORKER_POOL.shutdown)
+    app.include_router(authentication_router)
+    app.include_router(location_router)
+    app.include_router(dimensions_router)
+    app.include_router(natural_frequency_endpoint_router)
+    app.include_router(cladding_router)
+    app.include_router(roof_router)
+    app.include_router(building_router)
+    app.include_router(importance_category_router)
+    app.include_router(material_type_endpoint_router)
+    app.include_router(user_data_router)
+    app.include_router(wind_load_router)
+    app.include_router(calculate_main_structure_wind_factor_router)
+    app.include_router(height_zone_router)
+    app.include_router(seismic_load_router)
+    app.include_router(snow_load_router)
+    app.include_router(wall_load_combination_router)
+    app.include_router(main_structure_loads_router)
+    app.include_router(roof_load_combination_router)
+    app.include_router(server_status_endpoint)
+    app.include_router(visualization_router)
+    app.include_router(output_router)
+    return app
@@ -0,0 +1,58 @@
+########################################################################################################################
+# cache_constants.py
+# This file contains the constants pertaining to the caches used by the backend
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# The directory, relative to the source root, in which the persistent caches are stored
+CACHE_DIRECTORY = "data/cache"
+
+# The file in which geocoding results are cached
+GEOCODE_CACHE_FILE = f"{CACHE_DIRECTORY}/geocode_cache.sqlite3"
+# The maximum number of addresses kept in the geocoding cache
+GEOCODE_CACHE_MAX_ENTRIES = 50000
+# The number of seconds a successful geocoding result is kept (30 days)
+GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60
+# The number of seconds a failed geocoding result is kept (1 day)
+GEOCODE_CACHE_NEGATIVE_TTL = 24 * 60 * 60
+
+# The file in which the results of bulk geocoding the climatic stations are checkpointed
+STATION_GEOCODE_CACHE_FILE = f"{CACHE_DIRECTORY}/station_geocode_cache.sqlite3"
+# The maximum number of stations kept in the bulk geocoding checkpoint
+STATION_GEOCODE_CACHE_MAX_ENTRIES = 100000
+
+# The file in which seismic hazard results are cached
+SEISMIC_HAZARD_CACHE_FILE = f"{CACHE_DIRECTORY}/seismic_hazard_cache.sqlite3"
+# The maximum number of site results kept in the seismic hazard cache
+SEISMIC_HAZARD_CACHE_MAX_ENTRIES = 50000
+# The number of seconds a seismic hazard result is kept (365 days), the hazard model only changes between code editions
+SEISMIC_HAZARD_CACHE_TTL = 365 * 24 * 60 * 60
+# The number of decimal places coordinates are rounded to before querying the seismic hazard tool (about 11 m)
+SEISMIC_HAZARD_COORDINATE_PRECISION = 4
+
+# The file in which the memory-mapped postal code index is stored, rebuilt from the postal code CSV when it changes
+POSTAL_CODE_INDEX_FILE = f"{CACHE_DIRECTORY}/postal_code_index.bin"
+
+# The maximum number of users whose data is kept in memory
+SESSION_STORE_MAX_USERS = 1000
+# The approximate number of bytes of user data kept in memory (512 MB)
+SESSION_STORE_MAX_BYTES = 512 * 1024 * 1024
+# The number of seconds a user's data is kept in memory without being accessed (1 hour)
+SESSION_STORE_IDLE_TTL = 60 * 60
+# The file in which the data of users evicted from memory is kept until they return
+SESSION_SPILL_FILE = f"{CACHE_DIRECTORY}/session_spill.sqlite3"
+# The maximum number of evicted users whose data is kept on disk
+SESSION_SPILL_MAX_ENTRIES = 100000
+# The number of seconds the data of an evicted user is kept on disk (30 days)
+SESSION_SPILL_TTL = 30 * 24 * 60 * 60
+# The file in which the data of every user is shared between the worker processes of a server started with more than
+# one worker
+SHARED_SESSION_FILE = f"{CACHE_DIRECTORY}/shared_sessions.sqlite3"
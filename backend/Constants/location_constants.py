@@ -14,3 +14,26 @@
 
 # The radius of the earth in kilometers
 EARTH_RADIUS = 6371
+
+# The minimum number of seconds between checks for changes to the ClimaticData table by the climatic station index
+CLIMATIC_STATION_INDEX_REFRESH_INTERVAL = 60
+
+# The CSV file, relative to the source root, containing the coordinates of every canadian postal code
+POSTAL_CODE_CSV_FILE = "data/location/CanadianPostalCodes202312.csv"
+# The minimum number of seconds between checks for changes to the postal code CSV by the postal code index
+POSTAL_CODE_INDEX_REFRESH_INTERVAL = 60
+
+# The optional offline gazetteer, relative to the source root, consulted before Nominatim when bulk geocoding the
+# climatic stations. It is a CSV file with a header and name, latitude and longitude columns.
+GAZETTEER_FILE = "data/location/gazetteer.csv"
+# The number of threads geocoding the climatic stations concurrently, the Nominatim rate limit is shared between them
+BULK_GEOCODE_WORKERS = 4
+# The number of geocoded stations written to the database in each commit
+BULK_GEOCODE_COMMIT_SIZE = 50
+
+# The number of seconds the location pipeline waits for the coordinates of an address
+LOCATION_COORDINATES_TIMEOUT = 15
+# The number of seconds the location pipeline waits for the climatic data of a location
+LOCATION_CLIMATIC_TIMEOUT = 10
+# The number of seconds the location pipeline waits for the seismic data of a location
+LOCATION_SEISMIC_TIMEOUT = 35
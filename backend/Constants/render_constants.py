@@ -0,0 +1,24 @@
+########################################################################################################################
+# render_constants.py
+# This file contains the constants pertaining to rendering models with Blender
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# The default Blender executable, used when BLENDER is not set
+BLENDER_PATH = "blender"
+# The default number of workers kept running
+BLENDER_POOL_SIZE = 2
+# The default number of seconds a render job may take before its worker is killed
+BLENDER_JOB_TIMEOUT = 120
+# The default number of seconds a worker may take to start
+BLENDER_STARTUP_TIMEOUT = 60
+# The default number of jobs a worker runs before it is replaced, bounding memory leaked by Blender between jobs
+BLENDER_WORKER_MAX_JOBS = 100
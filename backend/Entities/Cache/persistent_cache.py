@@ -0,0 +1,230 @@
+########################################################################################################################
+# persistent_cache.py
+# This file contains a small disk-backed key-value cache with LRU eviction and per-entry expiry.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# Returned by PersistentCache.get when a key is not cached, so that None can itself be cached
+CACHE_MISS = object()
+# The number of seconds access times are kept in memory before they are written to the SQLite file
+ACCESS_FLUSH_INTERVAL = 5.0
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class PersistentCache:
+    """
+    A key-value cache stored in a SQLite file. Values must be JSON serializable. Entries expire after their time to
+    live and the least recently used entries are evicted once the cache holds more than max_entries entries.
+    """
+
+    # The path of the SQLite file
+    path: str
+    # The maximum number of entries kept in the cache
+    max_entries: int
+    # The default number of seconds an entry is kept
+    ttl: Optional[float]
+    # The number of lookups that found a live entry
+    hits: int
+    # The number of lookups that found no entry or an expired entry
+    misses: int
+    # The number of entries removed to respect max_entries
+    evictions: int
+    # The number of entries in the cache, kept up to date by every write instead of counted on each insert
+    size: int
+    # The access times of cache hits that have not been written to the SQLite file yet
+    pending_accesses: Dict[str, float]
+    # The time access times were last written to the SQLite file
+    last_flush: float
+
+    def __init__(self, path: str, max_entries: int, ttl: Optional[float] = None):
+        """
+        Constructor for the PersistentCache class
+        :param path: The path of the SQLite file, created if it does not exist
+        :param max_entries: The maximum number of entries kept in the cache
+        :param ttl: The default number of seconds an entry is kept, None to keep entries until they are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.pending_accesses = {}
+        self.last_flush = time.time()
+        self.lock = threading.Lock()
+        # Create the directory of the cache if it does not exist
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        # Write-ahead logging lets other processes read the cache while it is being written
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT, expires_at REAL, last_access REAL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS cache_last_access ON cache (last_access)"
+        )
+        self.connection.commit()
+        (self.size,) = self.connection.execute("SELECT COUNT(*) FROM cache").fetchone()
+
+    def flush_accesses(self) -> None:
+        """
+        Writes the buffered access times of cache hits to the SQLite file, the caller must hold the lock
+        :return: None
+        """
+        if self.pending_accesses:
+            self.connection.executemany(
+                "UPDATE cache SET last_access = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self.pending_accesses.items()],
+            )
+            self.connection.commit()
+            self.pending_accesses.clear()
+        self.last_flush = time.time()
+
+    def get(self, key: str) -> Any:
+        """
+        Gets the value cached for a key and marks the entry as recently used
+        :param key: The key to look up
+        :return: The cached value, or CACHE_MISS if the key is not cached or has expired
+        """
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            # The key is not cached
+            if row is None:
+                self.misses += 1
+                return CACHE_MISS
+            value, expires_at = row
+            # The entry has expired, remove it
+            if expires_at is not None and expires_at <= now:
+                self.remove(key)
+                self.connection.commit()
+                self.misses += 1
+                return CACHE_MISS
+            # Mark the entry as recently used, the access time is only written once the flush interval has passed
+            self.pending_accesses[key] = now
+            if now - self.last_flush >= ACCESS_FLUSH_INTERVAL:
+                self.flush_accesses()
+            self.hits += 1
+            return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Caches a value for a key, evicting the least recently used entries if the cache is full
+        :param key: The key to cache the value under
+        :param value: The JSON serializable value to cache
+        :param ttl: The number of seconds the entry is kept, defaults to the ttl of the cache
+        :return: None
+        """
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else now + ttl
+        with self.lock:
+            exists = self.connection.execute(
+                "SELECT 1 FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            self.pending_accesses.pop(key, None)
+            if exists is None:
+                self.size += 1
+            # Evict the least recently used entries beyond the maximum number of entries
+            if self.size > self.max_entries:
+                # The eviction order depends on the access times, so the buffered ones are written first
+                self.flush_accesses()
+                evicted = self.connection.execute(
+                    "DELETE FROM cache WHERE key IN "
+                    "(SELECT key FROM cache ORDER BY last_access LIMIT ?)",
+                    (self.size - self.max_entries,),
+                ).rowcount
+                self.size -= evicted
+                self.evictions += evicted
+            self.connection.commit()
+
+    def delete(self, key: str) -> None:
+        """
+        Removes a key from the cache
+        :param key: The key to remove
+        :return: None
+        """
+        with self.lock:
+            self.remove(key)
+            self.connection.commit()
+
+    def remove(self, key: str) -> None:
+        """
+        Removes a key from the SQLite file and the buffered access times without committing, the caller must hold the
+        lock
+        :param key: The key to remove
+        :return: None
+        """
+        self.size -= self.connection.execute(
+            "DELETE FROM cache WHERE key = ?", (key,)
+        ).rowcount
+        self.pending_accesses.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        Removes every entry from the cache and resets the counters
+        :return: None
+        """
+        with self.lock:
+            self.connection.execute("DELETE FROM cache")
+            self.connection.commit()
+            self.pending_accesses.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """
+        Gets the counters of the cache
+        :return: A dictionary containing the size, capacity, hits, misses, hit rate and evictions of the cache
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": self.size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def close(self) -> None:
+        """
+        Writes the buffered access times and closes the SQLite file
+        :return: None
+        """
+        with self.lock:
+            self.flush_accesses()
+            self.connection.close()
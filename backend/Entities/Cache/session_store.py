@@ -0,0 +1,872 @@
+########################################################################################################################
+# session_store.py
+# This file contains the stores used to keep the in-memory data of each user between requests.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import hashlib
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextvars import ContextVar
+from enum import Enum
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jsonpickle
+
+from backend.Entities.Cache.persistent_cache import PersistentCache, CACHE_MISS
+from backend.Entities.User.user_locks import UserLockRegistry
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The users read or written while serving the current request, keyed by username, None outside of a request. Set by
+# the session scope middleware so that the users can be written back to a shared store once the request is served.
+REQUEST_USERS: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "REQUEST_USERS", default=None
+)
+# The number of seconds between measurements of the size of a user kept in memory
+SESSION_SIZE_MEASURE_INTERVAL = 30
+# The number of seconds between removals of expired users from a shared store
+SHARED_SESSION_PURGE_INTERVAL = 60
+# The number of seconds a process waits for another process to finish writing to a shared store
+SHARED_SESSION_BUSY_TIMEOUT = 30
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+@lru_cache(maxsize=None)
+def get_slot_names(cls: type) -> Tuple[str, ...]:
+    """
+    Gets the names of the slots declared by a class and its base classes
+    :param cls: The class
+    :return: The names of the slots holding the attributes of instances of the class
+    """
+    names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in ("__dict__", "__weakref__"))
+    return tuple(names)
+
+
+def get_approximate_size(obj: Any) -> int:
+    """
+    Approximates the number of bytes used by an object and everything it references
+    :param obj: The object to measure
+    :return: The approximate size of the object in bytes
+    """
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        current = stack.pop()
+        # Enums and classes are shared between users and are not counted
+        if id(current) in seen or isinstance(current, (type, Enum)):
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            if hasattr(current, "__dict__"):
+                stack.append(vars(current))
+            # Entities storing their attributes in slots have no dictionary to follow
+            for name in get_slot_names(type(current)):
+                if hasattr(current, name):
+                    stack.append(getattr(current, name))
+    return size
+
+
+########################################################################################################################
+# EXCEPTIONS
+########################################################################################################################
+
+
+class SessionConflictError(Exception):
+    """
+    Raised when users cannot be written back to a shared store because another worker has written them since they were
+    read
+    """
+
+    # The usernames of the users that were not written
+    usernames: List[str]
+
+    def __init__(self, usernames: List[str]):
+        """
+        Constructor for the SessionConflictError class
+        :param usernames: The usernames of the users that were not written
+        """
+        super().__init__(
+            f"The data of {', '.join(usernames)} was changed by another request, please try again"
+        )
+        self.usernames = usernames
+
+
+########################################################################################################################
+# INTERFACE
+########################################################################################################################
+
+
+class SessionStoreInterface:
+    """
+    Interface for the stores that keep the data of each user between requests. Stores behave like a dictionary from
+    usernames to user objects.
+    """
+
+    def get(self, username: str, default: Any = None) -> Any:
+        pass
+
+    def __getitem__(self, username: str) -> Any:
+        pass
+
+    def __setitem__(self, username: str, user: Any) -> None:
+        pass
+
+    def __delitem__(self, username: str) -> None:
+        pass
+
+    def __contains__(self, username: str) -> bool:
+        pass
+
+    def write_back(self, users: Dict[str, Any]) -> None:
+        pass
+
+    def stats(self) -> dict:
+        pass
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class MemorySessionStore(SessionStoreInterface):
+    """
+    Keeps the data of each user in memory, bounded by a number of users, an approximate number of bytes and an idle
+    time to live. The least recently used users are evicted first. Evicted users are written to a spill cache on disk
+    and rehydrated the next time they are accessed, so eviction is invisible to the endpoints.
+
+    Users are measured when they are set or rehydrated, and measured again when the requests that used them are written
+    back, at most once every measure_interval seconds, so reads never walk the data of the users. A user is only evicted
+    while its lock is free, and is encoded while holding the lock for writing, so that a request changing the user is
+    never lost.
+    """
+
+    # The maximum number of users kept in memory
+    max_users: int
+    # The approximate number of bytes of user data kept in memory, None for no limit
+    max_bytes: Optional[int]
+    # The number of seconds a user is kept in memory without being accessed, None for no limit
+    idle_ttl: Optional[float]
+    # The cache evicted users are written to, None to discard evicted users
+    spill: Optional[PersistentCache]
+    # The users kept in memory, ordered from least to most recently used
+    entries: "OrderedDict[str, Any]"
+    # The time each user was last accessed
+    last_access: Dict[str, float]
+    # The approximate size of each user when it was last measured
+    sizes: Dict[str, int]
+    # The time each user was last measured
+    measured_at: Dict[str, float]
+    # The sum of the approximate sizes of the users
+    total_bytes: int
+    # Measures the approximate size of a user
+    sizer: Callable[[Any], int]
+    # The minimum number of seconds between measurements of a user
+    measure_interval: float
+    # The locks of the users, a user is only evicted while its lock is free, None to evict users without locking
+    locks: Optional[UserLockRegistry]
+
+    def __init__(
+        self,
+        max_users: int,
+        max_bytes: Optional[int] = None,
+        idle_ttl: Optional[float] = None,
+        spill: Optional[PersistentCache] = None,
+        sizer: Callable[[Any], int] = get_approximate_size,
+        measure_interval: float = SESSION_SIZE_MEASURE_INTERVAL,
+        locks: Optional[UserLockRegistry] = None,
+    ):
+        """
+        Constructor for the MemorySessionStore class
+        :param max_users: The maximum number of users kept in memory
+        :param max_bytes: The approximate number of bytes of user data kept in memory, None for no limit
+        :param idle_ttl: The number of seconds a user is kept in memory without being accessed, None for no limit
+        :param spill: The cache evicted users are written to, None to discard evicted users
+        :param sizer: Measures the approximate size of a user
+        :param measure_interval: The minimum number of seconds between measurements of a user
+        :param locks: The locks of the users, a user is only evicted while its lock is free
+        """
+        self.max_users = max_users
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.spill = spill
+        self.sizer = sizer
+        self.measure_interval = measure_interval
+        self.locks = locks
+        self.entries = OrderedDict()
+        self.last_access = {}
+        self.sizes = {}
+        self.measured_at = {}
+        self.total_bytes = 0
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.rehydrations = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def touch(self, username: str) -> None:
+        """
+        Marks a user as the most recently used
+        :param username: The username of the user
+        :return: None
+        """
+        self.entries.move_to_end(username)
+        self.last_access[username] = time.monotonic()
+
+    def set_size(self, username: str, size: int) -> None:
+        """
+        Records the approximate size of a user
+        :param username: The username of the user
+        :param size: The approximate size of the user in bytes
+        :return: None
+        """
+        self.total_bytes += size - self.sizes.get(username, 0)
+        self.sizes[username] = size
+        self.measured_at[username] = time.monotonic()
+
+    def forget(self, username: str) -> Any:
+        """
+        Removes a user from memory without writing it to the spill cache
+        :param username: The username of the user
+        :return: The user object, or None if the user is not in memory
+        """
+        self.last_access.pop(username, None)
+        self.measured_at.pop(username, None)
+        self.total_bytes -= self.sizes.pop(username, 0)
+        return self.entries.pop(username, None)
+
+    def evict(self, username: str) -> bool:
+        """
+        Removes a user from memory, writing it to the spill cache. The user is only evicted if no thread holds or is
+        waiting for its lock, and is encoded while holding the lock for writing.
+        :param username: The username of the user
+        :return: True if the user was evicted, False if its lock is in use
+        """
+        if self.locks is None:
+            self.spill_user(username)
+            return True
+        with self.locks.try_write(username) as acquired:
+            if acquired:
+                self.spill_user(username)
+            return acquired
+
+    def spill_user(self, username: str) -> None:
+        """
+        Removes a user from memory and writes it to the spill cache. The lock of the user must be held by the caller.
+        :param username: The username of the user
+        :return: None
+        """
+        user = self.forget(username)
+        if self.spill is not None:
+            self.spill.set(username, jsonpickle.encode(user, keys=True))
+
+    def rehydrate(self, username: str) -> Any:
+        """
+        Reads an evicted user back from the spill cache
+        :param username: The username of the user
+        :return: The user object, or None if the user was never evicted or its spilled data has expired
+        """
+        if self.spill is None:
+            return None
+        encoded = self.spill.get(username)
+        if encoded is CACHE_MISS:
+            return None
+        # The user now lives in memory again
+        self.spill.delete(username)
+        self.rehydrations += 1
+        return jsonpickle.decode(encoded, keys=True)
+
+    def is_over_limits(self) -> bool:
+        """
+        Checks if the store holds more users or bytes than its limits
+        :return: True if the store is over its user or byte limit, False otherwise
+        """
+        if len(self.entries) > max(self.max_users, 1):
+            return True
+        return self.max_bytes is not None and self.total_bytes > self.max_bytes
+
+    def enforce_limits(self) -> None:
+        """
+        Evicts users that have been idle for longer than the idle time to live, then the least recently used users until
+        the store fits within its user and byte limits. The most recently used user is never evicted, and users whose
+        lock is in use are skipped until a later call.
+        :return: None
+        """
+        cutoff = None if self.idle_ttl is None else time.monotonic() - self.idle_ttl
+        oldest = next(iter(self.entries), None)
+        expired = (
+            cutoff is not None
+            and oldest is not None
+            and self.last_access[oldest] <= cutoff
+        )
+        if len(self.entries) <= 1 or not (expired or self.is_over_limits()):
+            return
+
+        # The least recently used users are first
+        for username in list(self.entries)[:-1]:
+            expired = cutoff is not None and self.last_access[username] <= cutoff
+            if not expired and not self.is_over_limits():
+                break
+            if not self.evict(username):
+                continue
+            if expired:
+                self.expirations += 1
+            else:
+                self.evictions += 1
+
+    def get_total_bytes(self) -> int:
+        """
+        Gets the approximate number of bytes used by the users in memory, as they were last measured
+        :return: The approximate number of bytes used by the users in memory
+        """
+        return self.total_bytes
+
+    def get(self, username: str, default: Any = None) -> Any:
+        """
+        Gets the data of a user, rehydrating the user if it was evicted
+        :param username: The username of the user
+        :param default: The value returned if the user is not in the store
+        :return: The user object, or default if the user is not in the store
+        """
+        with self.lock:
+            if username in self.entries:
+                self.hits += 1
+            else:
+                self.misses += 1
+                user = self.rehydrate(username)
+                if user is None:
+                    return default
+                self.entries[username] = user
+                self.set_size(username, self.sizer(user))
+            self.touch(username)
+            self.enforce_limits()
+            user = self.entries[username]
+        # The user is measured again once the request is served
+        users = REQUEST_USERS.get()
+        if users is not None:
+            users[username] = user
+        return user
+
+    def __getitem__(self, username: str) -> Any:
+        """
+        Gets the data of a user, rehydrating the user if it was evicted
+        :param username: The username of the user
+        :return: The user object
+        """
+        user = self.get(username)
+        if user is None:
+            raise KeyError(username)
+        return user
+
+    def __setitem__(self, username: str, user: Any) -> None:
+        """
+        Sets the data of a user
+        :param username: The username of the user
+        :param user: The user object
+        :return: None
+        """
+        size = self.sizer(user)
+        with self.lock:
+            self.entries[username] = user
+            self.set_size(username, size)
+            self.touch(username)
+            # Any spilled data of the user is now stale
+            if self.spill is not None:
+                self.spill.delete(username)
+            self.enforce_limits()
+
+    def __delitem__(self, username: str) -> None:
+        """
+        Removes a user from memory and from the spill cache
+        :param username: The username of the user
+        :return: None
+        """
+        with self.lock:
+            self.forget(username)
+            if self.spill is not None:
+                self.spill.delete(username)
+
+    def __contains__(self, username: str) -> bool:
+        """
+        Checks if a user is in memory
+        :param username: The username of the user
+        :return: True if the user is in memory, False otherwise
+        """
+        with self.lock:
+            return username in self.entries
+
+    def __len__(self) -> int:
+        """
+        Gets the number of users in memory
+        :return: The number of users in memory
+        """
+        return len(self.entries)
+
+    def write_back(self, users: Dict[str, Any]) -> None:
+        """
+        Measures the users read or written while serving a request, as they may have changed in place, skipping users
+        measured less than measure_interval seconds ago. A user is measured while holding its lock for reading, then the
+        limits are enforced with the new sizes.
+        :param users: The users read or written while serving a request, keyed by username
+        :return: None
+        """
+        for username, user in users.items():
+            with self.lock:
+                if self.entries.get(username) is not user:
+                    continue
+                measured_at = self.measured_at.get(username)
+                if (
+                    measured_at is not None
+                    and time.monotonic() - measured_at < self.measure_interval
+                ):
+                    continue
+            if self.locks is None:
+                size = self.sizer(user)
+            else:
+                with self.locks.read(username):
+                    size = self.sizer(user)
+            with self.lock:
+                # The user may have been evicted or replaced while it was measured
+                if self.entries.get(username) is user:
+                    self.set_size(username, size)
+        with self.lock:
+            self.enforce_limits()
+
+    def stats(self) -> dict:
+        """
+        Gets the counters of the store
+        :return: A dictionary containing the size, limits, hits, misses, hit rate, rehydrations, evictions, expirations
+        and the approximate number of bytes used by each user
+        """
+        with self.lock:
+            total_bytes = self.get_total_bytes()
+            lookups = self.hits + self.misses
+            return {
+                "users": len(self.entries),
+                "max_users": self.max_users,
+                "bytes": total_bytes,
+                "max_bytes": self.max_bytes,
+                "average_bytes_per_user": (
+                    total_bytes / len(self.entries) if self.entries else 0
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "rehydrations": self.rehydrations,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "bytes_per_user": dict(self.sizes),
+            }
+
+
+########################################################################################################################
+# SHARED STORE
+########################################################################################################################
+
+
+class SharedSessionStore(SessionStoreInterface):
+    """
+    Keeps the data of each user in a SQLite file in write-ahead logging mode, shared by every worker process of the
+    server so that any worker can serve any request. Each user is stored with a version that is incremented whenever it
+    is written. Workers keep the users they have decoded in memory and only decode a user again when another worker
+    has written a newer version.
+
+    Endpoints modify users in place, so the users read while serving a request are written back by write_back once the
+    request is served, and only if their encoded data has changed. A user is encoded while holding its lock for reading,
+    so that it is never written back while another request of the same worker is changing it.
+
+    The version and digest of each decoded user object are tracked for as long as the object exists. Requests of the
+    same worker share the object, so each write back compares against the latest write of any of them. A user is only
+    written back if the stored version is still the one of the object, otherwise, unless the stored data is the same,
+    a SessionConflictError is raised instead of overwriting the changes of another worker.
+    """
+
+    # The path of the SQLite file
+    path: str
+    # The maximum number of decoded users each worker keeps in memory
+    max_local_users: int
+    # The number of seconds a user is kept after it was last written, None to keep users forever
+    ttl: Optional[float]
+    # The decoded users kept in memory, with their version and a digest of their encoded data, ordered from least to
+    # most recently used
+    local: "OrderedDict[str, Tuple[int, Any, bytes]]"
+    # The version and digest each decoded or written user object was last read or written at, keyed by the id of the
+    # object, removed when the object is garbage collected
+    versions: Dict[int, Tuple[int, bytes]]
+    # The connection to the SQLite file
+    connection: sqlite3.Connection
+    # Guards the connection and the users kept in memory
+    lock: threading.Lock
+    # The locks of the users, held for reading while a user is written back, None to write users back without locking
+    locks: Optional[UserLockRegistry]
+
+    def __init__(
+        self,
+        path: str,
+        max_local_users: int,
+        ttl: Optional[float] = None,
+        locks: Optional[UserLockRegistry] = None,
+    ):
+        """
+        Constructor for the SharedSessionStore class
+        :param path: The path of the SQLite file, created if it does not exist
+        :param max_local_users: The maximum number of decoded users each worker keeps in memory
+        :param ttl: The number of seconds a user is kept after it was last written, None to keep users forever
+        :param locks: The locks of the users, held for reading while a user is written back
+        """
+        self.path = path
+        self.locks = locks
+        self.max_local_users = max(1, max_local_users)
+        self.ttl = ttl
+        self.local = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.loads = 0
+        self.misses = 0
+        self.writes = 0
+        self.unchanged = 0
+        self.conflicts = 0
+        self.expirations = 0
+        self.last_purge = 0.0
+        # Create the directory of the store if it does not exist
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(
+            path, timeout=SHARED_SESSION_BUSY_TIMEOUT, check_same_thread=False
+        )
+        # Write-ahead logging lets workers read users while another worker is writing
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "username TEXT PRIMARY KEY, version INTEGER, data TEXT, last_write REAL, digest BLOB)"
+        )
+        # Stores created before the digest of each user was kept gain the column, their users have no digest until they
+        # are written again
+        columns = [
+            row[1] for row in self.connection.execute("PRAGMA table_info(sessions)")
+        ]
+        if "digest" not in columns:
+            self.connection.execute("ALTER TABLE sessions ADD COLUMN digest BLOB")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_last_write ON sessions (last_write)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def encode(user: Any) -> Tuple[str, bytes]:
+        """
+        Encodes a user
+        :param user: The user object
+        :return: The encoded user and a digest of it
+        """
+        data = jsonpickle.encode(user, keys=True)
+        return data, hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
+
+    def remember(self, username: str, version: int, user: Any, digest: bytes) -> None:
+        """
+        Keeps a decoded user in memory, forgetting the least recently used users beyond max_local_users
+        :param username: The username of the user
+        :param version: The version of the user
+        :param user: The user object
+        :param digest: The digest of the encoded user
+        :return: None
+        """
+        self.local[username] = (version, user, digest)
+        self.local.move_to_end(username)
+        while len(self.local) > self.max_local_users:
+            self.local.popitem(last=False)
+
+    def track(self, user: Any, version: int, digest: bytes) -> None:
+        """
+        Records the version and digest a user object was read or written at, for as long as the object exists
+        :param user: The user object
+        :param version: The version of the user
+        :param digest: The digest of the encoded user
+        :return: None
+        """
+        key = id(user)
+        if key not in self.versions:
+            try:
+                # Forget the object once it is garbage collected, before its id can be reused
+                weakref.finalize(user, self.versions.pop, key, None)
+            except TypeError:
+                # Objects that cannot be referenced weakly are not tracked, and are compared with the stored data
+                return
+        self.versions[key] = (version, digest)
+
+    def load(self, username: str) -> Any:
+        """
+        Gets the latest version of a user, decoding it only if the version kept in memory is stale
+        :param username: The username of the user
+        :return: The user object, or None if the user is not in the store
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT version FROM sessions WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                self.local.pop(username, None)
+                self.misses += 1
+                return None
+            cached = self.local.get(username)
+            if cached is not None and cached[0] == row[0]:
+                self.local.move_to_end(username)
+                self.hits += 1
+                return cached[1]
+            row = self.connection.execute(
+                "SELECT version, data FROM sessions WHERE username = ?", (username,)
+            ).fetchone()
+            if row is None:
+                self.local.pop(username, None)
+                self.misses += 1
+                return None
+            version, data = row
+            user = jsonpickle.decode(data, keys=True)
+            digest = hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
+            self.remember(username, version, user, digest)
+            self.track(user, version, digest)
+            self.loads += 1
+            return user
+
+    def save(self, username: str, user: Any, replace: bool = False) -> Optional[int]:
+        """
+        Writes a user to the store, incrementing its version. Unless the user is replaced, it is only written if it has
+        changed since the object was read or written, and only if the stored version is still the one of the object.
+        :param username: The username of the user
+        :param user: The user object
+        :param replace: Whether to replace the stored user whatever its version
+        :return: The version of the user in the store, or None if another worker has written different data since the
+        object was read
+        """
+        data, digest = self.encode(user)
+        now = time.time()
+        with self.lock:
+            tracked = self.versions.get(id(user))
+            if not replace and tracked is not None and tracked[1] == digest:
+                self.unchanged += 1
+                return tracked[0]
+            with self.connection:
+                if replace:
+                    self.connection.execute(
+                        "INSERT INTO sessions (username, version, data, last_write, digest) VALUES (?, 1, ?, ?, ?) "
+                        "ON CONFLICT (username) DO UPDATE SET version = version + 1, data = excluded.data, "
+                        "last_write = excluded.last_write, digest = excluded.digest",
+                        (username, data, now, digest),
+                    )
+                elif tracked is not None:
+                    # Compare and swap, the user is only written if no other worker has written it since the object was
+                    # read or written
+                    cursor = self.connection.execute(
+                        "UPDATE sessions SET version = version + 1, data = ?, last_write = ?, digest = ? "
+                        "WHERE username = ? AND version = ?",
+                        (data, now, digest, username, tracked[0]),
+                    )
+                else:
+                    # The object was not read from the store, it is only written if the user is not in the store
+                    cursor = self.connection.execute(
+                        "INSERT INTO sessions (username, version, data, last_write, digest) VALUES (?, 1, ?, ?, ?) "
+                        "ON CONFLICT (username) DO NOTHING",
+                        (username, data, now, digest),
+                    )
+                if not replace and cursor.rowcount == 0:
+                    row = self.connection.execute(
+                        "SELECT version, digest FROM sessions WHERE username = ?",
+                        (username,),
+                    ).fetchone()
+                    # The stored user already holds the same data, there is nothing to write
+                    if row is not None and row[1] == digest:
+                        self.track(user, row[0], digest)
+                        self.unchanged += 1
+                        return row[0]
+                    # The object is stale, the next read decodes the latest version
+                    cached = self.local.get(username)
+                    if cached is not None and cached[1] is user:
+                        self.local.pop(username)
+                    self.conflicts += 1
+                    return None
+                (version,) = self.connection.execute(
+                    "SELECT version FROM sessions WHERE username = ?", (username,)
+                ).fetchone()
+            self.remember(username, version, user, digest)
+            self.track(user, version, digest)
+            self.writes += 1
+            self.purge_expired(now)
+            return version
+
+    def purge_expired(self, now: float) -> None:
+        """
+        Removes the users that have not been written for longer than the time to live, at most once every
+        SHARED_SESSION_PURGE_INTERVAL seconds. The lock must be held by the caller.
+        :param now: The current time
+        :return: None
+        """
+        if self.ttl is None or now - self.last_purge < SHARED_SESSION_PURGE_INTERVAL:
+            return
+        self.last_purge = now
+        with self.connection:
+            cursor = self.connection.execute(
+                "DELETE FROM sessions WHERE last_write < ?", (now - self.ttl,)
+            )
+        self.expirations += cursor.rowcount
+
+    def get(self, username: str, default: Any = None) -> Any:
+        """
+        Gets the data of a user. Within a request, the user is read from the store once and the same object is returned
+        for the rest of the request.
+        :param username: The username of the user
+        :param default: The value returned if the user is not in the store
+        :return: The user object, or default if the user is not in the store
+        """
+        users = REQUEST_USERS.get()
+        if users is not None and username in users:
+            return users[username]
+        user = self.load(username)
+        if user is None:
+            return default
+        if users is not None:
+            users[username] = user
+        return user
+
+    def __getitem__(self, username: str) -> Any:
+        """
+        Gets the data of a user
+        :param username: The username of the user
+        :return: The user object
+        """
+        user = self.get(username)
+        if user is None:
+            raise KeyError(username)
+        return user
+
+    def __setitem__(self, username: str, user: Any) -> None:
+        """
+        Sets the data of a user, writing it to the store immediately
+        :param username: The username of the user
+        :param user: The user object
+        :return: None
+        """
+        self.save(username, user, replace=True)
+        users = REQUEST_USERS.get()
+        if users is not None:
+            users[username] = user
+
+    def __delitem__(self, username: str) -> None:
+        """
+        Removes a user from the store
+        :param username: The username of the user
+        :return: None
+        """
+        with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "DELETE FROM sessions WHERE username = ?", (username,)
+                )
+            self.local.pop(username, None)
+        users = REQUEST_USERS.get()
+        if users is not None:
+            users.pop(username, None)
+
+    def __contains__(self, username: str) -> bool:
+        """
+        Checks if a user is in the store
+        :param username: The username of the user
+        :return: True if the user is in the store, False otherwise
+        """
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT 1 FROM sessions WHERE username = ?", (username,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        """
+        Gets the number of users in the store
+        :return: The number of users in the store
+        """
+        with self.lock:
+            (count,) = self.connection.execute(
+                "SELECT COUNT(*) FROM sessions"
+            ).fetchone()
+        return count
+
+    def write_back(self, users: Dict[str, Any]) -> None:
+        """
+        Writes the users read or written while serving a request back to the store, skipping users that have not changed.
+        Each user is compared and swapped against the version of its object, users another worker has written different
+        data to since are not written.
+        :param users: The users read or written while serving a request, keyed by username
+        :return: None
+        :raises SessionConflictError: If another worker has written any of the users since they were read
+        """
+        conflicts = []
+        for username, user in users.items():
+            if self.locks is None:
+                version = self.save(username, user)
+            else:
+                with self.locks.read(username):
+                    version = self.save(username, user)
+            if version is None:
+                conflicts.append(username)
+        if conflicts:
+            raise SessionConflictError(conflicts)
+
+    def stats(self) -> dict:
+        """
+        Gets the counters of the store
+        :return: A dictionary containing the number of users in the store and in the memory of this worker, the
+        approximate number of bytes stored, the lookups answered from memory, decoded or missed, and the writes made or
+        skipped because the user had not changed or was not written because of a conflict with another worker
+        """
+        with self.lock:
+            count, total_bytes = self.connection.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM sessions"
+            ).fetchone()
+            lookups = self.hits + self.loads + self.misses
+            return {
+                "users": count,
+                "local_users": len(self.local),
+                "max_local_users": self.max_local_users,
+                "bytes": total_bytes,
+                "hits": self.hits,
+                "loads": self.loads,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "writes": self.writes,
+                "unchanged": self.unchanged,
+                "conflicts": self.conflicts,
+                "expirations": self.expirations,
+            }
@@ -0,0 +1,222 @@
+########################################################################################################################
+# climatic_station_index.py
+# This file contains the in-memory spatial index used to find the climatic stations nearest to a location.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import func
+
+from backend.Constants.location_constants import (
+    EARTH_RADIUS,
+    CLIMATIC_STATION_INDEX_REFRESH_INTERVAL,
+)
+from database.Entities.climatic_data import ClimaticData
+from database.Entities.database_connection import (
+    get_reference_session,
+    open_scoped_session,
+)
+from settings import get_settings
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def to_unit_vectors(latitudes, longitudes) -> np.ndarray:
+    """
+    Converts latitudes and longitudes to cartesian coordinates on the unit sphere
+    :param latitudes: The latitudes in degrees
+    :param longitudes: The longitudes in degrees
+    :return: An (n, 3) array of unit vectors
+    """
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    cos_latitudes = np.cos(latitudes)
+    return np.column_stack(
+        (
+            cos_latitudes * np.cos(longitudes),
+            cos_latitudes * np.sin(longitudes),
+            np.sin(latitudes),
+        )
+    )
+
+
+def chord_to_distance(chord) -> np.ndarray:
+    """
+    Converts a chord length on the unit sphere to a great circle distance on the earth's surface
+    :param chord: The chord length(s) between two unit vectors
+    :return: The great circle distance(s) in km
+    """
+    # The chord and the great circle distance are monotonically related, so the nearest neighbour by chord length is
+    # also the nearest neighbour by great circle distance
+    return 2 * EARTH_RADIUS * np.arcsin(np.clip(np.asarray(chord) / 2, 0, 1))
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class ClimaticStationIndex:
+    """
+    A KD-tree over the climatic stations in the ClimaticData table, shared by all requests. The stations are loaded
+    once and reloaded only when the table is repopulated.
+    """
+
+    # The minimum number of seconds between checks for changes to the table
+    refresh_interval: float
+    # The KD-tree over the unit sphere coordinates of the stations
+    tree: Optional[cKDTree]
+    # The climatic data entries, in the same order as the points in the tree
+    entries: List[ClimaticData]
+    # A summary of the table contents at the time the index was built
+    fingerprint: Optional[tuple]
+    # The time at which the fingerprint was last compared against the table
+    last_checked: float
+    # Guards loading and swapping the index
+    lock: threading.Lock
+
+    def __init__(
+        self,
+        refresh_interval: float = CLIMATIC_STATION_INDEX_REFRESH_INTERVAL,
+    ):
+        """
+        Constructor for the ClimaticStationIndex class
+        :param refresh_interval: The minimum number of seconds between checks for changes to the table
+        """
+        self.refresh_interval = refresh_interval
+        self.tree = None
+        self.entries = []
+        self.fingerprint = None
+        self.last_checked = 0.0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_fingerprint(controller) -> tuple:
+        """
+        Gets a cheap summary of the ClimaticData table that changes whenever the table is repopulated
+        :param controller: An open session
+        :return: The row count, maximum ID and coordinate sums of the table
+        """
+        return tuple(
+            controller.query(
+                func.count(ClimaticData.ID),
+                func.max(ClimaticData.ID),
+                func.sum(ClimaticData.Latitude),
+                func.sum(ClimaticData.Longitude),
+            ).one()
+        )
+
+    def load(self) -> None:
+        """
+        Loads every station with valid coordinates from the database and builds the KD-tree
+        :return: None
+        """
+        # The connection returns to the pool when the block ends
+        with open_scoped_session(get_reference_session()) as controller:
+            fingerprint = self.get_fingerprint(controller)
+            # TODO: manually review database to ensure all entries have a valid Latitude and Longitude
+            entries = (
+                controller.query(ClimaticData)
+                .filter(ClimaticData.Latitude.isnot(None))
+                .filter(ClimaticData.Longitude.isnot(None))
+                .order_by(ClimaticData.ID)
+                .all()
+            )
+            # Detach the entries so that they can be shared between threads once the session is closed
+            controller.expunge_all()
+
+        tree = None
+        if entries:
+            tree = cKDTree(
+                to_unit_vectors(
+                    [entry.Latitude for entry in entries],
+                    [entry.Longitude for entry in entries],
+                )
+            )
+        # Swap in the new index in a single step so that readers never see a partially built index
+        self.tree, self.entries, self.fingerprint = tree, entries, fingerprint
+        self.last_checked = time.monotonic()
+
+    def refresh(self) -> None:
+        """
+        Reloads the index if it has never been loaded or if the table has changed since it was built. The table is
+        checked at most once every refresh_interval seconds.
+        :return: None
+        """
+        if self.fingerprint is not None and (
+            time.monotonic() - self.last_checked < self.refresh_interval
+        ):
+            return
+        with self.lock:
+            # Another thread may have refreshed the index while we were waiting for the lock
+            if self.fingerprint is not None and (
+                time.monotonic() - self.last_checked < self.refresh_interval
+            ):
+                return
+            if self.fingerprint is None:
+                self.load()
+                return
+            with open_scoped_session(get_reference_session()) as controller:
+                fingerprint = self.get_fingerprint(controller)
+            if fingerprint != self.fingerprint:
+                self.load()
+            else:
+                self.last_checked = time.monotonic()
+
+    def invalidate(self) -> None:
+        """
+        Forces the index to be reloaded on its next use
+        :return: None
+        """
+        with self.lock:
+            self.fingerprint = None
+
+    def nearest(
+        self, latitude: float, longitude: float, k: int = 1
+    ) -> List[Tuple[ClimaticData, float]]:
+        """
+        Finds the k stations nearest to the given coordinates
+        :param latitude: The latitude in degrees
+        :param longitude: The longitude in degrees
+        :param k: The number of stations to return
+        :return: A list of (entry, distance in km) pairs ordered from nearest to farthest
+        """
+        self.refresh()
+        tree, entries = self.tree, self.entries
+        if tree is None:
+            return []
+        k = min(k, len(entries))
+        chords, indices = tree.query(to_unit_vectors([latitude], [longitude])[0], k=k)
+        # cKDTree returns scalars rather than arrays when k is 1
+        chords, indices = np.atleast_1d(chords), np.atleast_1d(indices)
+        distances = chord_to_distance(chords)
+        return [
+            (entries[index], float(distance))
+            for index, distance in zip(indices, distances)
+        ]
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The climatic station index shared by all requests
+CLIMATIC_STATION_INDEX = ClimaticStationIndex(
+    refresh_interval=get_settings().location.climatic_station_index_refresh_interval
+)
@@ -0,0 +1,220 @@
+########################################################################################################################
+# geocoder.py
+# This file contains the geocoder used to find the coordinates of addresses, backed by a persistent cache.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import re
+import threading
+import uuid
+from typing import Optional, Tuple
+
+from geopy import Nominatim
+from geopy.adapters import AioHTTPAdapter
+from geopy.extra.rate_limiter import AsyncRateLimiter, RateLimiter
+
+from backend.Constants.cache_constants import (
+    GEOCODE_CACHE_FILE,
+    GEOCODE_CACHE_NEGATIVE_TTL,
+)
+from backend.Entities.Cache.persistent_cache import PersistentCache, CACHE_MISS
+from config import get_file_path
+from settings import get_settings
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalizes an address so that trivially different spellings of the same address share a cache entry
+    :param address: The address to normalize
+    :return: The lowercase address with punctuation removed and whitespace collapsed
+    """
+    # Replace punctuation with spaces, keeping characters that are meaningful in addresses such as # and -
+    address = re.sub(r"[^\w#\-/ ]+", " ", address.lower())
+    # Collapse repeated whitespace
+    return " ".join(address.split())
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class Geocoder:
+    """
+    Finds the coordinates of addresses using Nominatim. Results, including failed lookups, are kept in a persistent
+    cache so that repeated addresses are answered without waiting on the rate limiter.
+    """
+
+    # The cache of geocoding results, keyed by normalized address
+    cache: PersistentCache
+    # The number of seconds a failed lookup is kept in the cache
+    negative_ttl: float
+    # The number of lookups answered from a cached failure
+    negative_hits: int
+
+    def __init__(
+        self,
+        cache: PersistentCache,
+        negative_ttl: float = GEOCODE_CACHE_NEGATIVE_TTL,
+    ):
+        """
+        Constructor for the Geocoder class
+        :param cache: The cache of geocoding results
+        :param negative_ttl: The number of seconds a failed lookup is kept in the cache
+        """
+        self.cache = cache
+        self.negative_ttl = negative_ttl
+        self.negative_hits = 0
+        self.geolocator = None
+        self.rate_limited_geocode = None
+        self.async_geolocator = None
+        self.async_rate_limited_geocode = None
+        self.lock = threading.Lock()
+
+    def get_rate_limited_geocode(self):
+        """
+        Gets the rate limited geocode function, creating the Nominatim client on first use. A single client and rate
+        limiter are shared by all requests so that the rate limit applies across the whole process.
+        :return: The rate limited geocode function
+        """
+        if self.rate_limited_geocode is None:
+            with self.lock:
+                if self.rate_limited_geocode is None:
+                    self.geolocator = Nominatim(
+                        user_agent=str(uuid.uuid4()).replace("-", "")
+                    )
+                    # Errors are raised rather than returned as a failed lookup, so that they are not cached and the
+                    # address is retried on the next request
+                    self.rate_limited_geocode = RateLimiter(
+                        self.geolocator.geocode,
+                        min_delay_seconds=1,
+                        swallow_exceptions=False,
+                    )
+        return self.rate_limited_geocode
+
+    def get_async_rate_limited_geocode(self):
+        """
+        Gets the asyncio rate limited geocode function, creating the Nominatim client on first use. It must be called
+        from inside the event loop the client is used on, and its rate limit applies across all coroutines.
+        :return: The asyncio rate limited geocode function
+        """
+        if self.async_rate_limited_geocode is None:
+            self.async_geolocator = Nominatim(
+                user_agent=str(uuid.uuid4()).replace("-", ""),
+                adapter_factory=AioHTTPAdapter,
+            )
+            # Errors are raised rather than returned as a failed lookup, as for the synchronous rate limiter
+            self.async_rate_limited_geocode = AsyncRateLimiter(
+                self.async_geolocator.geocode,
+                min_delay_seconds=1,
+                swallow_exceptions=False,
+            )
+        return self.async_rate_limited_geocode
+
+    def get_cached(self, key: str):
+        """
+        Gets the cached coordinates of a normalized address
+        :param key: The normalized address
+        :return: The cached coordinates, None for a cached failure, or CACHE_MISS if the address is not cached
+        """
+        cached = self.cache.get(key)
+        if cached is CACHE_MISS:
+            return CACHE_MISS
+        # A cached failure is stored as None
+        if cached is None:
+            self.negative_hits += 1
+            return None
+        return cached[0], cached[1]
+
+    def store(self, key: str, location_info) -> Optional[Tuple[float, float]]:
+        """
+        Caches the result of a lookup
+        :param key: The normalized address
+        :param location_info: The location returned by Nominatim, or None if the address could not be found
+        :return: The latitude and longitude of the address, or None if the address could not be found
+        """
+        # Remember failed lookups for a shorter time than successful ones
+        if location_info is None:
+            self.cache.set(key, None, ttl=self.negative_ttl)
+            return None
+
+        coordinates = (location_info.latitude, location_info.longitude)
+        self.cache.set(key, list(coordinates))
+        return coordinates
+
+    def find_coordinates(self, address: str) -> Optional[Tuple[float, float]]:
+        """
+        Finds the coordinates of an address
+        :param address: The address to geocode
+        :return: The latitude and longitude of the address, or None if the address could not be found
+        """
+        key = normalize_address(address)
+        cached = self.get_cached(key)
+        if cached is not CACHE_MISS:
+            return cached
+
+        # Errors such as timeouts are raised rather than cached, so that the address is retried on the next request
+        return self.store(key, self.get_rate_limited_geocode()(address, timeout=10))
+
+    async def find_coordinates_async(
+        self, address: str
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Finds the coordinates of an address like find_coordinates, suspending the calling coroutine instead of blocking
+        a thread while waiting on the rate limiter and Nominatim
+        :param address: The address to geocode
+        :return: The latitude and longitude of the address, or None if the address could not be found
+        """
+        key = normalize_address(address)
+        cached = self.get_cached(key)
+        if cached is not CACHE_MISS:
+            return cached
+
+        # Errors such as timeouts are raised rather than cached, so that the address is retried on the next request
+        location_info = await self.get_async_rate_limited_geocode()(address, timeout=10)
+        return self.store(key, location_info)
+
+    async def aclose(self) -> None:
+        """
+        Closes the asyncio Nominatim client, intended to be called when the application shuts down
+        :return: None
+        """
+        if self.async_geolocator is not None:
+            await self.async_geolocator.__aexit__(None, None, None)
+        self.async_geolocator = None
+        self.async_rate_limited_geocode = None
+
+    def stats(self) -> dict:
+        """
+        Gets the counters of the geocoding cache
+        :return: A dictionary containing the cache counters and the number of cached failures served
+        """
+        return {**self.cache.stats(), "negative_hits": self.negative_hits}
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The geocoder shared by all requests
+GEOCODER = Geocoder(
+    cache=PersistentCache(
+        path=get_file_path(GEOCODE_CACHE_FILE),
+        max_entries=get_settings().cache.geocode_max_entries,
+        ttl=get_settings().cache.geocode_ttl,
+    ),
+    negative_ttl=get_settings().cache.geocode_negative_ttl,
+)
@@ -12,21 +12,24 @@
 # IMPORTS
 ########################################################################################################################
 
-import json
 import re
-import uuid
-import requests
-from typing import Optional
-from geopy import Nominatim
-from geopy.extra.rate_limiter import RateLimiter
-from numpy import arcsin, sqrt, sin, cos, radians, inf
-from sqlalchemy.orm import sessionmaker
+from typing import Optional, Tuple
+from numpy import arcsin, sqrt, sin, cos, radians
+from sqlalchemy import select
 from backend.Constants.location_constants import EARTH_RADIUS
 from backend.Constants.seismic_constants import SiteClass, SiteDesignation
-from database.Constants.connection_constants import PrivilegeType
+from backend.Entities.Location.climatic_station_index import CLIMATIC_STATION_INDEX
+from backend.Entities.Location.geocoder import GEOCODER
+from backend.Entities.Location.postal_code_index import POSTAL_CODE_INDEX
+from backend.Entities.Location.seismic_hazard_client import SEISMIC_HAZARD_CLIENT
 from database.Entities.canadian_postal_code_data import CanadianPostalCodeData
 from database.Entities.climatic_data import ClimaticData
-from database.Entities.database_connection import DatabaseConnection
+from database.Entities.database_connection import (
+    get_async_reference_session,
+    get_reference_session,
+    open_scoped_session,
+)
+from database.Entities.postal_code_climatic_station import PostalCodeClimaticStation
 
 
 ########################################################################################################################
@@ -56,6 +59,43 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return distance
 
 
+def extract_postal_code(address: str) -> Optional[str]:
+    """
+    Extracts a canadian postal code from an address, also detecting postal codes with no space
+    :param address: The address
+    :return: The postal code in the format A1A 1A1, or None if the address does not contain one
+    """
+    postal_code = re.search(r"\b[A-Za-z]\d[A-Za-z][ -]?\d[A-Za-z]\d\b", address)
+    if not postal_code:
+        return None
+    # capitalize all letters in the postal code
+    postal_code = postal_code.group(0).upper()
+    # ensure that there is a space between the first 3 characters and the last 3 characters
+    if len(postal_code) == 6:
+        postal_code = postal_code[:3] + " " + postal_code[3:]
+    return postal_code
+
+
+def select_postal_code_climatic_data(postal_code: str):
+    """
+    Builds the query for the coordinates and climatic data of a postal code, a single indexed lookup of the postal code
+    joined with its precomputed nearest climatic station
+    :param postal_code: The postal code in the format A1A 1A1
+    :return: The query
+    """
+    return (
+        select(
+            PostalCodeClimaticStation.latitude,
+            PostalCodeClimaticStation.longitude,
+            ClimaticData.HourlyWindPressures_kPa_1_50,
+            ClimaticData.SnowLoad_kPa_1_50_Sr,
+            ClimaticData.SnowLoad_kPa_1_50_Ss,
+        )
+        .join(ClimaticData, ClimaticData.ID == PostalCodeClimaticStation.climatic_id)
+        .where(PostalCodeClimaticStation.postal_code == postal_code)
+    )
+
+
 ########################################################################################################################
 # MAIN CLASS
 ########################################################################################################################
@@ -118,130 +158,190 @@ class Location:
         address = self.address
 
         # extract canadian postal code from address using regex, if it exists
-        # also detect postal codes with no space
-        postal_code = re.search(r"\b[A-Za-z]\d[A-Za-z][ -]?\d[A-Za-z]\d\b", address)
-        if postal_code:
-            postal_code = postal_code.group(0)
-            # capitalize all letters in the postal code
-            postal_code = postal_code.upper()
-            # ensure that there is a space between the first 3 characters and the last 3 characters
-            if len(postal_code) == 6:
-                postal_code = postal_code[:3] + " " + postal_code[3:]
-            # get the data from the database
-            database = DatabaseConnection(database_name="NBCC-2020")
-            engine = database.get_engine(privilege=PrivilegeType.ADMIN)
-            session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-            controller = session()
-            location_info = (
-                controller.query(CanadianPostalCodeData)
-                .filter_by(postal_code=postal_code)
-                .first()
-            )
+        postal_code = extract_postal_code(address)
+        coordinates = POSTAL_CODE_INDEX.find(postal_code) if postal_code else None
+        if coordinates is not None:
+            # The memory-mapped postal code index answers without querying the database
+            self.latitude, self.longitude = coordinates
+        elif postal_code:
+            # get the data from the reference database using the shared connection pool, the connection returns to the
+            # pool when the block ends
+            with open_scoped_session(get_reference_session()) as controller:
+                # The precomputed station of the postal code gives the climatic data in the same lookup
+                climatic_info = controller.execute(
+                    select_postal_code_climatic_data(postal_code)
+                ).first()
+                if climatic_info is not None:
+                    self.set_postal_code_climatic_data(climatic_info)
+                    return
+                location_info = (
+                    controller.query(CanadianPostalCodeData)
+                    .filter_by(postal_code=postal_code)
+                    .first()
+                )
             self.latitude = location_info.latitude
             self.longitude = location_info.longitude
         else:
-            geolocator = Nominatim(user_agent=str(uuid.uuid4()).replace("-", ""))
-            geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-            location_info = geocode(address, timeout=10)
+            # Geocode the address, repeated addresses are answered from the geocoding cache
+            coordinates = GEOCODER.find_coordinates(address)
 
             # Ensure function is given a valid location
             # TODO: Make custom error for this
-            assert location_info is not None
+            assert coordinates is not None
 
             # Set the latitude and longitude
-            self.latitude = location_info.latitude
-            self.longitude = location_info.longitude
+            self.latitude, self.longitude = coordinates
 
             # Test current longitude and latitude format and sigfig
             # print("\nLat: ", self.latitude, "\nLong: ", self.longitude, "\n")
 
+    async def find_coordinates_async(self):
+        """
+        Finds the latitude and longitude of the location using the address like find_coordinates, suspending the
+        calling coroutine instead of blocking a thread while waiting on the database or the geocoder
+        :return: None
+        """
+        assert self.address is not None
+        address = self.address
+
+        # extract canadian postal code from address using regex, if it exists
+        postal_code = extract_postal_code(address)
+        coordinates = POSTAL_CODE_INDEX.find(postal_code) if postal_code else None
+        if coordinates is not None:
+            # The memory-mapped postal code index answers without querying the database
+            self.latitude, self.longitude = coordinates
+        elif postal_code:
+            # get the data from the reference database using the shared asyncio connection pool
+            session = get_async_reference_session()
+            async with session() as controller:
+                # The precomputed station of the postal code gives the climatic data in the same lookup
+                result = await controller.execute(
+                    select_postal_code_climatic_data(postal_code)
+                )
+                climatic_info = result.first()
+                if climatic_info is not None:
+                    self.set_postal_code_climatic_data(climatic_info)
+                    return
+                result = await controller.execute(
+                    select(CanadianPostalCodeData)
+                    .filter_by(postal_code=postal_code)
+                    .limit(1)
+                )
+                location_info = result.scalars().first()
+            self.latitude = location_info.latitude
+            self.longitude = location_info.longitude
+        else:
+            # Geocode the address, repeated addresses are answered from the geocoding cache
+            coordinates = await GEOCODER.find_coordinates_async(address)
+
+            # Ensure function is given a valid location
+            # TODO: Make custom error for this
+            assert coordinates is not None
+
+            # Set the latitude and longitude
+            self.latitude, self.longitude = coordinates
+
     def get_seismic_data_xv(self):
         """
         Fetches the seismic data from the NBCC 2020 Seismic Hazard Tool API using the XV site designation
         :return:
         """
-        # The url of the API
-        url = "https://www.earthquakescanada.nrcan.gc.ca/api/canshm/graphql"
-
-        # The payload and headers containing the data we want to use in our POST request
-        payload = f'{{"query":"query{{\\n NBC2020(latitude: {self.latitude}, longitude: {self.longitude}){{\\n X148: siteDesignationsXv(vs30: {self.xv}, poe50: [2.0]){{\\n sa0p2\\n sa1p0\\n }}\\n }}\\n}}","variables":{{}}}}'
-        headers = {"Content-Type": "application/json"}
+        data = SEISMIC_HAZARD_CLIENT.fetch(
+            self.latitude, self.longitude, SiteDesignation.XV, self.xv
+        )
 
-        # The response received from the POST request
-        response = requests.request("POST", url, headers=headers, data=payload)
+        # Assign the data to the attributes
+        self.design_spectral_acceleration_0_2 = data.get("sa0p2")
+        self.design_spectral_acceleration_1 = data.get("sa1p0")
 
-        # Convert the data to json
-        data = json.loads(response.text)
+    async def get_seismic_data_xv_async(self):
+        """
+        Fetches the seismic data using the XV site designation without blocking the event loop
+        :return:
+        """
+        data = await SEISMIC_HAZARD_CLIENT.fetch_async(
+            self.latitude, self.longitude, SiteDesignation.XV, self.xv
+        )
 
         # Assign the data to the attributes
-        self.design_spectral_acceleration_0_2 = (
-            data.get("data", {}).get("NBC2020", {}).get("X148", [{}])[0].get("sa0p2")
-        )
-        self.design_spectral_acceleration_1 = (
-            data.get("data", {}).get("NBC2020", {}).get("X148", [{}])[0].get("sa1p0")
-        )
+        self.design_spectral_acceleration_0_2 = data.get("sa0p2")
+        self.design_spectral_acceleration_1 = data.get("sa1p0")
 
     def get_seismic_data_xs(self):
         """
         Fetches the seismic data from the NBCC 2020 Seismic Hazard Tool API using the XS site designation
         :return:
         """
-        # The url of the API
-        url = "https://www.earthquakescanada.nrcan.gc.ca/api/canshm/graphql"
-
-        # The payload and headers containing the data we want to use in our POST request
-        payload = f'{{"query":"query{{\\n NBC2020(latitude: {self.latitude}, longitude: {self.longitude}){{\\n XC: siteDesignationsXs(siteClass: C, poe50: [2.0]){{\\n sa0p2\\n sa1p0\\n }}\\n }}\\n}}","variables":{{}}}}'
-        headers = {"Content-Type": "application/json"}
-
-        # The response received from the POST request
-        response = requests.request("POST", url, headers=headers, data=payload)
+        site_class = self.xs if self.xs is not None else SiteClass.C
+        data = SEISMIC_HAZARD_CLIENT.fetch(
+            self.latitude, self.longitude, SiteDesignation.XS, site_class
+        )
 
-        # Convert the data to json
-        data = json.loads(response.text)
+        # Assign the data to the attributes
+        self.design_spectral_acceleration_0_2 = data["sa0p2"]
+        self.design_spectral_acceleration_1 = data["sa1p0"]
 
-        # example data
-        # {'data': {'NBC2020': {'XC': [{'sa0p2': 0.658, 'sa1p0': 0.209}]}}}
+    async def get_seismic_data_xs_async(self):
+        """
+        Fetches the seismic data using the XS site designation without blocking the event loop
+        :return:
+        """
+        site_class = self.xs if self.xs is not None else SiteClass.C
+        data = await SEISMIC_HAZARD_CLIENT.fetch_async(
+            self.latitude, self.longitude, SiteDesignation.XS, site_class
+        )
 
         # Assign the data to the attributes
-        self.design_spectral_acceleration_0_2 = data["data"]["NBC2020"]["XC"][0][
-            "sa0p2"
-        ]
-        self.design_spectral_acceleration_1 = data["data"]["NBC2020"]["XC"][0]["sa1p0"]
+        self.design_spectral_acceleration_0_2 = data["sa0p2"]
+        self.design_spectral_acceleration_1 = data["sa1p0"]
 
-    def get_climatic_data(self):
+    def set_postal_code_climatic_data(self, climatic_info):
         """
-        Fetches the climatic data from the database
+        Sets the coordinates and climatic data of the location from the precomputed station of its postal code
+        :param climatic_info: A row of the query built by select_postal_code_climatic_data
         :return: None
         """
-        # Connect to the database
-        database = DatabaseConnection(database_name="NBCC-2020")
-        engine = database.get_engine(privilege=PrivilegeType.ADMIN)
-        session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-        controller = session()
+        (
+            self.latitude,
+            self.longitude,
+            self.wind_velocity_pressure,
+            self.snow_load,
+            self.rain_load,
+        ) = climatic_info
+
+    def find_climatic_data(self) -> Tuple[float, float, float]:
+        """
+        Finds the climatic data of the nearest climatic station using the shared climatic station index, unless it was
+        already found along with the coordinates of the postal code. The location is not modified.
+        :return: The wind velocity pressure, snow load and rain load of the location
+        """
+        if None not in (self.wind_velocity_pressure, self.snow_load, self.rain_load):
+            return self.wind_velocity_pressure, self.snow_load, self.rain_load
 
         # Get the climatic data of the closest location in the database
-        # Future: This can be optimized using PostGIS extension for PostgreSQL
-        min_distance = inf
-        min_entry = None
-        # Iterate through all entries in the database (small enough that we can do this until we optimize code)
-        for entry in controller.query(ClimaticData).all():
-            # TODO: manually review database to ensure all entries have a valid Latitude and Longitude
-            if entry.Latitude is None or entry.Longitude is None:
-                continue
-            distance = haversine_distance(
-                entry.Latitude, entry.Longitude, self.latitude, self.longitude
-            )
-            if distance < min_distance:
-                min_distance = distance
-                min_entry = entry
-            # if this threshold is met, it is close enough and we can stop searching
-            if distance < 10:
-                break
+        nearest = CLIMATIC_STATION_INDEX.nearest(self.latitude, self.longitude, k=1)
+        # TODO: Make custom error for this
+        assert nearest, "No climatic stations with valid coordinates were found"
+        min_entry, _ = nearest[0]
+
+        return (
+            min_entry.HourlyWindPressures_kPa_1_50,
+            min_entry.SnowLoad_kPa_1_50_Sr,
+            min_entry.SnowLoad_kPa_1_50_Ss,
+        )
 
+    def get_climatic_data(self):
+        """
+        Fetches the climatic data of the nearest climatic station using the shared climatic station index, unless it
+        was already found along with the coordinates of the postal code
+        :return: None
+        """
         # Set the climatic attributes
-        self.wind_velocity_pressure = min_entry.HourlyWindPressures_kPa_1_50
-        self.snow_load = min_entry.SnowLoad_kPa_1_50_Sr
-        self.rain_load = min_entry.SnowLoad_kPa_1_50_Ss
+        (
+            self.wind_velocity_pressure,
+            self.snow_load,
+            self.rain_load,
+        ) = self.find_climatic_data()
 
     def __str__(self):
         """
@@ -283,10 +383,21 @@ class LocationBuilderInterface:
     def set_coordinates(self):
         pass
 
+    async def set_coordinates_async(self):
+        pass
+
     def set_seismic_data(self):
         pass
 
-    def set_climatic_data(self):
+    async def set_seismic_data_async(self):
+        pass
+
+    def find_climatic_data(self) -> Tuple[float, float, float]:
+        pass
+
+    def set_climatic_data(
+        self, climatic_data: Optional[Tuple[float, float, float]] = None
+    ):
         pass
 
     def get_address(self) -> str:
@@ -359,6 +470,14 @@ class LocationXvBuilder:
         assert self.location.address is not None
         self.location.find_coordinates()
 
+    async def set_coordinates_async(self):
+        """
+        Finds the latitude and longitude of the location using the address without blocking the event loop
+        :return: None
+        """
+        assert self.location.address is not None
+        await self.location.find_coordinates_async()
+
     def set_seismic_data(self, xv: int):
         """
         Sets the seismic data of the location using the XV site designation
@@ -369,15 +488,42 @@ class LocationXvBuilder:
         self.location.xv = xv
         self.location.get_seismic_data_xv()
 
-    def set_climatic_data(self):
+    async def set_seismic_data_async(self, xv: int):
         """
-        Fetches the climatic data from the database
+        Sets the seismic data of the location using the XV site designation without blocking the event loop
+        :param xv: The Vs30 value
         :return: None
         """
+        self.location.site_designation = SiteDesignation.XV
+        self.location.xv = xv
+        await self.location.get_seismic_data_xv_async()
+
+    def find_climatic_data(self) -> Tuple[float, float, float]:
+        """
+        Fetches the climatic data from the database without setting it, so that a search abandoned in a worker thread
+        never modifies the location
+        :return: The wind velocity pressure, snow load and rain load of the location
+        """
         assert self.location.address is not None
         assert self.location.latitude is not None
         assert self.location.longitude is not None
-        self.location.get_climatic_data()
+        return self.location.find_climatic_data()
+
+    def set_climatic_data(
+        self, climatic_data: Optional[Tuple[float, float, float]] = None
+    ):
+        """
+        Sets the climatic data of the location, fetching it from the database unless it is given
+        :param climatic_data: The wind velocity pressure, snow load and rain load returned by find_climatic_data
+        :return: None
+        """
+        if climatic_data is None:
+            climatic_data = self.find_climatic_data()
+        (
+            self.location.wind_velocity_pressure,
+            self.location.snow_load,
+            self.location.rain_load,
+        ) = climatic_data
 
     def get_address(self) -> str:
         """
@@ -495,6 +641,14 @@ class LocationXsBuilder:
         assert self.location.address is not None
         self.location.find_coordinates()
 
+    async def set_coordinates_async(self):
+        """
+        Finds the latitude and longitude of the location using the address without blocking the event loop
+        :return: None
+        """
+        assert self.location.address is not None
+        await self.location.find_coordinates_async()
+
     def set_seismic_data(self, xs: SiteClass):
         """
         The seismic data of the location using the XS site designation
@@ -505,15 +659,42 @@ class LocationXsBuilder:
         self.location.xs = xs
         self.location.get_seismic_data_xs()
 
-    def set_climatic_data(self):
+    async def set_seismic_data_async(self, xs: SiteClass):
         """
-        Fetches the climatic data from the database
+        Sets the seismic data of the location using the XS site designation without blocking the event loop
+        :param xs: The site class
         :return: None
         """
+        self.location.site_designation = SiteDesignation.XS
+        self.location.xs = xs
+        await self.location.get_seismic_data_xs_async()
+
+    def find_climatic_data(self) -> Tuple[float, float, float]:
+        """
+        Fetches the climatic data from the database without setting it, so that a search abandoned in a worker thread
+        never modifies the location
+        :return: The wind velocity pressure, snow load and rain load of the location
+        """
         assert self.location.address is not None
         assert self.location.latitude is not None
         assert self.location.longitude is not None
-        self.location.get_climatic_data()
+        return self.location.find_climatic_data()
+
+    def set_climatic_data(
+        self, climatic_data: Optional[Tuple[float, float, float]] = None
+    ):
+        """
+        Sets the climatic data of the location, fetching it from the database unless it is given
+        :param climatic_data: The wind velocity pressure, snow load and rain load returned by find_climatic_data
+        :return: None
+        """
+        if climatic_data is None:
+            climatic_data = self.find_climatic_data()
+        (
+            self.location.wind_velocity_pressure,
+            self.location.snow_load,
+            self.location.rain_load,
+        ) = climatic_data
 
     def get_address(self) -> str:
         """
@@ -0,0 +1,224 @@
+########################################################################################################################
+# location_pipeline.py
+# This file contains the pipeline used to resolve a location. Once the coordinates of the address are known, the
+# climatic and seismic lookups only depend on them and not on each other, so they run concurrently.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import asyncio
+import time
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from backend.Constants.location_constants import (
+    LOCATION_COORDINATES_TIMEOUT,
+    LOCATION_CLIMATIC_TIMEOUT,
+    LOCATION_SEISMIC_TIMEOUT,
+)
+from backend.Constants.seismic_constants import SiteClass
+from backend.Entities.Location.location import (
+    Location,
+    LocationBuilderInterface,
+)
+from settings import get_settings
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# The stage finished
+STAGE_COMPLETE = "complete"
+# The stage did not finish within its timeout
+STAGE_TIMEOUT = "timeout"
+# The stage raised an error
+STAGE_FAILED = "failed"
+# The stage did not run since a stage it depends on did not complete
+STAGE_SKIPPED = "skipped"
+
+
+########################################################################################################################
+# STAGE CLASS
+########################################################################################################################
+
+
+class LocationStage:
+    """
+    The outcome of a stage of the location pipeline
+    """
+
+    # The name of the stage
+    name: str
+    # The status of the stage, one of the STAGE_* constants
+    status: str
+    # The number of seconds the stage took
+    elapsed: float
+    # The error raised by the stage, if any
+    error: Optional[BaseException]
+    # The value returned by the stage, None if it did not finish
+    result: Any
+
+    def __init__(
+        self,
+        name: str,
+        status: str,
+        elapsed: float = 0.0,
+        error: Optional[BaseException] = None,
+        result: Any = None,
+    ):
+        """
+        Constructor for the LocationStage class
+        :param name: The name of the stage
+        :param status: The status of the stage
+        :param elapsed: The number of seconds the stage took
+        :param error: The error raised by the stage, if any
+        :param result: The value returned by the stage, None if it did not finish
+        """
+        self.name = name
+        self.status = status
+        self.elapsed = elapsed
+        self.error = error
+        self.result = result
+
+    def is_complete(self) -> bool:
+        """
+        Checks whether the stage finished
+        :return: True if the stage finished, False otherwise
+        """
+        return self.status == STAGE_COMPLETE
+
+    def to_dict(self) -> dict:
+        """
+        Gets a report of the stage
+        :return: A dictionary containing the status, elapsed time and error message of the stage
+        """
+        return {
+            "status": self.status,
+            "elapsed": round(self.elapsed, 3),
+            "error": None if self.error is None else str(self.error),
+        }
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class LocationPipeline:
+    """
+    Resolves a location in two steps. The coordinates are found first, then the climatic and seismic data are fetched
+    concurrently, so the latency is that of the slower lookup rather than the sum of both. Every stage has its own
+    timeout, and a failed climatic or seismic stage leaves the other one's data in place.
+    """
+
+    # The number of seconds to wait for the coordinates
+    coordinates_timeout: float
+    # The number of seconds to wait for the climatic data
+    climatic_timeout: float
+    # The number of seconds to wait for the seismic data
+    seismic_timeout: float
+
+    def __init__(
+        self,
+        coordinates_timeout: float = LOCATION_COORDINATES_TIMEOUT,
+        climatic_timeout: float = LOCATION_CLIMATIC_TIMEOUT,
+        seismic_timeout: float = LOCATION_SEISMIC_TIMEOUT,
+    ):
+        """
+        Constructor for the LocationPipeline class
+        :param coordinates_timeout: The number of seconds to wait for the coordinates
+        :param climatic_timeout: The number of seconds to wait for the climatic data
+        :param seismic_timeout: The number of seconds to wait for the seismic data
+        """
+        self.coordinates_timeout = coordinates_timeout
+        self.climatic_timeout = climatic_timeout
+        self.seismic_timeout = seismic_timeout
+
+    @staticmethod
+    async def run_stage(
+        name: str, awaitable: Awaitable, timeout: float
+    ) -> LocationStage:
+        """
+        Runs a stage, recording its outcome instead of raising
+        :param name: The name of the stage
+        :param awaitable: The work of the stage
+        :param timeout: The number of seconds to wait for the stage
+        :return: The outcome of the stage, with the value returned by its work if it finished
+        """
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(awaitable, timeout=timeout)
+            return LocationStage(
+                name, STAGE_COMPLETE, time.perf_counter() - start, result=result
+            )
+        except asyncio.TimeoutError:
+            error = TimeoutError(f"{name} lookup timed out after {timeout} seconds")
+            return LocationStage(
+                name, STAGE_TIMEOUT, time.perf_counter() - start, error
+            )
+        except Exception as e:
+            return LocationStage(name, STAGE_FAILED, time.perf_counter() - start, e)
+
+    async def resolve(
+        self,
+        location_builder: LocationBuilderInterface,
+        seismic_value: int | SiteClass,
+    ) -> Tuple[Location, Dict[str, LocationStage]]:
+        """
+        Resolves the coordinates, climatic data and seismic data of a location whose address has been set
+        :param location_builder: The builder of the location, with the address set
+        :param seismic_value: The Vs30 value or site class of the location
+        :return: The location, possibly partially resolved, and the outcome of each stage
+        """
+        coordinates = await self.run_stage(
+            "coordinates",
+            location_builder.set_coordinates_async(),
+            self.coordinates_timeout,
+        )
+        if not coordinates.is_complete():
+            return location_builder.get_location(), {
+                "coordinates": coordinates,
+                "climatic": LocationStage("climatic", STAGE_SKIPPED),
+                "seismic": LocationStage("seismic", STAGE_SKIPPED),
+            }
+
+        # The climatic station index may have to be loaded from the database, so it is searched in a worker thread.
+        # A timed out search is abandoned rather than interrupted, so the search only returns the climatic data, which
+        # is set on the location once it has finished in time.
+        climatic, seismic = await asyncio.gather(
+            self.run_stage(
+                "climatic",
+                asyncio.to_thread(location_builder.find_climatic_data),
+                self.climatic_timeout,
+            ),
+            self.run_stage(
+                "seismic",
+                location_builder.set_seismic_data_async(seismic_value),
+                self.seismic_timeout,
+            ),
+        )
+        if climatic.is_complete():
+            location_builder.set_climatic_data(climatic.result)
+        return location_builder.get_location(), {
+            "coordinates": coordinates,
+            "climatic": climatic,
+            "seismic": seismic,
+        }
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The location pipeline shared by all requests
+LOCATION_PIPELINE = LocationPipeline(
+    coordinates_timeout=get_settings().location.coordinates_timeout,
+    climatic_timeout=get_settings().location.climatic_timeout,
+    seismic_timeout=get_settings().location.seismic_timeout,
+)
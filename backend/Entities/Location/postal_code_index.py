@@ -0,0 +1,317 @@
+########################################################################################################################
+# postal_code_index.py
+# This file contains the memory-mapped index used to find the coordinates of a canadian postal code without querying
+# the database. The index is built from the postal code CSV and rebuilt whenever the CSV changes.
+#
+# Usage: python -m backend.Entities.Location.postal_code_index
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import csv
+import os
+import struct
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from backend.Constants.cache_constants import POSTAL_CODE_INDEX_FILE
+from backend.Constants.location_constants import (
+    POSTAL_CODE_CSV_FILE,
+    POSTAL_CODE_INDEX_REFRESH_INTERVAL,
+)
+from config import get_file_path
+from settings import get_settings
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# Identifies a postal code index file and the version of its layout
+INDEX_MAGIC = b"PCINDEX1"
+# The layout of the header: magic, number of postal codes, size and modification time of the CSV it was built from
+INDEX_HEADER = struct.Struct("<8sQqq")
+# The number of characters in a postal code without its space
+KEY_LENGTH = 6
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def to_key(postal_code: str) -> bytes:
+    """
+    Converts a postal code to the key it is stored under in the index
+    :param postal_code: The postal code, with or without a space
+    :return: The six uppercase characters of the postal code
+    """
+    return postal_code.replace(" ", "").upper().encode("ascii", errors="replace")
+
+
+def get_source_signature(path: str) -> Optional[Tuple[int, int]]:
+    """
+    Gets a cheap summary of a file that changes whenever the file is replaced or modified
+    :param path: The path of the file
+    :return: The size and modification time in nanoseconds of the file, or None if it does not exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def get_layout(count: int) -> Tuple[int, int, int]:
+    """
+    Gets the offsets of the arrays in an index file, the coordinate arrays are aligned to 4 bytes
+    :param count: The number of postal codes in the index
+    :return: The offsets of the keys, latitudes and longitudes
+    """
+    keys_offset = INDEX_HEADER.size
+    latitudes_offset = keys_offset + count * KEY_LENGTH
+    latitudes_offset += -latitudes_offset % 4
+    longitudes_offset = latitudes_offset + count * 4
+    return keys_offset, latitudes_offset, longitudes_offset
+
+
+def build_postal_code_index(csv_path: str, index_path: str) -> int:
+    """
+    Builds an index file from the postal code CSV. The file holds the sorted postal codes followed by their latitudes
+    and longitudes as float32, and replaces any existing index in a single step.
+    :param csv_path: The path of the postal code CSV
+    :param index_path: The path of the index file
+    :return: The number of postal codes in the index
+    """
+    # Read the signature first, so that a CSV modified while it is being read is detected as stale
+    signature = get_source_signature(csv_path)
+    assert signature is not None, f"Postal code CSV {csv_path} does not exist"
+
+    coordinates = {}
+    with open(csv_path, "r") as csv_file:
+        # Skip first line, header line and not data
+        next(csv_file)
+        for row in csv.reader(csv_file):
+            try:
+                key = to_key(row[0])
+                latitude, longitude = float(row[4]), float(row[5])
+            except (IndexError, ValueError):
+                continue
+            # Keep the first entry of postal codes listed more than once, like the database lookup
+            if len(key) == KEY_LENGTH:
+                coordinates.setdefault(key, (latitude, longitude))
+
+    keys = np.array(sorted(coordinates), dtype=f"S{KEY_LENGTH}")
+    latitudes = np.array([coordinates[key][0] for key in keys], dtype="<f4")
+    longitudes = np.array([coordinates[key][1] for key in keys], dtype="<f4")
+    keys_offset, latitudes_offset, longitudes_offset = get_layout(len(keys))
+
+    os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    # Write to a temporary file first so that readers never see a partially written index
+    temporary_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(INDEX_HEADER.pack(INDEX_MAGIC, len(keys), *signature))
+        file.write(keys.tobytes())
+        file.write(b"\0" * (latitudes_offset - keys_offset - keys.nbytes))
+        file.write(latitudes.tobytes())
+        file.write(longitudes.tobytes())
+    os.replace(temporary_path, index_path)
+    return len(keys)
+
+
+def read_header(index_path: str) -> Optional[Tuple[int, Tuple[int, int]]]:
+    """
+    Reads the header of an index file
+    :param index_path: The path of the index file
+    :return: The number of postal codes and the signature of the CSV the index was built from, or None if the file
+    does not exist or is not a valid index
+    """
+    try:
+        with open(index_path, "rb") as file:
+            header = file.read(INDEX_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != INDEX_HEADER.size:
+        return None
+    magic, count, size, mtime = INDEX_HEADER.unpack(header)
+    if magic != INDEX_MAGIC:
+        return None
+    return count, (size, mtime)
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class PostalCodeIndex:
+    """
+    A read-only index of the coordinates of every canadian postal code, memory-mapped from a file so that lookups are
+    a binary search over pages loaded on demand by the operating system. The index is shared by all requests and
+    processes, and is rebuilt when the postal code CSV changes.
+    """
+
+    # The path of the postal code CSV
+    csv_path: str
+    # The path of the index file
+    index_path: str
+    # The minimum number of seconds between checks for changes to the CSV
+    refresh_interval: float
+    # The sorted postal codes, the latitudes and the longitudes, or None if no index is available
+    arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]
+    # The signature of the CSV the mapped index was built from
+    signature: Optional[Tuple[int, int]]
+    # The time at which the CSV was last checked for changes
+    last_checked: Optional[float]
+    # Guards building and swapping the index
+    lock: threading.Lock
+
+    def __init__(
+        self,
+        csv_path: str = get_file_path(POSTAL_CODE_CSV_FILE),
+        index_path: str = get_file_path(POSTAL_CODE_INDEX_FILE),
+        refresh_interval: float = POSTAL_CODE_INDEX_REFRESH_INTERVAL,
+    ):
+        """
+        Constructor for the PostalCodeIndex class, the index is mapped on its first use
+        :param csv_path: The path of the postal code CSV
+        :param index_path: The path of the index file
+        :param refresh_interval: The minimum number of seconds between checks for changes to the CSV
+        """
+        self.csv_path = csv_path
+        self.index_path = index_path
+        self.refresh_interval = refresh_interval
+        self.arrays = None
+        self.signature = None
+        self.last_checked = None
+        self.lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        Maps the index file, building it first if it is missing or was built from a different version of the CSV. An
+        existing index is used as is when the CSV is not available.
+        :return: None
+        """
+        source_signature = get_source_signature(self.csv_path)
+        header = read_header(self.index_path)
+        if source_signature is not None and (
+            header is None or header[1] != source_signature
+        ):
+            build_postal_code_index(self.csv_path, self.index_path)
+            header = read_header(self.index_path)
+        if header is None:
+            self.arrays, self.signature = None, None
+            return
+
+        count, signature = header
+        keys_offset, latitudes_offset, longitudes_offset = get_layout(count)
+        arrays = None
+        if count > 0:
+            arrays = (
+                np.memmap(
+                    self.index_path,
+                    dtype=f"S{KEY_LENGTH}",
+                    mode="r",
+                    offset=keys_offset,
+                    shape=(count,),
+                ),
+                np.memmap(
+                    self.index_path,
+                    dtype="<f4",
+                    mode="r",
+                    offset=latitudes_offset,
+                    shape=(count,),
+                ),
+                np.memmap(
+                    self.index_path,
+                    dtype="<f4",
+                    mode="r",
+                    offset=longitudes_offset,
+                    shape=(count,),
+                ),
+            )
+        # Swap in the new index in a single step so that readers never see a partially mapped index, the replaced
+        # mapping stays valid until no reader holds it
+        self.arrays, self.signature = arrays, signature
+
+    def refresh(self) -> None:
+        """
+        Maps the index if it has never been mapped, and rebuilds it if the CSV has changed since it was built. The CSV
+        is checked at most once every refresh_interval seconds.
+        :return: None
+        """
+        if self.last_checked is not None and (
+            time.monotonic() - self.last_checked < self.refresh_interval
+        ):
+            return
+        with self.lock:
+            # Another thread may have refreshed the index while we were waiting for the lock
+            if self.last_checked is not None and (
+                time.monotonic() - self.last_checked < self.refresh_interval
+            ):
+                return
+            source_signature = get_source_signature(self.csv_path)
+            if self.last_checked is None or (
+                source_signature is not None and source_signature != self.signature
+            ):
+                self.load()
+            self.last_checked = time.monotonic()
+
+    def find(self, postal_code: str) -> Optional[Tuple[float, float]]:
+        """
+        Finds the coordinates of a postal code
+        :param postal_code: The postal code, with or without a space
+        :return: The latitude and longitude of the postal code, or None if it is not in the index or no index is
+        available
+        """
+        self.refresh()
+        arrays = self.arrays
+        if arrays is None:
+            return None
+        keys, latitudes, longitudes = arrays
+        key = to_key(postal_code)
+        i = int(np.searchsorted(keys, key))
+        if i < len(keys) and keys[i] == key:
+            return float(latitudes[i]), float(longitudes[i])
+        return None
+
+    def stats(self) -> dict:
+        """
+        Gets the state of the index
+        :return: A dictionary containing the number of postal codes in the index and the path of the index file
+        """
+        arrays = self.arrays
+        return {
+            "entries": 0 if arrays is None else len(arrays[0]),
+            "path": self.index_path,
+        }
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The postal code index shared by all requests
+POSTAL_CODE_INDEX = PostalCodeIndex(
+    refresh_interval=get_settings().location.postal_code_index_refresh_interval
+)
+
+
+########################################################################################################################
+# MAIN
+########################################################################################################################
+
+if __name__ == "__main__":
+    num_postal_codes = build_postal_code_index(
+        POSTAL_CODE_INDEX.csv_path, POSTAL_CODE_INDEX.index_path
+    )
+    print(f"Indexed {num_postal_codes} postal codes in {POSTAL_CODE_INDEX.index_path}")
@@ -0,0 +1,319 @@
+########################################################################################################################
+# seismic_hazard_client.py
+# This file contains the client used to fetch design spectral accelerations from the NBCC 2020 Seismic Hazard Tool API.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.Constants.cache_constants import (
+    SEISMIC_HAZARD_CACHE_FILE,
+    SEISMIC_HAZARD_COORDINATE_PRECISION,
+)
+from backend.Constants.seismic_constants import SiteClass, SiteDesignation
+from backend.Entities.Cache.persistent_cache import PersistentCache, CACHE_MISS
+from config import get_file_path
+from settings import get_settings
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The url of the NBCC 2020 Seismic Hazard Tool API
+SEISMIC_HAZARD_URL = "https://www.earthquakescanada.nrcan.gc.ca/api/canshm/graphql"
+
+# A site to query, made up of the latitude, longitude, site designation and Vs30 value or site class
+SiteQuery = Tuple[float, float, SiteDesignation, int | SiteClass]
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class SeismicHazardClient:
+    """
+    Fetches the design spectral accelerations of sites from the NBCC 2020 Seismic Hazard Tool API. Results are cached
+    by rounded coordinates, site designation and Vs30 value or site class, and every uncached site in a call is fetched
+    in a single GraphQL request using aliases.
+    """
+
+    # The url of the API
+    url: str
+    # The cache of results, keyed by site
+    cache: PersistentCache
+    # The number of seconds to wait for the API before giving up
+    timeout: float
+    # The number of decimal places coordinates are rounded to
+    precision: int
+    # The pooled HTTP session shared by all requests
+    session: requests.Session
+    # The pooled asyncio HTTP session shared by all coroutines, created on first use inside the event loop
+    async_session: Optional[aiohttp.ClientSession]
+
+    def __init__(
+        self,
+        cache: PersistentCache,
+        url: str = SEISMIC_HAZARD_URL,
+        timeout: float = 30,
+        precision: int = SEISMIC_HAZARD_COORDINATE_PRECISION,
+    ):
+        """
+        Constructor for the SeismicHazardClient class
+        :param cache: The cache of results
+        :param url: The url of the API
+        :param timeout: The number of seconds to wait for the API before giving up
+        :param precision: The number of decimal places coordinates are rounded to
+        """
+        self.url = url
+        self.cache = cache
+        self.timeout = timeout
+        self.precision = precision
+        # Reuse connections to the API across requests
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=10))
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.async_session = None
+
+    @staticmethod
+    def get_site_alias(site_designation: SiteDesignation, value: int | SiteClass) -> str:
+        """
+        Gets the GraphQL alias of a site designation, i.e. X148 for a Vs30 of 148 and XC for site class C
+        :param site_designation: The site designation type
+        :param value: The Vs30 value or site class
+        :return: The alias of the site designation
+        """
+        if site_designation == SiteDesignation.XS:
+            return f"X{SiteClass(value).value}"
+        return f"X{int(value)}"
+
+    @staticmethod
+    def get_site_field(site_designation: SiteDesignation, value: int | SiteClass) -> str:
+        """
+        Gets the GraphQL field that fetches the design spectral accelerations of a site designation
+        :param site_designation: The site designation type
+        :param value: The Vs30 value or site class
+        :return: The GraphQL field
+        """
+        if site_designation == SiteDesignation.XS:
+            argument = f"siteClass: {SiteClass(value).value}"
+            field = "siteDesignationsXs"
+        else:
+            argument = f"vs30: {int(value)}"
+            field = "siteDesignationsXv"
+        return f"{field}({argument}, poe50: [2.0]){{ sa0p2 sa1p0 }}"
+
+    def round_coordinates(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """
+        Rounds coordinates to the precision of the client
+        :param latitude: The latitude
+        :param longitude: The longitude
+        :return: The rounded latitude and longitude
+        """
+        return round(latitude, self.precision), round(longitude, self.precision)
+
+    def get_cache_key(self, site: SiteQuery) -> str:
+        """
+        Gets the cache key of a site
+        :param site: The site
+        :return: The cache key of the site
+        """
+        latitude, longitude, site_designation, value = site
+        latitude, longitude = self.round_coordinates(latitude, longitude)
+        return f"{latitude}:{longitude}:{self.get_site_alias(site_designation, value)}"
+
+    def build_query(self, sites: List[SiteQuery]) -> Tuple[str, Dict[str, Tuple[str, str]]]:
+        """
+        Builds a single GraphQL query for several sites. Each location is aliased L0, L1, ... and each site designation
+        within a location is aliased as in get_site_alias.
+        :param sites: The sites to query
+        :return: The query and a mapping from cache key to (location alias, site alias)
+        """
+        locations = {}
+        aliases = {}
+        for site in sites:
+            latitude, longitude, site_designation, value = site
+            coordinates = self.round_coordinates(latitude, longitude)
+            location = locations.setdefault(
+                coordinates, {"alias": f"L{len(locations)}", "fields": {}}
+            )
+            site_alias = self.get_site_alias(site_designation, value)
+            location["fields"][site_alias] = self.get_site_field(site_designation, value)
+            aliases[self.get_cache_key(site)] = (location["alias"], site_alias)
+
+        blocks = []
+        for (latitude, longitude), location in locations.items():
+            fields = " ".join(
+                f"{alias}: {field}" for alias, field in location["fields"].items()
+            )
+            blocks.append(
+                f"{location['alias']}: NBC2020(latitude: {latitude}, longitude: {longitude}){{ {fields} }}"
+            )
+        return f"query{{ {' '.join(blocks)} }}", aliases
+
+    def get_cached(self, sites: List[SiteQuery]) -> Tuple[Dict[str, dict], List[SiteQuery]]:
+        """
+        Splits sites into those that are already cached and those that must be fetched
+        :param sites: The sites to fetch
+        :return: A mapping from the cache key of each cached site to its result, and the sites that are not cached
+        """
+        results = {}
+        missing = []
+        for site in sites:
+            key = self.get_cache_key(site)
+            cached = self.cache.get(key)
+            if cached is CACHE_MISS:
+                missing.append(site)
+            else:
+                results[key] = cached
+        return results, missing
+
+    def store_response(
+        self, data: dict, aliases: Dict[str, Tuple[str, str]], results: Dict[str, dict]
+    ) -> Dict[str, dict]:
+        """
+        Caches the sites answered by a response and adds them to the results
+        :param data: The data field of the response
+        :param aliases: The mapping from cache key to (location alias, site alias) used to build the query
+        :param results: The results to add the answered sites to
+        :return: The results
+        """
+        # example data
+        # {'data': {'L0': {'XC': [{'sa0p2': 0.658, 'sa1p0': 0.209}]}}}
+        for key, (location_alias, site_alias) in aliases.items():
+            entries = (data.get(location_alias) or {}).get(site_alias) or []
+            if not entries:
+                continue
+            result = {"sa0p2": entries[0].get("sa0p2"), "sa1p0": entries[0].get("sa1p0")}
+            self.cache.set(key, result)
+            results[key] = result
+        return results
+
+    def fetch_many(self, sites: List[SiteQuery]) -> Dict[str, dict]:
+        """
+        Fetches the design spectral accelerations of several sites, querying the API at most once for every site that
+        is not already cached
+        :param sites: The sites to fetch
+        :return: A mapping from the cache key of each site to a dictionary containing sa0p2 and sa1p0, sites the API
+        returned no data for are omitted
+        """
+        results, missing = self.get_cached(sites)
+        if not missing:
+            return results
+
+        query, aliases = self.build_query(missing)
+        response = self.session.post(
+            self.url,
+            data=json.dumps({"query": query, "variables": {}}),
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        data = response.json().get("data") or {}
+        return self.store_response(data, aliases, results)
+
+    def get_async_session(self) -> aiohttp.ClientSession:
+        """
+        Gets the asyncio HTTP session, creating it on first use. It must be called from inside the event loop the
+        session is used on.
+        :return: The asyncio HTTP session
+        """
+        if self.async_session is None or self.async_session.closed:
+            self.async_session = aiohttp.ClientSession(
+                headers={"Content-Type": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=10),
+            )
+        return self.async_session
+
+    async def fetch_many_async(self, sites: List[SiteQuery]) -> Dict[str, dict]:
+        """
+        Fetches the design spectral accelerations of several sites like fetch_many, suspending the calling coroutine
+        instead of blocking a thread while waiting for the API
+        :param sites: The sites to fetch
+        :return: A mapping from the cache key of each site to a dictionary containing sa0p2 and sa1p0, sites the API
+        returned no data for are omitted
+        """
+        results, missing = self.get_cached(sites)
+        if not missing:
+            return results
+
+        query, aliases = self.build_query(missing)
+        async with self.get_async_session().post(
+            self.url, data=json.dumps({"query": query, "variables": {}})
+        ) as response:
+            response.raise_for_status()
+            data = (await response.json()).get("data") or {}
+        return self.store_response(data, aliases, results)
+
+    def fetch(
+        self,
+        latitude: float,
+        longitude: float,
+        site_designation: SiteDesignation,
+        value: int | SiteClass,
+    ) -> dict:
+        """
+        Fetches the design spectral accelerations of a single site
+        :param latitude: The latitude of the site
+        :param longitude: The longitude of the site
+        :param site_designation: The site designation type
+        :param value: The Vs30 value or site class
+        :return: A dictionary containing sa0p2 and sa1p0, empty if the API returned no data
+        """
+        site = (latitude, longitude, site_designation, value)
+        return self.fetch_many([site]).get(self.get_cache_key(site), {})
+
+    async def fetch_async(
+        self,
+        latitude: float,
+        longitude: float,
+        site_designation: SiteDesignation,
+        value: int | SiteClass,
+    ) -> dict:
+        """
+        Fetches the design spectral accelerations of a single site without blocking the event loop
+        :param latitude: The latitude of the site
+        :param longitude: The longitude of the site
+        :param site_designation: The site designation type
+        :param value: The Vs30 value or site class
+        :return: A dictionary containing sa0p2 and sa1p0, empty if the API returned no data
+        """
+        site = (latitude, longitude, site_designation, value)
+        results = await self.fetch_many_async([site])
+        return results.get(self.get_cache_key(site), {})
+
+    async def aclose(self) -> None:
+        """
+        Closes the asyncio HTTP session, intended to be called when the application shuts down
+        :return: None
+        """
+        if self.async_session is not None and not self.async_session.closed:
+            await self.async_session.close()
+        self.async_session = None
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The seismic hazard client shared by all requests
+SEISMIC_HAZARD_CLIENT = SeismicHazardClient(
+    cache=PersistentCache(
+        path=get_file_path(SEISMIC_HAZARD_CACHE_FILE),
+        max_entries=get_settings().cache.seismic_hazard_max_entries,
+        ttl=get_settings().cache.seismic_hazard_ttl,
+    )
+)
@@ -25,6 +25,9 @@ class SeismicFactor:
     This class is used to store the seismic factor information
     """
 
+    # Each height zone holds its own copy of the seismic factor
+    __slots__ = ("ar", "rp", "cp")
+
     # Element or component force amplification factor
     ar: Optional[float]
     # Element of component response modification factor
@@ -27,6 +27,9 @@ class SeismicLoad:
     This class is used to store all the information regarding seismic loads
     """
 
+    # One seismic load is stored per height zone
+    __slots__ = ("factor", "ax", "sp", "vp", "vp_snow")
+
     # The seismic factor
     factor: Optional[SeismicFactor]
     # Height factor
@@ -0,0 +1,172 @@
+########################################################################################################################
+# entity_serializer.py
+# This file contains the serializer used to send users, buildings, locations and loads to clients. The fields of each
+# entity are taken from the attributes declared on its class, and entities are encoded directly to JSON or MessagePack
+# bytes, without the intermediate string and reference tracking of jsonpickle.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from enum import Enum
+from typing import Any, Dict, List, Tuple
+
+import msgpack
+import numpy as np
+import orjson
+
+from backend.Entities.Building.building import Building
+from backend.Entities.Building.cladding import Cladding
+from backend.Entities.Building.dimensions import Dimensions
+from backend.Entities.Building.height_zone import HeightZone
+from backend.Entities.Building.roof import Roof
+from backend.Entities.Location.location import Location
+from backend.Entities.Seismic.seismic_factor import SeismicFactor
+from backend.Entities.Seismic.seismic_load import SeismicLoad
+from backend.Entities.Snow.snow_factor import SnowFactor
+from backend.Entities.Snow.snow_load import SnowLoad
+from backend.Entities.User.dependency_graph import DependencyGraph, DependencyNode
+from backend.Entities.User.profile import Profile
+from backend.Entities.User.user import User
+from backend.Entities.Wind.main_structure_wind_factor import MainStructureWindFactor
+from backend.Entities.Wind.wind_factor import WindFactor
+from backend.Entities.Wind.wind_load import WindLoad
+from backend.Entities.Wind.wind_pressure import WindPressure
+from backend.Entities.Wind.zone import Zone
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def get_declared_fields(cls: type) -> Tuple[str, ...]:
+    """
+    Gets the public attributes declared on a class and its base classes, in the order they are declared
+    :param cls: The class
+    :return: The names of the attributes
+    """
+    fields = []
+    for base in reversed(cls.__mro__):
+        for name in base.__dict__.get("__annotations__", {}):
+            if not name.startswith("_") and name not in fields:
+                fields.append(name)
+    return tuple(fields)
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The classes that are serialized field by field, every other object must be natively supported by the encoders
+ENTITY_CLASSES: List[type] = [
+    User,
+    Profile,
+    Location,
+    Building,
+    Dimensions,
+    Cladding,
+    Roof,
+    HeightZone,
+    WindLoad,
+    Zone,
+    WindPressure,
+    WindFactor,
+    MainStructureWindFactor,
+    SeismicLoad,
+    SeismicFactor,
+    SnowLoad,
+    SnowFactor,
+    DependencyGraph,
+    DependencyNode,
+]
+# The fields serialized for each entity class
+ENTITY_SCHEMAS: Dict[type, Tuple[str, ...]] = {
+    cls: get_declared_fields(cls) for cls in ENTITY_CLASSES
+}
+# The JSON encoding options, dictionaries keyed by height zone number are written with string keys
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+# Marks a declared attribute that an entity does not have, such as one added after the entity was saved
+MISSING = object()
+
+
+########################################################################################################################
+# SERIALIZATION FUNCTIONS
+########################################################################################################################
+
+
+def encode_entity(obj: Any) -> Any:
+    """
+    Converts an object the encoders do not support natively into one they do. Called by the encoders for each such
+    object, the values it returns are encoded in turn.
+    :param obj: The object
+    :return: A dictionary of the declared fields of an entity, the value of an enum, or a list or number for numpy
+    values
+    """
+    fields = ENTITY_SCHEMAS.get(type(obj))
+    if fields is not None:
+        result = {}
+        for name in fields:
+            value = getattr(obj, name, MISSING)
+            # Attributes that are declared but not set are left out, as jsonpickle does
+            if value is MISSING:
+                continue
+            # Buildings with custom height zones keep them as the keys of a dictionary used as an ordered set, which
+            # is written as the list of its keys
+            if (
+                type(value) is dict
+                and value
+                and type(next(iter(value))) in ENTITY_SCHEMAS
+            ):
+                value = list(value)
+            result[name] = value
+        return result
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize an object of type {type(obj).__name__}")
+
+
+def to_json(obj: Any) -> bytes:
+    """
+    Encodes an object as JSON
+    :param obj: The object, an entity or any combination of entities, lists, dictionaries and primitive values
+    :return: The UTF-8 encoded JSON
+    """
+    return orjson.dumps(obj, default=encode_entity, option=JSON_OPTIONS)
+
+
+def from_json(data: bytes | str) -> Any:
+    """
+    Decodes JSON into dictionaries, lists and primitive values
+    :param data: The JSON
+    :return: The decoded value
+    """
+    return orjson.loads(data)
+
+
+def to_msgpack(obj: Any) -> bytes:
+    """
+    Encodes an object as MessagePack, a compact binary encoding with the same structure as the JSON encoding
+    :param obj: The object, an entity or any combination of entities, lists, dictionaries and primitive values
+    :return: The MessagePack bytes
+    """
+    return msgpack.packb(obj, default=encode_entity, use_bin_type=True)
+
+
+def from_msgpack(data: bytes) -> Any:
+    """
+    Decodes MessagePack into dictionaries, lists and primitive values
+    :param data: The MessagePack bytes
+    :return: The decoded value
+    """
+    # Dictionaries keyed by height zone number keep their integer keys
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
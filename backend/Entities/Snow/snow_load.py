@@ -29,8 +29,10 @@ class SnowLoad:
 
     # The snow factor
     factor: Optional[SnowFactor]
-    # The snow load
+    # The ULS snow load
     s_uls: Optional[float]
+    # The SLS snow load
+    s_sls: Optional[float]
 
     def __init__(self):
         # Set the attributes
@@ -0,0 +1,267 @@
+########################################################################################################################
+# dependency_graph.py
+# This file contains the dependency graph used to recompute only the derived data of a user that is affected by a
+# change. Nodes are either inputs, set by the user, or derived from other nodes. Changing an input marks every node
+# derived from it as stale, and stale nodes are recomputed, in dependency order, only when they are next read.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+########################################################################################################################
+# NODE CLASS
+########################################################################################################################
+
+
+class DependencyNode:
+    """
+    A node of the dependency graph, with the value it was last computed to and the time its computations took. Holds
+    plain data only so that it is stored along with the user.
+    """
+
+    # The name of the node
+    name: str
+    # The names of the nodes this node is derived from, empty for an input
+    dependencies: List[str]
+    # Whether the node must be recomputed before it is read, always False for an input
+    stale: bool
+    # The value the node was last computed to, None if its last computation failed
+    value: Any
+    # The error raised by the last computation of the node, None if it succeeded
+    error: Optional[str]
+    # The number of times the node has been computed
+    computations: int
+    # The number of seconds the last computation took
+    last_seconds: float
+    # The total number of seconds spent computing the node
+    total_seconds: float
+
+    def __init__(self, name: str, dependencies: List[str]):
+        """
+        Constructor for the DependencyNode class
+        :param name: The name of the node
+        :param dependencies: The names of the nodes this node is derived from, empty for an input
+        """
+        self.name = name
+        self.dependencies = dependencies
+        self.stale = bool(dependencies)
+        self.value = None
+        self.error = None
+        self.computations = 0
+        self.last_seconds = 0.0
+        self.total_seconds = 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Gets the state and timings of the node
+        :return: A dictionary containing whether the node is an input or stale, the error its last computation raised,
+        the number of times it has been computed, and the time its last computation and all its computations took
+        """
+        return {
+            "input": not self.dependencies,
+            "stale": self.stale,
+            # Nodes saved before errors were recorded have no error attribute
+            "error": getattr(self, "error", None),
+            "dependencies": list(self.dependencies),
+            "computations": self.computations,
+            "last_seconds": self.last_seconds,
+            "total_seconds": self.total_seconds,
+        }
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class DependencyGraph:
+    """
+    A graph of the data of a user, where each derived node is recomputed from the nodes it depends on. The graph only
+    tracks which nodes are stale, the computations themselves are passed to refresh.
+    """
+
+    # The nodes of the graph, keyed by name
+    nodes: Dict[str, DependencyNode]
+
+    def __init__(self):
+        """
+        Constructor for the DependencyGraph class
+        """
+        self.nodes = {}
+
+    def define(self, name: str, dependencies: Iterable[str] = ()) -> None:
+        """
+        Adds a node to the graph, replacing any node with the same name. A derived node starts stale. Dependencies that
+        are not defined yet are defined as inputs.
+        :param name: The name of the node
+        :param dependencies: The names of the nodes it is derived from, none for an input
+        :return: None
+        """
+        dependencies = list(dependencies)
+        for dependency in dependencies:
+            if dependency not in self.nodes:
+                self.nodes[dependency] = DependencyNode(dependency, [])
+        self.nodes[name] = DependencyNode(name, dependencies)
+        # Anything derived from a replaced node must be recomputed
+        self.invalidate(name)
+
+    def remove(self, names: Iterable[str]) -> None:
+        """
+        Removes nodes from the graph, marking the nodes derived from them stale
+        :param names: The names of the nodes to remove
+        :return: None
+        """
+        for name in list(names):
+            if name in self.nodes:
+                self.invalidate(name)
+                del self.nodes[name]
+
+    def get_dependents(self, name: str) -> List[str]:
+        """
+        Gets the names of the nodes derived, directly or not, from a node
+        :param name: The name of the node
+        :return: The names of the nodes derived from the node
+        """
+        dependents = {}
+        for node in self.nodes.values():
+            for dependency in node.dependencies:
+                dependents.setdefault(dependency, []).append(node.name)
+        found = []
+        seen = {name}
+        stack = [name]
+        while stack:
+            for dependent in dependents.get(stack.pop(), []):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    found.append(dependent)
+                    stack.append(dependent)
+        return found
+
+    def invalidate(self, name: str) -> None:
+        """
+        Marks a changed node stale, along with every node derived from it. Inputs are never stale, only the nodes
+        derived from them are.
+        :param name: The name of the node that changed
+        :return: None
+        """
+        node = self.nodes.get(name)
+        if node is None:
+            return
+        node.stale = bool(node.dependencies)
+        for dependent in self.get_dependents(name):
+            self.nodes[dependent].stale = True
+
+    def get_stale(self) -> List[str]:
+        """
+        Gets the names of the stale nodes
+        :return: The names of the stale nodes
+        """
+        return [node.name for node in self.nodes.values() if node.stale]
+
+    def get_order(self, names: Iterable[str]) -> List[str]:
+        """
+        Orders nodes and the nodes they are derived from so that every node comes after its dependencies
+        :param names: The names of the nodes
+        :return: The names of the nodes and their dependencies, in dependency order
+        """
+        order = []
+        visited = set()
+        for name in names:
+            stack = [(name, False)]
+            while stack:
+                current, expanded = stack.pop()
+                if expanded:
+                    order.append(current)
+                    continue
+                if current in visited or current not in self.nodes:
+                    continue
+                visited.add(current)
+                stack.append((current, True))
+                for dependency in reversed(self.nodes[current].dependencies):
+                    stack.append((dependency, False))
+        return order
+
+    def get_error(self, name: str) -> Optional[str]:
+        """
+        Gets the error raised by the last computation of a node
+        :param name: The name of the node
+        :return: The error, None if the node is not defined or its last computation succeeded
+        """
+        return getattr(self.nodes.get(name), "error", None)
+
+    def refresh(
+        self,
+        compute: Callable[[str], Any],
+        names: Optional[Iterable[str]] = None,
+        raise_errors: bool = False,
+    ) -> List[str]:
+        """
+        Recomputes the stale nodes, after the nodes they are derived from. A node whose computation raises an error is
+        recorded as failed, along with the nodes derived from it, and is not recomputed again until one of the nodes it
+        is derived from changes.
+        :param compute: Computes the value of a node from its name
+        :param names: The names of the nodes to bring up to date along with their dependencies, None for every node
+        :param raise_errors: Whether to raise the first error raised by a computation once every other node has been
+        recomputed
+        :return: The names of the nodes that were recomputed, in the order they were recomputed
+        """
+        recomputed = []
+        first_error = None
+        for name in self.get_order(self.nodes if names is None else names):
+            node = self.nodes[name]
+            if not node.stale:
+                continue
+            failed = [
+                dependency
+                for dependency in node.dependencies
+                if self.get_error(dependency) is not None
+            ]
+            start = time.perf_counter()
+            if failed:
+                # A node derived from a failed node would be computed from outdated values
+                node.value = None
+                node.error = f"{failed[0]} could not be computed"
+                if first_error is None:
+                    first_error = ValueError(node.error)
+            else:
+                try:
+                    node.value = compute(name)
+                    node.error = None
+                except Exception as e:
+                    node.value = None
+                    node.error = str(e)
+                    if first_error is None:
+                        first_error = e
+            node.last_seconds = time.perf_counter() - start
+            node.total_seconds += node.last_seconds
+            node.computations += 1
+            node.stale = False
+            recomputed.append(name)
+        if raise_errors and first_error is not None:
+            raise first_error
+        return recomputed
+
+    def get_value(self, name: str) -> Any:
+        """
+        Gets the value a node was last computed to
+        :param name: The name of the node
+        :return: The value of the node, None if it is not defined or has not been computed
+        """
+        node = self.nodes.get(name)
+        return None if node is None else node.value
+
+    def stats(self) -> Dict[str, dict]:
+        """
+        Gets the state and timings of every node
+        :return: A dictionary containing the state and timings of each node, keyed by name
+        """
+        return {name: node.to_dict() for name, node in self.nodes.items()}
@@ -0,0 +1,142 @@
+########################################################################################################################
+# load_dependencies.py
+# This file contains the nodes of the dependency graph of a user's loads. The location, importance category, building
+# and the inputs of each load are the inputs of the graph. The wind and seismic loads of each height zone, the snow
+# load, and the wall load cases of each height zone are derived from them, so that changing the material load of one
+# height zone only recomputes the seismic load and wall load cases of that height zone.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from typing import Any, List, Optional, Tuple
+
+from backend.Entities.Building.building import Building
+from backend.Entities.User.dependency_graph import DependencyGraph
+
+########################################################################################################################
+# NODES
+########################################################################################################################
+
+# The location of the building
+LOCATION_NODE = "location"
+# The importance category of the building
+IMPORTANCE_CATEGORY_NODE = "importance_category"
+# The dimensions, roof, number of floors and height zones of the building
+BUILDING_NODE = "building"
+# The inputs of the seismic load, shared by every height zone
+SEISMIC_INPUT_NODE = "seismic_input"
+# The inputs of the snow load
+SNOW_INPUT_NODE = "snow_input"
+# The upwind and downwind snow loads
+SNOW_LOAD_NODE = "snow_load"
+
+# The kinds of nodes defined once per height zone
+MATERIAL_LOAD_KIND = "material_load"
+WIND_INPUT_KIND = "wind_input"
+WIND_LOAD_KIND = "wind_load"
+SEISMIC_LOAD_KIND = "seismic_load"
+WALL_LOAD_CASES_KIND = "wall_load_cases"
+HEIGHT_ZONE_KINDS = [
+    MATERIAL_LOAD_KIND,
+    WIND_INPUT_KIND,
+    WIND_LOAD_KIND,
+    SEISMIC_LOAD_KIND,
+    WALL_LOAD_CASES_KIND,
+]
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def get_zone_node(kind: str, zone_num: int) -> str:
+    """
+    Gets the name of the node of a height zone
+    :param kind: The kind of node, one of HEIGHT_ZONE_KINDS
+    :param zone_num: The number of the height zone
+    :return: The name of the node
+    """
+    return f"{kind}:{zone_num}"
+
+
+def parse_node(name: str) -> Tuple[str, Optional[int]]:
+    """
+    Splits the name of a node into its kind and height zone
+    :param name: The name of the node
+    :return: The kind of the node and the number of its height zone, or None if it is not defined per height zone
+    """
+    kind, _, zone_num = name.partition(":")
+    return kind, int(zone_num) if zone_num else None
+
+
+def have_same_value(first: Any, second: Any) -> bool:
+    """
+    Checks if two building components, such as the dimensions or the roof, hold the same values
+    :param first: The first component
+    :param second: The second component
+    :return: True if the components are the same object or have equal attributes, False otherwise
+    """
+    if first is second:
+        return True
+    if first is None or second is None:
+        return False
+    return vars(first) == vars(second)
+
+
+def have_same_structure(first: Building, second: Building) -> bool:
+    """
+    Checks if two buildings only differ by the material load of their height zones, in which case the loads of every
+    height zone whose material load is unchanged are still valid
+    :param first: The first building
+    :param second: The second building
+    :return: True if the buildings have the same dimensions, cladding, roof, number of floors, mid-height opening and
+    height zones, False otherwise
+    """
+
+    def get_zones(building: Building) -> List[Tuple[int, float]]:
+        return [(zone.zone_num, zone.elevation) for zone in building.height_zones]
+
+    return (
+        first.num_floor == second.num_floor
+        and first.h_opening == second.h_opening
+        and get_zones(first) == get_zones(second)
+        and have_same_value(first.dimensions, second.dimensions)
+        and have_same_value(first.cladding, second.cladding)
+        and have_same_value(first.roof, second.roof)
+    )
+
+
+def define_load_nodes(graph: DependencyGraph, building: Building) -> None:
+    """
+    Defines the nodes of the loads of a building, replacing the nodes of any previous building. Every derived node is
+    stale once they are defined.
+    :param graph: The dependency graph of the user
+    :param building: The building
+    :return: None
+    """
+    # Remove the nodes of the height zones of the previous building
+    graph.remove(
+        name for name in graph.nodes if parse_node(name)[0] in HEIGHT_ZONE_KINDS
+    )
+    common = [LOCATION_NODE, IMPORTANCE_CATEGORY_NODE, BUILDING_NODE]
+    graph.define(SNOW_LOAD_NODE, common + [SNOW_INPUT_NODE])
+    for height_zone in building.height_zones:
+        zone_num = height_zone.zone_num
+        wind_load = get_zone_node(WIND_LOAD_KIND, zone_num)
+        seismic_load = get_zone_node(SEISMIC_LOAD_KIND, zone_num)
+        material_load = get_zone_node(MATERIAL_LOAD_KIND, zone_num)
+        graph.define(material_load)
+        graph.define(wind_load, common + [get_zone_node(WIND_INPUT_KIND, zone_num)])
+        graph.define(seismic_load, common + [SEISMIC_INPUT_NODE, material_load])
+        graph.define(
+            get_zone_node(WALL_LOAD_CASES_KIND, zone_num),
+            [BUILDING_NODE, material_load, wind_load, seismic_load, SNOW_LOAD_NODE],
+        )
@@ -25,6 +25,19 @@ from backend.Entities.Building.height_zone import HeightZone
 from backend.Entities.Building.roof import Roof
 from backend.Entities.Location.location import Location
 from backend.Entities.Snow.snow_load import SnowLoad
+from backend.Entities.User.dependency_graph import DependencyGraph
+from backend.Entities.User.load_dependencies import (
+    BUILDING_NODE,
+    IMPORTANCE_CATEGORY_NODE,
+    LOCATION_NODE,
+    MATERIAL_LOAD_KIND,
+    SEISMIC_INPUT_NODE,
+    SNOW_INPUT_NODE,
+    WIND_INPUT_KIND,
+    define_load_nodes,
+    get_zone_node,
+    have_same_structure,
+)
 from backend.Entities.User.profile import Profile
 from backend.Entities.Wind.wind_factor import WindFactor
 
@@ -54,6 +67,14 @@ class User:
     importance_category: Optional[ImportanceFactor]
     material_type: Optional[Materials]
     snow_load: Optional[Dict["str", SnowLoad]]
+    # The inputs of the wind load of each height zone, keyed by height zone number
+    wind_load_inputs: Optional[Dict[int, dict]]
+    # The inputs of the seismic load
+    seismic_load_inputs: Optional[dict]
+    # The inputs of the snow load
+    snow_load_inputs: Optional[dict]
+    # Tracks which loads are affected by a change and must be recomputed before they are read
+    dependencies: Optional[DependencyGraph]
     # wind_factor: Optional[WindFactor]
 
     def __init__(self, username: str):
@@ -76,6 +97,10 @@ class User:
         self.importance_category = None
         self.snow_load = None
         self.material_type = None
+        self.wind_load_inputs = None
+        self.seismic_load_inputs = None
+        self.snow_load_inputs = None
+        self.dependencies = None
 
     def set_profile(self, profile: Profile):
         """
@@ -100,6 +125,7 @@ class User:
         :return: None
         """
         self.location = location
+        self.get_dependencies().invalidate(LOCATION_NODE)
 
     def set_dimensions(self, dimensions: Dimension):
         """
@@ -171,7 +197,27 @@ class User:
         :param building: The building
         :return: None
         """
+        previous = self.building
         self.building = building
+        graph = self.get_dependencies()
+        if building is None:
+            graph.invalidate(BUILDING_NODE)
+        elif previous is not None and have_same_structure(previous, building):
+            # Only the material loads changed, keep the loads of the other height zones
+            for height_zone in building.height_zones:
+                previous_zone = previous.get_height_zone(height_zone.zone_num)
+                height_zone.wind_load = previous_zone.wind_load
+                height_zone.seismic_load = previous_zone.seismic_load
+                height_zone.main_structure_wind_factor = (
+                    previous_zone.main_structure_wind_factor
+                )
+                if height_zone.wp != previous_zone.wp:
+                    graph.invalidate(
+                        get_zone_node(MATERIAL_LOAD_KIND, height_zone.zone_num)
+                    )
+        else:
+            define_load_nodes(graph, building)
+            graph.invalidate(BUILDING_NODE)
 
     def set_importance_category(self, importance_category: ImportanceFactor):
         """
@@ -180,6 +226,7 @@ class User:
         :return: None
         """
         self.importance_category = importance_category
+        self.get_dependencies().invalidate(IMPORTANCE_CATEGORY_NODE)
 
     def set_material_type(self, material_type: Materials):
         """
@@ -311,3 +358,73 @@ class User:
         :return: The snow load of the building
         """
         return self.snow_load
+
+    def set_wind_load_inputs(self, zone_num: int, wind_load_inputs: dict):
+        """
+        Sets the inputs of the wind load of a height zone, marking its wind load stale if they changed
+        :param zone_num: The number of the height zone
+        :param wind_load_inputs: The inputs of the wind load of the height zone
+        :return: None
+        """
+        if getattr(self, "wind_load_inputs", None) is None:
+            self.wind_load_inputs = {}
+        if self.wind_load_inputs.get(zone_num) != wind_load_inputs:
+            self.wind_load_inputs[zone_num] = wind_load_inputs
+            self.get_dependencies().invalidate(
+                get_zone_node(WIND_INPUT_KIND, zone_num)
+            )
+
+    def set_seismic_load_inputs(self, seismic_load_inputs: dict):
+        """
+        Sets the inputs of the seismic load, marking the seismic loads stale if they changed
+        :param seismic_load_inputs: The inputs of the seismic load
+        :return: None
+        """
+        if self.get_seismic_load_inputs() != seismic_load_inputs:
+            self.seismic_load_inputs = seismic_load_inputs
+            self.get_dependencies().invalidate(SEISMIC_INPUT_NODE)
+
+    def set_snow_load_inputs(self, snow_load_inputs: dict):
+        """
+        Sets the inputs of the snow load, marking the snow load stale if they changed
+        :param snow_load_inputs: The inputs of the snow load
+        :return: None
+        """
+        if self.get_snow_load_inputs() != snow_load_inputs:
+            self.snow_load_inputs = snow_load_inputs
+            self.get_dependencies().invalidate(SNOW_INPUT_NODE)
+
+    def get_wind_load_inputs(self, zone_num: int):
+        """
+        Returns the inputs of the wind load of a height zone
+        :param zone_num: The number of the height zone
+        :return: The inputs of the wind load of the height zone, or None if they have not been set
+        """
+        # Users stored before the inputs were kept do not have the attribute
+        wind_load_inputs = getattr(self, "wind_load_inputs", None)
+        return None if wind_load_inputs is None else wind_load_inputs.get(zone_num)
+
+    def get_seismic_load_inputs(self):
+        """
+        Returns the inputs of the seismic load
+        :return: The inputs of the seismic load, or None if they have not been set
+        """
+        return getattr(self, "seismic_load_inputs", None)
+
+    def get_snow_load_inputs(self):
+        """
+        Returns the inputs of the snow load
+        :return: The inputs of the snow load, or None if they have not been set
+        """
+        return getattr(self, "snow_load_inputs", None)
+
+    def get_dependencies(self) -> DependencyGraph:
+        """
+        Returns the dependency graph of the user's loads, creating it for users stored before it was kept
+        :return: The dependency graph of the user's loads
+        """
+        if getattr(self, "dependencies", None) is None:
+            self.dependencies = DependencyGraph()
+            if getattr(self, "building", None) is not None:
+                define_load_nodes(self.dependencies, self.building)
+        return self.dependencies
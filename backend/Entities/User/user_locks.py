@@ -0,0 +1,191 @@
+########################################################################################################################
+# user_locks.py
+# This file contains the reader/writer locks that serialize concurrent changes to the data of each user, so that
+# requests for the same user served by different threads never see a partially updated building.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterator
+
+########################################################################################################################
+# LOCK CLASS
+########################################################################################################################
+
+
+class ReadWriteLock:
+    """
+    A lock held either by any number of readers or by a single writer. Writers are preferred: once a writer is waiting,
+    new readers wait until it is done, so that a steady stream of reads cannot starve a write. The lock is not
+    reentrant, a thread holding it must not acquire it again.
+    """
+
+    # Guards the counters and is waited on by blocked readers and writers
+    condition: threading.Condition
+    # The number of readers holding the lock
+    readers: int
+    # Whether a writer holds the lock
+    writing: bool
+    # The number of writers waiting for the lock
+    waiting_writers: int
+
+    def __init__(self):
+        """
+        Constructor for the ReadWriteLock class
+        """
+        self.condition = threading.Condition(threading.Lock())
+        self.readers = 0
+        self.writing = False
+        self.waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """
+        Acquires the lock for reading, waiting while a writer holds or is waiting for the lock
+        :return: None
+        """
+        with self.condition:
+            while self.writing or self.waiting_writers:
+                self.condition.wait()
+            self.readers += 1
+
+    def release_read(self) -> None:
+        """
+        Releases the lock held for reading
+        :return: None
+        """
+        with self.condition:
+            self.readers -= 1
+            if self.readers == 0:
+                self.condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Acquires the lock for writing, waiting until no reader or writer holds the lock
+        :return: None
+        """
+        with self.condition:
+            self.waiting_writers += 1
+            try:
+                while self.writing or self.readers:
+                    self.condition.wait()
+            finally:
+                self.waiting_writers -= 1
+            self.writing = True
+
+    def try_acquire_write(self) -> bool:
+        """
+        Acquires the lock for writing if no reader or writer holds or is waiting for it, without waiting
+        :return: True if the lock was acquired, False otherwise
+        """
+        with self.condition:
+            if self.writing or self.readers or self.waiting_writers:
+                return False
+            self.writing = True
+            return True
+
+    def release_write(self) -> None:
+        """
+        Releases the lock held for writing
+        :return: None
+        """
+        with self.condition:
+            self.writing = False
+            self.condition.notify_all()
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class UserLockRegistry:
+    """
+    Hands out one ReadWriteLock per user. Locks are only kept while they are in use, so the registry does not grow
+    with the number of users that have ever made a request. Locks only serialize the threads of a single process.
+    """
+
+    # The lock of each user currently holding or waiting for one, keyed by username
+    locks: "weakref.WeakValueDictionary[str, ReadWriteLock]"
+    # Guards the creation of locks
+    lock: threading.Lock
+
+    def __init__(self):
+        """
+        Constructor for the UserLockRegistry class
+        """
+        self.locks = weakref.WeakValueDictionary()
+        self.lock = threading.Lock()
+
+    def get_lock(self, username: str) -> ReadWriteLock:
+        """
+        Gets the lock of a user, creating it if no thread is using it
+        :param username: The username of the user
+        :return: The lock of the user, which must be referenced for as long as it is held
+        """
+        with self.lock:
+            user_lock = self.locks.get(username)
+            if user_lock is None:
+                user_lock = ReadWriteLock()
+                self.locks[username] = user_lock
+            return user_lock
+
+    @contextmanager
+    def read(self, username: str) -> Iterator[None]:
+        """
+        Holds the lock of a user for reading, for code that reads the user's data without changing it
+        :param username: The username of the user
+        :return: A context manager holding the lock
+        """
+        user_lock = self.get_lock(username)
+        user_lock.acquire_read()
+        try:
+            yield
+        finally:
+            user_lock.release_read()
+
+    @contextmanager
+    def write(self, username: str) -> Iterator[None]:
+        """
+        Holds the lock of a user for writing, for code that changes the user's data or the objects it references
+        :param username: The username of the user
+        :return: A context manager holding the lock
+        """
+        user_lock = self.get_lock(username)
+        user_lock.acquire_write()
+        try:
+            yield
+        finally:
+            user_lock.release_write()
+
+    @contextmanager
+    def try_write(self, username: str) -> Iterator[bool]:
+        """
+        Holds the lock of a user for writing if it is free, without waiting for it
+        :param username: The username of the user
+        :return: A context manager yielding True if the lock is held, False if another thread is using it
+        """
+        user_lock = self.get_lock(username)
+        acquired = user_lock.try_acquire_write()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                user_lock.release_write()
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The locks of the users of this process
+USER_LOCKS = UserLockRegistry()
@@ -23,15 +23,34 @@ class MainStructureWindFactor:
     """
     This class stores wind factor information for a structure.
     """
-    
+
+    # One main structure wind factor is stored per height zone
+    __slots__ = (
+        "ct",
+        "ce_windward",
+        "ce_leeward",
+        "ce_side_walls",
+        "cp_windward",
+        "cp_leeward",
+        "cp_side_walls",
+        "cg_uls",
+        "cg_sls",
+        "p_windward_uls",
+        "p_windward_sls",
+        "p_leeward_uls",
+        "p_leeward_sls",
+        "p_side_walls_uls",
+        "p_side_walls_sls",
+    )
+
     # Topographic factor
     ct: Optional[float]
     # Exposure factor
     # (windward = Ce(elevation of height zone), leeward =  Ce(H/2), side walls Ce(H))
 
-    ce_windward = Optional[float]
-    ce_leeward = Optional[float]
-    ce_side_walls = Optional[float]
+    ce_windward: Optional[float]
+    ce_leeward: Optional[float]
+    ce_side_walls: Optional[float]
 
     # pressure factor
     # (windward, leeward, side walls = -0.7)
@@ -44,14 +63,14 @@ class MainStructureWindFactor:
     cg_sls: Optional[float]
 
     # wind pressure
-    p_windward_uls = Optional[float]
-    p_windward_sls = Optional[float]
+    p_windward_uls: Optional[float]
+    p_windward_sls: Optional[float]
 
-    p_leeward_uls = Optional[float]
-    p_leeward_sls = Optional[float]
+    p_leeward_uls: Optional[float]
+    p_leeward_sls: Optional[float]
 
-    p_side_walls_uls = Optional[float]
-    p_side_walls_sls = Optional[float]
+    p_side_walls_uls: Optional[float]
+    p_side_walls_sls: Optional[float]
 
     def __init__(self):
         """
@@ -27,6 +27,10 @@ class WindFactor:
     This class is used to store the wind factor information
     """
 
+    # One wind factor is stored per height zone. The underscored slots are never set, they hold the unused private
+    # attributes of users saved by earlier versions so that those users can still be loaded.
+    __slots__ = ("ct", "ce", "cei", "cg", "_ct", "_ce", "_cei", "_cg")
+
     # Topographic factor
     ct: Optional[float]
     # Exposure factor
@@ -39,10 +43,10 @@ class WindFactor:
         """
         Constructor for the WindFactor class
         """
-        self._ct = None    # Topographic factor
-        self._ce = None    # Exposure factor
-        self._cei = None   # Exposure factor (Intermediate custom value)
-        self._cg = None    # Gust factor
+        self.ct = None  # Topographic factor
+        self.ce = None  # Exposure factor
+        self.cei = None  # Exposure factor (Intermediate custom value)
+        self.cg = None  # Gust factor
 
     def __str__(self):
         """
@@ -28,6 +28,9 @@ class WindLoad:
     This class is used to store all the information regarding wind loads
     """
 
+    # One wind load is stored per height zone
+    __slots__ = ("factor", "zones")
+
     # The wind factor
     factor: Optional[WindFactor]
     # The zones
@@ -25,6 +25,23 @@ class WindPressure:
     This class is used to store the wind pressure information
     """
 
+    # Every zone of every height zone holds a wind pressure, so its twelve values are stored in slots rather than in a
+    # dictionary per instance
+    __slots__ = (
+        "pi_pos_uls",
+        "pi_neg_uls",
+        "pe_pos_uls",
+        "pe_neg_uls",
+        "pos_uls",
+        "neg_uls",
+        "pi_pos_sls",
+        "pi_neg_sls",
+        "pe_pos_sls",
+        "pe_neg_sls",
+        "pos_sls",
+        "neg_sls",
+    )
+
     # Positive internal pressure
     pi_pos_uls: Optional[float]
     # Negative internal pressure
@@ -27,12 +27,17 @@ class Zone:
     This class is used to store the zone information
     """
 
+    # The wind load of each height zone holds five zones, stored in slots to keep them small
+    __slots__ = ("name", "num", "pressure", "wind_load")
+
     # The name of the zone
     name: Optional[str]
     # The zone number
     num: Optional[int]
     # The wind pressure
     pressure: Optional[WindPressure]
+    # Always None, kept for string representation purposes
+    wind_load: None
 
     def __init__(self):
         """
@@ -0,0 +1,397 @@
+########################################################################################################################
+# benchmark_suite.py
+# This file contains a reproducible benchmark suite for the load calculation pipeline. It drives the managers directly,
+# without HTTP, over synthetic buildings with a varying number of height zones and reports the time and memory taken by
+# each stage, the memory held by the session of each building and the size of the user data it sends, as JSON. The
+# user data is serialized both the way it was with jsonpickle and with the entity serializer.
+#
+# Usage: python -m backend.Testing.benchmark_suite --zones 1 10 100 500 --repeat 5 --output benchmark.json
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+from unittest import mock
+
+import jsonpickle
+
+from backend.API.Managers.building_manager import process_building_data
+from backend.API.Managers.cladding_manager import process_cladding_data
+from backend.API.Managers.dimensions_manager import process_dimension_data
+from backend.API.Managers.location_manager import process_location_data
+from backend.API.Managers.main_structure_wind_factor_manager import (
+    process_main_structure_wind_factors,
+)
+from backend.API.Managers.roof_manager import process_roof_data
+from backend.API.Managers.seismic_load_manager import process_seismic_load_data
+from backend.API.Managers.snow_load_manager import process_snow_load_data
+from backend.API.Managers.user_data_manager import (
+    ALL_USER_DATA,
+    check_user_exists,
+    set_user_building,
+    set_user_cladding,
+    set_user_dimensions,
+    set_user_importance_category,
+    set_user_location,
+    set_user_material_type,
+    set_user_natural_frequency,
+    set_user_roof,
+    set_user_snow_load,
+)
+from backend.API.Managers.wind_load_manager import process_wind_load_data
+from backend.Constants.importance_factor_constants import ImportanceFactor
+from backend.Constants.materials import Materials
+from backend.Constants.wind_constants import WindExposureFactorSelections
+from backend.Entities.Cache.session_store import get_approximate_size
+from backend.Entities.Location.climatic_station_index import CLIMATIC_STATION_INDEX
+from backend.Entities.Location.geocoder import GEOCODER
+from backend.Entities.Location.seismic_hazard_client import SEISMIC_HAZARD_CLIENT
+from backend.Entities.Serialization.entity_serializer import to_json, to_msgpack
+from backend.algorithms.load_combination_engine import (
+    compute_all_roof_load_combinations,
+    compute_all_wall_load_combinations,
+)
+from backend.reports.excel_report import create_excel_report
+from backend.reports.excel_report_writer import iterate_chunks
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The number of height zones of the synthetic buildings benchmarked by default
+DEFAULT_ZONE_COUNTS = [1, 10, 50, 100, 500]
+# The number of timed runs of each stage by default
+DEFAULT_REPEAT = 5
+# The height of each height zone of a synthetic building in meters
+ZONE_HEIGHT = 4.0
+# The username the synthetic buildings are stored under
+BENCHMARK_USERNAME = "__benchmark__"
+# The address of the synthetic location, it contains no postal code so that the stubbed geocoder is used
+BENCHMARK_ADDRESS = "1 Benchmark Street, Toronto, Ontario"
+# The coordinates returned by the stubbed geocoder
+BENCHMARK_COORDINATES = (43.6532, -79.3832)
+# The climatic station returned by the stubbed climatic station index
+BENCHMARK_STATION = SimpleNamespace(
+    HourlyWindPressures_kPa_1_50=0.52,
+    SnowLoad_kPa_1_50_Sr=0.4,
+    SnowLoad_kPa_1_50_Ss=2.5,
+)
+# The seismic hazard values returned by the stubbed seismic hazard client
+BENCHMARK_SEISMIC_DATA = {"sa0p2": 0.249, "sa1p0": 0.0927}
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def stub_external_services() -> ExitStack:
+    """
+    Replaces the database, geocoder and seismic hazard lookups with fixed answers, so that the benchmark measures only
+    the calculations and is independent of the network and database
+    :return: A context manager that restores the services when exited
+    """
+    stack = ExitStack()
+    stack.enter_context(
+        mock.patch.object(
+            GEOCODER, "find_coordinates", return_value=BENCHMARK_COORDINATES
+        )
+    )
+    stack.enter_context(
+        mock.patch.object(
+            SEISMIC_HAZARD_CLIENT, "fetch", return_value=BENCHMARK_SEISMIC_DATA
+        )
+    )
+    stack.enter_context(
+        mock.patch.object(
+            CLIMATIC_STATION_INDEX, "nearest", return_value=[(BENCHMARK_STATION, 0.0)]
+        )
+    )
+    return stack
+
+
+def measure(function: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Measures a stage, timing repeated runs and then tracing the allocations of one more run
+    :param function: The stage to measure
+    :param repeat: The number of timed runs
+    :return: A dictionary containing the timings in seconds and the allocations of the stage
+    """
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    # Tracing slows the stage down, so the allocations are measured on a separate run
+    gc.collect()
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    before = tracemalloc.take_snapshot()
+    function()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks
+    allocations = sum(
+        max(stat.count_diff, 0) for stat in after.compare_to(before, "lineno")
+    )
+
+    return {
+        "runs": repeat,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+        "peak_bytes": peak,
+        "allocations": allocations,
+        "retained_blocks": retained_blocks,
+    }
+
+
+def remove_synthetic_user() -> None:
+    """
+    Removes the synthetic building from the session store
+    :return: None
+    """
+    if BENCHMARK_USERNAME in ALL_USER_DATA:
+        del ALL_USER_DATA[BENCHMARK_USERNAME]
+
+
+def create_synthetic_user(num_zones: int) -> None:
+    """
+    Stores the dimensions, cladding, roof and categories of a synthetic building with a number of height zones
+    :param num_zones: The number of height zones of the building
+    :return: None
+    """
+    remove_synthetic_user()
+    check_user_exists(BENCHMARK_USERNAME)
+    height = num_zones * ZONE_HEIGHT
+    set_user_dimensions(
+        BENCHMARK_USERNAME,
+        process_dimension_data(
+            width=30, width_across=30, width_along=40, height=height, sea_level=100
+        ),
+    )
+    set_user_cladding(BENCHMARK_USERNAME, process_cladding_data(c_top=height, c_bot=0))
+    set_user_roof(
+        BENCHMARK_USERNAME,
+        process_roof_data(w_roof=30, l_roof=40, slope=5, uniform_dead_load=1.5),
+    )
+    set_user_importance_category(BENCHMARK_USERNAME, ImportanceFactor.NORMAL)
+    set_user_material_type(BENCHMARK_USERNAME, Materials.CONCRETE)
+    set_user_natural_frequency(BENCHMARK_USERNAME, 0.5)
+
+
+########################################################################################################################
+# STAGES
+########################################################################################################################
+
+
+def benchmark_building(num_zones: int, repeat: int) -> Dict[str, Any]:
+    """
+    Runs every stage of the pipeline on a synthetic building, in the order the frontend calls them
+    :param num_zones: The number of height zones of the building
+    :param repeat: The number of timed runs of each stage
+    :return: A dictionary mapping each stage to its measurements
+    """
+    create_synthetic_user(num_zones)
+    zones = [(i + 1, (i + 1) * ZONE_HEIGHT) for i in range(num_zones)]
+    materials = [(i + 1, 10.0) for i in range(num_zones)]
+    importance_category = ImportanceFactor.NORMAL
+    # The state shared between the stages, each stage stores what the next ones use
+    state = SimpleNamespace(location=None, building=None, snow_load=None)
+
+    def location_stage():
+        state.location = process_location_data(BENCHMARK_ADDRESS, "xv", 450)
+        set_user_location(BENCHMARK_USERNAME, state.location)
+
+    def building_stage():
+        state.building = process_building_data(
+            num_floor=num_zones,
+            h_opening=0,
+            zones=zones,
+            materials=materials,
+            username=BENCHMARK_USERNAME,
+        )
+        set_user_building(BENCHMARK_USERNAME, state.building)
+
+    def wind_load_stage():
+        for height_zone in state.building.height_zones:
+            process_wind_load_data(
+                building=state.building,
+                height_zone=height_zone,
+                importance_category=importance_category,
+                location=state.location,
+                ct=1,
+                exposure_factor="open",
+                internal_pressure_category="enclosed",
+            )
+
+    def snow_load_stage():
+        state.snow_load = process_snow_load_data(
+            state.building, state.location, importance_category, "open", "other"
+        )
+        set_user_snow_load(BENCHMARK_USERNAME, state.snow_load)
+
+    def seismic_load_stage():
+        process_seismic_load_data(
+            state.building, state.location, importance_category, ar=1, rp=2.5, cp=1
+        )
+
+    def main_structure_wind_factor_stage():
+        for height_zone in state.building.height_zones:
+            process_main_structure_wind_factors(
+                height_zone,
+                state.building.dimensions,
+                0.5,
+                Materials.CONCRETE,
+                1,
+                WindExposureFactorSelections.OPEN,
+                None,
+                state.location.wind_velocity_pressure,
+                importance_category,
+            )
+
+    def wall_load_combination_stage():
+        compute_all_wall_load_combinations(
+            building=state.building,
+            snow_load=state.snow_load["upwind"],
+            as_dataframe=False,
+        )
+
+    def roof_load_combination_stage():
+        for side in ["upwind", "downwind"]:
+            compute_all_roof_load_combinations(
+                building=state.building,
+                snow_load=state.snow_load[side],
+                as_dataframe=False,
+            )
+
+    def user_data_jsonpickle_stage():
+        # The user data was encoded to a string by jsonpickle, which FastAPI then encoded again
+        json.dumps(
+            jsonpickle.encode(
+                ALL_USER_DATA[BENCHMARK_USERNAME], indent=4, unpicklable=False
+            )
+        )
+
+    def user_data_json_stage():
+        to_json(ALL_USER_DATA[BENCHMARK_USERNAME])
+
+    def user_data_msgpack_stage():
+        to_msgpack(ALL_USER_DATA[BENCHMARK_USERNAME])
+
+    def excel_report_stage():
+        report = create_excel_report(BENCHMARK_USERNAME, consolidate=True)
+        # Read the finished report the same way it is streamed to the client
+        for _ in iterate_chunks(report):
+            pass
+
+    stages = [
+        ("location", location_stage),
+        ("building", building_stage),
+        ("wind_load", wind_load_stage),
+        ("snow_load", snow_load_stage),
+        ("seismic_load", seismic_load_stage),
+        ("main_structure_wind_factors", main_structure_wind_factor_stage),
+        ("wall_load_combinations", wall_load_combination_stage),
+        ("roof_load_combinations", roof_load_combination_stage),
+        ("user_data_jsonpickle", user_data_jsonpickle_stage),
+        ("user_data_json", user_data_json_stage),
+        ("user_data_msgpack", user_data_msgpack_stage),
+        ("excel_report", excel_report_stage),
+    ]
+    return {name: measure(stage, repeat) for name, stage in stages}
+
+
+def run_benchmarks(zone_counts: List[int], repeat: int) -> Dict[str, Any]:
+    """
+    Runs the benchmark suite
+    :param zone_counts: The number of height zones of each synthetic building
+    :param repeat: The number of timed runs of each stage
+    :return: A dictionary containing the environment and the measurements of each building
+    """
+    results = []
+    with stub_external_services():
+        for num_zones in zone_counts:
+            stages = benchmark_building(num_zones, repeat)
+            user = ALL_USER_DATA[BENCHMARK_USERNAME]
+            results.append(
+                {
+                    "zones": num_zones,
+                    "stages": stages,
+                    # The memory held by the session once every load of the building has been computed
+                    "session_bytes": get_approximate_size(user),
+                    # The size of the user data sent by each serializer
+                    "user_data_bytes": {
+                        "jsonpickle": len(
+                            json.dumps(
+                                jsonpickle.encode(user, indent=4, unpicklable=False)
+                            )
+                        ),
+                        "json": len(to_json(user)),
+                        "msgpack": len(to_msgpack(user)),
+                    },
+                }
+            )
+    remove_synthetic_user()
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+########################################################################################################################
+# MAIN
+########################################################################################################################
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the load calculation pipeline"
+    )
+    parser.add_argument(
+        "-z",
+        "--zones",
+        type=int,
+        nargs="+",
+        default=DEFAULT_ZONE_COUNTS,
+        help="Number of height zones of each synthetic building",
+    )
+    parser.add_argument(
+        "-r",
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Number of timed runs of each stage",
+    )
+    parser.add_argument(
+        "-o", "--output", type=str, help="File to write the JSON results to"
+    )
+    args = parser.parse_args()
+
+    report = json.dumps(run_benchmarks(args.zones, args.repeat), indent=4)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report)
+    print(report)
@@ -10,7 +10,7 @@
 ########################################################################################################################
 # NOTE: These algorithims are poorly written and have only been kept in order to accomidate legacy implmentations of
 # load combinations for wall cladding algorithims. The actual aogrithims are in `load_combinations_algorithims.py`
-# 
+#
 ########################################################################################################################
 # IMPORTS
 ########################################################################################################################
@@ -27,7 +27,10 @@ from backend.Constants.wall_load_combination_constants import (
 )
 from backend.Entities.Building.building import Building
 from backend.Entities.Snow.snow_load import SnowLoad
-
+from backend.algorithms.load_combination_engine import (
+    compute_wall_load_combination_values,
+    compute_roof_load_combination_values,
+)
 
 ########################################################################################################################
 # HEIGHT ZONE CALCULATIONS
@@ -749,36 +752,12 @@ def get_sls_roof_1_0D_1_0L_Wy_keys():
 ########################################################################################################################
 
 
-def generate_wall_load_entries(columns, dataframe, variables, uls_wall, sls_wall):
-    """
-    Generate wall load entries
-    :param columns: The columns of the dataframe
-    :param dataframe: The dataframe to add the entries to
-    :param variables: The variables associated with the height zone
-    :param uls_wall: The ULS wall load combination values
-    :param sls_wall: The SLS wall load combination values
-    :return: A dataframe containing the wall load entries
-    """
-    # Create a new entry
-    entry = {x: 0.0 for x in columns}
-    # Add the variables to the entry
-    for key, value in variables.items():
-        entry[key] = value
-    # Add the ULS wall load combination values to the entry
-    for key, value in uls_wall.items():
-        entry[key] = value
-    # Add the SLS wall load combination values to the entry
-    for key, value in sls_wall.items():
-        entry[key] = value
-    # Add the entry to the dataframe
-    dataframe.loc[len(dataframe)] = [entry[column] for column in dataframe.columns]
-
-
 def compute_wall_load_combinations(
     building: Building,
     snow_load: SnowLoad,
     uls_wall_load_combination_type: ULSWallLoadCombinationTypes,
     sls_wall_load_combination_type: SLSWallLoadCombinationTypes,
+    load_cases=None,
 ):
     """
     Compute the wall load combinations
@@ -786,316 +765,19 @@ def compute_wall_load_combinations(
     :param snow_load: THe snow load associated with the building
     :param uls_wall_load_combination_type: The ULS wall load combination type
     :param sls_wall_load_combination_type: The SLS wall load combination type
+    :param load_cases: The wall load case matrix if it has already been collected, from the top height zone down
     :return: A dataframe containing the wall load combinations
     """
-    # Determine the wall load combination type
-    selection = (uls_wall_load_combination_type, sls_wall_load_combination_type)
-    # Compute the appropriate combination based on the selection
-    match selection:
-        # ULS 1.4D and SLS 1.0D 1.0Wy
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_4_D,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_4D_keys()
-                + get_sls_wall_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_4D(building, height_zone.zone_num),
-                    sls_wall=sls_wall_1_0D_1_0Wy(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0Wx
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_4_D,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_4D_keys()
-                + get_sls_wall_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_4D(building, height_zone.zone_num),
-                    sls_wall=sls_wall_1_0D_1_0Wx(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 1.25D 1.4Wy and SLS 1.0D 1.0Wy
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_25D_1_4Wy_keys()
-                + get_sls_wall_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_25D_1_4Wy(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wy(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0Wx
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_25D_1_4Wy_keys()
-                + get_sls_wall_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_25D_1_4Wy(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wx(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0Wx
-        case (
-            ULSWallLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_0_9D_1_4Wx_keys()
-                + get_sls_wall_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_0_9D_1_4Wx(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wy(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0Wx
-        case (
-            ULSWallLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_0_9D_1_4Wx_keys()
-                + get_sls_wall_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_0_9D_1_4Wx(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wx(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 1.0D 1.0Ey and SLS 1.0D 1.0Wy
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_0D_1_0Ey_keys()
-                + get_sls_wall_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_0D_1_0Ey(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wy(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 1.0D 1.0Ex and SLS 1.0D 1.0Wx
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_0D_1_0Ey_keys()
-                + get_sls_wall_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_0D_1_0Ey(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wx(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0S
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_0D_1_0Ex_keys()
-                + get_sls_wall_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_0D_1_0Ex(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wy(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0S
-        case (
-            ULSWallLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_wall_1_0D_1_0Ex_keys()
-                + get_sls_wall_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Iterate through the height zones
-            for height_zone in sorted(
-                building.height_zones, key=lambda x: x.zone_num, reverse=True
-            ):
-                # Generate the wall load entries
-                generate_wall_load_entries(
-                    columns=columns,
-                    dataframe=df,
-                    variables=compute_height_zone_variables(
-                        building, height_zone.zone_num
-                    ),
-                    uls_wall=uls_wall_1_0D_1_0Ex(
-                        building, snow_load, height_zone.zone_num
-                    ),
-                    sls_wall=sls_wall_1_0D_1_0Wx(building, height_zone.zone_num),
-                )
-            # Return the dataframe containing the wall load combinations
-            return df
+    # Compute every height zone at once with the vectorized engine
+    columns, values = compute_wall_load_combination_values(
+        building,
+        snow_load,
+        uls_wall_load_combination_type,
+        sls_wall_load_combination_type,
+        load_cases,
+    )
+    # Return the dataframe containing the wall load combinations
+    return pd.DataFrame(values, columns=columns)
 
 
 ########################################################################################################################
@@ -1103,31 +785,6 @@ def compute_wall_load_combinations(
 ########################################################################################################################
 
 
-def generate_roof_load_entries(columns, dataframe, variables, uls_roof, sls_roof):
-    """
-    Generate roof load entries
-    :param columns: The columns of the dataframe
-    :param dataframe: The dataframe to add the entries to
-    :param variables: The variables associated with the height zone
-    :param uls_roof: The ULS roof load combination values
-    :param sls_roof: The SLS roof load combination values
-    :return:
-    """
-    # Create a new entry
-    entry = {x: 0.0 for x in columns}
-    # Add the variables to the entry
-    for key, value in variables.items():
-        entry[key] = value
-    # Add the ULS roof load combination values to the entry
-    for key, value in uls_roof.items():
-        entry[key] = value
-    # Add the SLS roof load combination values to the entry
-    for key, value in sls_roof.items():
-        entry[key] = value
-    # Add the entry to the dataframe
-    dataframe.loc[len(dataframe)] = [entry[column] for column in dataframe.columns]
-
-
 def compute_roof_load_combinations(
     building: Building,
     snow_load: SnowLoad,
@@ -1142,1044 +799,16 @@ def compute_roof_load_combinations(
     :param sls_roof_load_combination_type: The SLS roof load combination type
     :return: A dataframe containing the roof load combinations
     """
-    # Determine the roof load combination type
-    selection = (uls_roof_load_combination_type, sls_roof_load_combination_type)
-    # Compute the appropriate combination based on the selection
-    match selection:
-        # ULS 1.4D and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_4_D,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_4D_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_4D(building),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_4_D,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_4D_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_4D(building),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_4_D,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_4D_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_4D(building),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_4_D,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_4D_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_4D(building),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_4_D,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_4D_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_4D(building),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.4Wy and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_4Wy_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_4Wy(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.4Wy and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_4Wy_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_4Wy(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.4Wy and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_4Wy_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_4Wy(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.4Wy and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_4Wy_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_4Wy(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.4Wy and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_4Wy_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_4Wy(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_4Wx_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_4Wx(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_4Wx_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_4Wx(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0S
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_4Wx_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_4Wx(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_4Wx_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_4Wx(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.4Wx and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_4WX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_4Wx_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_4Wx(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0Ey and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ey_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ey(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0Ey and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ey_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ey(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0Ey and SLS 1.0D 1.0S
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ey_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ey(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0Ey and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ey_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ey(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0Ey and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ey_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ey(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ex_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ex(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0EX and SLS 1.0D 1.0WX
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ex_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ex(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0EX and SLS 1.0D 1.0WY
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ex_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ex(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0EX and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ex_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ex(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.0D 1.0EX and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_0D_1_0Ex_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_0D_1_0Ex(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0WY
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5S and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0WY
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0S
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.4D and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5S,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5S_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5S(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5L and SLS 1.0D 1.0WY
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5L and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5L and SLS 1.0D 1.0Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5L and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 1.25D 1.5L and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_1_25D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_1_25D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_1_25D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.5L and SLS 1.0D 1.0WY
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wy(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.5L and SLS 1.0D 1.0Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0Wx(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.5L and SLS 1.0D 1.0S
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0S_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0S(building, snow_load),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.5L and SLS 1.0D 1.0L Wx
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0L_Wx_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wx(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
-        # ULS 0.9D 1.5L and SLS 1.0D 1.0L Wy
-        case (
-            ULSRoofLoadCombinationTypes.ULS_0_9D_1_5L,
-            SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY,
-        ):
-            # Get the columns for the dataframe
-            columns = (
-                get_height_zone_variables_keys()
-                + get_uls_roof_0_9D_1_5L_keys()
-                + get_sls_roof_1_0D_1_0L_Wy_keys()
-            )
-            # Create a new dataframe
-            df = pd.DataFrame(columns=columns)
-            # Generate the roof load entries
-            generate_roof_load_entries(
-                columns=columns,
-                dataframe=df,
-                variables=compute_top_height_zone_variables(building),
-                uls_roof=uls_roof_0_9D_1_5L(building, snow_load),
-                sls_roof=sls_roof_1_0D_1_0L_Wy(building),
-            )
-            # Return the dataframe containing the roof load combinations
-            return df
+    # Compute the combination with the vectorized engine
+    columns, values = compute_roof_load_combination_values(
+        building,
+        snow_load,
+        uls_roof_load_combination_type,
+        sls_roof_load_combination_type,
+    )
+    # Return the dataframe containing the roof load combinations
+    return pd.DataFrame(values, columns=columns)
+
 
 ###############################################################################################
 # Simple load calculations (used in main calcualtions and should be used in the future)
@@ -2190,15 +819,19 @@ from backend.Constants.materials import Materials
 
 OFFICE_LIVE_LOAD_KPA_PER_UNIT = 4.8
 
+
 # NOTE: this function won't be used since it's a user input
 def calculate_dead_load(width, reference_height, material: Materials):
     return width * reference_height * Materials.get_density(material)
 
+
 # Live Load (NBCC Table 4.1.5.3)
 # NOTE: for now will a simplification of live load
 
+
 def calculate_live_load(width, reference_height):
     return OFFICE_LIVE_LOAD_KPA_PER_UNIT * width * reference_height
 
+
 def calculate_wind_load(width, reference_height, dynamic_pressure):
-    return width * reference_height * dynamic_pressure
\ No newline at end of file
+    return width * reference_height * dynamic_pressure
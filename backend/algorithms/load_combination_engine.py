@@ -0,0 +1,713 @@
+########################################################################################################################
+# load_combination_engine.py
+# This file contains the vectorized engine used to compute the wall and roof load combinations of a building. The load
+# cases of every height zone are collected once into a matrix, and every ULS and SLS combination is expressed as a
+# coefficient matrix applied to it. The formulas mirror the per-combination functions in
+# `load_combination_algorithms.py`.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.Constants.roof_load_combination_constants import (
+    ULSRoofLoadCombinationTypes,
+    SLSRoofLoadCombinationTypes,
+)
+from backend.Constants.wall_load_combination_constants import (
+    ULSWallLoadCombinationTypes,
+    SLSWallLoadCombinationTypes,
+)
+from backend.Entities.Building.building import Building
+from backend.Entities.Snow.snow_load import SnowLoad
+
+########################################################################################################################
+# LOAD CASES
+########################################################################################################################
+
+# The load cases collected for every row, in the order of the columns of the load case matrix. The centre and edge wind
+# pressures are taken from the wall_centre and wall_corner zones for walls and from the roof_interior and roof_corner
+# zones for roofs.
+LOAD_CASES = [
+    # A column of ones, used for constant terms
+    "one",
+    # The height zone variables
+    "xn",
+    "hx",
+    "ce",
+    "ax",
+    # The dead load
+    "D",
+    # The centre wind pressures
+    "W centre pos uls",
+    "W centre neg uls",
+    "W centre pos sls",
+    "W centre neg sls",
+    # The edge wind pressures
+    "W edge pos uls",
+    "W edge neg uls",
+    "W edge pos sls",
+    "W edge neg sls",
+    # The lateral earthquake force
+    "E",
+    # The snow loads
+    "S uls",
+    "S sls",
+]
+
+# The column of each load case in the load case matrix
+LOAD_CASE_INDEX = {case: index for index, case in enumerate(LOAD_CASES)}
+
+# A linear combination of load cases, mapping each load case to its coefficient
+Form = Dict[str, float]
+
+
+def maximum(*forms: Form) -> Tuple[Form, ...]:
+    """
+    Marks a value as the element-wise maximum of several linear combinations of load cases
+    :param forms: The linear combinations of load cases
+    :return: The linear combinations of load cases
+    """
+    return forms
+
+
+# The height zone variables shared by every combination
+HEIGHT_ZONE_VARIABLES = {
+    "xn": {"xn": 1},
+    "hx": {"hx": 1},
+    "ce": {"ce": 1},
+    "ax": {"ax": 1},
+}
+
+########################################################################################################################
+# WALL COMBINATION TABLES
+########################################################################################################################
+
+# The columns and values of each ULS wall combination
+ULS_WALL_COMBINATIONS = {
+    ULSWallLoadCombinationTypes.ULS_1_4_D: (
+        ["uls 1.4D"],
+        {"uls 1.4D": {"D": 1.4}},
+    ),
+    ULSWallLoadCombinationTypes.ULS_1_25D_1_4WY: (
+        ["uls 1.25D", "uls 1.4Wy (centre)", "uls 1.4Wy (edge)", "companion"],
+        {
+            "uls 1.25D": {"D": 1.25},
+            "uls 1.4Wy (centre)": {"W centre pos uls": 1},
+            "uls 1.4Wy (edge)": {"W edge pos uls": 1},
+            "companion": {"S uls": 0.5},
+        },
+    ),
+    ULSWallLoadCombinationTypes.ULS_0_9D_1_4WX: (
+        ["uls 0.9D", "uls 1.4Wx (centre)", "uls 1.4Wx (edge)", "companion"],
+        {
+            "uls 0.9D": {"D": 0.9},
+            "uls 1.4Wx (centre)": {"W centre neg uls": 1},
+            "uls 1.4Wx (edge)": {"W edge neg uls": 1},
+            "companion": {"S uls": 0.5},
+        },
+    ),
+    ULSWallLoadCombinationTypes.ULS_1_0D_1_0EY: (
+        ["uls 1.0D", "uls 1.0Ey", "companion"],
+        {
+            "uls 1.0D": {"D": 1},
+            "uls 1.0Ey": {"E": 1},
+            "companion": {"S uls": 0.25},
+        },
+    ),
+    ULSWallLoadCombinationTypes.ULS_1_0D_1_0EX: (
+        ["uls 1.0D", "uls 1.0Ex", "companion"],
+        {
+            "uls 1.0D": {"D": 1},
+            "uls 1.0Ex": {"E": 1},
+            "companion": {"S uls": 0.25},
+        },
+    ),
+}
+
+# The columns and values of each SLS wall combination
+SLS_WALL_COMBINATIONS = {
+    SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY: (
+        ["sls 1.0D", "sls 1.0Wy (centre)", "sls 1.0Wy (edge)"],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0Wy (centre)": {"W centre pos sls": 1},
+            "sls 1.0Wy (edge)": {"W edge pos sls": 1},
+        },
+    ),
+    # NOTE: sls_wall_1_0D_1_0Wx stores its values under the Wy keys, so the Wx columns are left at zero. This is kept
+    # so that the engine matches the legacy output.
+    SLSWallLoadCombinationTypes.SLS_1_0D_1_0WX: (
+        ["sls 1.0D", "sls 1.0Wx (centre)", "sls 1.0Wx (edge)"],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0Wy (centre)": {"W centre neg sls": 1},
+            "sls 1.0Wy (edge)": {"W edge neg sls": 1},
+        },
+    ),
+}
+
+########################################################################################################################
+# ROOF COMBINATION TABLES
+########################################################################################################################
+
+# The columns and values of each ULS roof combination
+ULS_ROOF_COMBINATIONS = {
+    ULSRoofLoadCombinationTypes.ULS_1_4_D: (
+        ["uls 1.4D"],
+        {"uls 1.4D": {"D": 1.4}},
+    ),
+    ULSRoofLoadCombinationTypes.ULS_1_25D_1_4WY: (
+        [
+            "uls 1.25D",
+            "uls 1.4Wy (corner)",
+            "uls 1.4Wy (edge)",
+            "uls 1.4Wy (centre)",
+            "companion",
+        ],
+        {
+            "uls 1.25D": {"D": 1.25},
+            "uls 1.4Wy (corner)": {"W edge pos uls": 1},
+            "uls 1.4Wy (edge)": {"W edge pos uls": 1},
+            "uls 1.4Wy (centre)": {"W centre pos uls": 1},
+            "companion": maximum({"S uls": 0.5}, {"one": 1}),
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_0_9D_1_4WX: (
+        [
+            "uls 0.9D",
+            "uls 1.4Wx (corner)",
+            "uls 1.4Wx (edge)",
+            "uls 1.4Wx (centre)",
+            "companion",
+        ],
+        {
+            "uls 0.9D": {"D": 0.9},
+            "uls 1.4Wx (corner)": {"W edge neg uls": 1},
+            "uls 1.4Wx (edge)": {"W edge neg uls": 1},
+            "uls 1.4Wx (centre)": {"W centre neg uls": 1},
+            "companion": maximum({"S uls": 0.5}, {"one": 1}),
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EY: (
+        ["uls 1.0D", "uls 1.0Ey", "companion"],
+        {
+            "uls 1.0D": {"D": 1},
+            "uls 1.0Ey": {"E": 1},
+            "companion": {"S uls": 0.25, "one": 1},
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_1_0D_1_0EX: (
+        ["uls 1.0D", "uls 1.0Ex", "companion"],
+        {
+            "uls 1.0D": {"D": 1},
+            "uls 1.0Ex": {"E": 1},
+            "companion": {"S uls": 0.25, "one": 1},
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_1_25D_1_5S: (
+        ["uls 1.25D", "uls 1.5S", "companion (centre)", "companion (edge)"],
+        {
+            "uls 1.25D": {"D": 1.25},
+            "uls 1.5S": {"S uls": 1.5},
+            "companion (centre)": maximum({"W centre pos uls": 0.4}, {"one": 1}),
+            "companion (edge)": maximum({"W edge pos uls": 0.4}, {"one": 1}),
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_0_9D_1_5S: (
+        [
+            "uls 0.9D",
+            "uls 1.5S",
+            "companion",
+            "companion (centre)",
+            "companion (edge)",
+        ],
+        {
+            "uls 0.9D": {"D": 0.9},
+            "uls 1.5S": {"S uls": 1.5},
+            "companion (centre)": maximum({"W centre neg uls": 0.4}, {"one": 1}),
+            "companion (edge)": maximum({"W edge neg uls": 0.4}, {"one": 1}),
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_1_25D_1_5L: (
+        ["uls 1.25D", "uls 1.5L", "companion (centre)", "companion (edge)"],
+        {
+            "uls 1.25D": {"D": 1.25},
+            "uls 1.5L": {"one": 1.5},
+            "companion (centre)": maximum({"W centre pos uls": 0.4}, {"S uls": 1}),
+            "companion (edge)": maximum({"W edge pos uls": 0.4}, {"S uls": 1}),
+        },
+    ),
+    ULSRoofLoadCombinationTypes.ULS_0_9D_1_5L: (
+        ["uls 0.9D", "uls 1.5L", "companion (centre)", "companion (edge)"],
+        {
+            "uls 0.9D": {"D": 0.9},
+            "uls 1.5L": {"one": 1.5},
+            "companion (centre)": maximum({"W centre neg uls": 0.4}, {"S uls": 1}),
+            "companion (edge)": maximum({"W edge neg uls": 0.4}, {"S uls": 1}),
+        },
+    ),
+}
+
+# The columns and values of each SLS roof combination
+SLS_ROOF_COMBINATIONS = {
+    SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WY: (
+        [
+            "sls 1.0D",
+            "sls 1.0Wy (centre)",
+            "sls 1.0Wy (edge)",
+            "companion (centre)",
+            "companion (edge)",
+        ],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0Wy (centre)": {"W centre pos sls": 1},
+            "sls 1.0Wy (edge)": {"W edge pos sls": 1},
+            "companion (centre)": maximum({"W centre neg sls": 0.3}, {"S sls": 0.35}),
+            "companion (edge)": maximum({"W edge neg sls": 0.3}, {"S sls": 0.35}),
+        },
+    ),
+    SLSRoofLoadCombinationTypes.SLS_1_0D_1_0WX: (
+        [
+            "sls 1.0D",
+            "sls 1.0Wx (centre)",
+            "sls 1.0Wx (edge)",
+            "companion (centre)",
+            "companion (edge)",
+        ],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0Wx (centre)": {"W centre neg sls": 1},
+            "sls 1.0Wx (edge)": {"W edge neg sls": 1},
+            "companion (centre)": maximum({"W centre pos sls": 0.3}, {"S sls": 0.35}),
+            "companion (edge)": maximum({"W edge pos sls": 0.3}, {"S sls": 0.35}),
+        },
+    ),
+    SLSRoofLoadCombinationTypes.SLS_1_0D_1_0S: (
+        ["sls 1.0D", "sls 1.0S", "companion"],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0S": {"S sls": 1},
+            "companion": maximum({"S sls": 0.35}, {"one": 0.35}),
+        },
+    ),
+    SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WX: (
+        ["sls 1.0D", "sls 1.0L", "companion (centre)", "companion (edge)"],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0L": {"one": 1},
+            "companion (centre)": maximum({"W centre neg sls": 0.3}, {"one": 0.35}),
+            "companion (edge)": maximum({"W edge neg sls": 0.3}, {"one": 0.35}),
+        },
+    ),
+    SLSRoofLoadCombinationTypes.SLS_1_0D_1_0L_WY: (
+        ["sls 1.0D", "sls 1.0L", "companion (centre)", "companion (edge)"],
+        {
+            "sls 1.0D": {"D": 1},
+            "sls 1.0L": {"one": 1},
+            "companion (centre)": maximum({"W centre pos sls": 0.3}, {"one": 0.35}),
+            "companion (edge)": maximum({"W edge pos sls": 0.3}, {"one": 0.35}),
+        },
+    ),
+}
+
+
+########################################################################################################################
+# COMBINATION PLANS
+########################################################################################################################
+
+
+class CombinationPlan:
+    """
+    A ULS and SLS combination compiled into a coefficient matrix. Each row of the coefficient matrix is a linear
+    combination of load cases, and each column of the output is the element-wise maximum of a contiguous run of rows.
+    """
+
+    # The columns of the output
+    columns: List[str]
+    # The coefficient matrix, with one row per linear combination and one column per load case
+    coefficients: np.ndarray
+    # The first row of the coefficient matrix used by each column of the output
+    starts: np.ndarray
+
+    def __init__(self, columns: List[str], values: Dict[str, Form | Tuple[Form, ...]]):
+        """
+        Constructor for the CombinationPlan class
+        :param columns: The columns of the output
+        :param values: The value of each column, columns without a value are zero
+        """
+        self.columns = columns
+        rows = []
+        starts = []
+        for column in columns:
+            value = values.get(column, {})
+            forms = (value,) if isinstance(value, dict) else value
+            starts.append(len(rows))
+            for form in forms:
+                row = np.zeros(len(LOAD_CASES))
+                for case, coefficient in form.items():
+                    row[LOAD_CASE_INDEX[case]] = coefficient
+                rows.append(row)
+        self.coefficients = np.array(rows)
+        self.starts = np.array(starts)
+
+    def evaluate(self, load_cases: np.ndarray) -> np.ndarray:
+        """
+        Computes the combination for every row of a load case matrix
+        :param load_cases: The load case matrix, with one row per height zone and one column per load case
+        :return: A matrix with one row per height zone and one column per column of the output
+        """
+        return np.maximum.reduceat(
+            load_cases @ self.coefficients.T, self.starts, axis=1
+        )
+
+
+def compile_plan(uls_combination: tuple, sls_combination: tuple) -> CombinationPlan:
+    """
+    Compiles a ULS and SLS combination into a plan. Values are resolved the same way as the legacy entries, the SLS
+    values override the ULS values, which override the height zone variables.
+    :param uls_combination: The columns and values of the ULS combination
+    :param sls_combination: The columns and values of the SLS combination
+    :return: The compiled plan
+    """
+    uls_columns, uls_values = uls_combination
+    sls_columns, sls_values = sls_combination
+    columns = list(HEIGHT_ZONE_VARIABLES) + uls_columns + sls_columns
+    values = {**HEIGHT_ZONE_VARIABLES, **uls_values, **sls_values}
+    return CombinationPlan(columns, values)
+
+
+@lru_cache(maxsize=None)
+def get_wall_plan(
+    uls_wall_load_combination_type: ULSWallLoadCombinationTypes,
+    sls_wall_load_combination_type: SLSWallLoadCombinationTypes,
+) -> CombinationPlan:
+    """
+    Gets the compiled plan of a wall combination
+    :param uls_wall_load_combination_type: The ULS wall load combination type
+    :param sls_wall_load_combination_type: The SLS wall load combination type
+    :return: The compiled plan
+    """
+    return compile_plan(
+        ULS_WALL_COMBINATIONS[uls_wall_load_combination_type],
+        SLS_WALL_COMBINATIONS[sls_wall_load_combination_type],
+    )
+
+
+@lru_cache(maxsize=None)
+def get_roof_plan(
+    uls_roof_load_combination_type: ULSRoofLoadCombinationTypes,
+    sls_roof_load_combination_type: SLSRoofLoadCombinationTypes,
+) -> CombinationPlan:
+    """
+    Gets the compiled plan of a roof combination
+    :param uls_roof_load_combination_type: The ULS roof load combination type
+    :param sls_roof_load_combination_type: The SLS roof load combination type
+    :return: The compiled plan
+    """
+    return compile_plan(
+        ULS_ROOF_COMBINATIONS[uls_roof_load_combination_type],
+        SLS_ROOF_COMBINATIONS[sls_roof_load_combination_type],
+    )
+
+
+def evaluate_plans(
+    plans: List[CombinationPlan], load_cases: np.ndarray
+) -> List[np.ndarray]:
+    """
+    Computes several combinations with a single matrix product
+    :param plans: The compiled plans
+    :param load_cases: The load case matrix
+    :return: The output matrix of each plan
+    """
+    coefficients = np.vstack([plan.coefficients for plan in plans])
+    products = load_cases @ coefficients.T
+    results = []
+    offset = 0
+    for plan in plans:
+        rows = len(plan.coefficients)
+        results.append(
+            np.maximum.reduceat(
+                products[:, offset : offset + rows], plan.starts, axis=1
+            )
+        )
+        offset += rows
+    return results
+
+
+########################################################################################################################
+# LOAD CASE COLLECTION
+########################################################################################################################
+
+
+def get_pressures(height_zone, zone_name: str) -> List[float]:
+    """
+    Gets the positive and negative ULS and SLS pressures of a wind zone
+    :param height_zone: The height zone containing the wind zone
+    :param zone_name: The name of the wind zone
+    :return: The pos_uls, neg_uls, pos_sls and neg_sls pressures
+    """
+    pressure = height_zone.wind_load.get_zone(zone_name).pressure
+    return [pressure.pos_uls, pressure.neg_uls, pressure.pos_sls, pressure.neg_sls]
+
+
+def get_load_case_row(
+    zones_by_number: dict,
+    height_zone,
+    snow_load: SnowLoad,
+    centre_zone: str,
+    edge_zone: str,
+    dead_load=None,
+) -> List[float]:
+    """
+    Collects the load cases of a single height zone into a row of the load case matrix
+    :param zones_by_number: The height zones of the building, keyed by number
+    :param height_zone: The height zone to collect
+    :param snow_load: The snow load associated with the building
+    :param centre_zone: The name of the wind zone used for the centre pressures
+    :param edge_zone: The name of the wind zone used for the edge pressures
+    :param dead_load: The dead load of the row, defaults to the wp of the height zone
+    :return: The row of the load case matrix
+    """
+    # The height of the first height zone is simply its elevation, otherwise it is the difference between its
+    # elevation and the elevation of the previous height zone
+    if height_zone.zone_num == 1:
+        xn = height_zone.elevation
+    else:
+        if height_zone.zone_num - 1 not in zones_by_number:
+            # TODO: Custom error required
+            raise IndexError
+        prev_elevation = zones_by_number[height_zone.zone_num - 1].elevation
+        assert height_zone.elevation > prev_elevation
+        xn = height_zone.elevation - prev_elevation
+    return (
+        [
+            1,
+            xn,
+            height_zone.elevation,
+            height_zone.wind_load.factor.ce,
+            height_zone.seismic_load.ax,
+            height_zone.wp if dead_load is None else dead_load,
+        ]
+        + get_pressures(height_zone, centre_zone)
+        + get_pressures(height_zone, edge_zone)
+        + [height_zone.seismic_load.vp, snow_load.s_uls, snow_load.s_sls]
+    )
+
+
+def get_zones_by_number(building: Building) -> dict:
+    """
+    Indexes the height zones of a building by number, keeping the first height zone with each number like
+    get_height_zone
+    :param building: The building
+    :return: The height zones of the building, keyed by number
+    """
+    zones_by_number = {}
+    for height_zone in building.height_zones:
+        zones_by_number.setdefault(height_zone.zone_num, height_zone)
+    return zones_by_number
+
+
+def collect_load_cases(
+    building: Building,
+    snow_load: SnowLoad,
+    height_zones: list,
+    centre_zone: str,
+    edge_zone: str,
+    dead_load=None,
+) -> np.ndarray:
+    """
+    Collects the load cases of height zones into a load case matrix
+    :param building: The building associated with the height zones
+    :param snow_load: The snow load associated with the building
+    :param height_zones: The height zones to collect, one row is produced per height zone
+    :param centre_zone: The name of the wind zone used for the centre pressures
+    :param edge_zone: The name of the wind zone used for the edge pressures
+    :param dead_load: The dead load used for every row, defaults to the wp of each height zone
+    :return: The load case matrix
+    """
+    # Index the height zones by number once
+    zones_by_number = get_zones_by_number(building)
+    rows = [
+        get_load_case_row(
+            zones_by_number,
+            zones_by_number[height_zone.zone_num],
+            snow_load,
+            centre_zone,
+            edge_zone,
+            dead_load,
+        )
+        for height_zone in height_zones
+    ]
+    return np.array(rows, dtype=float).reshape(len(rows), len(LOAD_CASES))
+
+
+def collect_wall_height_zone_load_cases(
+    building: Building, snow_load: SnowLoad, zone_num: int
+) -> List[float]:
+    """
+    Collects the wall load cases of a single height zone, so that the load case matrix can be assembled from rows that
+    are only recomputed when their height zone changes
+    :param building: The building associated with the height zone
+    :param snow_load: The snow load associated with the building
+    :param zone_num: The number of the height zone
+    :return: The row of the wall load case matrix of the height zone
+    """
+    zones_by_number = get_zones_by_number(building)
+    return get_load_case_row(
+        zones_by_number,
+        zones_by_number[zone_num],
+        snow_load,
+        centre_zone="wall_centre",
+        edge_zone="wall_corner",
+    )
+
+
+def collect_wall_load_cases(building: Building, snow_load: SnowLoad) -> np.ndarray:
+    """
+    Collects the wall load cases of every height zone, from the top height zone down
+    :param building: The building to collect the load cases of
+    :param snow_load: The snow load associated with the building
+    :return: The load case matrix
+    """
+    return collect_load_cases(
+        building,
+        snow_load,
+        sorted(building.height_zones, key=lambda x: x.zone_num, reverse=True),
+        centre_zone="wall_centre",
+        edge_zone="wall_corner",
+    )
+
+
+def collect_roof_load_cases(building: Building, snow_load: SnowLoad) -> np.ndarray:
+    """
+    Collects the roof load cases, which are taken from the top height zone with the dead load of the roof
+    :param building: The building to collect the load cases of
+    :param snow_load: The snow load associated with the building
+    :return: The load case matrix
+    """
+    top_height_zone = max(building.height_zones, key=lambda x: x.zone_num)
+    return collect_load_cases(
+        building,
+        snow_load,
+        [top_height_zone],
+        centre_zone="roof_interior",
+        edge_zone="roof_corner",
+        dead_load=building.roof.wp,
+    )
+
+
+########################################################################################################################
+# MAIN FUNCTIONS
+########################################################################################################################
+
+
+def compute_wall_load_combination_values(
+    building: Building,
+    snow_load: SnowLoad,
+    uls_wall_load_combination_type: ULSWallLoadCombinationTypes,
+    sls_wall_load_combination_type: SLSWallLoadCombinationTypes,
+    load_cases: Optional[np.ndarray] = None,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Compute a wall load combination without building a dataframe
+    :param building: The building to compute the wall load combination for
+    :param snow_load: The snow load associated with the building
+    :param uls_wall_load_combination_type: The ULS wall load combination type
+    :param sls_wall_load_combination_type: The SLS wall load combination type
+    :param load_cases: The wall load case matrix if it has already been collected, from the top height zone down
+    :return: The columns and a matrix with one row per height zone, from the top height zone down
+    """
+    plan = get_wall_plan(uls_wall_load_combination_type, sls_wall_load_combination_type)
+    if load_cases is None:
+        load_cases = collect_wall_load_cases(building, snow_load)
+    return plan.columns, plan.evaluate(load_cases)
+
+
+def compute_roof_load_combination_values(
+    building: Building,
+    snow_load: SnowLoad,
+    uls_roof_load_combination_type: ULSRoofLoadCombinationTypes,
+    sls_roof_load_combination_type: SLSRoofLoadCombinationTypes,
+) -> Tuple[List[str], np.ndarray]:
+    """
+    Compute a roof load combination without building a dataframe
+    :param building: The building to compute the roof load combination for
+    :param snow_load: The snow load associated with the building
+    :param uls_roof_load_combination_type: The ULS roof load combination type
+    :param sls_roof_load_combination_type: The SLS roof load combination type
+    :return: The columns and a matrix with a single row for the top height zone
+    """
+    plan = get_roof_plan(uls_roof_load_combination_type, sls_roof_load_combination_type)
+    return plan.columns, plan.evaluate(collect_roof_load_cases(building, snow_load))
+
+
+def compute_all_wall_load_combinations(
+    building: Building,
+    snow_load: SnowLoad,
+    as_dataframe: bool = True,
+    load_cases: Optional[np.ndarray] = None,
+) -> dict:
+    """
+    Compute every wall load combination, collecting the load cases once
+    :param building: The building to compute the wall load combinations for
+    :param snow_load: The snow load associated with the building
+    :param as_dataframe: Whether to return dataframes or (columns, matrix) pairs
+    :param load_cases: The wall load case matrix if it has already been collected, from the top height zone down
+    :return: A dictionary mapping each (ULS, SLS) combination type pair to its result
+    """
+    selections = [
+        (uls_wall, sls_wall)
+        for uls_wall in ULSWallLoadCombinationTypes
+        for sls_wall in SLSWallLoadCombinationTypes
+    ]
+    plans = [get_wall_plan(*selection) for selection in selections]
+    if load_cases is None:
+        load_cases = collect_wall_load_cases(building, snow_load)
+    results = evaluate_plans(plans, load_cases)
+    return {
+        selection: (
+            pd.DataFrame(result, columns=plan.columns)
+            if as_dataframe
+            else (plan.columns, result)
+        )
+        for selection, plan, result in zip(selections, plans, results)
+    }
+
+
+def compute_all_roof_load_combinations(
+    building: Building, snow_load: SnowLoad, as_dataframe: bool = True
+) -> dict:
+    """
+    Compute every roof load combination, collecting the load cases once
+    :param building: The building to compute the roof load combinations for
+    :param snow_load: The snow load associated with the building
+    :param as_dataframe: Whether to return dataframes or (columns, matrix) pairs
+    :return: A dictionary mapping each (ULS, SLS) combination type pair to its result
+    """
+    selections = [
+        (uls_roof, sls_roof)
+        for uls_roof in ULSRoofLoadCombinationTypes
+        for sls_roof in SLSRoofLoadCombinationTypes
+    ]
+    plans = [get_roof_plan(*selection) for selection in selections]
+    results = evaluate_plans(plans, collect_roof_load_cases(building, snow_load))
+    return {
+        selection: (
+            pd.DataFrame(result, columns=plan.columns)
+            if as_dataframe
+            else (plan.columns, result)
+        )
+        for selection, plan, result in zip(selections, plans, results)
+    }
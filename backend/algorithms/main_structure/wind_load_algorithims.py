@@ -9,7 +9,11 @@
 ########################################################################################################################
 
 import math
+import threading
+from functools import lru_cache
+import numpy as np
 from scipy.integrate import quad
+from scipy.interpolate import RectBivariateSpline
 from backend.Constants.wind_constants import (WindExposureFactorSelections, WindFaceConstants)
 from backend.Constants.materials import Materials
 
@@ -18,6 +22,13 @@ from backend.Constants.materials import Materials
 T_CONST = 3600
 # air densitykg/m3
 ρ_CONST = 1.2929
+# Heights and widths (m) covered by the background turbulence factor table, B is interpolated in log space between them
+B_TABLE_MIN_DIMENSION = 1
+B_TABLE_MAX_DIMENSION = 1000
+# Number of grid points along each axis of the background turbulence factor table
+B_TABLE_SIZE = 40
+# Largest relative error allowed between the table and quadrature, the table is not used if it is exceeded
+B_TABLE_TOLERANCE = 1e-4
 
 def get_exposure_factor(reference_height, terrain_type: WindExposureFactorSelections, value = None) -> float:
     """
@@ -134,6 +145,75 @@ def calculate_B(H, w):
     B = (4 / 3) * result
     return B
 
+class BackgroundTurbulenceTable:
+    """
+    Bicubic interpolation table of B(H, w) over log(H) and log(w). The table is built on first use and checked against
+    quadrature at the centres of a sample of its cells, if the error exceeds B_TABLE_TOLERANCE the table is disabled
+    and every lookup falls back to quadrature.
+    """
+
+    def __init__(self, min_dimension=B_TABLE_MIN_DIMENSION, max_dimension=B_TABLE_MAX_DIMENSION,
+                 size=B_TABLE_SIZE, tolerance=B_TABLE_TOLERANCE):
+        self.min_dimension = min_dimension
+        self.max_dimension = max_dimension
+        self.size = size
+        self.tolerance = tolerance
+        # The interpolating spline, None until the table is built or if it failed validation
+        self.spline = None
+        # The largest relative error measured while validating the table
+        self.max_error = None
+        self.built = False
+        self.lock = threading.Lock()
+
+    def build(self):
+        """
+        Computes B at every grid point with quadrature and validates the interpolation at cell centres
+        """
+        with self.lock:
+            if self.built:
+                return
+            axis = np.linspace(math.log(self.min_dimension), math.log(self.max_dimension), self.size)
+            values = np.array([[calculate_B(math.exp(h), math.exp(w)) for w in axis] for h in axis])
+            spline = RectBivariateSpline(axis, axis, values, kx=3, ky=3)
+            # Validate at the centres of every third cell along each axis and of the last cell, where the error is
+            # largest
+            centres = (axis[:-1] + axis[1:]) / 2
+            samples = list(centres[::3]) + [centres[-1]]
+            self.max_error = 0
+            for h in samples:
+                for w in samples:
+                    exact = calculate_B(math.exp(h), math.exp(w))
+                    self.max_error = max(self.max_error, abs(spline.ev(h, w) - exact) / exact)
+            self.spline = spline if self.max_error <= self.tolerance else None
+            self.built = True
+
+    def contains(self, H, w):
+        return self.min_dimension <= H <= self.max_dimension and self.min_dimension <= w <= self.max_dimension
+
+    def lookup(self, H, w):
+        """
+        Returns the interpolated B(H, w), or None if (H, w) is outside the table or the table is disabled
+        """
+        if not self.contains(H, w):
+            return None
+        if not self.built:
+            self.build()
+        if self.spline is None:
+            return None
+        return float(self.spline.ev(math.log(H), math.log(w)))
+
+
+BACKGROUND_TURBULENCE_TABLE = BackgroundTurbulenceTable()
+
+@lru_cache(maxsize=4096)
+def get_B(H, w):
+    """
+    Background turbulence factor served from the interpolation table, falling back to quadrature outside of it.
+    Results are memoized since every height zone of a building shares the same H and w.
+    """
+    B = BACKGROUND_TURBULENCE_TABLE.lookup(H, w)
+    return calculate_B(H, w) if B is None else B
+
 # Size Reduction Factor (s) corrected formula
 def calculate_size_reduction_factor(H, w, f_nD, V_H):
     term1 = 1 / (1 + (8 * f_nD * H) / (3 * V_H))
@@ -199,7 +279,7 @@ def calculate_cg_dynamic(H, w, f_nD, material: Materials, CeH, q, Iw, terrain_ty
     F = calculate_gust_energy_ratio(f_nD, V_H)
 
     # 5. Background turbulence factor (B)
-    B = calculate_B(H, w)
+    B = get_B(H, w)
 
     beta = None
     if material == Materials.STEEL:
@@ -0,0 +1,344 @@
+########################################################################################################################
+# excel_report.py
+# This file contains the code used to create the Excel report of a user from the data stored in the user's memory slot.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import tempfile
+
+from backend.API.Managers.load_dependency_manager import get_user_wall_load_cases
+from backend.API.Managers.user_data_manager import (
+    get_user_location,
+    get_user_dimensions,
+    get_user_cladding,
+    get_user_roof,
+    get_user_importance_category,
+    get_user_building,
+    get_user_snow_load,
+)
+from backend.algorithms.load_combination_engine import (
+    compute_all_wall_load_combinations,
+    compute_all_roof_load_combinations,
+)
+from backend.reports.excel_report_writer import ExcelReportWriter
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def get_wind_factor_row(height_zone) -> list:
+    """
+    Gets the wind factor row of a height zone
+    :param height_zone: The height zone
+    :return: The height zone number followed by its ct, ce, cei and cg
+    """
+    factor = height_zone.wind_load.factor
+    return [height_zone.zone_num, factor.ct, factor.ce, factor.cei, factor.cg]
+
+
+def get_wind_pressure_rows(height_zone) -> list:
+    """
+    Gets the wind pressure rows of a height zone, one for each of its five zones
+    :param height_zone: The height zone
+    :return: The wind pressure rows of the height zone
+    """
+    rows = []
+    for i in range(1, 6):
+        zone = height_zone.wind_load.get_zone(i)
+        pressure = zone.pressure
+        rows.append(
+            [
+                height_zone.zone_num,
+                i,
+                zone.name,
+                pressure.pi_pos_uls,
+                pressure.pi_neg_uls,
+                pressure.pe_pos_uls,
+                pressure.pe_neg_uls,
+                pressure.pos_uls,
+                pressure.neg_uls,
+                pressure.pi_pos_sls,
+                pressure.pi_neg_sls,
+                pressure.pe_pos_sls,
+                pressure.pe_neg_sls,
+                pressure.pos_sls,
+                pressure.neg_sls,
+            ]
+        )
+    return rows
+
+
+def get_seismic_row(height_zone) -> list:
+    """
+    Gets the seismic row of a height zone
+    :param height_zone: The height zone
+    :return: The height zone number followed by its ar, rp, cp, ax, sp, vp and vp_snow
+    """
+    seismic_load = height_zone.seismic_load
+    return [
+        height_zone.zone_num,
+        seismic_load.factor.ar,
+        seismic_load.factor.rp,
+        seismic_load.factor.cp,
+        seismic_load.ax,
+        seismic_load.sp,
+        seismic_load.vp,
+        seismic_load.vp_snow,
+    ]
+
+
+########################################################################################################################
+# MAIN FUNCTION
+########################################################################################################################
+
+
+def create_excel_report(
+    username: str, consolidate: bool = False
+) -> tempfile.SpooledTemporaryFile:
+    """
+    Creates the Excel report of a user using all the data stored in the user's memory slot
+    :param username: The username of the user
+    :param consolidate: Whether to write the height zone wind factor, wind pressure and seismic data as one table each
+    instead of one sheet per height zone
+    :return: A file positioned at the start of the finished report
+    """
+    # The report is written row by row with a bounded amount of memory
+    writer = ExcelReportWriter()
+
+    # Get the location data of the user
+    location = get_user_location(username)
+    location_headers = [
+        "Address",
+        "Latitude",
+        "Longitude",
+        "Site Designation",
+        "Xv",
+        "Xs",
+        "Wind Velocity Pressure",
+        "Snow Load",
+        "Rain Load",
+        "Design Spectral Acceleration 0.2s",
+        "Design Spectral Acceleration 1.0s",
+    ]
+    location_data = [
+        [
+            location.address,
+            location.latitude,
+            location.longitude,
+            location.site_designation,
+            location.xv,
+            location.xs,
+            location.wind_velocity_pressure,
+            location.snow_load,
+            location.rain_load,
+            location.design_spectral_acceleration_0_2,
+            location.design_spectral_acceleration_1,
+        ]
+    ]
+    writer.write_table("Location", location_headers, location_data)
+
+    # Get the dimensions data of the user
+    dimensions = get_user_dimensions(username)
+    dimension_headers = ["Height", "Height Eave", "Height Ridge", "Width"]
+    dimension_data = [
+        [
+            dimensions.height,
+            dimensions.height_eave,
+            dimensions.height_ridge,
+            dimensions.width,
+        ]
+    ]
+    writer.write_table("Dimensions", dimension_headers, dimension_data)
+
+    # Get the cladding data of the user
+    cladding = get_user_cladding(username)
+    cladding_headers = ["Top of Cladding", "Bottom of Cladding"]
+    cladding_data = [[cladding.c_top, cladding.c_bot]]
+    writer.write_table("Cladding", cladding_headers, cladding_data)
+
+    # Get the roof data of the user
+    roof = get_user_roof(username)
+    roof_headers = [
+        "Smaller Plan Dimension",
+        "Larger Plan Dimension",
+        "Slope",
+        "Wall Slope",
+        "Uniform Dead Load",
+    ]
+    roof_data = [[roof.w_roof, roof.l_roof, roof.slope, roof.wall_slope, roof.wp]]
+    writer.write_table("Roof", roof_headers, roof_data)
+
+    # Get the building data of the user
+    building = get_user_building(username)
+    building_headers = ["Number of Floors", "Mid Height"]
+    building_data = [[building.num_floor, building.h_opening]]
+    writer.write_table("Building", building_headers, building_data)
+
+    # Get the importance category data of the user
+    importance_category = get_user_importance_category(username)
+    importance_category_headers = ["Importance Category"]
+    importance_category_data = [[importance_category]]
+    writer.write_table(
+        "Importance Category", importance_category_headers, importance_category_data
+    )
+
+    # Get the height zone data of the user
+    height_zones = sorted(building.height_zones, key=lambda x: x.zone_num)
+    height_zone_elevation_headers = ["Height Zone", "Elevation"]
+    writer.write_table(
+        "Height Zone Elevation",
+        height_zone_elevation_headers,
+        ([height_zone.zone_num, height_zone.elevation] for height_zone in height_zones),
+    )
+
+    height_zone_material_headers = ["Height Zone", "Material Load"]
+    writer.write_table(
+        "Height Zone Material",
+        height_zone_material_headers,
+        ([height_zone.zone_num, height_zone.wp] for height_zone in height_zones),
+    )
+
+    # Get the wind factor and pressure data of the user
+    wind_factor_headers = ["Height Zone", "ct", "ce", "cei", "cg"]
+    wind_pressure_headers = [
+        "Height Zone",
+        "Zone",
+        "Zone Name",
+        "pi pos uls",
+        "pi neg uls",
+        "pe pos uls",
+        "pe neg uls",
+        "pos uls",
+        "neg uls",
+        "pi pos sls",
+        "pi neg sls",
+        "pe pos sls",
+        "pe neg sls",
+        "pos sls",
+        "neg sls",
+    ]
+    # Get the seismic data of the user
+    height_zone_seismic_headers = [
+        "Height Zone",
+        "ar",
+        "rp",
+        "cp",
+        "ax",
+        "sp",
+        "vp",
+        "vp_snow",
+    ]
+    # Either write one table per kind of data, or one sheet per height zone and kind of data
+    if consolidate:
+        writer.write_table(
+            "Height Zone Wind Factor",
+            wind_factor_headers,
+            (get_wind_factor_row(height_zone) for height_zone in height_zones),
+        )
+        writer.write_table(
+            "Height Zone Wind Pressure",
+            wind_pressure_headers,
+            (
+                row
+                for height_zone in height_zones
+                for row in get_wind_pressure_rows(height_zone)
+            ),
+        )
+        writer.write_table(
+            "Height Zone Seismic",
+            height_zone_seismic_headers,
+            (get_seismic_row(height_zone) for height_zone in height_zones),
+        )
+    else:
+        for i, height_zone in enumerate(height_zones):
+            writer.write_table(
+                f"Height Zone {i + 1} Wind Factor",
+                wind_factor_headers,
+                [get_wind_factor_row(height_zone)],
+            )
+        for i, height_zone in enumerate(height_zones):
+            writer.write_table(
+                f"Height Zone {i + 1} Wind Pressure",
+                wind_pressure_headers,
+                get_wind_pressure_rows(height_zone),
+            )
+        for i, height_zone in enumerate(height_zones):
+            writer.write_table(
+                f"Height Zone {i + 1} Seismic",
+                height_zone_seismic_headers,
+                [get_seismic_row(height_zone)],
+            )
+
+    # Get the snow load data of the user
+    upwind_snow_load = get_user_snow_load(username)["upwind"]
+    downwind_snow_load = get_user_snow_load(username)["downwind"]
+
+    snow_load_headers = ["slope", "cs", "ca", "cw", "cb", "s_uls"]
+    for name, snow_load in [
+        ("upwind", upwind_snow_load),
+        ("downwind", downwind_snow_load),
+    ]:
+        snow_load_data = [
+            [
+                name,
+                snow_load.factor.cs,
+                snow_load.factor.ca,
+                snow_load.factor.cw,
+                snow_load.factor.cb,
+                snow_load.s_uls,
+            ]
+        ]
+        writer.write_table(
+            f"{name.capitalize()} Snow Load", snow_load_headers, snow_load_data
+        )
+
+    # Get the wall and roof load combination data of the user, each collects the load cases of the building once. The
+    # wall load cases of each height zone are reused from the user's dependency graph when they are up to date.
+    wall_load_combinations = compute_all_wall_load_combinations(
+        building=building,
+        snow_load=upwind_snow_load,
+        as_dataframe=False,
+        load_cases=get_user_wall_load_cases(username),
+    )
+    roof_load_combinations_upwind = compute_all_roof_load_combinations(
+        building=building, snow_load=upwind_snow_load, as_dataframe=False
+    )
+    roof_load_combinations_downwind = compute_all_roof_load_combinations(
+        building=building, snow_load=downwind_snow_load, as_dataframe=False
+    )
+
+    # Write all wall combinations into a single sheet
+    writer.write_sections(
+        "Wall Load Combinations",
+        (
+            (f"{uls_wall.value} {sls_wall.value}", columns, values.tolist())
+            for (uls_wall, sls_wall), (
+                columns,
+                values,
+            ) in wall_load_combinations.items()
+        ),
+    )
+
+    # Write all roof combinations into a single sheet, the upwind combinations first
+    writer.write_sections(
+        "Roof Load Combinations",
+        (
+            (f"{side} {uls_roof.value} {sls_roof.value}", columns, values.tolist())
+            for side, combinations in [
+                ("Upwind", roof_load_combinations_upwind),
+                ("Downwind", roof_load_combinations_downwind),
+            ]
+            for (uls_roof, sls_roof), (columns, values) in combinations.items()
+        ),
+    )
+
+    return writer.save()
@@ -0,0 +1,160 @@
+########################################################################################################################
+# excel_report_writer.py
+# This file contains the writer used to stream Excel reports row by row with a bounded amount of memory.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import math
+import tempfile
+from enum import Enum
+from typing import Any, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The number of bytes of the finished workbook kept in memory before it is spooled to a temporary file
+REPORT_SPOOL_SIZE = 8 * 1024 * 1024
+# The number of bytes sent in each chunk of a streamed report
+REPORT_CHUNK_SIZE = 64 * 1024
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def to_cell_value(value: Any) -> Any:
+    """
+    Converts a value to one that can be written to a cell, matching the conversions made by pandas.to_excel
+    :param value: The value to convert
+    :return: The converted value
+    """
+    # Missing values are written as empty cells
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    # Numpy scalars are written as their Python equivalent
+    if isinstance(value, np.generic):
+        return to_cell_value(value.item())
+    # Enums and other objects are written as their string representation
+    if isinstance(value, Enum) or not isinstance(value, (int, float, str, bool)):
+        return str(value)
+    return value
+
+
+def iterate_chunks(
+    file: tempfile.SpooledTemporaryFile, chunk_size: int = REPORT_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Reads a finished report in chunks, closing it once it has been read
+    :param file: The finished report
+    :param chunk_size: The number of bytes in each chunk
+    :return: An iterator over the chunks of the report
+    """
+    try:
+        while chunk := file.read(chunk_size):
+            yield chunk
+    finally:
+        file.close()
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class ExcelReportWriter:
+    """
+    Writes an Excel report using a write-only workbook, so rows are flushed to disk as they are appended and memory use
+    does not grow with the size of the report. Tables are laid out the same way pandas.to_excel lays out a dataframe.
+    """
+
+    # The write-only workbook the report is written to
+    workbook: Workbook
+
+    def __init__(self):
+        """
+        Constructor for the ExcelReportWriter class
+        """
+        self.workbook = Workbook(write_only=True)
+
+    @staticmethod
+    def header_row(worksheet, headers: Sequence[str], index: bool) -> List[Any]:
+        """
+        Creates a bold header row
+        :param worksheet: The worksheet the row is written to
+        :param headers: The column headers
+        :param index: Whether the table has an index column
+        :return: The header row
+        """
+        row = [None] if index else []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=to_cell_value(header))
+            cell.font = Font(bold=True)
+            row.append(cell)
+        return row
+
+    def write_table(
+        self,
+        sheet_name: str,
+        headers: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        index: bool = True,
+    ) -> None:
+        """
+        Writes a table to a new sheet
+        :param sheet_name: The name of the sheet
+        :param headers: The column headers
+        :param rows: The rows of the table, consumed lazily
+        :param index: Whether to prefix each row with its index, like pandas.to_excel
+        :return: None
+        """
+        worksheet = self.workbook.create_sheet(title=sheet_name)
+        worksheet.append(self.header_row(worksheet, headers, index))
+        for i, row in enumerate(rows):
+            values = [to_cell_value(value) for value in row]
+            worksheet.append([i] + values if index else values)
+
+    def write_sections(
+        self,
+        sheet_name: str,
+        sections: Iterable[Tuple[str, Sequence[str], Iterable[Sequence[Any]]]],
+    ) -> None:
+        """
+        Writes several titled tables one after another to a new sheet, separated by a blank row
+        :param sheet_name: The name of the sheet
+        :param sections: The title, column headers and rows of each table, consumed lazily
+        :return: None
+        """
+        worksheet = self.workbook.create_sheet(title=sheet_name)
+        for i, (title, headers, rows) in enumerate(sections):
+            # Separate each table from the previous one
+            if i > 0:
+                worksheet.append([])
+            worksheet.append(self.header_row(worksheet, [title], index=True))
+            worksheet.append(self.header_row(worksheet, headers, index=False))
+            for row in rows:
+                worksheet.append([to_cell_value(value) for value in row])
+
+    def save(self) -> tempfile.SpooledTemporaryFile:
+        """
+        Finishes the report
+        :return: A file positioned at the start of the finished workbook, kept in memory unless it is large
+        """
+        output = tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_SIZE)
+        self.workbook.save(output)
+        output.seek(0)
+        return output
@@ -13,7 +13,8 @@
 ########################################################################################################################
 
 import matplotlib
-matplotlib.use('Agg')
+
+matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt
 import numpy as np
@@ -29,7 +30,6 @@ from backend.algorithms.load_combination_algorithms import (
 )
 from config import get_file_path
 
-
 ########################################################################################################################
 # MAIN FUNCTION
 ########################################################################################################################
@@ -44,6 +44,31 @@ def generate_bar_chart(id: str, building: Building, snow_load: SnowLoad):
     :return: The number of bar charts generated
     """
     count = 0
+    # Compute the load combinations once, they contain a row for every height zone
+    dead_load_data = compute_wall_load_combinations(
+        building,
+        snow_load,
+        ULSWallLoadCombinationTypes.ULS_1_4_D,
+        SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
+    )
+    full_wind_y_data = compute_wall_load_combinations(
+        building,
+        snow_load,
+        ULSWallLoadCombinationTypes.ULS_1_25D_1_4WY,
+        SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
+    )
+    seismic_y_data = compute_wall_load_combinations(
+        building,
+        snow_load,
+        ULSWallLoadCombinationTypes.ULS_1_0D_1_0EY,
+        SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
+    )
+    seismic_x_data = compute_wall_load_combinations(
+        building,
+        snow_load,
+        ULSWallLoadCombinationTypes.ULS_1_0D_1_0EX,
+        SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
+    )
     # Iterate through each height zone
     for height_zone in sorted(building.height_zones, key=lambda x: x.zone_num):
         # Axis labels
@@ -53,23 +78,10 @@ def generate_bar_chart(id: str, building: Building, snow_load: SnowLoad):
         # Create a dictionary to store the pairs with a default value of 0
         pairs = {(a, b): 0 for a in x_labels for b in y_labels}
 
-        # Compute the load combinations
-        dead_load_data = compute_wall_load_combinations(
-            building,
-            snow_load,
-            ULSWallLoadCombinationTypes.ULS_1_4_D,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        )
         pairs[("Dead Load", "D")] = dead_load_data.loc[
             height_zone.zone_num - 1, "uls 1.4D"
         ]
 
-        full_wind_y_data = compute_wall_load_combinations(
-            building,
-            snow_load,
-            ULSWallLoadCombinationTypes.ULS_1_25D_1_4WY,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        )
         pairs[("Full Wind Y", "D")] = full_wind_y_data.loc[
             height_zone.zone_num - 1, "uls 1.25D"
         ]
@@ -77,12 +89,6 @@ def generate_bar_chart(id: str, building: Building, snow_load: SnowLoad):
             height_zone.zone_num - 1, "uls 1.4Wy (centre)"
         ]
 
-        seismic_y_data = compute_wall_load_combinations(
-            building,
-            snow_load,
-            ULSWallLoadCombinationTypes.ULS_1_0D_1_0EY,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        )
         pairs[("Seismic Y", "D")] = seismic_y_data.loc[
             height_zone.zone_num - 1, "uls 1.0D"
         ]
@@ -90,12 +96,6 @@ def generate_bar_chart(id: str, building: Building, snow_load: SnowLoad):
             height_zone.zone_num - 1, "uls 1.0Ey"
         ]
 
-        seismic_x_data = compute_wall_load_combinations(
-            building,
-            snow_load,
-            ULSWallLoadCombinationTypes.ULS_1_0D_1_0EX,
-            SLSWallLoadCombinationTypes.SLS_1_0D_1_0WY,
-        )
         pairs[("Seismic X", "D")] = seismic_x_data.loc[
             height_zone.zone_num - 1, "uls 1.0D"
         ]
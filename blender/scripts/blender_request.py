@@ -1,6 +1,7 @@
 ########################################################################################################################
 # blender_request.py
-# This file contains the code to create a JSON string to be used in Blender and then runs Blender with created json
+# This file contains the code to create a JSON string to be used in Blender and then runs the Blender scripts with the
+# created json on the Blender worker pool
 #
 # Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
 # By using this code, you agree to abide by the terms and conditions in those files.
@@ -20,12 +21,18 @@ file = __file__
 module_path = os.path.dirname(file)
 sys.path.append(module_path)
 
-import subprocess
-from concurrent.futures import ThreadPoolExecutor
-
 import json
 from blender_object import *
+from blender_worker_pool import BlenderWorkerPool
 import jsonpickle
+from settings import get_settings
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The pool of Blender workers the scripts are run on, configured by the render settings
+BLENDER_WORKER_POOL = BlenderWorkerPool.from_settings(get_settings().render)
 
 ########################################################################################################################
 # FUNCTIONS
@@ -56,31 +63,31 @@ def create_blender_json(num_zones, heights, loads):
 # id = 3
 def run_blender_script(script_path, id, json_str):
     """
-    Run a Blender script.
+    Run a Blender script on a worker from the Blender worker pool.
     :param script_path: The path to the Blender script.
     :param id: The id of the Blender script.
     :param json_str: The JSON string to be used in Blender.
     :return: None
     """
-    try:
-        blender_path = os.environ["BLENDER"]
-    except KeyError:
-        print("Blender path not found trying default")
-        blender_path = "blender"
-    args = ["--background", "--python", script_path, "--", str(id), json_str]
-
-    # Combine the Blender path and arguments
-    command = [blender_path] + args
-    print(command)
-    # return(command)
-    # Run the command
-    try:
-        result = subprocess.run(
-            command, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        print(f"{script_path} ran successfully:", result.stdout.decode())
-    except subprocess.CalledProcessError as e:
-        print(f"Error running {script_path}:", e.stderr.decode())
+    run_blender_scripts([(script_path, id, json_str)])
+
+
+def run_blender_scripts(jobs):
+    """
+    Run several Blender scripts concurrently on workers from the Blender worker pool, waiting for all of them to finish.
+    :param jobs: A list of (script path, id, JSON string) tuples.
+    :return: None
+    """
+    futures = [
+        (script_path, BLENDER_WORKER_POOL.submit(script_path, id, json_str))
+        for script_path, id, json_str in jobs
+    ]
+    for script_path, future in futures:
+        try:
+            future.result()
+            print(f"{script_path} ran successfully")
+        except Exception as e:
+            print(f"Error running {script_path}:", e)
 
 
 # # Paths to the scripts
@@ -0,0 +1,88 @@
+########################################################################################################################
+# blender_worker.py
+# This file contains the long-lived worker run inside Blender. It reads render jobs from stdin, one JSON object per line,
+# resets the scene, runs the requested script and writes a reply line to stdout.
+#
+# Usage: blender --background --python blender_worker.py
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import bpy
+import sys
+import os
+import json
+import runpy
+import traceback
+
+# adding modules to blender path
+file = __file__
+module_path = os.path.dirname(file)
+sys.path.append(module_path)
+
+from blender_worker_pool import REPLY_PREFIX
+
+########################################################################################################################
+# FUNCTIONS
+########################################################################################################################
+
+
+def reply(message):
+    """
+    Writes a reply line to stdout, prefixed so that it can be told apart from Blender's own output.
+    :param message: The reply to write.
+    :return: None
+    """
+    sys.stdout.write(REPLY_PREFIX + json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+
+def reset_scene():
+    """
+    Restores the startup scene, so that every job starts from the same state as a freshly started Blender.
+    :return: None
+    """
+    bpy.ops.wm.read_homefile()
+
+
+def run_job(job, base_argv):
+    """
+    Runs a render job. The scripts read their id and JSON string from the end of sys.argv, so they are passed there.
+    :param job: A dictionary containing the script path, id and JSON string of the job.
+    :param base_argv: The arguments Blender was started with.
+    :return: None
+    """
+    reset_scene()
+    sys.argv = base_argv + [str(job["id"]), job["json"]]
+    runpy.run_path(job["script"], run_name="__main__")
+
+
+########################################################################################################################
+# MAIN
+########################################################################################################################
+
+
+def main():
+    base_argv = list(sys.argv)
+    if "--" not in base_argv:
+        base_argv.append("--")
+    reply({"ready": True})
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            run_job(json.loads(line), base_argv)
+            reply({"ok": True})
+        except BaseException as e:
+            reply({"ok": False, "error": "".join(traceback.format_exception(e))})
+
+
+if __name__ == "__main__":
+    main()
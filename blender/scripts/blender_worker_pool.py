@@ -0,0 +1,342 @@
+########################################################################################################################
+# blender_worker_pool.py
+# This file contains the pool of long-lived headless Blender workers used to render models without starting a new
+# Blender process for every render.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import json
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The prefix of the lines a worker writes to report its state, distinguishing them from Blender's own output
+REPLY_PREFIX = "@@blender-worker@@"
+# The path of the script run inside each worker
+WORKER_SCRIPT_PATH = os.path.join(os.path.dirname(__file__), "blender_worker.py")
+
+
+########################################################################################################################
+# WORKER CLASS
+########################################################################################################################
+
+
+class BlenderWorker:
+    """
+    A headless Blender process that runs render jobs sent to it over its stdin, one JSON object per line
+    """
+
+    # The Blender process
+    process: subprocess.Popen
+    # The replies written by the worker, read from its stdout by a background thread
+    replies: queue.Queue
+    # The number of jobs run by the worker
+    num_jobs: int
+
+    def __init__(self, blender_path: str, startup_timeout: float):
+        """
+        Constructor for the BlenderWorker class, starts the process and waits until it is ready to accept jobs
+        :param blender_path: The path of the Blender executable
+        :param startup_timeout: The number of seconds the worker may take to start
+        """
+        self.process = subprocess.Popen(
+            [blender_path, "--background", "--python", WORKER_SCRIPT_PATH, "--"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+        self.replies = queue.Queue()
+        self.num_jobs = 0
+        threading.Thread(target=self.read_replies, daemon=True).start()
+        try:
+            self.wait_for_reply(startup_timeout)
+        except Exception:
+            self.kill()
+            raise
+
+    def read_replies(self) -> None:
+        """
+        Reads the output of the worker until it exits, keeping the replies and discarding Blender's own output
+        :return: None
+        """
+        for line in self.process.stdout:
+            if line.startswith(REPLY_PREFIX):
+                self.replies.put(json.loads(line[len(REPLY_PREFIX) :]))
+        # Wake up anyone waiting on a worker that has exited
+        self.replies.put(None)
+
+    def wait_for_reply(self, timeout: float) -> dict:
+        """
+        Waits for the next reply of the worker
+        :param timeout: The number of seconds to wait
+        :return: The reply
+        """
+        try:
+            reply = self.replies.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"Blender worker did not reply within {timeout} seconds")
+        if reply is None:
+            raise RuntimeError(f"Blender worker exited with code {self.process.wait()}")
+        return reply
+
+    def run(self, script_path: str, id: str, json_str: str, timeout: float) -> None:
+        """
+        Runs a render job, the worker resets its scene before running the script
+        :param script_path: The path of the Blender script
+        :param id: The id of the render
+        :param json_str: The JSON string passed to the script
+        :param timeout: The number of seconds the job may take
+        :return: None
+        """
+        self.num_jobs += 1
+        job = {"script": script_path, "id": str(id), "json": json_str}
+        self.process.stdin.write(json.dumps(job) + "\n")
+        self.process.stdin.flush()
+        reply = self.wait_for_reply(timeout)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error"))
+
+    def is_alive(self) -> bool:
+        """
+        Checks whether the worker process is still running
+        :return: True if the worker is running, False otherwise
+        """
+        return self.process.poll() is None
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        Asks the worker to exit by closing its stdin, killing it if it does not exit in time
+        :param timeout: The number of seconds to wait for the worker to exit
+        :return: None
+        """
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+    def kill(self) -> None:
+        """
+        Kills the worker process
+        :return: None
+        """
+        self.process.kill()
+        self.process.wait()
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class BlenderWorkerPool:
+    """
+    A pool of long-lived headless Blender workers. Workers are started when first needed and reused between jobs, and a
+    worker that fails, times out, or reaches its job limit is replaced by a fresh one.
+    """
+
+    # The path of the Blender executable
+    blender_path: str
+    # The maximum number of workers, and therefore of jobs running at once
+    size: int
+    # The number of seconds a job may take
+    job_timeout: float
+    # The number of seconds a worker may take to start
+    startup_timeout: float
+    # The number of jobs a worker runs before it is replaced
+    max_jobs: int
+    # The workers waiting for a job
+    idle: queue.Queue
+    # Every worker that is running
+    workers: List[BlenderWorker]
+    # The threads submitting jobs to the workers
+    executor: Optional[ThreadPoolExecutor]
+    # The lock guarding the workers and executor
+    lock: threading.Lock
+    # Limits the number of workers that are running or starting
+    slots: threading.BoundedSemaphore
+
+    def __init__(
+        self,
+        blender_path: str,
+        size: int,
+        job_timeout: float,
+        startup_timeout: float,
+        max_jobs: int,
+    ):
+        """
+        Constructor for the BlenderWorkerPool class
+        :param blender_path: The path of the Blender executable
+        :param size: The maximum number of workers, and therefore of jobs running at once
+        :param job_timeout: The number of seconds a job may take before its worker is killed
+        :param startup_timeout: The number of seconds a worker may take to start
+        :param max_jobs: The number of jobs a worker runs before it is replaced
+        """
+        self.blender_path = blender_path
+        self.size = max(1, size)
+        self.job_timeout = job_timeout
+        self.startup_timeout = startup_timeout
+        self.max_jobs = max_jobs
+        self.idle = queue.Queue()
+        self.workers = []
+        self.executor = None
+        self.lock = threading.Lock()
+        self.slots = threading.BoundedSemaphore(self.size)
+
+    @classmethod
+    def from_settings(cls, settings) -> "BlenderWorkerPool":
+        """
+        Creates a pool configured by the render settings of the server
+        :param settings: The RenderSettings of the server
+        :return: The pool
+        """
+        return cls(
+            blender_path=settings.blender_path,
+            size=settings.pool_size,
+            job_timeout=settings.job_timeout,
+            startup_timeout=settings.startup_timeout,
+            max_jobs=settings.worker_max_jobs,
+        )
+
+    def acquire(self) -> BlenderWorker:
+        """
+        Takes an idle worker, starting a new one if fewer than size workers are running
+        :return: The worker
+        """
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                # Start a new worker if there is room for one, otherwise wait for a worker to become idle
+                if self.slots.acquire(blocking=False):
+                    try:
+                        worker = BlenderWorker(self.blender_path, self.startup_timeout)
+                    except Exception:
+                        self.slots.release()
+                        raise
+                    with self.lock:
+                        self.workers.append(worker)
+                    return worker
+                worker = self.idle.get()
+            # A discarded worker wakes up a waiting caller so that it can start a replacement
+            if worker is None:
+                continue
+            if worker.is_alive():
+                return worker
+            self.discard(worker)
+
+    def release(self, worker: BlenderWorker) -> None:
+        """
+        Returns a worker to the pool, replacing it if it has reached its job limit
+        :param worker: The worker
+        :return: None
+        """
+        if worker.num_jobs >= self.max_jobs:
+            worker.stop()
+            self.discard(worker)
+        else:
+            self.idle.put(worker)
+
+    def discard(self, worker: BlenderWorker) -> None:
+        """
+        Removes a worker from the pool, making room for a new one
+        :param worker: The worker
+        :return: None
+        """
+        if worker.is_alive():
+            worker.kill()
+        with self.lock:
+            if worker not in self.workers:
+                return
+            self.workers.remove(worker)
+        self.slots.release()
+        self.idle.put(None)
+
+    def run(self, script_path: str, id: str, json_str: str) -> None:
+        """
+        Runs a render job on a worker, blocking until it finishes
+        :param script_path: The path of the Blender script
+        :param id: The id of the render
+        :param json_str: The JSON string passed to the script
+        :return: None
+        """
+        worker = self.acquire()
+        try:
+            worker.run(script_path, id, json_str, self.job_timeout)
+        except (TimeoutError, OSError):
+            # The worker is stuck or has exited, replace it
+            self.discard(worker)
+            raise
+        except RuntimeError:
+            # A failed script may leave the worker in any state, so only keep it if it is still running
+            if worker.is_alive():
+                self.release(worker)
+            else:
+                self.discard(worker)
+            raise
+        self.release(worker)
+
+    def submit(self, script_path: str, id: str, json_str: str) -> Future:
+        """
+        Submits a render job to the pool without waiting for it to finish
+        :param script_path: The path of the Blender script
+        :param id: The id of the render
+        :param json_str: The JSON string passed to the script
+        :return: A future completed when the job finishes
+        """
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=self.size, thread_name_prefix="blender"
+                )
+            executor = self.executor
+        return executor.submit(self.run, script_path, id, json_str)
+
+    def shutdown(self) -> None:
+        """
+        Stops every worker and the threads submitting jobs to them
+        :return: None
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        while True:
+            try:
+                worker = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if worker is not None:
+                worker.stop()
+                self.discard(worker)
+
+    def stats(self) -> dict:
+        """
+        Gets the state of the pool
+        :return: A dictionary containing the number of running workers and the pool limits
+        """
+        with self.lock:
+            running = len(self.workers)
+        return {
+            "workers": running,
+            "size": self.size,
+            "job_timeout": self.job_timeout,
+            "max_jobs": self.max_jobs,
+        }
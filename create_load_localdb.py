@@ -16,27 +16,32 @@
 # IMPORTS
 from sqlalchemy import create_engine
 from sqlalchemy.engine import URL
-from dotenv import load_dotenv
-from config import get_file_path
 from sqlalchemy.sql import text
-import os
 from database.Population import populate_authentication_data
 from database.Population import populate_canadian_postal_code_data
 from database.Population import populate_climate_data
 from database.Population import populate_save_data
 from database.Population import populate_wind_speed_data
+from database.Population import populate_reference_database
+from database.Migrations.migration_manager import migrate
+from database.Population.populate_postal_code_climatic_station import (
+    refresh_postal_code_climatic_station_table,
+)
+from concurrent.futures import ThreadPoolExecutor
+from settings import get_settings
 ########################################################################################################################
 
-#Load environment variables
-load_dotenv(get_file_path("database/.env"))
+# Load the database settings
+database_settings = get_settings().database
+database_settings.check_credentials()
 
 # Create a connection URL for the default PostgreSQL database
 default_url = URL.create(
     drivername="postgresql",
-    username=os.getenv("ADMIN_USERNAME"),  # Use environment variables
-    password=os.getenv("ADMIN_PASSWORD"),  # Use environment variables
-    host=os.getenv("HOST"),
-    port=os.getenv("PORT"),
+    username=database_settings.admin_username,
+    password=database_settings.admin_password,
+    host=database_settings.host,
+    port=database_settings.port,
     database="postgres"  # Connect to the default 'postgres' database
 )
 
@@ -61,10 +66,10 @@ with default_engine.connect() as default_conn:
 # Create a new URL for the newly created database
 new_url = URL.create(
     drivername="postgresql",
-    username=os.getenv("ADMIN_USERNAME"),
-    password=os.getenv("ADMIN_PASSWORD"),
-    host=os.getenv("HOST"),
-    port=os.getenv("PORT"),
+    username=database_settings.admin_username,
+    password=database_settings.admin_password,
+    host=database_settings.host,
+    port=database_settings.port,
     database=db_name
 )
 
@@ -81,10 +86,26 @@ except Exception as e:
 
 # POPULATING THE DB
 try:
+    # Create the tables and indexes at the latest schema version
+    migrate(new_engine)
     populate_authentication_data.main()
-    populate_canadian_postal_code_data.main()
-    populate_climate_data.main()
     populate_save_data.main()
-    populate_wind_speed_data.main()
+    # The reference tables are independent of each other, so they are bulk loaded in parallel
+    with ThreadPoolExecutor() as executor:
+        loads = [
+            executor.submit(populate_canadian_postal_code_data.repopulate_canadian_postal_code_data_table),
+            executor.submit(populate_climate_data.repopulate_climatic_data_table),
+            executor.submit(populate_wind_speed_data.repopulate_wind_speed_data_table),
+        ]
+        # Raise the first error, if any
+        for load in loads:
+            load.result()
+    populate_climate_data.update_location()
+    refresh_postal_code_climatic_station_table()
+    populate_reference_database.main()
+    # Close the connections opened by the parallel loads
+    populate_canadian_postal_code_data.DATABASE.close()
+    populate_climate_data.DATABASE.close()
+    populate_wind_speed_data.DATABASE.close()
 except Exception as e:
     print(f"Error populating the new database: {e}")
\ No newline at end of file
@@ -28,3 +28,46 @@ class PrivilegeType(Enum):
     ADMIN: str = "admin"
     WRITE: str = "write"
     READ: str = "read"
+
+
+class ReferenceBackend(Enum):
+    """
+    Enum for the backends the read-only NBCC reference tables can be read from
+    """
+
+    # The PostgreSQL server holding every table
+    POSTGRESQL: str = "postgresql"
+    # An embedded SQLite file holding a copy of the reference tables, read in-process
+    SQLITE: str = "sqlite"
+
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# The default number of connections kept open in each pooled engine
+DEFAULT_POOL_SIZE: int = 5
+# The default number of connections that may be opened beyond the pool size during a burst
+DEFAULT_MAX_OVERFLOW: int = 10
+# The default number of seconds to wait for a pooled connection before giving up
+DEFAULT_POOL_TIMEOUT: int = 30
+# The default number of seconds after which a pooled connection is recycled
+DEFAULT_POOL_RECYCLE: int = 1800
+# Whether pooled connections are tested for liveness before being handed out
+DEFAULT_POOL_PRE_PING: bool = True
+
+# The name of the database holding the NBCC reference tables
+REFERENCE_DATABASE_NAME: str = "NBCC-2020"
+# The default backend the reference tables are read from
+DEFAULT_REFERENCE_BACKEND: str = ReferenceBackend.POSTGRESQL.value
+# The default file, relative to the source root, of the embedded reference database
+DEFAULT_REFERENCE_DATABASE_FILE: str = "data/reference/NBCC-2020.sqlite3"
+
+# The upper bounds, in milliseconds, of the buckets of the database latency histograms
+LATENCY_BUCKETS: tuple = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# The default number of milliseconds after which a statement is written to the slow query log, 0 disables the log
+DEFAULT_SLOW_QUERY_THRESHOLD: float = 0
+# The file, relative to the source root, of the slow query log
+SLOW_QUERY_LOG_FILE: str = "data/logs/slow_queries.log"
+# The maximum number of characters of a statement written to the slow query log
+SLOW_QUERY_MAX_LENGTH: int = 2000
@@ -13,14 +13,42 @@
 ########################################################################################################################
 
 import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
 import psycopg2
 import sqlalchemy
 from sqlalchemy import create_engine
-from dotenv import load_dotenv
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
 
 from config import get_file_path
-from database.Constants.connection_constants import PrivilegeType
+from database.Constants.connection_constants import (
+    PrivilegeType,
+    ReferenceBackend,
+    REFERENCE_DATABASE_NAME,
+)
+from database.Entities.database_metrics import (
+    DATABASE_METRICS,
+    InstrumentedQueuePool,
+    InstrumentedAsyncAdaptedQueuePool,
+)
+from settings import DatabaseSettings, get_settings
 
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# Long-lived engines shared by the whole process, keyed by (database name, privilege)
+POOLED_ENGINES: dict[tuple[str, PrivilegeType], sqlalchemy.Engine] = {}
+# Scoped session factories bound to the pooled engines, keyed by (database name, privilege)
+SCOPED_SESSIONS: dict[tuple[str, PrivilegeType], scoped_session] = {}
+# Long-lived asyncio engines shared by the whole process, keyed by (database name, privilege)
+ASYNC_POOLED_ENGINES: dict[tuple[str, PrivilegeType], AsyncEngine] = {}
+# Asyncio session factories bound to the asyncio engines, keyed by (database name, privilege)
+ASYNC_SESSIONS: dict[tuple[str, PrivilegeType], async_sessionmaker] = {}
+# Guards the creation and disposal of pooled engines and scoped sessions
+REGISTRY_LOCK = threading.Lock()
 
 
 ########################################################################################################################
@@ -33,6 +61,8 @@ class DatabaseConnection:
     Class for the database connection
     """
 
+    # The settings the credentials were read from
+    settings: DatabaseSettings
     # The host of the database
     host: str
     # The port of the database
@@ -58,23 +88,27 @@ class DatabaseConnection:
     # The list of engines
     engines: list[sqlalchemy.Engine]
 
-    def __init__(self, database_name: str):
+    def __init__(
+        self, database_name: str, settings: Optional[DatabaseSettings] = None
+    ):
         """
         Initializes the database connection
         :param database_name: The name of the database
+        :param settings: The database settings, the settings of the server if not given
         """
-        # Load the .env file
-        load_dotenv(get_file_path("database/.env"))
-        
-        # Read and store the values retrieved from the .env file
-        self.host = os.getenv("HOST")
-        self.port = int(os.getenv("PORT"))
-        self.admin_username = os.getenv("ADMIN_USERNAME")
-        self.admin_password = os.getenv("ADMIN_PASSWORD")
-        self.write_username = os.getenv("WRITE_USERNAME")
-        self.write_password = os.getenv("WRITE_PASSWORD")
-        self.read_username = os.getenv("READ_USERNAME")
-        self.read_password = os.getenv("READ_PASSWORD")
+        if settings is None:
+            settings = get_settings().database
+
+        # Store the credentials from the settings, they are checked once a connection is made
+        self.settings = settings
+        self.host = settings.host
+        self.port = settings.port
+        self.admin_username = settings.admin_username
+        self.admin_password = settings.admin_password
+        self.write_username = settings.write_username
+        self.write_password = settings.write_password
+        self.read_username = settings.read_username
+        self.read_password = settings.read_password
         self.database_name = database_name
         # initialize connection, cursors, and engines lists
         self.connections = []
@@ -87,6 +121,8 @@ class DatabaseConnection:
         :param privilege: The privilege level
         :return: The username and password for the given privilege
         """
+        # Connecting to the PostgreSQL server requires its connection settings
+        self.settings.check_credentials()
         # Map the privilege to the username and password
         privileges = {
             PrivilegeType.ADMIN: (self.admin_username, self.admin_password),
@@ -137,17 +173,44 @@ class DatabaseConnection:
         # Return the cursor
         return cursor
 
+    def get_connection_url(self, privilege: PrivilegeType) -> str:
+        """
+        Gets the sqlalchemy connection url for the given privilege
+        :param privilege: The privilege level
+        :return: The connection url for the database
+        """
+        # Get the username and password for the given privilege
+        user, password = self.get_credentials(privilege)
+        # Return the connection url for the database
+        return f"postgresql+psycopg2://{user}:{password}@{self.host}:{self.port}/{self.database_name}"
+
+    def get_async_connection_url(self, privilege: PrivilegeType) -> str:
+        """
+        Gets the sqlalchemy connection url for the given privilege using the asyncpg driver
+        :param privilege: The privilege level
+        :return: The asyncio connection url for the database
+        """
+        # Get the username and password for the given privilege
+        user, password = self.get_credentials(privilege)
+        # Return the connection url for the database
+        return f"postgresql+asyncpg://{user}:{password}@{self.host}:{self.port}/{self.database_name}"
+
+    @staticmethod
+    def get_pool_options() -> dict:
+        """
+        Gets the connection pool options from the settings of the server
+        :return: A dictionary of keyword arguments for sqlalchemy's create_engine
+        """
+        return get_settings().database.get_pool_options()
+
     def get_engine(self, privilege: PrivilegeType) -> sqlalchemy.Engine:
         """
         Gets the engine for the given privilege
         :param privilege: The privilege level
         :return: A sqlalchemy engine for the database
         """
-        # Get the username and password for the given privilege
-        user, password = self.get_credentials(privilege)
         # Create an engine for the database
-        connection_url = f"postgresql+psycopg2://{user}:{password}@{self.host}:{self.port}/{self.database_name}"
-        engine = create_engine(connection_url)
+        engine = create_engine(self.get_connection_url(privilege))
         # Add the engine to the list of engines
         self.engines.append(engine)
         # Return the engine
@@ -194,3 +257,295 @@ class DatabaseConnection:
             f"{'DATABASE:':<16} {self.database_name}"
         )
 
+
+########################################################################################################################
+# POOLED ENGINE REGISTRY
+########################################################################################################################
+
+
+def create_instrumented_engine(url: str, name: str, **options) -> sqlalchemy.Engine:
+    """
+    Creates an engine whose connections, checkouts and statements are recorded in the database metrics
+    :param url: The connection url for the database
+    :param name: The name the metrics of the engine are reported under
+    :param options: The remaining keyword arguments of sqlalchemy's create_engine
+    :return: The instrumented sqlalchemy engine
+    """
+    engine = create_engine(
+        url, poolclass=InstrumentedQueuePool, pool_logging_name=name, **options
+    )
+    DATABASE_METRICS.instrument(engine, name)
+    return engine
+
+
+def create_instrumented_async_engine(url: str, name: str, **options) -> AsyncEngine:
+    """
+    Creates an asyncio engine whose connections, checkouts and statements are recorded in the database metrics
+    :param url: The connection url for the database
+    :param name: The name the metrics of the engine are reported under
+    :param options: The remaining keyword arguments of sqlalchemy's create_async_engine
+    :return: The instrumented sqlalchemy asyncio engine
+    """
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+        **options,
+    )
+    # Events are registered on the synchronous engine the asyncio engine proxies
+    DATABASE_METRICS.instrument(engine.sync_engine, name)
+    return engine
+
+
+def get_pooled_engine(database_name: str, privilege: PrivilegeType) -> sqlalchemy.Engine:
+    """
+    Gets the long-lived engine for the given database and privilege, creating it on first use. Unlike
+    DatabaseConnection.get_engine, the engine is shared by every caller in the process and must not be disposed by them.
+    :param database_name: The name of the database
+    :param privilege: The privilege level
+    :return: A pooled sqlalchemy engine for the database
+    """
+    key = (database_name, privilege)
+    # Fast path, the engine has already been created
+    engine = POOLED_ENGINES.get(key)
+    if engine is not None:
+        return engine
+    with REGISTRY_LOCK:
+        # Another thread may have created the engine while we were waiting for the lock
+        if key not in POOLED_ENGINES:
+            database = DatabaseConnection(database_name=database_name)
+            POOLED_ENGINES[key] = create_instrumented_engine(
+                database.get_connection_url(privilege),
+                name=f"{database_name}:{privilege.value}",
+                **DatabaseConnection.get_pool_options(),
+            )
+        return POOLED_ENGINES[key]
+
+
+def get_scoped_session(database_name: str, privilege: PrivilegeType) -> scoped_session:
+    """
+    Gets the thread-local session factory bound to the pooled engine for the given database and privilege. Callers
+    should open sessions with open_scoped_session so that the connection returns to the pool.
+    :param database_name: The name of the database
+    :param privilege: The privilege level
+    :return: A scoped session factory
+    """
+    key = (database_name, privilege)
+    # Fast path, the session factory has already been created
+    session = SCOPED_SESSIONS.get(key)
+    if session is not None:
+        return session
+    engine = get_pooled_engine(database_name, privilege)
+    with REGISTRY_LOCK:
+        # Another thread may have created the session factory while we were waiting for the lock
+        if key not in SCOPED_SESSIONS:
+            SCOPED_SESSIONS[key] = scoped_session(
+                sessionmaker(autocommit=False, autoflush=True, bind=engine)
+            )
+        return SCOPED_SESSIONS[key]
+
+
+@contextmanager
+def open_scoped_session(session: scoped_session) -> Iterator[Session]:
+    """
+    Opens the thread-local session of a scoped session factory and removes it once the block is done, even if the block
+    raises, so that the connection always returns to the pool
+    :param session: The scoped session factory
+    :return: A context manager yielding the session
+    """
+    try:
+        yield session()
+    finally:
+        # Close the session, rolling back anything not committed, and return the connection to the pool
+        session.remove()
+
+
+def dispose_pooled_engines() -> None:
+    """
+    Removes all scoped sessions and disposes all pooled engines, intended to be called when the application shuts down
+    :return: None
+    """
+    with REGISTRY_LOCK:
+        # Close any sessions still held by the current thread
+        for session in SCOPED_SESSIONS.values():
+            session.remove()
+        SCOPED_SESSIONS.clear()
+        # Close every pooled connection
+        for engine in POOLED_ENGINES.values():
+            engine.dispose()
+        POOLED_ENGINES.clear()
+
+
+def get_async_pooled_engine(database_name: str, privilege: PrivilegeType) -> AsyncEngine:
+    """
+    Gets the long-lived asyncio engine for the given database and privilege, creating it on first use. Waiting on the
+    database through this engine suspends the calling coroutine instead of blocking a thread.
+    :param database_name: The name of the database
+    :param privilege: The privilege level
+    :return: A pooled sqlalchemy asyncio engine for the database
+    """
+    key = (database_name, privilege)
+    # Fast path, the engine has already been created
+    engine = ASYNC_POOLED_ENGINES.get(key)
+    if engine is not None:
+        return engine
+    with REGISTRY_LOCK:
+        # Another thread may have created the engine while we were waiting for the lock
+        if key not in ASYNC_POOLED_ENGINES:
+            database = DatabaseConnection(database_name=database_name)
+            ASYNC_POOLED_ENGINES[key] = create_instrumented_async_engine(
+                database.get_async_connection_url(privilege),
+                name=f"{database_name}:{privilege.value}:async",
+                **DatabaseConnection.get_pool_options(),
+            )
+        return ASYNC_POOLED_ENGINES[key]
+
+
+def get_async_session(database_name: str, privilege: PrivilegeType) -> async_sessionmaker:
+    """
+    Gets the asyncio session factory bound to the pooled asyncio engine for the given database and privilege. Sessions
+    should be used as async context managers so that their connection returns to the pool.
+    :param database_name: The name of the database
+    :param privilege: The privilege level
+    :return: An asyncio session factory
+    """
+    key = (database_name, privilege)
+    # Fast path, the session factory has already been created
+    session = ASYNC_SESSIONS.get(key)
+    if session is not None:
+        return session
+    engine = get_async_pooled_engine(database_name, privilege)
+    with REGISTRY_LOCK:
+        # Another thread may have created the session factory while we were waiting for the lock
+        if key not in ASYNC_SESSIONS:
+            # Objects are read after the session is closed, so they must not expire on commit
+            ASYNC_SESSIONS[key] = async_sessionmaker(
+                bind=engine, autoflush=True, expire_on_commit=False
+            )
+        return ASYNC_SESSIONS[key]
+
+
+async def dispose_async_pooled_engines() -> None:
+    """
+    Disposes all pooled asyncio engines, intended to be called when the application shuts down
+    :return: None
+    """
+    with REGISTRY_LOCK:
+        engines = list(ASYNC_POOLED_ENGINES.values())
+        ASYNC_SESSIONS.clear()
+        ASYNC_POOLED_ENGINES.clear()
+    # Close every pooled connection
+    for engine in engines:
+        await engine.dispose()
+
+
+########################################################################################################################
+# REFERENCE DATABASE
+########################################################################################################################
+
+
+def get_reference_backend() -> ReferenceBackend:
+    """
+    Gets the backend the read-only NBCC reference tables are read from, set by REFERENCE_BACKEND in the .env file
+    :return: The reference backend
+    """
+    return get_settings().database.reference_backend
+
+
+def get_reference_database_path() -> str:
+    """
+    Gets the path of the embedded reference database, set by REFERENCE_DATABASE_FILE in the .env file
+    :return: The absolute path of the SQLite file
+    """
+    return get_file_path(get_settings().database.reference_database_file)
+
+
+def get_embedded_connection_url(
+    path: str, asynchronous: bool = False, read_only: bool = True
+) -> str:
+    """
+    Gets the sqlalchemy connection url of an embedded SQLite database
+    :param path: The path of the SQLite file
+    :param asynchronous: Whether to use the aiosqlite driver
+    :param read_only: Whether to open the file read-only, otherwise it is created if it does not exist
+    :return: The connection url for the database
+    """
+    driver = "sqlite+aiosqlite" if asynchronous else "sqlite"
+    if read_only:
+        return f"{driver}:///file:{path}?mode=ro&uri=true"
+    return f"{driver}:///{path}"
+
+
+def check_reference_database(path: str) -> None:
+    """
+    Ensures the embedded reference database has been generated
+    :param path: The path of the SQLite file
+    :return: None
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"Embedded reference database {path} not found, generate it with "
+            "python -m database.Population.populate_reference_database"
+        )
+
+
+def get_reference_session() -> scoped_session:
+    """
+    Gets the thread-local session factory for the read-only NBCC reference tables (ClimaticData,
+    CanadianPostalCodeData, WindSpeedData and PostalCodeClimaticStation), bound to either the PostgreSQL server or the
+    embedded SQLite file depending on the configured reference backend. Callers should open sessions with
+    open_scoped_session so that the connection returns to the pool.
+    :return: A scoped session factory
+    """
+    if get_reference_backend() is ReferenceBackend.POSTGRESQL:
+        return get_scoped_session(
+            database_name=REFERENCE_DATABASE_NAME, privilege=PrivilegeType.ADMIN
+        )
+    path = get_reference_database_path()
+    key = (path, PrivilegeType.READ)
+    # Fast path, the session factory has already been created
+    session = SCOPED_SESSIONS.get(key)
+    if session is not None:
+        return session
+    check_reference_database(path)
+    with REGISTRY_LOCK:
+        # Another thread may have created the session factory while we were waiting for the lock
+        if key not in SCOPED_SESSIONS:
+            POOLED_ENGINES[key] = create_instrumented_engine(
+                get_embedded_connection_url(path), name="reference:sqlite"
+            )
+            SCOPED_SESSIONS[key] = scoped_session(
+                sessionmaker(autocommit=False, autoflush=True, bind=POOLED_ENGINES[key])
+            )
+        return SCOPED_SESSIONS[key]
+
+
+def get_async_reference_session() -> async_sessionmaker:
+    """
+    Gets the asyncio session factory for the read-only NBCC reference tables, bound to either the PostgreSQL server or
+    the embedded SQLite file depending on the configured reference backend
+    :return: An asyncio session factory
+    """
+    if get_reference_backend() is ReferenceBackend.POSTGRESQL:
+        return get_async_session(
+            database_name=REFERENCE_DATABASE_NAME, privilege=PrivilegeType.ADMIN
+        )
+    path = get_reference_database_path()
+    key = (path, PrivilegeType.READ)
+    # Fast path, the session factory has already been created
+    session = ASYNC_SESSIONS.get(key)
+    if session is not None:
+        return session
+    check_reference_database(path)
+    with REGISTRY_LOCK:
+        # Another thread may have created the session factory while we were waiting for the lock
+        if key not in ASYNC_SESSIONS:
+            ASYNC_POOLED_ENGINES[key] = create_instrumented_async_engine(
+                get_embedded_connection_url(path, asynchronous=True),
+                name="reference:sqlite:async",
+            )
+            # Objects are read after the session is closed, so they must not expire on commit
+            ASYNC_SESSIONS[key] = async_sessionmaker(
+                bind=ASYNC_POOLED_ENGINES[key], autoflush=True, expire_on_commit=False
+            )
+        return ASYNC_SESSIONS[key]
@@ -0,0 +1,489 @@
+########################################################################################################################
+# database_metrics.py
+# This file contains the instrumentation of the pooled database engines. SQLAlchemy engine and pool events record the
+# time spent opening connections, waiting for a pooled connection and executing each statement, labelled by the
+# function that issued it, along with how saturated each pool is.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import bisect
+import logging
+import os
+import sys
+import threading
+import time
+from types import FrameType
+from typing import Dict, Optional
+
+import sqlalchemy
+from greenlet import getcurrent
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import get_file_path
+from database.Constants.connection_constants import (
+    LATENCY_BUCKETS,
+    SLOW_QUERY_LOG_FILE,
+    SLOW_QUERY_MAX_LENGTH,
+)
+from settings import get_settings
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# Statements are labelled by the first calling function outside of these modules
+IGNORED_MODULE_PREFIXES = (
+    "sqlalchemy",
+    "greenlet",
+    "asyncio",
+    "contextlib",
+    "concurrent",
+    "threading",
+    "database.Entities.database_connection",
+    "database.Entities.database_metrics",
+)
+# The label of statements whose calling function could not be found
+UNKNOWN_CALLER = "unknown"
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def find_caller(frame: Optional[FrameType]) -> Optional[str]:
+    """
+    Finds the first function on a stack that is not part of SQLAlchemy or of the database connection code
+    :param frame: The innermost frame of the stack
+    :return: The module and name of the function, or None if every frame is ignored
+    """
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(IGNORED_MODULE_PREFIXES):
+            return f"{module.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return None
+
+
+def get_caller_label() -> str:
+    """
+    Gets the label of the function that issued the statement being executed. Statements issued through the asyncio
+    engines run in a greenlet whose stack ends inside SQLAlchemy, the calling coroutine is found on the stack of the
+    greenlet that spawned it.
+    :return: The module and name of the calling function
+    """
+    label = find_caller(sys._getframe(1))
+    if label is None:
+        parent = getcurrent().parent
+        if parent is not None:
+            label = find_caller(parent.gr_frame)
+    return label or UNKNOWN_CALLER
+
+
+########################################################################################################################
+# HISTOGRAM CLASS
+########################################################################################################################
+
+
+class LatencyHistogram:
+    """
+    A thread-safe histogram of durations, with fixed bucket bounds in milliseconds
+    """
+
+    # The upper bounds of the buckets, in milliseconds
+    bounds: tuple
+    # The number of durations in each bucket, the last bucket holds durations above every bound
+    counts: list
+    # The number of durations observed
+    count: int
+    # The sum of the durations observed, in milliseconds
+    total: float
+    # The longest duration observed, in milliseconds
+    max: float
+    # Guards the counters
+    lock: threading.Lock
+
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        """
+        Constructor for the LatencyHistogram class
+        :param bounds: The upper bounds of the buckets, in increasing order of milliseconds
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """
+        Records a duration
+        :param seconds: The duration, in seconds
+        :return: None
+        """
+        milliseconds = seconds * 1000
+        i = bisect.bisect_left(self.bounds, milliseconds)
+        with self.lock:
+            self.counts[i] += 1
+            self.count += 1
+            self.total += milliseconds
+            self.max = max(self.max, milliseconds)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates a quantile of the durations as the upper bound of the bucket it falls in
+        :param q: The quantile, between 0 and 1
+        :return: The estimated quantile in milliseconds, the longest duration if it falls in the last bucket, or None
+        if no duration has been observed
+        """
+        with self.lock:
+            counts, count, longest = list(self.counts), self.count, self.max
+        if count == 0:
+            return None
+        rank, seen = q * count, 0
+        for bound, bucket_count in zip(self.bounds, counts):
+            seen += bucket_count
+            if seen >= rank:
+                return round(min(bound, longest), 3)
+        return round(longest, 3)
+
+    def snapshot(self) -> dict:
+        """
+        Gets the state of the histogram
+        :return: A dictionary containing the count, total, mean, maximum and estimated percentiles in milliseconds, and
+        the cumulative number of durations at or below each bucket bound
+        """
+        with self.lock:
+            counts, count, total, longest = (
+                list(self.counts),
+                self.count,
+                self.total,
+                self.max,
+            )
+        buckets, cumulative = {}, 0
+        for bound, bucket_count in zip(self.bounds, counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound}ms"] = cumulative
+        buckets["le_inf"] = count
+        return {
+            "count": count,
+            "total_ms": round(total, 3),
+            "mean_ms": round(total / count, 3) if count else None,
+            "max_ms": round(longest, 3),
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "p99_ms": self.quantile(0.99),
+            "buckets": buckets,
+        }
+
+
+########################################################################################################################
+# POOL CLASSES
+########################################################################################################################
+
+
+class InstrumentedPoolMixin:
+    """
+    Records how long each checkout waits for a pooled connection. SQLAlchemy has no event fired before a checkout
+    starts waiting, so the wait is timed around Pool.connect. The pool reports to the engine metrics registered under
+    its logging name.
+    """
+
+    # The number of connections that may be opened beyond the pool size
+    max_overflow_limit: int
+
+    def __init__(self, creator, pool_size: int = 5, max_overflow: int = 10, **kw):
+        """
+        Constructor for the instrumented pools
+        :param creator: The function opening new connections
+        :param pool_size: The number of connections kept open
+        :param max_overflow: The number of connections that may be opened beyond the pool size
+        :param kw: The remaining keyword arguments of the pool
+        """
+        self.max_overflow_limit = max_overflow
+        super().__init__(creator, pool_size=pool_size, max_overflow=max_overflow, **kw)
+
+    def connect(self):
+        """
+        Checks out a connection, recording how long it took, including opening a new connection if one was needed
+        :return: The pooled connection
+        """
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            DATABASE_METRICS.observe_checkout_timeout(self.logging_name)
+            raise
+        DATABASE_METRICS.observe_checkout(
+            self.logging_name, time.perf_counter() - start
+        )
+        return connection
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    """
+    A QueuePool recording how long each checkout waits, used by the synchronous engines
+    """
+
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """
+    An AsyncAdaptedQueuePool recording how long each checkout waits, used by the asyncio engines
+    """
+
+    pass
+
+
+########################################################################################################################
+# ENGINE METRICS CLASS
+########################################################################################################################
+
+
+class EngineMetrics:
+    """
+    The metrics of a single pooled engine
+    """
+
+    # The synchronous engine, the sync_engine of asyncio engines
+    engine: sqlalchemy.Engine
+    # The time taken to open each new database connection
+    connect: LatencyHistogram
+    # The time taken to check out each pooled connection
+    checkout_wait: LatencyHistogram
+    # The number of checkouts that gave up waiting for a connection
+    checkout_timeouts: int
+    # The largest number of connections checked out at once
+    peak_checked_out: int
+
+    def __init__(self, engine: sqlalchemy.Engine):
+        """
+        Constructor for the EngineMetrics class
+        :param engine: The synchronous engine, the sync_engine of asyncio engines
+        """
+        self.engine = engine
+        self.connect = LatencyHistogram()
+        self.checkout_wait = LatencyHistogram()
+        self.checkout_timeouts = 0
+        self.peak_checked_out = 0
+
+    def snapshot(self) -> dict:
+        """
+        Gets the state of the engine and its pool
+        :return: A dictionary containing the connect and checkout histograms and the saturation of the pool
+        """
+        pool = self.engine.pool
+        pool_status = {"status": pool.status()}
+        if isinstance(pool, InstrumentedPoolMixin):
+            checked_out = pool.checkedout()
+            capacity = pool.size() + pool.max_overflow_limit
+            pool_status.update(
+                {
+                    "size": pool.size(),
+                    "checked_in": pool.checkedin(),
+                    "checked_out": checked_out,
+                    "overflow": max(0, pool.overflow()),
+                    "capacity": capacity,
+                    "saturation": round(checked_out / capacity, 3)
+                    if capacity
+                    else None,
+                    "peak_checked_out": self.peak_checked_out,
+                    "peak_saturation": round(self.peak_checked_out / capacity, 3)
+                    if capacity
+                    else None,
+                }
+            )
+        return {
+            "pool": pool_status,
+            "connect": self.connect.snapshot(),
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "checkout_timeouts": self.checkout_timeouts,
+        }
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class DatabaseMetrics:
+    """
+    Collects the metrics of every instrumented engine in the process, and writes statements slower than the configured
+    threshold to the slow query log
+    """
+
+    # The metrics of each engine, keyed by the name the engine was instrumented with
+    engines: Dict[str, EngineMetrics]
+    # The latency of the statements issued by each function, keyed by the module and name of the function
+    statements: Dict[str, LatencyHistogram]
+    # The number of milliseconds after which a statement is written to the slow query log, 0 if the log is disabled
+    slow_query_threshold: float
+    # The slow query log, or None if it is disabled
+    slow_query_logger: Optional[logging.Logger]
+    # Guards the registries
+    lock: threading.Lock
+
+    def __init__(self, slow_query_threshold: float, slow_query_log_path: str):
+        """
+        Constructor for the DatabaseMetrics class
+        :param slow_query_threshold: The number of milliseconds after which a statement is written to the slow query
+        log, 0 disables the log
+        :param slow_query_log_path: The path of the slow query log
+        """
+        self.engines = {}
+        self.statements = {}
+        self.slow_query_threshold = slow_query_threshold
+        self.slow_query_logger = None
+        self.lock = threading.Lock()
+        if slow_query_threshold > 0:
+            os.makedirs(os.path.dirname(slow_query_log_path), exist_ok=True)
+            handler = logging.FileHandler(slow_query_log_path)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.slow_query_logger = logging.getLogger("database.slow_queries")
+            self.slow_query_logger.setLevel(logging.WARNING)
+            self.slow_query_logger.addHandler(handler)
+
+    def instrument(self, engine: sqlalchemy.Engine, name: str) -> None:
+        """
+        Registers the event listeners recording the metrics of an engine. The engine should have been created with
+        pool_logging_name=name and one of the instrumented pool classes for its checkout waits to be recorded.
+        :param engine: The synchronous engine, the sync_engine of asyncio engines
+        :param name: The name the metrics of the engine are reported under
+        :return: None
+        """
+        metrics = EngineMetrics(engine)
+        with self.lock:
+            self.engines[name] = metrics
+
+        @event.listens_for(engine, "do_connect")
+        def before_connect(dialect, connection_record, cargs, cparams):
+            connection_record.info["connect_start"] = time.perf_counter()
+
+        @event.listens_for(engine, "connect")
+        def after_connect(dbapi_connection, connection_record):
+            start = connection_record.info.pop("connect_start", None)
+            if start is not None:
+                metrics.connect.observe(time.perf_counter() - start)
+
+        @event.listens_for(engine, "checkout")
+        def after_checkout(dbapi_connection, connection_record, connection_proxy):
+            pool = engine.pool
+            if isinstance(pool, InstrumentedPoolMixin):
+                metrics.peak_checked_out = max(
+                    metrics.peak_checked_out, pool.checkedout()
+                )
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_execute(
+            connection, cursor, statement, parameters, context, executemany
+        ):
+            connection.info["query_start"] = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_execute(
+            connection, cursor, statement, parameters, context, executemany
+        ):
+            start = connection.info.pop("query_start", None)
+            if start is not None:
+                self.observe_statement(statement, time.perf_counter() - start)
+
+        @event.listens_for(engine, "handle_error")
+        def on_error(exception_context):
+            if exception_context.connection is not None:
+                exception_context.connection.info.pop("query_start", None)
+
+    def observe_checkout(self, name: str, seconds: float) -> None:
+        """
+        Records how long a checkout waited for a pooled connection
+        :param name: The name of the engine
+        :param seconds: The duration of the checkout, in seconds
+        :return: None
+        """
+        metrics = self.engines.get(name)
+        if metrics is not None:
+            metrics.checkout_wait.observe(seconds)
+
+    def observe_checkout_timeout(self, name: str) -> None:
+        """
+        Records a checkout that gave up waiting for a pooled connection
+        :param name: The name of the engine
+        :return: None
+        """
+        metrics = self.engines.get(name)
+        if metrics is not None:
+            with self.lock:
+                metrics.checkout_timeouts += 1
+
+    def observe_statement(self, statement: str, seconds: float) -> None:
+        """
+        Records the latency of a statement under the function that issued it, writing it to the slow query log if it
+        exceeded the threshold
+        :param statement: The SQL of the statement
+        :param seconds: The duration of the statement, in seconds
+        :return: None
+        """
+        label = get_caller_label()
+        histogram = self.statements.get(label)
+        if histogram is None:
+            with self.lock:
+                histogram = self.statements.setdefault(label, LatencyHistogram())
+        histogram.observe(seconds)
+        milliseconds = seconds * 1000
+        if (
+            self.slow_query_logger is not None
+            and milliseconds >= self.slow_query_threshold
+        ):
+            self.slow_query_logger.warning(
+                "%.1f ms %s: %s",
+                milliseconds,
+                label,
+                " ".join(statement.split())[:SLOW_QUERY_MAX_LENGTH],
+            )
+
+    def snapshot(self) -> dict:
+        """
+        Gets the metrics of every engine and calling function
+        :return: A dictionary containing the metrics of each engine, and the statement latency of each calling function
+        ordered by total time spent
+        """
+        with self.lock:
+            engines = dict(self.engines)
+            statements = dict(self.statements)
+        statement_snapshots = {
+            label: histogram.snapshot() for label, histogram in statements.items()
+        }
+        return {
+            "engines": {
+                name: metrics.snapshot() for name, metrics in sorted(engines.items())
+            },
+            "statements": dict(
+                sorted(
+                    statement_snapshots.items(),
+                    key=lambda item: item[1]["total_ms"],
+                    reverse=True,
+                )
+            ),
+            "slow_query_threshold_ms": self.slow_query_threshold or None,
+        }
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The metrics of every instrumented engine in the process
+DATABASE_METRICS = DatabaseMetrics(
+    slow_query_threshold=get_settings().database.slow_query_threshold,
+    slow_query_log_path=get_file_path(SLOW_QUERY_LOG_FILE),
+)
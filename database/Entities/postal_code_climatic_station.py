@@ -0,0 +1,68 @@
+########################################################################################################################
+# postal_code_climatic_station.py
+# This file contains the classes for the precomputed mapping from postal codes to their nearest climatic station
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from sqlalchemy import Column, Integer, Float, String
+from sqlalchemy.orm import declarative_base
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# Required for SQLAlchemy to use the ORM
+BASE = declarative_base()
+
+
+########################################################################################################################
+# POSTAL CODE CLIMATIC STATION CLASS
+########################################################################################################################
+
+
+class PostalCodeClimaticStation(BASE):
+    """
+    Class for the nearest climatic station of each postal code
+    """
+
+    # The name of the table
+    __tablename__ = "PostalCodeClimaticStation"
+    # The postal code, in the format A1A 1A1
+    postal_code = Column(String(255), primary_key=True)
+    # The latitude of the postal code
+    latitude = Column(Float)
+    # The longitude of the postal code
+    longitude = Column(Float)
+    # The ID of the nearest entry in the ClimaticData table
+    climatic_id = Column(Integer, index=True)
+    # The great circle distance to the nearest climatic station in km
+    distance = Column(Float)
+
+
+########################################################################################################################
+# CLIMATIC STATION SNAPSHOT CLASS
+########################################################################################################################
+
+
+class ClimaticStationSnapshot(BASE):
+    """
+    Class for the climatic stations the PostalCodeClimaticStation table was computed from, used to find the stations
+    that were added, moved or removed since
+    """
+
+    # The name of the table
+    __tablename__ = "ClimaticStationSnapshot"
+    # The ID of the entry in the ClimaticData table
+    ID = Column(Integer, primary_key=True, autoincrement=False)
+    # The latitude of the station
+    Latitude = Column(Float)
+    # The longitude of the station
+    Longitude = Column(Float)
@@ -12,7 +12,7 @@
 # IMPORTS
 ########################################################################################################################
 
-from sqlalchemy import Column, String, DateTime, Integer
+from sqlalchemy import Column, String, DateTime, Integer, Index
 from sqlalchemy.orm import declarative_base
 
 ########################################################################################################################
@@ -40,3 +40,7 @@ class SaveData(BASE):
     Username = Column(String)
     DateModified = Column(DateTime)
     JsonData = Column(String)
+    # Serves the lookups of a user's save files, most recently modified first
+    __table_args__ = (
+        Index("ix_SaveData_Username_DateModified", Username, DateModified.desc()),
+    )
@@ -0,0 +1,43 @@
+########################################################################################################################
+# schema_migration.py
+# This file contains the class for the schema migration entries in the database, one for each migration applied
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import declarative_base
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# Required for SQLAlchemy to use the ORM
+BASE = declarative_base()
+
+
+########################################################################################################################
+# SCHEMA MIGRATION CLASS
+########################################################################################################################
+
+
+class SchemaMigration(BASE):
+    """
+    Class for the schema migrations applied to the database
+    """
+
+    # The name of the table
+    __tablename__ = "SchemaMigrations"
+    # The version of the migration, migrations are applied in increasing order of version
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    # The name of the migration
+    name = Column(String(255))
+    # The time at which the migration was applied
+    applied_at = Column(DateTime)
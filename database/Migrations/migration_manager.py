@@ -0,0 +1,159 @@
+########################################################################################################################
+# migration_manager.py
+# This file contains the code for bringing the schema of the database up to date. Every migration that has not been
+# applied yet is applied in order, each in its own transaction together with the entry recording it, so a failed
+# migration leaves the database at the last version that succeeded.
+#
+# Usage: python -m database.Migrations.migration_manager
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from datetime import datetime
+from typing import List, Set
+
+import sqlalchemy
+from sqlalchemy import Connection, insert, select, text
+
+from database.Constants.connection_constants import PrivilegeType
+from database.Entities.database_connection import DatabaseConnection
+from database.Entities.schema_migration import BASE, SchemaMigration
+from database.Migrations.migrations import MIGRATIONS, Migration
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The name of the database
+DATABASE_NAME = "NBCC-2020"
+# The key of the PostgreSQL advisory lock held while migrating, so that concurrent installs do not migrate twice
+MIGRATION_LOCK_KEY = 2020_0001
+
+
+########################################################################################################################
+# DATABASE FUNCTIONS
+########################################################################################################################
+
+
+def create_database_if_missing(database_name: str) -> None:
+    """
+    Creates a PostgreSQL database if it does not exist
+    :param database_name: The name of the database
+    :return: None
+    """
+    # CREATE DATABASE can not run inside a transaction, so it is issued from the maintenance database in autocommit
+    maintenance = DatabaseConnection(database_name="postgres")
+    engine = maintenance.get_engine(privilege=PrivilegeType.ADMIN)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM pg_database WHERE datname = :name"),
+            {"name": database_name},
+        ).scalar()
+        if not exists:
+            print(f"Creating database {database_name}")
+            connection.execute(text(f'CREATE DATABASE "{database_name}"'))
+    maintenance.close()
+
+
+def get_applied_versions(connection: Connection) -> Set[int]:
+    """
+    Gets the versions of the migrations applied to the database
+    :param connection: The connection to the database
+    :return: The versions of the applied migrations
+    """
+    return set(connection.execute(select(SchemaMigration.version)).scalars())
+
+
+def apply_migration(connection: Connection, migration: Migration) -> None:
+    """
+    Applies a migration and records it in a single transaction
+    :param connection: The connection to the database
+    :param migration: The migration to apply
+    :return: None
+    """
+    with connection.begin():
+        migration.upgrade(connection)
+        connection.execute(
+            insert(SchemaMigration).values(
+                version=migration.version,
+                name=migration.name,
+                applied_at=datetime.now(),
+            )
+        )
+
+
+########################################################################################################################
+# MIGRATION FUNCTIONS
+########################################################################################################################
+
+
+def migrate(engine: sqlalchemy.Engine) -> List[Migration]:
+    """
+    Applies every migration that has not been applied to the database yet, in order of version
+    :param engine: The engine of the database
+    :return: The migrations that were applied
+    """
+    is_postgresql = engine.dialect.name == "postgresql"
+    applied = []
+    with engine.connect() as connection:
+        if is_postgresql:
+            # Wait for any other process migrating the same database to finish
+            connection.execute(
+                text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            )
+            connection.commit()
+        try:
+            with connection.begin():
+                BASE.metadata.create_all(bind=connection, checkfirst=True)
+            with connection.begin():
+                applied_versions = get_applied_versions(connection)
+            for migration in sorted(MIGRATIONS, key=lambda m: m.version):
+                if migration.version in applied_versions:
+                    continue
+                print(f"Applying migration {migration.version}: {migration.name}")
+                apply_migration(connection, migration)
+                applied.append(migration)
+        finally:
+            if is_postgresql:
+                connection.execute(
+                    text("SELECT pg_advisory_unlock(:key)"),
+                    {"key": MIGRATION_LOCK_KEY},
+                )
+                connection.commit()
+    return applied
+
+
+def migrate_database(database_name: str = DATABASE_NAME) -> List[Migration]:
+    """
+    Creates the database if it does not exist and brings its schema up to date
+    :param database_name: The name of the database
+    :return: The migrations that were applied
+    """
+    create_database_if_missing(database_name)
+    database = DatabaseConnection(database_name=database_name)
+    try:
+        return migrate(database.get_engine(privilege=PrivilegeType.ADMIN))
+    finally:
+        database.close()
+
+
+########################################################################################################################
+# MAIN
+########################################################################################################################
+
+
+def main():
+    print(f"This script will bring the schema of {DATABASE_NAME} up to date.")
+    applied = migrate_database()
+    print(f"Applied {len(applied)} migrations, the schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+########################################################################################################################
+# migrations.py
+# This file contains the schema migrations of the database, in the order they are applied. Migrations are never edited
+# once released, changes to the schema are made by appending a new migration with the next version.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from typing import Callable, List
+
+from sqlalchemy import Connection, inspect, text
+
+from database.Entities import (
+    authentication_data,
+    canadian_postal_code_data,
+    climatic_data,
+    postal_code_climatic_station,
+    save_data,
+    wind_speed_data,
+)
+
+########################################################################################################################
+# MIGRATION CLASS
+########################################################################################################################
+
+
+class Migration:
+    """
+    Class for a schema migration
+    """
+
+    # The version of the migration, migrations are applied in increasing order of version
+    version: int
+    # The name of the migration
+    name: str
+    # Applies the migration using the given connection, within the transaction that records it
+    upgrade: Callable[[Connection], None]
+
+    def __init__(self, version: int, name: str, upgrade: Callable[[Connection], None]):
+        """
+        Constructor for the Migration class
+        :param version: The version of the migration
+        :param name: The name of the migration
+        :param upgrade: Applies the migration using the given connection
+        """
+        self.version = version
+        self.name = name
+        self.upgrade = upgrade
+
+
+########################################################################################################################
+# MIGRATIONS
+########################################################################################################################
+
+
+def create_tables(connection: Connection) -> None:
+    """
+    Creates every table the backend uses that does not exist yet. Databases created before migrations were introduced
+    keep their tables as they are, later migrations bring them up to date.
+    :param connection: The connection to the database
+    :return: None
+    """
+    for entity in [
+        authentication_data,
+        save_data,
+        canadian_postal_code_data,
+        climatic_data,
+        wind_speed_data,
+        postal_code_climatic_station,
+    ]:
+        entity.BASE.metadata.create_all(bind=connection, checkfirst=True)
+
+
+def create_lookup_indexes(connection: Connection) -> None:
+    """
+    Creates the indexes used by the postal code, save file and email lookups on tables created without them
+    :param connection: The connection to the database
+    :return: None
+    """
+    connection.execute(
+        text(
+            'CREATE INDEX IF NOT EXISTS "ix_CanadianPostalCodeData_postal_code" '
+            'ON "CanadianPostalCodeData" (postal_code)'
+        )
+    )
+    connection.execute(
+        text(
+            'CREATE INDEX IF NOT EXISTS "ix_SaveData_Username_DateModified" '
+            'ON "SaveData" ("Username", "DateModified" DESC)'
+        )
+    )
+    # Emails are declared unique, and the index backing the unique constraint already serves the lookups
+    inspector = inspect(connection)
+    covered = [
+        constraint["column_names"]
+        for constraint in inspector.get_unique_constraints("AuthenticationData")
+    ] + [index["column_names"] for index in inspector.get_indexes("AuthenticationData")]
+    if ["email"] not in covered:
+        connection.execute(
+            text(
+                'CREATE INDEX IF NOT EXISTS "ix_AuthenticationData_email" '
+                'ON "AuthenticationData" (email)'
+            )
+        )
+
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The migrations of the database, in increasing order of version
+MIGRATIONS: List[Migration] = [
+    Migration(1, "create tables", create_tables),
+    Migration(2, "create lookup indexes", create_lookup_indexes),
+]
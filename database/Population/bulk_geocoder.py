@@ -0,0 +1,284 @@
+########################################################################################################################
+# bulk_geocoder.py
+# This file contains the bulk geocoder used by the population scripts to find the coordinates of many places at once.
+# Results are checkpointed to a local cache as they arrive, so an interrupted run resumes where it stopped and only
+# places that are new or have changed are geocoded again.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import csv
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from geopy import Nominatim
+from geopy.extra.rate_limiter import RateLimiter
+from tqdm import tqdm
+
+from backend.Constants.cache_constants import (
+    GEOCODE_CACHE_NEGATIVE_TTL,
+    STATION_GEOCODE_CACHE_FILE,
+)
+from backend.Constants.location_constants import GAZETTEER_FILE, BULK_GEOCODE_WORKERS
+from backend.Entities.Cache.persistent_cache import PersistentCache, CACHE_MISS
+from backend.Entities.Location.geocoder import normalize_address
+from config import get_file_path
+from settings import get_settings
+
+########################################################################################################################
+# SOURCE INTERFACE
+########################################################################################################################
+
+
+class GeocodingSourceInterface:
+    """
+    Interface for the sources the bulk geocoder finds coordinates with
+    """
+
+    # The name of the source, reported in the statistics of a run
+    name: str
+
+    def geocode(self, query: str) -> Optional[Tuple[float, float]]:
+        pass
+
+
+########################################################################################################################
+# SOURCES
+########################################################################################################################
+
+
+class NominatimSource(GeocodingSourceInterface):
+    """
+    Finds coordinates using the Nominatim web service. A single rate limiter spaces out the requests of every thread
+    using the source.
+    """
+
+    # The Nominatim client
+    geolocator: Nominatim
+    # The rate limited geocode function, geopy's RateLimiter is thread-safe
+    rate_limited_geocode: RateLimiter
+    # The number of seconds to wait for each response
+    timeout: float
+
+    def __init__(self, min_delay_seconds: float = 1, timeout: float = 10):
+        """
+        Constructor for the NominatimSource class
+        :param min_delay_seconds: The minimum number of seconds between two requests, across all threads
+        :param timeout: The number of seconds to wait for each response
+        """
+        self.name = "nominatim"
+        self.geolocator = Nominatim(user_agent=str(uuid.uuid4()).replace("-", ""))
+        # Errors are raised rather than returned as a failed lookup, so that they are not checkpointed and the place is
+        # retried on the next run
+        self.rate_limited_geocode = RateLimiter(
+            self.geolocator.geocode,
+            min_delay_seconds=min_delay_seconds,
+            swallow_exceptions=False,
+        )
+        self.timeout = timeout
+
+    def geocode(self, query: str) -> Optional[Tuple[float, float]]:
+        """
+        Finds the coordinates of a place
+        :param query: The name of the place
+        :return: The latitude and longitude of the place, or None if it could not be found
+        """
+        location_info = self.rate_limited_geocode(query, timeout=self.timeout)
+        if location_info is None:
+            return None
+        return location_info.latitude, location_info.longitude
+
+
+class GazetteerSource(GeocodingSourceInterface):
+    """
+    Finds coordinates in an offline gazetteer, a CSV file with a header and name, latitude and longitude columns. Names
+    are matched after normalization, the same way geocoding results are cached.
+    """
+
+    # The coordinates of each place, keyed by normalized name
+    places: Dict[str, Tuple[float, float]]
+
+    def __init__(self, path: str):
+        """
+        Constructor for the GazetteerSource class
+        :param path: The path of the gazetteer CSV file
+        """
+        self.name = "gazetteer"
+        self.places = {}
+        with open(path, "r") as csv_file:
+            # Skip first line, header line and not data
+            next(csv_file)
+            for row in csv.reader(csv_file):
+                try:
+                    coordinates = float(row[1]), float(row[2])
+                except (IndexError, ValueError):
+                    continue
+                # Keep the first entry of places listed more than once
+                self.places.setdefault(normalize_address(row[0]), coordinates)
+
+    def geocode(self, query: str) -> Optional[Tuple[float, float]]:
+        """
+        Finds the coordinates of a place
+        :param query: The name of the place
+        :return: The latitude and longitude of the place, or None if it is not in the gazetteer
+        """
+        return self.places.get(normalize_address(query))
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def get_default_sources() -> List[GeocodingSourceInterface]:
+    """
+    Gets the sources used to geocode the climatic stations, the offline gazetteer first if it exists and Nominatim
+    :return: The sources, in the order they are consulted
+    """
+    sources = []
+    gazetteer_path = get_file_path(GAZETTEER_FILE)
+    if os.path.exists(gazetteer_path):
+        sources.append(GazetteerSource(gazetteer_path))
+    sources.append(NominatimSource())
+    return sources
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class BulkGeocoder:
+    """
+    Geocodes many places concurrently. Each result is checkpointed to a persistent cache as soon as it arrives, keyed
+    by the normalized query, so a run that is interrupted or repeated only geocodes the places that are not cached.
+    Places that could not be found are cached for a shorter time so that they are eventually retried.
+    """
+
+    # The sources consulted for each place, in order, until one finds it
+    sources: List[GeocodingSourceInterface]
+    # The checkpoint of geocoding results
+    cache: PersistentCache
+    # The number of threads geocoding places concurrently
+    max_workers: int
+    # The number of seconds a failed lookup is kept in the checkpoint
+    negative_ttl: float
+
+    def __init__(
+        self,
+        sources: List[GeocodingSourceInterface],
+        cache: PersistentCache,
+        max_workers: int = BULK_GEOCODE_WORKERS,
+        negative_ttl: float = GEOCODE_CACHE_NEGATIVE_TTL,
+    ):
+        """
+        Constructor for the BulkGeocoder class
+        :param sources: The sources consulted for each place, in order, until one finds it
+        :param cache: The checkpoint of geocoding results
+        :param max_workers: The number of threads geocoding places concurrently
+        :param negative_ttl: The number of seconds a failed lookup is kept in the checkpoint
+        """
+        self.sources = sources
+        self.cache = cache
+        self.max_workers = max(1, max_workers)
+        self.negative_ttl = negative_ttl
+
+    @classmethod
+    def for_climatic_stations(cls) -> "BulkGeocoder":
+        """
+        Creates the bulk geocoder used for the climatic stations, checkpointing to the station geocoding cache
+        :return: The bulk geocoder
+        """
+        settings = get_settings()
+        return cls(
+            sources=get_default_sources(),
+            cache=PersistentCache(
+                path=get_file_path(STATION_GEOCODE_CACHE_FILE),
+                max_entries=settings.cache.station_geocode_max_entries,
+            ),
+            max_workers=settings.location.bulk_geocode_workers,
+            negative_ttl=settings.cache.geocode_negative_ttl,
+        )
+
+    def geocode(
+        self, query: str
+    ) -> Tuple[Optional[str], Optional[Tuple[float, float]]]:
+        """
+        Finds the coordinates of a place using the first source that knows it
+        :param query: The name of the place
+        :return: The name of the source and the latitude and longitude of the place, or None and None if no source
+        could find it
+        """
+        for source in self.sources:
+            coordinates = source.geocode(query)
+            if coordinates is not None:
+                return source.name, coordinates
+        return None, None
+
+    def geocode_all(
+        self,
+        queries: Dict[Any, str],
+        on_result: Callable[[Any, Optional[Tuple[float, float]]], None],
+    ) -> Dict[str, int]:
+        """
+        Geocodes places, calling on_result from the calling thread as each result becomes available. Places answered by
+        the checkpoint are reported first, and places sharing a query are only geocoded once. A place whose lookup
+        raised an error is reported with no coordinates and is not checkpointed.
+        :param queries: The name of each place, keyed by an identifier passed back to on_result
+        :param on_result: Called with the identifier and the latitude and longitude of each place, or None if it could
+        not be found
+        :return: A dictionary counting the places answered by the checkpoint, by each source, not found and failed
+        """
+        stats = {"cached": 0, "not_found": 0, "errors": 0}
+        stats.update({source.name: 0 for source in self.sources})
+
+        # Answer the places that have already been geocoded from the checkpoint
+        pending: Dict[str, List[Any]] = {}
+        for identifier, query in queries.items():
+            key = normalize_address(query)
+            cached = CACHE_MISS if key in pending else self.cache.get(key)
+            if cached is CACHE_MISS:
+                pending.setdefault(key, []).append(identifier)
+                continue
+            stats["cached"] += 1
+            on_result(identifier, None if cached is None else (cached[0], cached[1]))
+
+        if not pending:
+            return stats
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="geocode"
+        ) as executor:
+            futures = {
+                executor.submit(self.geocode, queries[identifiers[0]]): key
+                for key, identifiers in pending.items()
+            }
+            for future in tqdm(as_completed(futures), "Geocoding", total=len(futures)):
+                key = futures[future]
+                identifiers = pending[key]
+                try:
+                    source_name, coordinates = future.result()
+                except Exception as e:
+                    print(f"Failed to geocode {queries[identifiers[0]]}: {e}")
+                    stats["errors"] += len(identifiers)
+                    coordinates = None
+                else:
+                    # Checkpoint the result before reporting it
+                    if coordinates is None:
+                        self.cache.set(key, None, ttl=self.negative_ttl)
+                        stats["not_found"] += len(identifiers)
+                    else:
+                        self.cache.set(key, list(coordinates))
+                        stats[source_name] += len(identifiers)
+                for identifier in identifiers:
+                    on_result(identifier, coordinates)
+        return stats
@@ -0,0 +1,200 @@
+########################################################################################################################
+# bulk_loader.py
+# This file contains the bulk loader used by the population scripts. Rows are streamed to PostgreSQL with COPY FROM
+# STDIN, and inserted in batches with executemany on other backends.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import sqlalchemy
+from sqlalchemy import Table, insert
+from tqdm import tqdm
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The number of characters COPY reads from the stream at a time
+COPY_BUFFER_SIZE = 64 * 1024
+# The number of rows inserted in each executemany batch when COPY is not available
+INSERT_BATCH_SIZE = 5000
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def encode_copy_value(value: Any) -> str:
+    """
+    Encodes a value as a field of a COPY ... WITH (FORMAT csv) stream
+    :param value: The value to encode
+    :return: The encoded field, an unquoted empty field for None so that it is loaded as NULL
+    """
+    if value is None:
+        return ""
+    # Strings are always quoted so that an empty string is not loaded as NULL
+    if isinstance(value, str):
+        return '"' + value.replace('"', '""') + '"'
+    return str(value)
+
+
+########################################################################################################################
+# STREAM CLASS
+########################################################################################################################
+
+
+class CopyStream:
+    """
+    A read-only file-like object that encodes rows as CSV lines only as COPY reads them, so the rows are never all held
+    in memory
+    """
+
+    # The rows left to encode
+    rows: Iterator[Dict[str, Any]]
+    # The columns of each row, in the order of the COPY statement
+    columns: Sequence[str]
+    # The progress bar advanced for each encoded row
+    progress: tqdm
+    # The encoded text not yet read
+    pending: str
+
+    def __init__(
+        self, rows: Iterable[Dict[str, Any]], columns: Sequence[str], progress: tqdm
+    ):
+        """
+        Constructor for the CopyStream class
+        :param rows: The rows to encode, each a dictionary mapping column names to values
+        :param columns: The columns of each row, in the order of the COPY statement
+        :param progress: The progress bar advanced for each encoded row
+        """
+        self.rows = iter(rows)
+        self.columns = columns
+        self.progress = progress
+        self.pending = ""
+
+    def read(self, size: int = -1) -> str:
+        """
+        Reads encoded text from the stream
+        :param size: The maximum number of characters to read, or -1 to read the whole stream
+        :return: The text read, an empty string once every row has been read
+        """
+        lines = [self.pending]
+        length = len(self.pending)
+        while size < 0 or length < size:
+            row = next(self.rows, None)
+            if row is None:
+                break
+            line = (
+                ",".join(encode_copy_value(row.get(column)) for column in self.columns)
+                + "\n"
+            )
+            lines.append(line)
+            length += len(line)
+            self.progress.update(1)
+        text = "".join(lines)
+        if size < 0:
+            self.pending = ""
+            return text
+        self.pending = text[size:]
+        return text[:size]
+
+
+########################################################################################################################
+# LOADING FUNCTIONS
+########################################################################################################################
+
+
+def copy_rows(
+    engine: sqlalchemy.Engine,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Dict[str, Any]],
+    progress: tqdm,
+) -> None:
+    """
+    Loads rows into a PostgreSQL table with a single COPY FROM STDIN statement
+    :param engine: The engine of the database
+    :param table: The table to load the rows into
+    :param columns: The columns of each row
+    :param rows: The rows to load, each a dictionary mapping column names to values
+    :param progress: The progress bar advanced for each loaded row
+    :return: None
+    """
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    statement = f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)'
+    connection = engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(
+                statement,
+                CopyStream(rows, columns, progress),
+                size=COPY_BUFFER_SIZE,
+            )
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def insert_rows(
+    engine: sqlalchemy.Engine,
+    table: Table,
+    columns: Sequence[str],
+    rows: Iterable[Dict[str, Any]],
+    progress: tqdm,
+) -> None:
+    """
+    Loads rows into a table with batched executemany inserts in a single transaction, for backends without COPY
+    :param engine: The engine of the database
+    :param table: The table to load the rows into
+    :param columns: The columns of each row
+    :param rows: The rows to load, each a dictionary mapping column names to values
+    :param progress: The progress bar advanced for each loaded row
+    :return: None
+    """
+    rows = iter(rows)
+    with engine.begin() as connection:
+        while batch := list(islice(rows, INSERT_BATCH_SIZE)):
+            connection.execute(
+                insert(table),
+                [{column: row.get(column) for column in columns} for row in batch],
+            )
+            progress.update(len(batch))
+
+
+def bulk_load(
+    engine: sqlalchemy.Engine,
+    table: Table,
+    columns: List[str],
+    rows: Iterable[Dict[str, Any]],
+    description: str,
+) -> int:
+    """
+    Loads rows into a table, streaming them with COPY on PostgreSQL and inserting them in batches otherwise. Either
+    every row is loaded or none are.
+    :param engine: The engine of the database
+    :param table: The table to load the rows into
+    :param columns: The columns of each row, columns not listed take their default value
+    :param rows: The rows to load, each a dictionary mapping column names to values, consumed lazily
+    :param description: The description of the progress bar
+    :return: The number of rows loaded
+    """
+    with tqdm(desc=description, unit=" rows") as progress:
+        if engine.dialect.name == "postgresql":
+            copy_rows(engine, table, columns, rows, progress)
+        else:
+            insert_rows(engine, table, columns, rows, progress)
+        return progress.n
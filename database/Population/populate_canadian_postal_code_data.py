@@ -14,13 +14,16 @@
 
 import csv
 from sqlalchemy import inspect
-from sqlalchemy.orm import sessionmaker
-from tqdm import tqdm
 from config import get_file_path
 from database.Constants.connection_constants import PrivilegeType
 from database.Entities.canadian_postal_code_data import CanadianPostalCodeData
 from database.Entities.canadian_postal_code_data import BASE
 from database.Entities.database_connection import DatabaseConnection
+from database.Population.bulk_loader import bulk_load
+from database.Population.populate_postal_code_climatic_station import (
+    refresh_postal_code_climatic_station_table,
+)
+from database.Population.populate_reference_database import refresh_reference_database
 from database.Warnings.database_warnings import already_exists_warning
 
 ########################################################################################################################
@@ -80,16 +83,11 @@ def clean_canadian_postal_code_data_table():
 ########################################################################################################################
 
 
-def populate_canadian_postal_code_data_table():
+def read_canadian_postal_code_data():
     """
-    Populates the CanadianPostalCodeData table
-    :return: None
+    Reads the entries of the CanadianPostalCodeData table from data/location/CanadianPostalCodes202312.csv
+    :return: An iterator over the entries, each a dictionary mapping column names to values
     """
-    # Get the engine and controller
-    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-
     # get the path to the data/location/CanadianPostalCodes202312.csv file
     file_path = get_file_path("data/location/CanadianPostalCodes202312.csv")
     # read the file
@@ -100,24 +98,43 @@ def populate_canadian_postal_code_data_table():
         # read data/location/CanadianPostalCodes202312.csv file
         csv_reader = csv.reader(csv_file)
 
-        # map column names to appropriate column index
-        for row in tqdm(csv_reader, "Populating Canadian Postal Code Data"):
-
-            # unpack entry_data to create a ClimaticData object
-            entry = CanadianPostalCodeData(
-                postal_code=row[0],
-                city=row[1],
-                province=row[2],
-                time_zone=row[3],
-                latitude=row[4],
-                longitude=row[5],
-            )
-            # prepare the entry to be added to the database
-            controller.add(entry)
-        # add all entries to the database
-        print("Committing changes to database...")
-        print("This may take a while...")
-        controller.commit()
+        # map each row to the columns of the table
+        for row in csv_reader:
+            yield {
+                "postal_code": row[0],
+                "city": row[1],
+                "province": row[2],
+                "time_zone": row[3],
+                "latitude": row[4],
+                "longitude": row[5],
+            }
+
+
+def populate_canadian_postal_code_data_table():
+    """
+    Populates the CanadianPostalCodeData table
+    :return: None
+    """
+    # Get the engine
+    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+    # Stream the entries to the database in bulk rather than adding them one by one
+    bulk_load(
+        engine,
+        CanadianPostalCodeData.__table__,
+        ["postal_code", "city", "province", "time_zone", "latitude", "longitude"],
+        read_canadian_postal_code_data(),
+        "Populating Canadian Postal Code Data",
+    )
+
+
+def repopulate_canadian_postal_code_data_table():
+    """
+    Creates, cleans and populates the CanadianPostalCodeData table
+    :return: None
+    """
+    create_canadian_postal_code_data_table()
+    clean_canadian_postal_code_data_table()
+    populate_canadian_postal_code_data_table()
 
 
 ########################################################################################################################
@@ -131,9 +148,11 @@ def main():
     )
     choice = input("Are you sure you want to continue? (y/n): ")
     if choice.lower() == "y":
-        create_canadian_postal_code_data_table()
-        clean_canadian_postal_code_data_table()
-        populate_canadian_postal_code_data_table()
+        repopulate_canadian_postal_code_data_table()
+        # Remap the postal codes affected by the new data to their nearest climatic station
+        refresh_postal_code_climatic_station_table()
+        # Regenerate the embedded reference database if the server reads the reference tables from it
+        refresh_reference_database()
         DATABASE.close()
     else:
         exit(0)
@@ -14,17 +14,20 @@
 
 import ast
 import csv
-import uuid
-from tqdm import tqdm
-from geopy.extra.rate_limiter import RateLimiter
-from sqlalchemy import inspect
+from sqlalchemy import inspect, update
 from sqlalchemy.orm import sessionmaker
 from config import get_file_path
 from database.Constants.connection_constants import PrivilegeType
 from database.Entities.climatic_data import BASE, ClimaticData
 from database.Entities.database_connection import DatabaseConnection
+from database.Population.bulk_geocoder import BulkGeocoder
+from database.Population.bulk_loader import bulk_load
+from database.Population.populate_postal_code_climatic_station import (
+    refresh_postal_code_climatic_station_table,
+)
+from database.Population.populate_reference_database import refresh_reference_database
 from database.Warnings.database_warnings import already_exists_warning
-from geopy.geocoders import Nominatim
+from settings import get_settings
 
 ########################################################################################################################
 # GLOBALS
@@ -82,15 +85,32 @@ def clean_climatic_data_table():
 ########################################################################################################################
 
 
-def populate_climatic_data_table():
+def read_climatic_data():
     """
-    Populates the ClimaticData table
-    :return: None
+    Reads the entries of the ClimaticData table from data-extraction/output/table_c2.csv, their coordinates are set
+    afterwards by update_location
+    :return: An iterator over the entries, each a dictionary mapping column names to values
     """
-    # Get the engine and controller
-    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
+    # map column names to appropriate column index
+    column_mapping = {
+        "ProvinceAndLocation": 1,
+        "Elev_m": 2,
+        "Jan_2_5_percent_C": 3,
+        "Jan_1_percent_C": 4,
+        "July_Dry_C": 5,
+        "July_Wet_C": 6,
+        "DegreeDaysBelow18C": 7,
+        "Rain_15_Min_mm": 8,
+        "OneDayRain_1_50_mm": 9,
+        "Ann_Rain_mm": 10,
+        "MoistIndex": 11,
+        "Ann_Tot_Ppn_mm": 12,
+        "DrivingRainWindPressures_Pa_1_5": 13,
+        "SnowLoad_kPa_1_50_Ss": 14,
+        "SnowLoad_kPa_1_50_Sr": 15,
+        "HourlyWindPressures_kPa_1_10": 16,
+        "HourlyWindPressures_kPa_1_50": 17,
+    }
 
     # get the path to the data-extraction/output/table_c2.csv file
     file_path = get_file_path("data-extraction/output/table_c2.csv")
@@ -103,30 +123,9 @@ def populate_climatic_data_table():
         # read data-extraction/output/table_c2.csv file
         csv_reader = csv.reader(csv_file)
 
-        # map column names to appropriate column index
-        for row in tqdm(csv_reader, "Populating Climatic Data"):
-            column_mapping = {
-                "ProvinceAndLocation": 1,
-                "Elev_m": 2,
-                "Jan_2_5_percent_C": 3,
-                "Jan_1_percent_C": 4,
-                "July_Dry_C": 5,
-                "July_Wet_C": 6,
-                "DegreeDaysBelow18C": 7,
-                "Rain_15_Min_mm": 8,
-                "OneDayRain_1_50_mm": 9,
-                "Ann_Rain_mm": 10,
-                "MoistIndex": 11,
-                "Ann_Tot_Ppn_mm": 12,
-                "DrivingRainWindPressures_Pa_1_5": 13,
-                "SnowLoad_kPa_1_50_Ss": 14,
-                "SnowLoad_kPa_1_50_Sr": 15,
-                "HourlyWindPressures_kPa_1_10": 16,
-                "HourlyWindPressures_kPa_1_50": 17,
-            }
-
+        for row in csv_reader:
             # store the data of the entry in a dictionary
-            entry_data = {}
+            entry_data = {"Latitude": 0, "Longitude": 0}
             # go through each column and set value
             for column in column_mapping:
                 # the only column that should be a string
@@ -138,18 +137,44 @@ def populate_climatic_data_table():
                 # otherwise, we use an abstract syntax tree to parse the value appropriately
                 else:
                     entry_data[column] = ast.literal_eval(row[column_mapping[column]])
+            yield entry_data
 
-            # unpack entry_data to create a ClimaticData object
-            entry = ClimaticData(**entry_data, Latitude=0, Longitude=0)
-            # prepare the entry to be added to the database
-            controller.add(entry)
-        # add all entries to the database
-        controller.commit()
+
+def populate_climatic_data_table():
+    """
+    Populates the ClimaticData table
+    :return: None
+    """
+    # Get the engine
+    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+    # Stream the entries to the database in bulk rather than adding them one by one
+    bulk_load(
+        engine,
+        ClimaticData.__table__,
+        [
+            column.name
+            for column in ClimaticData.__table__.columns
+            if not column.primary_key
+        ],
+        read_climatic_data(),
+        "Populating Climatic Data",
+    )
+
+
+def repopulate_climatic_data_table():
+    """
+    Creates, cleans and populates the ClimaticData table, without setting the coordinates of the entries
+    :return: None
+    """
+    create_climatic_data_table()
+    clean_climatic_data_table()
+    populate_climatic_data_table()
 
 
 def update_location():
     """
-    Updates the location of each entry in the ClimaticData table
+    Updates the location of each entry in the ClimaticData table. Stations are geocoded concurrently and each result is
+    checkpointed, so an interrupted update resumes where it stopped and only new or renamed stations are geocoded.
     :return: None
     """
     # Get the engine and controller
@@ -157,27 +182,37 @@ def update_location():
     session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
     controller = session()
 
-    # Create a geolocator and geocode rate limiter
-    geolocator = Nominatim(user_agent=str(uuid.uuid4()).replace("-", ""))
-    geocode = RateLimiter(geolocator.geocode, min_delay_seconds=1)
-
-    # For each entry in the ClimaticData table
-    for entry in tqdm(controller.query(ClimaticData).all(), desc="Updating Locations"):
-        # Get the location information
-        location = entry.ProvinceAndLocation
-        location_info = geocode(location, timeout=10)
-
+    # The location of each entry in the ClimaticData table, keyed by ID
+    queries = {
+        entry.ID: entry.ProvinceAndLocation
+        for entry in controller.query(ClimaticData.ID, ClimaticData.ProvinceAndLocation)
+    }
+    # The coordinates not yet written to the database
+    updates = []
+    commit_size = get_settings().location.bulk_geocode_commit_size
+
+    def commit_updates():
+        # Update the coordinates of the entries by primary key
+        if updates:
+            controller.execute(update(ClimaticData), updates)
+            controller.commit()
+            updates.clear()
+
+    def store_coordinates(entry_id, coordinates):
         # If the location information is None, we set the latitude and longitude to None
-        if location_info is None:
-            entry.Latitude = None
-            entry.Longitude = None
-        # Otherwise, we set the latitude and longitude to the location information
-        else:
-            entry.Latitude = location_info.latitude
-            entry.Longitude = location_info.longitude
-
-    # Commit the changes
-    controller.commit()
+        latitude, longitude = coordinates if coordinates is not None else (None, None)
+        updates.append({"ID": entry_id, "Latitude": latitude, "Longitude": longitude})
+        # Commit regularly so that the database reflects the progress of the update
+        if len(updates) >= commit_size:
+            commit_updates()
+
+    stats = BulkGeocoder.for_climatic_stations().geocode_all(
+        queries, store_coordinates
+    )
+    # Commit the remaining changes
+    commit_updates()
+    controller.close()
+    print(f"Updated the locations of {len(queries)} stations: {stats}")
 
 
 ########################################################################################################################
@@ -192,10 +227,12 @@ def main():
     )
     choice = input("Are you sure you want to continue? (y/n): ")
     if choice.lower() == "y":
-        create_climatic_data_table()
-        clean_climatic_data_table()
-        populate_climatic_data_table()
+        repopulate_climatic_data_table()
         update_location()
+        # Remap the postal codes affected by the new data to their nearest climatic station
+        refresh_postal_code_climatic_station_table()
+        # Regenerate the embedded reference database if the server reads the reference tables from it
+        refresh_reference_database()
         DATABASE.close()
     else:
         exit(0)
@@ -0,0 +1,358 @@
+########################################################################################################################
+# populate_postal_code_climatic_station.py
+# This file contains the code for populating the PostalCodeClimaticStation table, which assigns every postal code its
+# nearest climatic station. The table is updated incrementally, only postal codes affected by changes to the
+# CanadianPostalCodeData or ClimaticData tables since the last run are recomputed.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import delete, inspect
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import sessionmaker
+from tqdm import tqdm
+
+from backend.Entities.Location.climatic_station_index import (
+    chord_to_distance,
+    to_unit_vectors,
+)
+from database.Constants.connection_constants import PrivilegeType
+from database.Entities.canadian_postal_code_data import CanadianPostalCodeData
+from database.Entities.climatic_data import ClimaticData
+from database.Entities.database_connection import DatabaseConnection
+from database.Entities.postal_code_climatic_station import (
+    BASE,
+    ClimaticStationSnapshot,
+    PostalCodeClimaticStation,
+)
+from database.Population.populate_reference_database import refresh_reference_database
+from database.Warnings.database_warnings import already_exists_warning
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The database connection
+DATABASE = DatabaseConnection(database_name="NBCC-2020")
+# The number of rows written to the database in each statement
+CHUNK_SIZE = 10000
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def find_nearest(
+    stations: Dict[int, Tuple[float, float]],
+    coordinates: List[Tuple[float, float]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Finds the nearest station to each pair of coordinates
+    :param stations: The coordinates of each station, keyed by ID
+    :param coordinates: The latitude and longitude of each point
+    :return: The ID of the nearest station and the distance to it in km, for each point
+    """
+    station_ids = np.array(sorted(stations), dtype=np.int64)
+    tree = cKDTree(
+        to_unit_vectors(
+            [stations[station_id][0] for station_id in station_ids],
+            [stations[station_id][1] for station_id in station_ids],
+        )
+    )
+    latitudes, longitudes = zip(*coordinates)
+    chords, indices = tree.query(to_unit_vectors(latitudes, longitudes), k=1)
+    return station_ids[indices], chord_to_distance(chords)
+
+
+def iterate_chunks(items: list, description: str):
+    """
+    Splits a list into chunks of CHUNK_SIZE items, showing the progress
+    :param items: The list to split
+    :param description: The description of the progress bar
+    :return: An iterator over the chunks
+    """
+    for start in tqdm(range(0, len(items), CHUNK_SIZE), description):
+        yield items[start : start + CHUNK_SIZE]
+
+
+########################################################################################################################
+# DATABASE FUNCTIONS
+########################################################################################################################
+
+
+def create_postal_code_climatic_station_tables():
+    """
+    Creates the PostalCodeClimaticStation and ClimaticStationSnapshot tables
+    :return: None
+    """
+    # Get the engine
+    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+
+    # Names of the tables
+    table_names = ["PostalCodeClimaticStation", "ClimaticStationSnapshot"]
+    inspector = inspect(engine)
+    existing_table_names = inspector.get_table_names()
+    # If the tables already exist, we don't want to create them again
+    if all(table_name in existing_table_names for table_name in table_names):
+        for table_name in table_names:
+            already_exists_warning(
+                item=table_name, database_name=DATABASE.database_name
+            )
+        return
+
+    # Otherwise, we create the missing tables
+    BASE.metadata.bind = engine
+    BASE.metadata.create_all(bind=engine)
+
+
+def source_tables_exist() -> bool:
+    """
+    Checks whether the CanadianPostalCodeData and ClimaticData tables the mapping is computed from exist
+    :return: True if both tables exist, False otherwise
+    """
+    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+    table_names = inspect(engine).get_table_names()
+    return "CanadianPostalCodeData" in table_names and "ClimaticData" in table_names
+
+
+def load_postal_codes(controller) -> Dict[str, Tuple[float, float]]:
+    """
+    Loads the coordinates of every postal code, keeping the first entry of postal codes listed more than once
+    :param controller: An open session
+    :return: The latitude and longitude of each postal code
+    """
+    postal_codes = {}
+    rows = (
+        controller.query(
+            CanadianPostalCodeData.postal_code,
+            CanadianPostalCodeData.latitude,
+            CanadianPostalCodeData.longitude,
+        )
+        .filter(CanadianPostalCodeData.postal_code.isnot(None))
+        .filter(CanadianPostalCodeData.latitude.isnot(None))
+        .filter(CanadianPostalCodeData.longitude.isnot(None))
+        .order_by(CanadianPostalCodeData.ID)
+    )
+    for postal_code, latitude, longitude in rows:
+        postal_codes.setdefault(postal_code, (latitude, longitude))
+    return postal_codes
+
+
+def load_stations(controller) -> Dict[int, Tuple[float, float]]:
+    """
+    Loads the coordinates of every climatic station with valid coordinates
+    :param controller: An open session
+    :return: The latitude and longitude of each station, keyed by ID
+    """
+    rows = (
+        controller.query(ClimaticData.ID, ClimaticData.Latitude, ClimaticData.Longitude)
+        .filter(ClimaticData.Latitude.isnot(None))
+        .filter(ClimaticData.Longitude.isnot(None))
+    )
+    return {
+        station_id: (latitude, longitude) for station_id, latitude, longitude in rows
+    }
+
+
+########################################################################################################################
+# POPULATION FUNCTIONS
+########################################################################################################################
+
+
+def update_postal_code_climatic_station_table() -> Dict[str, int]:
+    """
+    Brings the PostalCodeClimaticStation table up to date with the CanadianPostalCodeData and ClimaticData tables.
+    Postal codes that are new, have moved, or were mapped to a station that has since moved or been removed are
+    searched against every station. The remaining postal codes are only searched against stations added since the
+    last run, and keep their station unless a new one is closer.
+    :return: A dictionary containing the number of postal codes recomputed, updated and removed
+    """
+    # Get the engine and controller
+    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
+    controller = session()
+
+    print("Loading postal codes and climatic stations...")
+    postal_codes = load_postal_codes(controller)
+    stations = load_stations(controller)
+    mapping = {
+        row.postal_code: row
+        for row in controller.query(
+            PostalCodeClimaticStation.postal_code,
+            PostalCodeClimaticStation.latitude,
+            PostalCodeClimaticStation.longitude,
+            PostalCodeClimaticStation.climatic_id,
+            PostalCodeClimaticStation.distance,
+        )
+    }
+    snapshot = {
+        station_id: (latitude, longitude)
+        for station_id, latitude, longitude in controller.query(
+            ClimaticStationSnapshot.ID,
+            ClimaticStationSnapshot.Latitude,
+            ClimaticStationSnapshot.Longitude,
+        )
+    }
+
+    # Stations that were moved count as both removed and added
+    removed_stations = {
+        station_id
+        for station_id, coordinates in snapshot.items()
+        if stations.get(station_id) != coordinates
+    }
+    added_stations = {
+        station_id: coordinates
+        for station_id, coordinates in stations.items()
+        if snapshot.get(station_id) != coordinates
+    }
+    removed_postal_codes = [
+        postal_code for postal_code in mapping if postal_code not in postal_codes
+    ]
+
+    # Postal codes whose nearest station may be any station
+    stale = [
+        postal_code
+        for postal_code, coordinates in postal_codes.items()
+        if postal_code not in mapping
+        or (mapping[postal_code].latitude, mapping[postal_code].longitude)
+        != coordinates
+        or mapping[postal_code].climatic_id in removed_stations
+    ]
+    # Postal codes whose nearest station is either their current one or a new one
+    current = []
+    if added_stations:
+        stale_set = set(stale)
+        current = [
+            postal_code for postal_code in postal_codes if postal_code not in stale_set
+        ]
+
+    rows = []
+    if stations and stale:
+        station_ids, distances = find_nearest(
+            stations, [postal_codes[postal_code] for postal_code in stale]
+        )
+        rows.extend(zip(stale, station_ids.tolist(), distances.tolist()))
+    num_updated = 0
+    if current:
+        station_ids, distances = find_nearest(
+            added_stations, [postal_codes[postal_code] for postal_code in current]
+        )
+        for postal_code, station_id, distance in zip(
+            current, station_ids.tolist(), distances.tolist()
+        ):
+            if distance < mapping[postal_code].distance:
+                rows.append((postal_code, station_id, distance))
+                num_updated += 1
+
+    # Without any stations every postal code is unmapped
+    if not stations:
+        removed_postal_codes = list(mapping)
+
+    for chunk in iterate_chunks(removed_postal_codes, "Removing postal codes"):
+        controller.execute(
+            delete(PostalCodeClimaticStation).where(
+                PostalCodeClimaticStation.postal_code.in_(chunk)
+            )
+        )
+    for chunk in iterate_chunks(rows, "Mapping postal codes to climatic stations"):
+        statement = insert(PostalCodeClimaticStation).values(
+            [
+                {
+                    "postal_code": postal_code,
+                    "latitude": postal_codes[postal_code][0],
+                    "longitude": postal_codes[postal_code][1],
+                    "climatic_id": station_id,
+                    "distance": distance,
+                }
+                for postal_code, station_id, distance in chunk
+            ]
+        )
+        controller.execute(
+            statement.on_conflict_do_update(
+                index_elements=[PostalCodeClimaticStation.postal_code],
+                set_={
+                    "latitude": statement.excluded.latitude,
+                    "longitude": statement.excluded.longitude,
+                    "climatic_id": statement.excluded.climatic_id,
+                    "distance": statement.excluded.distance,
+                },
+            )
+        )
+
+    # Record the stations the table now reflects
+    for chunk in iterate_chunks(sorted(removed_stations), "Updating station snapshot"):
+        controller.execute(
+            delete(ClimaticStationSnapshot).where(ClimaticStationSnapshot.ID.in_(chunk))
+        )
+    for chunk in iterate_chunks(sorted(added_stations), "Updating station snapshot"):
+        controller.execute(
+            insert(ClimaticStationSnapshot).values(
+                [
+                    {
+                        "ID": station_id,
+                        "Latitude": added_stations[station_id][0],
+                        "Longitude": added_stations[station_id][1],
+                    }
+                    for station_id in chunk
+                ]
+            )
+        )
+
+    print("Committing changes to database...")
+    controller.commit()
+    controller.close()
+
+    summary = {
+        "recomputed": len(stale) if stations else 0,
+        "updated": num_updated,
+        "removed": len(removed_postal_codes),
+    }
+    print(
+        f"Recomputed {summary['recomputed']} postal codes, moved {summary['updated']} to a new station and removed "
+        f"{summary['removed']}"
+    )
+    return summary
+
+
+def refresh_postal_code_climatic_station_table():
+    """
+    Updates the PostalCodeClimaticStation table after one of the tables it is computed from has been repopulated. Does
+    nothing until both tables exist.
+    :return: None
+    """
+    if not source_tables_exist():
+        return
+    create_postal_code_climatic_station_tables()
+    update_postal_code_climatic_station_table()
+
+
+########################################################################################################################
+# MAIN
+########################################################################################################################
+
+
+def main():
+    print(
+        "This script will update the PostalCodeClimaticStation table to match the CanadianPostalCodeData and "
+        "ClimaticData tables. Only postal codes affected by changes since the last run are recomputed."
+    )
+    refresh_postal_code_climatic_station_table()
+    # Regenerate the embedded reference database if the server reads the reference tables from it
+    refresh_reference_database()
+    DATABASE.close()
+
+
+if __name__ == "__main__":
+    main()
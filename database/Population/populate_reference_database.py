@@ -0,0 +1,130 @@
+########################################################################################################################
+# populate_reference_database.py
+# This file contains the code for generating the embedded reference database, a SQLite file holding a copy of the
+# read-only NBCC reference tables. Servers configured with REFERENCE_BACKEND=sqlite read these tables in-process
+# instead of from PostgreSQL.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import os
+from typing import Dict
+
+from sqlalchemy import create_engine, insert, inspect, select, text
+from tqdm import tqdm
+
+from database.Constants.connection_constants import PrivilegeType, ReferenceBackend
+from database.Entities.canadian_postal_code_data import CanadianPostalCodeData
+from database.Entities.climatic_data import ClimaticData
+from database.Entities.database_connection import (
+    DatabaseConnection,
+    get_embedded_connection_url,
+    get_reference_backend,
+    get_reference_database_path,
+)
+from database.Entities.postal_code_climatic_station import PostalCodeClimaticStation
+from database.Entities.wind_speed_data import WindSpeedData
+
+########################################################################################################################
+# GLOBALS
+########################################################################################################################
+
+# The database connection
+DATABASE = DatabaseConnection(database_name="NBCC-2020")
+# The tables copied to the embedded reference database
+REFERENCE_TABLES = [
+    ClimaticData.__table__,
+    CanadianPostalCodeData.__table__,
+    WindSpeedData.__table__,
+    PostalCodeClimaticStation.__table__,
+]
+# The number of rows copied in each statement
+CHUNK_SIZE = 10000
+
+
+########################################################################################################################
+# POPULATION FUNCTIONS
+########################################################################################################################
+
+
+def populate_reference_database(path: str) -> Dict[str, int]:
+    """
+    Copies the reference tables from PostgreSQL into a new SQLite file, replacing any existing file in a single step.
+    Tables missing from PostgreSQL are created empty.
+    :param path: The path of the SQLite file
+    :return: The number of rows copied to each table
+    """
+    # Get the engines
+    source = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+    source_table_names = inspect(source).get_table_names()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Build a temporary file first so that running servers never see a partially written database
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(temporary_path):
+        os.remove(temporary_path)
+    target = create_engine(get_embedded_connection_url(temporary_path, read_only=False))
+
+    num_rows = {}
+    for table in REFERENCE_TABLES:
+        # Creates the indexes declared on the table along with it
+        table.create(bind=target)
+        num_rows[table.name] = 0
+        if table.name not in source_table_names:
+            print(
+                f"{table.name} does not exist in {DATABASE.database_name}, leaving it empty"
+            )
+            continue
+        with source.connect() as source_connection, target.begin() as target_connection:
+            result = source_connection.execution_options(yield_per=CHUNK_SIZE).execute(
+                select(table)
+            )
+            for partition in tqdm(result.partitions(), f"Copying {table.name}"):
+                target_connection.execute(
+                    insert(table), [row._asdict() for row in partition]
+                )
+                num_rows[table.name] += len(partition)
+
+    with target.begin() as target_connection:
+        # Gather statistics for the query planner
+        target_connection.execute(text("ANALYZE"))
+    target.dispose()
+    os.replace(temporary_path, path)
+    return num_rows
+
+
+def refresh_reference_database():
+    """
+    Regenerates the embedded reference database after one of the reference tables has been repopulated. Does nothing
+    unless the server is configured to read the reference tables from it.
+    :return: None
+    """
+    if get_reference_backend() is ReferenceBackend.SQLITE:
+        populate_reference_database(get_reference_database_path())
+
+
+########################################################################################################################
+# MAIN
+########################################################################################################################
+
+
+def main():
+    path = get_reference_database_path()
+    print(
+        f"This script will copy the reference tables of {DATABASE.database_name} to the embedded reference database "
+        f"{path}, replacing it if it exists."
+    )
+    num_rows = populate_reference_database(path)
+    for table_name, count in num_rows.items():
+        print(f"{table_name}: {count} rows")
+    DATABASE.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,15 @@
 ########################################################################################################################
 
 from sqlalchemy import inspect
-from sqlalchemy.orm import sessionmaker
 
 from database.Constants.connection_constants import PrivilegeType
 from database.Entities.save_data import SaveData
 from database.Entities.save_data import BASE
-from database.Entities.database_connection import DatabaseConnection
+from database.Entities.database_connection import (
+    DatabaseConnection,
+    get_scoped_session,
+    open_scoped_session,
+)
 from database.Warnings.database_warnings import already_exists_warning
 
 ########################################################################################################################
@@ -77,17 +80,14 @@ def add_entry(save_data: SaveData):
     :param save_data: The SaveData object
     :return: None
     """
-    # Connect to the database
-    new_connection = DatabaseConnection(database_name="NBCC-2020")
-    engine = new_connection.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-    # Add the entry
-    controller.add(save_data)
-    # Commit the changes
-    controller.commit()
-    # Close the connection
-    new_connection.close()
+    # Connect to the database using the shared connection pool, the connection returns to the pool when the block ends
+    with open_scoped_session(
+        get_scoped_session(database_name="NBCC-2020", privilege=PrivilegeType.ADMIN)
+    ) as controller:
+        # Add the entry
+        controller.add(save_data)
+        # Commit the changes
+        controller.commit()
 
 
 ########################################################################################################################
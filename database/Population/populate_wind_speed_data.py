@@ -14,12 +14,12 @@
 
 import csv
 from sqlalchemy import inspect
-from sqlalchemy.orm import sessionmaker
-from tqdm import tqdm
 from config import get_file_path
 from database.Constants.connection_constants import PrivilegeType
 from database.Entities.database_connection import DatabaseConnection
+from database.Population.bulk_loader import bulk_load
 from database.Entities.wind_speed_data import BASE, WindSpeedData
+from database.Population.populate_reference_database import refresh_reference_database
 from database.Warnings.database_warnings import already_exists_warning
 
 
@@ -78,16 +78,11 @@ def clean_wind_speed_data_table():
 ########################################################################################################################
 
 
-def populate_wind_speed_data_table():
+def read_wind_speed_data():
     """
-    Populates the WindSpeedData table
-    :return: None
+    Reads the entries of the WindSpeedData table from data-extraction/output/table_c1.csv
+    :return: An iterator over the entries, each a dictionary mapping column names to values
     """
-    # Get the engine and controller
-    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
-    session = sessionmaker(autocommit=False, autoflush=True, bind=engine)
-    controller = session()
-
     # Open the data-extraction/output/table_c1.csv file
     file_path = get_file_path("data-extraction/output/table_c1.csv")
     # Read the file
@@ -100,14 +95,37 @@ def populate_wind_speed_data_table():
         csv_reader = csv.reader(csv_file)
 
         # Iterate through each row of the csv file
-        for row in tqdm(csv_reader, "Populating Wind Speed Data"):
+        for row in csv_reader:
             # Each row of the csv file contains 4 entries, hence we need to split the row into groups of two columns
             for i in range(1, 9, 2):
-                entry = WindSpeedData(q_KPa=float(row[i]), V_ms=float(row[i + 1]))
-                # Add the entry to the controller
-                controller.add(entry)
-        # Commit the changes
-        controller.commit()
+                yield {"q_KPa": float(row[i]), "V_ms": float(row[i + 1])}
+
+
+def populate_wind_speed_data_table():
+    """
+    Populates the WindSpeedData table
+    :return: None
+    """
+    # Get the engine
+    engine = DATABASE.get_engine(privilege=PrivilegeType.ADMIN)
+    # Stream the entries to the database in bulk rather than adding them one by one
+    bulk_load(
+        engine,
+        WindSpeedData.__table__,
+        ["q_KPa", "V_ms"],
+        read_wind_speed_data(),
+        "Populating Wind Speed Data",
+    )
+
+
+def repopulate_wind_speed_data_table():
+    """
+    Creates, cleans and populates the WindSpeedData table
+    :return: None
+    """
+    create_wind_speed_data_table()
+    clean_wind_speed_data_table()
+    populate_wind_speed_data_table()
 
 
 ########################################################################################################################
@@ -121,9 +139,9 @@ def main():
     )
     choice = input("Are you sure you want to continue? (y/n): ")
     if choice.lower() == "y":
-        create_wind_speed_data_table()
-        clean_wind_speed_data_table()
-        populate_wind_speed_data_table()
+        repopulate_wind_speed_data_table()
+        # Regenerate the embedded reference database if the server reads the reference tables from it
+        refresh_reference_database()
         DATABASE.close()
     else:
         exit(0)
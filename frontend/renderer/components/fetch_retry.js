@@ -0,0 +1,45 @@
+/**
+ fetch_retry.js
+ This file makes every request of the page resend itself when the server answers 409 Conflict. A server running several
+ workers answers 409 when another request changed the same user's data first, in which case none of the changes of the
+ request were stored and it can safely be sent again.
+
+Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+By using this code, you agree to abide by the terms and conditions in those files.
+
+Author: Noah Subedar [https://github.com/noahsub]
+ **/
+
+// The number of times a request is resent after a conflict
+const conflictRetries = 3;
+// The number of milliseconds to wait before the first resend, doubled before each following resend
+const conflictRetryDelay = 100;
+
+const fetchWithoutRetry = window.fetch.bind(window);
+
+/**
+ * Sends a request, resending it while the server answers 409 Conflict
+ * @param {RequestInfo} resource The url or request to send
+ * @param {RequestInit} options The options of the request
+ * @returns {Promise<Response>} The response to the last attempt
+ */
+window.fetch = async function (resource, options) {
+  // Request objects can only be sent once, so a copy is sent on each attempt
+  const send = () =>
+    fetchWithoutRetry(
+      resource instanceof Request ? resource.clone() : resource,
+      options
+    );
+  let response = await send();
+  for (
+    let attempt = 0;
+    response.status === 409 && attempt < conflictRetries;
+    attempt++
+  ) {
+    await new Promise((resolve) =>
+      setTimeout(resolve, conflictRetryDelay * 2 ** attempt)
+    );
+    response = await send();
+  }
+  return response;
+};
@@ -128,7 +128,7 @@ class CustomNavbar extends HTMLElement {
         fetch(`${connectionAddress}/get_user_profile`, requestOptions)
           .then((response) => response.json())
           .then((result) => {
-            let data = JSON.parse(result);
+            let data = result;
             const username = data["username"];
             this.shadowRoot.querySelector(
               "#navbarDropdownMenuLink"
@@ -234,10 +234,10 @@ async function getNumHeightZones() {
 
     const result = await response.json();
     console.log({
-      result: Object.keys(JSON.parse(result)),
-      length: Object.keys(JSON.parse(result)).length,
+      result: Object.keys(result),
+      length: Object.keys(result).length,
     });
-    return Object.keys(JSON.parse(result)).length;
+    return Object.keys(result).length;
   } catch (error) {
     console.error(error);
     throw error;
@@ -238,8 +238,7 @@ async function getHeightZones() {
       redirect: "follow",
     });
 
-    const result = await response.json();
-    return JSON.parse(result);
+    return await response.json();
   } catch (error) {
     console.error(error);
     throw error;
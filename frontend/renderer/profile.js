@@ -52,7 +52,7 @@ function getProfile() {
         fetch(`${connectionAddress}/get_user_profile`, requestOptions)
           .then((response) => response.json())
           .then((result) => {
-            let data = JSON.parse(result);
+            let data = result;
             document.getElementById("first-name").innerHTML =
               data["first_name"];
             document.getElementById("last-name").innerHTML = data["last_name"];
@@ -201,6 +201,11 @@ document
     //   ];
     if (result?.detail) {
       const alertBox = document.getElementById("alert-box");
+      // The address was found but the climatic or seismic data could not be fetched, the previous location is kept
+      if (result.detail.stages?.coordinates?.status === "complete") {
+        alertBox.alert(`${result.detail.message}. Please try again.`);
+        return;
+      }
       alertBox.alert("Address Not Found. Maybe use a postal code");
       return;
     }
@@ -50,7 +50,7 @@ function getNumHeightZones() {
           fetch(`${connectionAddress}/get_height_zones`, requestOptions)
             .then((response) => response.json())
             .then((result) => {
-              let heightZoneData = JSON.parse(result);
+              let heightZoneData = result;
               let numHeightZones = Object.keys(heightZoneData).length;
               resolve(numHeightZones); // Resolve the promise with numHeightZones
             })
@@ -445,7 +445,7 @@ function getWindLoads() {
             fetch(`${connectionAddress}/get_height_zones`, requestOptions)
               .then((response) => response.json())
               .then((result) => {
-                let heightZoneData = JSON.parse(result);
+                let heightZoneData = result;
                 console.log(heightZoneData);
 
                 for (let zoneNum in heightZoneData) {
@@ -625,7 +625,7 @@ function getSeismicLoads() {
             fetch(`${connectionAddress}/get_height_zones`, requestOptions)
               .then((response) => response.json())
               .then((result) => {
-                let heightZoneData = JSON.parse(result);
+                let heightZoneData = result;
 
                 for (let zoneNum in heightZoneData) {
                   let seismicLoad = heightZoneData[zoneNum]["seismic_load"];
@@ -813,7 +813,7 @@ function generate_bar_chart() {
         fetch(`${connectionAddress}/bar_chart`, requestOptions)
           .then((response) => response.json())
           .then((result) => {
-            let data = JSON.parse(result);
+            let data = result;
             let id = data["id"];
             let numBarCharts = data["num_bar_charts"];
             for (let i = 0; i < numBarCharts; i++) {
@@ -180,6 +180,12 @@ python3.11 -m database.Population.populate_climate_data
 python3.11 -m database.Population.populate_save_data
 python3.11 -m database.Population.populate_wind_speed_data
 
+# Generate the embedded reference database, used when REFERENCE_BACKEND=sqlite is set in database/.env
+python3.11 -m database.Population.populate_reference_database
+
+# Build the memory-mapped postal code index
+python3.11 -m backend.Entities.Location.postal_code_index
+
 # Deactivate the virtual environment
 deactivate
 
@@ -1,11 +1,19 @@
 import argparse
+import os
 import secrets
 from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI
 
 from config import get_file_path
+from settings import (
+    API_ENV_FILE,
+    DATABASE_ENV_FILE,
+    REQUIRED_API_KEYS,
+    REQUIRED_DATABASE_KEYS,
+    get_missing_keys,
+    get_settings,
+)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="")
@@ -21,51 +29,33 @@ if __name__ == "__main__":
     parser.add_argument("-p", "--port", type=int, help="Port Number")
     parser.add_argument("-du", "--admin_username", type=str, help="Admin Username")
     parser.add_argument("-dp", "--admin_password", type=str, help="Admin Password")
+    parser.add_argument(
+        "-sh", "--server_host", type=str, help="Address the Server Listens On"
+    )
+    parser.add_argument(
+        "-sp", "--server_port", type=int, help="Port the Server Listens On"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, help="Number of Worker Processes Serving Requests"
+    )
     args = parser.parse_args()
 
-    api_env_path = Path(get_file_path("data/EnvironmentVariables/.env"))
-    database_env_path = Path(get_file_path("database/.env"))
-
-    api_env_valid = True
-    database_env_valid = True
-
-    # check that the files at the paths
-    if not api_env_path.exists():
-        # create the directory
-        api_env_path.parent.mkdir(parents=True, exist_ok=True)
-        # create the file
-        api_env_path.touch()
-        api_env_valid = False
-
-    else:
-        # get the keys of the .env file
-        with open(api_env_path, "r") as file:
-            keys = {x.split("=")[0] for x in file.read().splitlines()}
-            if keys != {"API_SECRET_KEY"}:
-                api_env_valid = False
+    api_env_path = Path(get_file_path(API_ENV_FILE))
+    database_env_path = Path(get_file_path(DATABASE_ENV_FILE))
 
-    if not database_env_path.exists():
+    # check that the files at the paths exist
+    for env_path in (api_env_path, database_env_path):
         # create the directory
-        database_env_path.parent.mkdir(parents=True, exist_ok=True)
+        env_path.parent.mkdir(parents=True, exist_ok=True)
         # create the file
-        database_env_path.touch()
-        database_env_valid = False
+        env_path.touch()
 
-    else:
-        # get the keys of the .env file
-        with open(database_env_path, "r") as file:
-            keys = {x.split("=")[0] for x in file.read().splitlines()}
-            if keys != {
-                "ADMIN_PASSWORD",
-                "ADMIN_USERNAME",
-                "WRITE_USERNAME",
-                "READ_PASSWORD",
-                "WRITE_PASSWORD",
-                "HOST",
-                "READ_USERNAME",
-                "PORT",
-            }:
-                database_env_valid = False
+    # check that the files define the required keys, optional keys such as the connection pool settings may also be
+    # present
+    api_env_valid = not get_missing_keys(API_ENV_FILE, REQUIRED_API_KEYS)
+    database_env_valid = not get_missing_keys(
+        DATABASE_ENV_FILE, REQUIRED_DATABASE_KEYS
+    )
 
     if api_env_valid is False:
         # populate the .env file
@@ -103,61 +93,36 @@ if __name__ == "__main__":
 
     # Installation mode
     if args.install:
-        exit(0)
+        from database.Migrations.migration_manager import migrate_database
 
-    from backend.API.Endpoints.authentication import authentication_router
-    from backend.API.Endpoints.building_endpoint import building_router
-    from backend.API.Endpoints.cladding_endpoint import cladding_router
-    from backend.API.Endpoints.dimensions_endpoint import dimensions_router
-    from backend.API.Endpoints.natural_frequency_endpoint import natural_frequency_endpoint_router
-    from backend.API.Endpoints.height_zones_endpoint import height_zone_router
-    from backend.API.Endpoints.importance_category_endpoint import (
-        importance_category_router,
-    )
-    from backend.API.Endpoints.material_type_endpoint import (
-        material_type_endpoint_router,
-    )
-    from backend.API.Endpoints.location import location_router
-    from backend.API.Endpoints.roof_endpoint import roof_router
-    from backend.API.Endpoints.roof_load_combination_endpoint import (
-        roof_load_combination_router,
-    )
-    from backend.API.Endpoints.seismic_load_endpoint import seismic_load_router
-    from backend.API.Endpoints.main_structure_loads_endpoint import main_structure_loads_router
-    from backend.API.Endpoints.server_status_endpoint import server_status_endpoint
-    from backend.API.Endpoints.snow_load_endpoint import snow_load_router
-    from backend.API.Endpoints.user_data_endpoint import user_data_router
-    from backend.API.Endpoints.wall_load_combination_endpoint import (
-        wall_load_combination_router,
-    )
-    from backend.API.Endpoints.wind_load_endpoint import wind_load_router
-    from backend.API.Endpoints.calculate_main_structure_wind_factor import calculate_main_structure_wind_factor_router
-    from backend.API.Endpoints.visualization_endpoint import visualization_router
-    from backend.API.Endpoints.output_endpoint import output_router
+        # Create the database and bring its schema up to date
+        try:
+            migrate_database()
+        except Exception as e:
+            print(f"Failed to migrate the database: {e}")
+            exit(1)
+        exit(0)
 
-    app = FastAPI()
-    app.include_router(authentication_router)
-    app.include_router(location_router)
-    app.include_router(dimensions_router)
-    app.include_router(natural_frequency_endpoint_router)
-    app.include_router(cladding_router)
-    app.include_router(roof_router)
-    app.include_router(building_router)
-    app.include_router(importance_category_router)
-    app.include_router(material_type_endpoint_router)
-    app.include_router(user_data_router)
-    app.include_router(wind_load_router)
-    app.include_router(calculate_main_structure_wind_factor_router)
-    app.include_router(height_zone_router)
-    app.include_router(seismic_load_router)
-    app.include_router(snow_load_router)
-    app.include_router(wall_load_combination_router)
-    app.include_router(main_structure_loads_router)
-    app.include_router(roof_load_combination_router)
-    app.include_router(server_status_endpoint)
-    app.include_router(visualization_router)
-    app.include_router(output_router)
+    # The flags override the settings, and are passed to the worker processes through the environment
+    if args.server_host:
+        os.environ["SERVER_HOST"] = args.server_host
+    if args.server_port:
+        os.environ["SERVER_PORT"] = str(args.server_port)
+    if args.workers:
+        os.environ["SERVER_WORKERS"] = str(args.workers)
 
+    settings = get_settings()
     print("\n\n server will start soon, please wait for a bit\n\n")
-    uvicorn.run(app, host="0.0.0.0", port=42614)
- 
\ No newline at end of file
+    if settings.server.workers > 1:
+        # Each worker process creates its own application, the data of each user is shared through the session store
+        uvicorn.run(
+            "backend.API.application:create_app",
+            factory=True,
+            host=settings.server.host,
+            port=settings.server.port,
+            workers=settings.server.workers,
+        )
+    else:
+        from backend.API.application import create_app
+
+        uvicorn.run(create_app(), host=settings.server.host, port=settings.server.port)
@@ -0,0 +1,549 @@
+########################################################################################################################
+# settings.py
+# This file contains the settings of the server. The settings are read once from the .env files and the environment,
+# validated, and cached, so that every tunable of the server is configured in one place. Variables set in the
+# environment take precedence over the .env files, and unset variables take the defaults in the constants modules.
+#
+# Please refer to the LICENSE and DISCLAIMER files for more information regarding the use and distribution of this code.
+# By using this code, you agree to abide by the terms and conditions in those files.
+#
+# Author: Noah Subedar [https://github.com/noahsub]
+########################################################################################################################
+
+########################################################################################################################
+# IMPORTS
+########################################################################################################################
+
+import os
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Set, TypeVar
+
+from dotenv import dotenv_values
+
+from backend.Constants import cache_constants, location_constants, render_constants
+from config import get_file_path
+from database.Constants import connection_constants
+from database.Constants.connection_constants import ReferenceBackend
+
+########################################################################################################################
+# CONSTANTS
+########################################################################################################################
+
+# The .env file, relative to the source root, holding the database connection settings
+DATABASE_ENV_FILE = "database/.env"
+# The .env file, relative to the source root, holding the API settings
+API_ENV_FILE = "data/EnvironmentVariables/.env"
+# The keys the database .env file must define
+REQUIRED_DATABASE_KEYS = {
+    "HOST",
+    "PORT",
+    "ADMIN_USERNAME",
+    "ADMIN_PASSWORD",
+    "WRITE_USERNAME",
+    "WRITE_PASSWORD",
+    "READ_USERNAME",
+    "READ_PASSWORD",
+}
+# The keys the API .env file must define
+REQUIRED_API_KEYS = {"API_SECRET_KEY"}
+
+# The default address the server listens on
+DEFAULT_SERVER_HOST = "0.0.0.0"
+# The default port the server listens on
+DEFAULT_SERVER_PORT = 42614
+# The number of worker processes serving requests by default
+DEFAULT_SERVER_WORKERS = 1
+# The number of threads each worker process runs sync endpoints on by default, the default of anyio
+DEFAULT_SERVER_THREADS = 40
+
+T = TypeVar("T")
+
+
+########################################################################################################################
+# HELPER FUNCTIONS
+########################################################################################################################
+
+
+def read_env_file(relative_path: str) -> Dict[str, str]:
+    """
+    Reads the variables defined in a .env file
+    :param relative_path: The path of the .env file relative to the source root
+    :return: The variables defined in the file, empty if the file does not exist
+    """
+    path = get_file_path(relative_path)
+    if not os.path.exists(path):
+        return {}
+    return {
+        key: value for key, value in dotenv_values(path).items() if value is not None
+    }
+
+
+def get_missing_keys(relative_path: str, required_keys: Set[str]) -> Set[str]:
+    """
+    Gets the required keys a .env file does not define
+    :param relative_path: The path of the .env file relative to the source root
+    :param required_keys: The keys the file must define
+    :return: The keys missing from the file
+    """
+    return required_keys - read_env_file(relative_path).keys()
+
+
+def parse_bool(value: str) -> bool:
+    """
+    Parses a boolean setting
+    :param value: The value of the setting
+    :return: True for 1, true and yes, False for 0, false and no
+    """
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"{value} is not a boolean")
+
+
+def get_value(
+    values: Dict[str, str],
+    key: str,
+    parse: Callable[[str], T],
+    default: Optional[T],
+    minimum: Optional[float] = None,
+) -> Optional[T]:
+    """
+    Gets and validates a setting
+    :param values: The variables read from the .env files and the environment
+    :param key: The name of the variable
+    :param parse: Converts the value of the variable to the type of the setting
+    :param default: The value of the setting when the variable is not set
+    :param minimum: The smallest valid value of a numeric setting
+    :return: The value of the setting
+    """
+    raw = values.get(key)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        value = parse(raw.strip())
+    except ValueError as e:
+        raise ValueError(f"Invalid value for setting {key}: {e}") from None
+    if minimum is not None and value < minimum:
+        raise ValueError(f"Invalid value for setting {key}: must be at least {minimum}")
+    return value
+
+
+########################################################################################################################
+# SETTINGS CLASSES
+########################################################################################################################
+
+
+class ServerSettings:
+    """
+    Settings of the web server
+    """
+
+    # The address the server listens on
+    host: str
+    # The port the server listens on
+    port: int
+    # The number of worker processes serving requests, more than one keeps the data of each user in a shared store
+    workers: int
+    # The number of threads each worker process runs sync endpoints on
+    threads: int
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the ServerSettings class
+        :param values: The variables read from the .env files and the environment
+        """
+        self.host = get_value(values, "SERVER_HOST", str, DEFAULT_SERVER_HOST)
+        self.port = get_value(values, "SERVER_PORT", int, DEFAULT_SERVER_PORT, 1)
+        self.workers = get_value(
+            values, "SERVER_WORKERS", int, DEFAULT_SERVER_WORKERS, 1
+        )
+        self.threads = get_value(
+            values, "SERVER_THREADS", int, DEFAULT_SERVER_THREADS, 1
+        )
+
+
+class ApiSettings:
+    """
+    Settings of the API
+    """
+
+    # The secret key used to sign and verify JWT tokens, or None if it has not been generated
+    secret_key: Optional[str]
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the ApiSettings class
+        :param values: The variables read from the .env files and the environment
+        """
+        self.secret_key = get_value(values, "API_SECRET_KEY", str, None)
+
+
+class DatabaseSettings:
+    """
+    Settings of the database connections
+    """
+
+    # The host of the database, None if it is not set
+    host: Optional[str]
+    # The port of the database, None if it is not set
+    port: Optional[int]
+    # The admin username of the database, None if it is not set
+    admin_username: Optional[str]
+    # The admin password of the database, None if it is not set
+    admin_password: Optional[str]
+    # The write username of the database
+    write_username: Optional[str]
+    # The write password of the database
+    write_password: Optional[str]
+    # The read username of the database
+    read_username: Optional[str]
+    # The read password of the database
+    read_password: Optional[str]
+    # The number of connections kept open in each pooled engine
+    pool_size: int
+    # The number of connections that may be opened beyond the pool size during a burst
+    max_overflow: int
+    # The number of seconds to wait for a pooled connection before giving up
+    pool_timeout: int
+    # The number of seconds after which a pooled connection is recycled
+    pool_recycle: int
+    # Whether pooled connections are tested for liveness before being handed out
+    pool_pre_ping: bool
+    # The backend the read-only NBCC reference tables are read from
+    reference_backend: ReferenceBackend
+    # The file, relative to the source root, of the embedded reference database
+    reference_database_file: str
+    # The number of milliseconds after which a statement is written to the slow query log, 0 disables the log
+    slow_query_threshold: float
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the DatabaseSettings class
+        :param values: The variables read from the .env files and the environment
+        """
+        # The connection settings are only required once the PostgreSQL server is connected to, see check_credentials
+        self.host = get_value(values, "HOST", str, None)
+        self.port = get_value(values, "PORT", int, None, 1)
+        self.admin_username = get_value(values, "ADMIN_USERNAME", str, None)
+        self.admin_password = get_value(values, "ADMIN_PASSWORD", str, None)
+        self.write_username = get_value(values, "WRITE_USERNAME", str, None)
+        self.write_password = get_value(values, "WRITE_PASSWORD", str, None)
+        self.read_username = get_value(values, "READ_USERNAME", str, None)
+        self.read_password = get_value(values, "READ_PASSWORD", str, None)
+        self.pool_size = get_value(
+            values, "POOL_SIZE", int, connection_constants.DEFAULT_POOL_SIZE, 1
+        )
+        self.max_overflow = get_value(
+            values,
+            "POOL_MAX_OVERFLOW",
+            int,
+            connection_constants.DEFAULT_MAX_OVERFLOW,
+            0,
+        )
+        self.pool_timeout = get_value(
+            values, "POOL_TIMEOUT", int, connection_constants.DEFAULT_POOL_TIMEOUT, 0
+        )
+        self.pool_recycle = get_value(
+            values, "POOL_RECYCLE", int, connection_constants.DEFAULT_POOL_RECYCLE
+        )
+        self.pool_pre_ping = get_value(
+            values,
+            "POOL_PRE_PING",
+            parse_bool,
+            connection_constants.DEFAULT_POOL_PRE_PING,
+        )
+        self.reference_backend = get_value(
+            values,
+            "REFERENCE_BACKEND",
+            lambda value: ReferenceBackend(value.lower()),
+            ReferenceBackend(connection_constants.DEFAULT_REFERENCE_BACKEND),
+        )
+        self.reference_database_file = get_value(
+            values,
+            "REFERENCE_DATABASE_FILE",
+            str,
+            connection_constants.DEFAULT_REFERENCE_DATABASE_FILE,
+        )
+        self.slow_query_threshold = get_value(
+            values,
+            "SLOW_QUERY_THRESHOLD_MS",
+            float,
+            connection_constants.DEFAULT_SLOW_QUERY_THRESHOLD,
+            0,
+        )
+
+    def check_credentials(self) -> None:
+        """
+        Ensures the settings needed to connect to the PostgreSQL server are set. They are checked when a connection to
+        the server is first made rather than when the settings are loaded, so that the server and the benchmarks can run
+        from the embedded reference database without a PostgreSQL server.
+        :return: None
+        """
+        for key, value in (
+            ("HOST", self.host),
+            ("PORT", self.port),
+            ("ADMIN_USERNAME", self.admin_username),
+            ("ADMIN_PASSWORD", self.admin_password),
+        ):
+            if not value:
+                raise ValueError(
+                    f"Setting {key} is not set, run main.py to configure {DATABASE_ENV_FILE}"
+                )
+
+    def get_pool_options(self) -> dict:
+        """
+        Gets the connection pool options
+        :return: A dictionary of keyword arguments for sqlalchemy's create_engine
+        """
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+
+class CacheSettings:
+    """
+    Settings of the server's caches, each variable is named after the constant holding its default
+    """
+
+    # The maximum number of addresses kept in the geocoding cache
+    geocode_max_entries: int
+    # The number of seconds a successful geocoding result is kept
+    geocode_ttl: float
+    # The number of seconds a failed geocoding result is kept
+    geocode_negative_ttl: float
+    # The maximum number of stations kept in the bulk geocoding checkpoint
+    station_geocode_max_entries: int
+    # The maximum number of site results kept in the seismic hazard cache
+    seismic_hazard_max_entries: int
+    # The number of seconds a seismic hazard result is kept
+    seismic_hazard_ttl: float
+    # The maximum number of users whose data is kept in memory
+    session_store_max_users: int
+    # The approximate number of bytes of user data kept in memory
+    session_store_max_bytes: int
+    # The number of seconds a user's data is kept in memory without being accessed
+    session_store_idle_ttl: float
+    # The maximum number of evicted users whose data is kept on disk
+    session_spill_max_entries: int
+    # The number of seconds the data of an evicted user is kept on disk
+    session_spill_ttl: float
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the CacheSettings class
+        :param values: The variables read from the .env files and the environment
+        """
+        for name, parse in [
+            ("GEOCODE_CACHE_MAX_ENTRIES", int),
+            ("GEOCODE_CACHE_TTL", float),
+            ("GEOCODE_CACHE_NEGATIVE_TTL", float),
+            ("STATION_GEOCODE_CACHE_MAX_ENTRIES", int),
+            ("SEISMIC_HAZARD_CACHE_MAX_ENTRIES", int),
+            ("SEISMIC_HAZARD_CACHE_TTL", float),
+            ("SESSION_STORE_MAX_USERS", int),
+            ("SESSION_STORE_MAX_BYTES", int),
+            ("SESSION_STORE_IDLE_TTL", float),
+            ("SESSION_SPILL_MAX_ENTRIES", int),
+            ("SESSION_SPILL_TTL", float),
+        ]:
+            attribute = name.lower().replace("_cache_", "_")
+            setattr(
+                self,
+                attribute,
+                get_value(values, name, parse, getattr(cache_constants, name), 1),
+            )
+
+
+class RenderSettings:
+    """
+    Settings of the Blender workers rendering models
+    """
+
+    # The path of the Blender executable
+    blender_path: str
+    # The maximum number of workers, and therefore of renders running at once
+    pool_size: int
+    # The number of seconds a render job may take before its worker is killed
+    job_timeout: float
+    # The number of seconds a worker may take to start
+    startup_timeout: float
+    # The number of jobs a worker runs before it is replaced
+    worker_max_jobs: int
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the RenderSettings class
+        :param values: The variables read from the .env files and the environment
+        """
+        self.blender_path = get_value(
+            values, "BLENDER", str, render_constants.BLENDER_PATH
+        )
+        self.pool_size = get_value(
+            values, "BLENDER_POOL_SIZE", int, render_constants.BLENDER_POOL_SIZE, 1
+        )
+        self.job_timeout = get_value(
+            values,
+            "BLENDER_JOB_TIMEOUT",
+            float,
+            render_constants.BLENDER_JOB_TIMEOUT,
+            1,
+        )
+        self.startup_timeout = get_value(
+            values,
+            "BLENDER_STARTUP_TIMEOUT",
+            float,
+            render_constants.BLENDER_STARTUP_TIMEOUT,
+            1,
+        )
+        self.worker_max_jobs = get_value(
+            values,
+            "BLENDER_WORKER_MAX_JOBS",
+            int,
+            render_constants.BLENDER_WORKER_MAX_JOBS,
+            1,
+        )
+
+
+class LocationSettings:
+    """
+    Settings of the location lookups
+    """
+
+    # The number of seconds the location pipeline waits for the coordinates of an address
+    coordinates_timeout: float
+    # The number of seconds the location pipeline waits for the climatic data of a location
+    climatic_timeout: float
+    # The number of seconds the location pipeline waits for the seismic data of a location
+    seismic_timeout: float
+    # The minimum number of seconds between checks for changes to the ClimaticData table
+    climatic_station_index_refresh_interval: float
+    # The minimum number of seconds between checks for changes to the postal code CSV
+    postal_code_index_refresh_interval: float
+    # The number of threads geocoding the climatic stations concurrently
+    bulk_geocode_workers: int
+    # The number of geocoded stations written to the database in each commit
+    bulk_geocode_commit_size: int
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the LocationSettings class
+        :param values: The variables read from the .env files and the environment
+        """
+        self.coordinates_timeout = get_value(
+            values,
+            "LOCATION_COORDINATES_TIMEOUT",
+            float,
+            location_constants.LOCATION_COORDINATES_TIMEOUT,
+            0,
+        )
+        self.climatic_timeout = get_value(
+            values,
+            "LOCATION_CLIMATIC_TIMEOUT",
+            float,
+            location_constants.LOCATION_CLIMATIC_TIMEOUT,
+            0,
+        )
+        self.seismic_timeout = get_value(
+            values,
+            "LOCATION_SEISMIC_TIMEOUT",
+            float,
+            location_constants.LOCATION_SEISMIC_TIMEOUT,
+            0,
+        )
+        self.climatic_station_index_refresh_interval = get_value(
+            values,
+            "CLIMATIC_STATION_INDEX_REFRESH_INTERVAL",
+            float,
+            location_constants.CLIMATIC_STATION_INDEX_REFRESH_INTERVAL,
+            0,
+        )
+        self.postal_code_index_refresh_interval = get_value(
+            values,
+            "POSTAL_CODE_INDEX_REFRESH_INTERVAL",
+            float,
+            location_constants.POSTAL_CODE_INDEX_REFRESH_INTERVAL,
+            0,
+        )
+        self.bulk_geocode_workers = get_value(
+            values,
+            "BULK_GEOCODE_WORKERS",
+            int,
+            location_constants.BULK_GEOCODE_WORKERS,
+            1,
+        )
+        self.bulk_geocode_commit_size = get_value(
+            values,
+            "BULK_GEOCODE_COMMIT_SIZE",
+            int,
+            location_constants.BULK_GEOCODE_COMMIT_SIZE,
+            1,
+        )
+
+
+########################################################################################################################
+# MAIN CLASS
+########################################################################################################################
+
+
+class Settings:
+    """
+    The settings of the server, grouped by the part of the server they configure
+    """
+
+    # Settings of the web server
+    server: ServerSettings
+    # Settings of the API
+    api: ApiSettings
+    # Settings of the database connections
+    database: DatabaseSettings
+    # Settings of the server's caches
+    cache: CacheSettings
+    # Settings of the Blender workers rendering models
+    render: RenderSettings
+    # Settings of the location lookups
+    location: LocationSettings
+
+    def __init__(self, values: Dict[str, str]):
+        """
+        Constructor for the Settings class, raises a ValueError if a setting is missing or invalid
+        :param values: The variables read from the .env files and the environment
+        """
+        self.server = ServerSettings(values)
+        self.api = ApiSettings(values)
+        self.database = DatabaseSettings(values)
+        self.cache = CacheSettings(values)
+        self.render = RenderSettings(values)
+        self.location = LocationSettings(values)
+
+    @classmethod
+    def load(cls) -> "Settings":
+        """
+        Reads the settings from the .env files and the environment, the environment taking precedence
+        :return: The settings
+        """
+        return cls(
+            {
+                **read_env_file(DATABASE_ENV_FILE),
+                **read_env_file(API_ENV_FILE),
+                **os.environ,
+            }
+        )
+
+
+########################################################################################################################
+# SETTINGS FUNCTIONS
+########################################################################################################################
+
+
+@lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """
+    Gets the settings of the server, read once per process. Can be used as a FastAPI dependency.
+    :return: The settings
+    """
+    return Settings.load()